@@ -58,6 +58,15 @@ def get_conn():
         return None
 
 
+def get_status_counts(conn):
+    """Task counts by status (V3.4: from trigger-maintained lane_status_counts)."""
+    try:
+        rows = conn.execute("SELECT status, SUM(count) FROM lane_status_counts GROUP BY status").fetchall()
+    except sqlite3.OperationalError:
+        rows = conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+    return {status: count for status, count in rows}
+
+
 def main():
     # Header
     st.title("🏭 Vibe Coding Factory Floor")
@@ -69,6 +78,7 @@ def main():
     
     # === Metrics Row ===
     st.markdown("---")
+    status_counts = get_status_counts(conn)
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
@@ -77,19 +87,19 @@ def main():
         st.metric("👷 Workers", f"{active_workers}/{total_workers}", delta="active")
     
     with col2:
-        pending = pd.read_sql("SELECT COUNT(*) as c FROM tasks WHERE status='pending'", conn).iloc[0]['c']
+        pending = status_counts.get("pending", 0)
         st.metric("⏳ Pending", pending)
     
     with col3:
-        in_progress = pd.read_sql("SELECT COUNT(*) as c FROM tasks WHERE status='in_progress'", conn).iloc[0]['c']
+        in_progress = status_counts.get("in_progress", 0)
         st.metric("🔄 In Progress", in_progress)
     
     with col4:
-        completed = pd.read_sql("SELECT COUNT(*) as c FROM tasks WHERE status='completed'", conn).iloc[0]['c']
+        completed = status_counts.get("completed", 0)
         st.metric("✅ Completed", completed)
     
     with col5:
-        dlq = pd.read_sql("SELECT COUNT(*) as c FROM tasks WHERE status='dead_letter'", conn).iloc[0]['c']
+        dlq = status_counts.get("dead_letter", 0)
         if dlq > 0:
             st.metric("💀 Dead Letter", dlq, delta=f"⚠️ ALERT", delta_color="inverse")
         else:
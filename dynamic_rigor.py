@@ -578,9 +578,12 @@ def auto_lock_if_needed() -> bool:
 # v9.8 DYNAMIC CLARIFICATION (Pre-Flight Interrogation)
 # =============================================================================
 # Forces agents to ask questions before coding, based on rigor level.
-# Uses machine-parsable metadata for reliable parsing.
+# Questions live in an indexed SQLite store; the markdown queue is an export.
 
 import json
+import sqlite3
+import tempfile
+import threading
 
 # Clarification round limits by rigor level
 CLARIFICATION_LIMITS = {
@@ -602,90 +605,270 @@ CLARIFICATION_SAFE_TOOLS = [
     "ask_question", "get_open_questions", "dashboard"
 ]
 
-# Path to clarification queue
+# Path to clarification queue (markdown export, rendered from the store)
 CLARIFICATION_QUEUE_PATH = "docs/CLARIFICATION_QUEUE.md"
 
+# Source of truth: indexed SQLite store (atomic ID allocation, no md parsing)
+CLARIFICATION_DB_PATH = "control/state/clarifications.db"
+
+_QUESTION_META_RE = re.compile(r'<!--QUESTION_META:(\{[^}]+\})-->')
+
 
 def _get_queue_path():
     """Returns full path to clarification queue file."""
     return os.path.join(os.getcwd(), CLARIFICATION_QUEUE_PATH)
 
 
-def _ensure_queue_exists():
-    """Creates the clarification queue file if it doesn't exist."""
+def _get_clarification_db_path():
+    """Returns full path to the clarification store."""
+    return os.path.join(os.getcwd(), CLARIFICATION_DB_PATH)
+
+
+def _parse_legacy_queue(content: str) -> list:
+    """
+    Parses questions from a pre-store markdown queue (HTML-comment metadata).
+    Only used once, to import an existing queue into the store.
+    """
+    questions = []
+    for match in _QUESTION_META_RE.finditer(content):
+        try:
+            data = json.loads(match.group(1))
+        except json.JSONDecodeError:
+            continue
+        qid = data.get("id", "")
+        q_match = re.search(
+            rf'## {re.escape(qid)} \[(?:OPEN|CLOSED)\].*?\*\*Context:\*\* `(.*?)`.*?\*\*Question:\*\* (.+?)(?:\n|$)',
+            content[match.end():], re.DOTALL
+        )
+        if q_match:
+            data["context"] = q_match.group(1)
+            data["question"] = q_match.group(2).strip()
+        questions.append(data)
+    return questions
+
+
+# Store paths whose schema + legacy import already ran in this process
+_clarification_db_ready = set()
+_clarification_db_lock = threading.Lock()
+
+
+def _init_clarification_db(conn: sqlite3.Connection) -> None:
+    """Creates the schema and imports a legacy markdown queue (first use only)."""
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS clarification_questions (
+            num INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            question TEXT NOT NULL DEFAULT '',
+            context TEXT DEFAULT '',
+            round INTEGER DEFAULT 1,
+            task_id INTEGER,
+            status TEXT NOT NULL DEFAULT 'OPEN',
+            answer TEXT,
+            timestamp REAL,
+            closed_at REAL
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_clarification_status "
+        "ON clarification_questions(status, num)"
+    )
+
+    # One-time import of a queue written before the store existed
     queue_path = _get_queue_path()
-    os.makedirs(os.path.dirname(queue_path), exist_ok=True)
-    
     if not os.path.exists(queue_path):
-        with open(queue_path, "w", encoding="utf-8") as f:
-            f.write("# Clarification Queue\n\n")
-            f.write("_Questions logged by agents. Answer with `/answer Qn \"your answer\"`_\n\n")
+        return
+    if conn.execute("SELECT 1 FROM clarification_questions LIMIT 1").fetchone() is not None:
+        return  # Already populated: the markdown is our own export
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        empty = conn.execute("SELECT 1 FROM clarification_questions LIMIT 1").fetchone() is None
+        if empty:
+            with open(queue_path, "r", encoding="utf-8") as f:
+                legacy = _parse_legacy_queue(f.read())
+            for q in legacy:
+                m = re.fullmatch(r"Q(\d+)", str(q.get("id", "")))
+                if not m:
+                    continue
+                conn.execute(
+                    "INSERT OR IGNORE INTO clarification_questions "
+                    "(num, id, question, context, round, task_id, status, answer, timestamp, closed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (int(m.group(1)), q["id"], q.get("question", ""), q.get("context", ""),
+                     q.get("round", 1), q.get("task_id"), q.get("status", "OPEN"),
+                     q.get("answer"), q.get("timestamp"), q.get("closed_at"))
+                )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+
+
+def _open_clarification_db(readonly: bool = False) -> sqlite3.Connection:
+    """
+    Opens the clarification store (caller must close). Schema creation and
+    the legacy markdown import run once per store per process; after that,
+    readonly connections (polled status reads) never take the write lock.
+    """
+    db_path = _get_clarification_db_path()
+    with _clarification_db_lock:
+        if db_path in _clarification_db_ready and not os.path.exists(db_path):
+            _clarification_db_ready.discard(db_path)  # Store removed: set it up again
+        ready = db_path in _clarification_db_ready
+    if not ready:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+    conn = sqlite3.connect(db_path, timeout=30.0, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA busy_timeout=5000;")
+    if not ready:
+        with _clarification_db_lock:
+            if db_path not in _clarification_db_ready:
+                try:
+                    _init_clarification_db(conn)
+                except Exception:
+                    conn.close()
+                    raise
+                _clarification_db_ready.add(db_path)
+    if readonly:
+        conn.execute("PRAGMA query_only=ON;")
+    return conn
+
+
+def render_clarification_queue(conn: sqlite3.Connection = None) -> str:
+    """
+    Renders the store to docs/CLARIFICATION_QUEUE.md (human-readable export).
+    The HTML-comment metadata is kept so older tooling can still read it.
+
+    The snapshot and the file replace happen under the store's write lock
+    (BEGIN IMMEDIATE), so concurrent renders - in any process - replace the
+    file in snapshot order and an older snapshot never wins.
+
+    Returns:
+        Path of the rendered file
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = _open_clarification_db()
+    owns_txn = not conn.in_transaction
+    try:
+        if owns_txn:
+            conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute("SELECT * FROM clarification_questions ORDER BY num").fetchall()
+            return _write_clarification_markdown(rows)
+        finally:
+            if owns_txn:
+                conn.execute("COMMIT")  # Read-only transaction: just releases the lock
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def _write_clarification_markdown(rows) -> str:
+    """Writes the markdown export for these question rows; returns its path."""
+    parts = [
+        "# Clarification Queue\n\n",
+        "_Questions logged by agents. Answer with `/answer Qn \"your answer\"`_\n\n",
+    ]
+    for row in rows:
+        q_status = row["status"]
+        meta = {
+            "id": row["id"],
+            "status": q_status,  # SAFETY-ALLOW: status-write (question metadata, not task)
+            "round": row["round"],
+            "task_id": row["task_id"],
+            "timestamp": row["timestamp"],
+        }
+        answer_line = ""
+        if q_status == "CLOSED":
+            meta["answer"] = row["answer"]
+            meta["closed_at"] = row["closed_at"]
+            answer_line = f"\n**Answer:** {row['answer']}\n"
+        parts.append(f"""
+<!--QUESTION_META:{json.dumps(meta)}-->
+## {row["id"]} [{q_status}]
+**Round:** {row["round"]} ({ROUND_FOCUS.get(row["round"], "General")})
+**Context:** `{row["context"]}`
+**Question:** {row["question"]}
+{answer_line}
+---
+""")
+
+    queue_path = _get_queue_path()
+    os.makedirs(os.path.dirname(queue_path), exist_ok=True)
+    # Unique temp file + atomic replace: readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(queue_path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
+    os.replace(tmp_path, queue_path)
+    return queue_path
 
 
 def get_next_question_id() -> str:
-    """Gets the next question ID (Q1, Q2, etc.)."""
-    _ensure_queue_exists()
-    
+    """
+    Gets the next question ID (Q1, Q2, etc.).
+
+    NOTE: Advisory only - the ID is not reserved. Use enqueue_question to
+    allocate and store atomically.
+    """
     try:
-        with open(_get_queue_path(), "r", encoding="utf-8") as f:
-            content = f.read()
-        
-        # Find all existing question IDs using metadata
-        import re
-        matches = re.findall(r'"id":\s*"Q(\d+)"', content)
-        if matches:
-            max_id = max(int(m) for m in matches)
-            return f"Q{max_id + 1}"
+        conn = _open_clarification_db(readonly=True)
+        try:
+            row = conn.execute("SELECT MAX(num) FROM clarification_questions").fetchone()
+        finally:
+            conn.close()
+        return f"Q{(row[0] or 0) + 1}"
     except Exception:
-        pass
-    
-    return "Q1"
+        return "Q1"
 
 
-def append_to_clarification_queue(
-    qid: str,
+def enqueue_question(
     question: str,
     context: str,
     round_num: int = 1,
-    task_id: int = None
+    task_id: int = None,
+    qid: str = None
 ) -> str:
     """
-    v9.8: Appends a question to the clarification queue.
-    Uses HTML comment metadata for machine-reliable parsing.
-    
+    Stores a question with an atomically allocated ID and re-renders the
+    markdown queue.
+
     Args:
-        qid: Question ID (e.g., "Q1")
         question: The question text
         context: File or context being discussed
         round_num: Clarification round (1, 2, or 3)
         task_id: Optional task ID this question blocks
-        
+        qid: Preferred ID (e.g., "Q3"); ignored if missing or already taken
+
     Returns:
-        Confirmation message
+        The allocated question ID
     """
-    _ensure_queue_exists()
-    
-    # Machine-parsable metadata (JSON in HTML comment)
-    metadata = json.dumps({
-        "id": qid,
-        "status": "OPEN",  # SAFETY-ALLOW: status-write
-        "round": round_num,
-        "task_id": task_id,
-        "timestamp": _time.time()
-    })
-    
-    entry = f"""
-<!--QUESTION_META:{metadata}-->
-## {qid} [OPEN]
-**Round:** {round_num} ({ROUND_FOCUS.get(round_num, "General")})
-**Context:** `{context}`
-**Question:** {question}
-
----
-"""
-    
-    with open(_get_queue_path(), "a", encoding="utf-8") as f:
-        f.write(entry)
+    conn = _open_clarification_db()
+    try:
+        # BEGIN IMMEDIATE serializes concurrent writers: ID allocation is atomic
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            m = re.fullmatch(r"Q(\d+)", qid or "")
+            num = int(m.group(1)) if m else None
+            if num is None or conn.execute(
+                "SELECT 1 FROM clarification_questions WHERE num = ?", (num,)
+            ).fetchone():
+                row = conn.execute("SELECT MAX(num) FROM clarification_questions").fetchone()
+                num = (row[0] or 0) + 1
+            qid = f"Q{num}"
+            conn.execute(
+                "INSERT INTO clarification_questions "
+                "(num, id, question, context, round, task_id, status, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?, 'OPEN', ?)",
+                (num, qid, question, context, round_num, task_id, _time.time())
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        render_clarification_queue(conn)
+    finally:
+        conn.close()
     
     # Log to mesh.log
     try:
@@ -696,48 +879,66 @@ def append_to_clarification_queue(
     except Exception:
         pass
     
+    return qid
+
+
+def append_to_clarification_queue(
+    qid: str,
+    question: str,
+    context: str,
+    round_num: int = 1,
+    task_id: int = None
+) -> str:
+    """
+    v9.8: Appends a question to the clarification queue.
+    Stored in the clarification store; the markdown queue is re-rendered.
+    
+    Args:
+        qid: Question ID (e.g., "Q1"); re-allocated if already taken
+        question: The question text
+        context: File or context being discussed
+        round_num: Clarification round (1, 2, or 3)
+        task_id: Optional task ID this question blocks
+        
+    Returns:
+        Confirmation message
+    """
+    qid = enqueue_question(question, context, round_num, task_id, qid=qid)
     return f"⛔ Question {qid} logged. Waiting for user input via /answer"
 
 
 def get_open_questions() -> list:
     """
     v9.8: Returns all open questions from the queue.
-    Uses JSON metadata for reliable parsing.
+    Indexed lookup on (status, num) - no markdown parsing.
     """
-    _ensure_queue_exists()
-    
     try:
-        with open(_get_queue_path(), "r", encoding="utf-8") as f:
-            content = f.read()
+        conn = _open_clarification_db(readonly=True)
+        try:
+            rows = conn.execute(
+                "SELECT id, status, round, task_id, timestamp, question "
+                "FROM clarification_questions WHERE status = 'OPEN' ORDER BY num"
+            ).fetchall()
+        finally:
+            conn.close()
     except Exception:
         return []
-    
-    import re
-    questions = []
-    
-    # Parse JSON metadata from HTML comments
-    for match in re.finditer(r'<!--QUESTION_META:(\{[^}]+\})-->', content):
-        try:
-            data = json.loads(match.group(1))
-            if data.get("status") == "OPEN":
-                # Extract the question text
-                qid = data.get("id", "?")
-                q_match = re.search(
-                    rf'## {qid} \[OPEN\].*?\*\*Question:\*\* (.+?)(?:\n|$)',
-                    content, re.DOTALL
-                )
-                if q_match:
-                    data["question"] = q_match.group(1).strip()
-                questions.append(data)
-        except json.JSONDecodeError:
-            continue
-    
-    return questions
+    return [dict(row) for row in rows]
 
 
 def count_open_questions() -> int:
     """Returns count of open questions."""
-    return len(get_open_questions())
+    try:
+        conn = _open_clarification_db(readonly=True)
+        try:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM clarification_questions WHERE status = 'OPEN'"
+            ).fetchone()
+        finally:
+            conn.close()
+    except Exception:
+        return 0
+    return row[0]
 
 
 def mark_question_closed(qid: str, answer: str) -> bool:
@@ -751,44 +952,21 @@ def mark_question_closed(qid: str, answer: str) -> bool:
     Returns:
         True if question was found and closed
     """
-    _ensure_queue_exists()
-    
     try:
-        with open(_get_queue_path(), "r", encoding="utf-8") as f:
-            content = f.read()
+        conn = _open_clarification_db()
     except Exception:
         return False
-    
-    import re
-    
-    # Update metadata status
-    def update_meta(match):
-        try:
-            data = json.loads(match.group(1))
-            if data.get("id") == qid:
-                data["status"] = "CLOSED"  # SAFETY-ALLOW: status-write (question metadata, not task)
-                data["answer"] = answer
-                data["closed_at"] = _time.time()
-                return f'<!--QUESTION_META:{json.dumps(data)}-->'
-        except Exception:
-            pass
-        return match.group(0)
-    
-    content = re.sub(r'<!--QUESTION_META:(\{[^}]+\})-->', update_meta, content)
-    
-    # Update header
-    content = content.replace(f'## {qid} [OPEN]', f'## {qid} [CLOSED]')
-    
-    # Add answer text
-    answer_block = f"\n**Answer:** {answer}\n"
-    content = re.sub(
-        rf'(## {qid} \[CLOSED\].*?\*\*Question:\*\* .+?\n)',
-        rf'\1{answer_block}',
-        content, flags=re.DOTALL
-    )
-    
-    with open(_get_queue_path(), "w", encoding="utf-8") as f:
-        f.write(content)
+    try:
+        cur = conn.execute(
+            "UPDATE clarification_questions SET status = 'CLOSED', answer = ?, closed_at = ? "  # SAFETY-ALLOW: status-write (question metadata, not task)
+            "WHERE id = ?",
+            (answer, _time.time(), qid)
+        )
+        if cur.rowcount == 0:
+            return False
+        render_clarification_queue(conn)
+    finally:
+        conn.close()
     
     return True
 
@@ -156,6 +156,16 @@ import logging
 
 logger = logging.getLogger("LibrarianTools")
 
+# v35: Shared background git-status cache (tools/git_state.py). The guard gates
+# file moves, so it accepts a cached state only this fresh (else re-runs git).
+try:
+    from tools.git_state import read_git_state
+    GIT_STATE_AVAILABLE = True
+except ImportError:
+    GIT_STATE_AVAILABLE = False
+
+LIBRARIAN_GIT_MAX_AGE_S = 2.0
+
 def check_git_status(project_root: str, ignore_untracked: bool = True) -> Dict:
     """
     Check if git working tree is clean (Patch 2: Git Conflict Fix).
@@ -176,26 +186,39 @@ def check_git_status(project_root: str, ignore_untracked: bool = True) -> Dict:
     }
     
     try:
-        # FIX: Use list arguments to avoid shell injection (Issue #2)
-        proc = subprocess.run(
-            ["git", "status", "--porcelain"],
-            capture_output=True,
-            text=True,
-            cwd=project_root,
-            check=False  # Don't raise on non-zero exit
-        )
-        
-        if proc.returncode != 0:
-            logger.error(f"Git command failed: {proc.stderr}")
-            return {
-                "clean": True,
-                "modified_files": [],
-                "untracked_files": [],
-                "message": "Git check skipped (command failed)"
-            }
+        if GIT_STATE_AVAILABLE:
+            state = read_git_state(project_root, max_age_s=LIBRARIAN_GIT_MAX_AGE_S)
+            if not state.ok:
+                logger.error(f"Git command failed: {state.error}")
+                return {
+                    "clean": True,
+                    "modified_files": [],
+                    "untracked_files": [],
+                    "message": "Git check skipped (command failed)"
+                }
+            lines = list(state.entries)
+        else:
+            # FIX: Use list arguments to avoid shell injection (Issue #2)
+            proc = subprocess.run(
+                ["git", "status", "--porcelain"],
+                capture_output=True,
+                text=True,
+                cwd=project_root,
+                check=False  # Don't raise on non-zero exit
+            )
+            
+            if proc.returncode != 0:
+                logger.error(f"Git command failed: {proc.stderr}")
+                return {
+                    "clean": True,
+                    "modified_files": [],
+                    "untracked_files": [],
+                    "message": "Git check skipped (command failed)"
+                }
+            lines = proc.stdout.strip().split('\n')
         
-        if proc.stdout.strip():
-            for line in proc.stdout.strip().split('\n'):
+        if lines:
+            for line in lines:
                 if not line.strip():
                     continue
                 
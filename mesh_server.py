@@ -6,6 +6,7 @@
 # CONSUMES: SQLite (mesh.db)
 # VERSION: v22.0
 # ---------------------------------------------------------
+import base64
 import sqlite3
 import json
 import time
@@ -14,30 +15,27 @@ import signal
 import sys
 import re
 import hashlib
+import threading
+import zlib
+import importlib
+import importlib.util
+import itertools
 from datetime import date, datetime
 from enum import Enum
 from contextlib import contextmanager
-from mcp.server.fastmcp import FastMCP
 from typing import List, Dict
 
 # v10.8 Document Ingestion (optional dependencies)
-try:
-    import pypdf
-    PYPDF_AVAILABLE = True
-except ImportError:
-    PYPDF_AVAILABLE = False
+# v30: Availability is probed with find_spec (no import); the heavy modules are
+# imported on first use via _optional_module() to keep cold start fast.
+PYPDF_AVAILABLE = importlib.util.find_spec("pypdf") is not None
+DOCX_AVAILABLE = importlib.util.find_spec("docx") is not None
+MARKDOWNIFY_AVAILABLE = importlib.util.find_spec("markdownify") is not None
 
-try:
-    import docx
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
 
-try:
-    from markdownify import markdownify
-    MARKDOWNIFY_AVAILABLE = True
-except ImportError:
-    MARKDOWNIFY_AVAILABLE = False
+def _optional_module(name: str):
+    """Import an optional dependency on first use (cached by sys.modules)."""
+    return importlib.import_module(name)
 
 # =============================================================================
 # v10.18.0: VERSION CONSTANT
@@ -328,7 +326,58 @@ COMPLEXITY_TRIGGERS = [
     "from scratch", "entire system", "major change"
 ]
 
-mcp = FastMCP("AtomicMesh")
+class LazyFastMCP:
+    """
+    v30: Deferred FastMCP server.
+
+    Importing the MCP SDK and building each tool's pydantic argument model
+    dominated import time (~150 tools). @mcp.tool() only records the function;
+    the FastMCP instance is created and every recorded tool registered the
+    first time anything else is asked of the server (run, list_tools,
+    run_stdio_async, ...). Decorated functions stay plain callables.
+    """
+
+    def __init__(self, name: str, **settings):
+        self._name = name
+        self._settings = settings
+        self._pending_tools = []
+        self._server = None
+
+    def tool(self, *args, **kwargs):
+        if args and callable(args[0]):
+            raise TypeError(
+                "The @tool decorator was used incorrectly. "
+                "Did you forget to call it? Use @tool() instead of @tool"
+            )
+
+        def decorator(fn):
+            if self._server is not None:
+                return self._server.tool(*args, **kwargs)(fn)
+            self._pending_tools.append((fn, args, kwargs))
+            return fn
+        return decorator
+
+    @property
+    def server(self):
+        """The real FastMCP instance (created + populated on first access)."""
+        if self._server is None:
+            from mcp.server.fastmcp import FastMCP
+
+            server = FastMCP(self._name, **self._settings)
+            for fn, args, kwargs in self._pending_tools:
+                server.tool(*args, **kwargs)(fn)
+            self._pending_tools = []
+            self._server = server
+        return self._server
+
+    def __getattr__(self, attr):
+        # Only reached for attributes not defined here: run, list_tools, ...
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        return getattr(self.server, attr)
+
+
+mcp = LazyFastMCP("AtomicMesh")
 
 # Server start time for uptime tracking
 SERVER_START_TIME = time.time()
@@ -777,7 +826,8 @@ def update_task_state(task_id: int, new_status: str, *, via_gavel: bool = False)
                 return False, f"Task {task_id} not found"
 
             # 2. Timestamp Emission - always update updated_at
-            conn.execute(
+            _execute_transition(
+                conn, "gavel" if via_gavel else "update_task_state",
                 "UPDATE tasks SET status = ?, updated_at = ? WHERE id = ?",
                 (new_status, timestamp, task_id)
             )
@@ -788,19 +838,347 @@ def update_task_state(task_id: int, new_status: str, *, via_gavel: bool = False)
         return False, f"DB Error: {e}"
 
 
+def update_task_states(conn, task_ids: list, new_status: str, *, via_gavel: bool = False,
+                       expect_status: str = None) -> list:
+    """
+    v49: update_task_state for many tasks inside the caller's transaction
+    (same One Gavel hard lock, same timestamp emission and transition tag).
+    expect_status guards against concurrent moves. Returns the ids updated.
+
+    Raises:
+        PermissionError: 'completed' requested outside the Gavel
+    """
+    if new_status == "completed" and not via_gavel:
+        raise PermissionError("⛔ SECURITY VIOLATION: 'completed' status can only be set via submit_review_decision (The Gavel).")
+
+    timestamp = int(time.time())
+    updated = []
+    for i in range(0, len(task_ids), _SQL_IN_CHUNK):
+        chunk = list(task_ids[i:i + _SQL_IN_CHUNK])
+        guard = " AND status = ?" if expect_status is not None else ""
+        params = [*chunk] + ([expect_status] if expect_status is not None else [])
+        updated.extend(row[0] for row in conn.execute(
+            f"SELECT id FROM tasks WHERE id IN ({','.join('?' * len(chunk))}){guard}", params
+        ))
+        _execute_transition(
+            conn, "gavel" if via_gavel else "update_task_state",
+            f"UPDATE tasks SET status = ?, updated_at = ? "  # SAFETY-ALLOW: status-write
+            f"WHERE id IN ({','.join('?' * len(chunk))}){guard}",
+            [new_status, timestamp] + params,
+        )
+    return updated
+
+
+def _execute_transition(conn, via: str, sql: str, params=()):
+    """
+    v37: Run a status-changing statement with transition_context.via set, so
+    the task_transitions rows its triggers write are tagged (claim, reap, ...).
+    The tag is cleared before returning; the write lock held by the open
+    transaction keeps other connections from seeing it.
+    """
+    try:
+        conn.execute("UPDATE transition_context SET via = ? WHERE id = 1", (via,))
+    except sqlite3.OperationalError:
+        return conn.execute(sql, params)  # Pre-v37 schema: untagged
+    try:
+        return conn.execute(sql, params)
+    finally:
+        conn.execute("UPDATE transition_context SET via = '' WHERE id = 1")
+
+
 # Setup logging for server (Issue #1, #8)
 import logging
-from tools.readiness import get_context_readiness as _get_readiness_impl
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 server_logger = logging.getLogger("MeshServer")
 
-def init_db():
+# v30: Schema version stamped into PRAGMA user_version by init_db().
+# BUMP THIS whenever init_db() adds/changes tables, columns or indexes.
+MESH_SCHEMA_VERSION = 11
+
+# v32: Tables whose writes bump change_counters (via triggers) so readers such
+# as tools/snapshot.py and get_exec_snapshot can skip unchanged sections.
+CHANGE_COUNTER_TABLES = ("tasks", "config", "decisions", "audit_log")
+
+# v34: Triggers maintaining lane_status_counts. Decrements are upserts too, so
+# the result does not depend on the order SQLite fires these relative to the
+# status-lowering triggers; zeroed rows are dropped by whichever trigger lands last.
+_LSC_KEY = "IFNULL({row}.lane, ''), IFNULL({row}.type, ''), IFNULL({row}.status, '')"
+_LSC_ADJUST = (
+    "INSERT INTO lane_status_counts (lane, type, status, count) VALUES ({key}, {delta}) "
+    "ON CONFLICT (lane, type, status) DO UPDATE SET count = count + ({delta});"
+)
+_LSC_PRUNE = (
+    "DELETE FROM lane_status_counts WHERE count = 0 AND lane = IFNULL({row}.lane, '') "
+    "AND type = IFNULL({row}.type, '') AND status = IFNULL({row}.status, '');"
+)
+LANE_STATUS_COUNT_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_lane_status_insert
+    AFTER INSERT ON tasks
+    BEGIN
+        {_LSC_ADJUST.format(key=_LSC_KEY.format(row="NEW"), delta=1)}
+        {_LSC_PRUNE.format(row="NEW")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_lane_status_delete
+    AFTER DELETE ON tasks
+    BEGIN
+        {_LSC_ADJUST.format(key=_LSC_KEY.format(row="OLD"), delta=-1)}
+        {_LSC_PRUNE.format(row="OLD")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_lane_status_update
+    AFTER UPDATE OF lane, type, status ON tasks
+    WHEN OLD.lane IS NOT NEW.lane OR OLD.type IS NOT NEW.type OR OLD.status IS NOT NEW.status
+    BEGIN
+        {_LSC_ADJUST.format(key=_LSC_KEY.format(row="OLD"), delta=-1)}
+        {_LSC_ADJUST.format(key=_LSC_KEY.format(row="NEW"), delta=1)}
+        {_LSC_PRUNE.format(row="OLD")}
+        {_LSC_PRUNE.format(row="NEW")}
+    END
+    """,
+)
+
+
+# v34: HIGH-risk unverified task count for the snapshot header, kept in
+# task_rollups by triggers. tasks.verified is not part of this schema (external
+# tooling adds it), so init_db() only installs these when the column exists.
+_HIGH_RISK_UNVERIFIED = "(UPPER({row}.risk) = 'HIGH' AND {row}.verified = 0)"
+HIGH_RISK_ROLLUP_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_high_risk_insert
+    AFTER INSERT ON tasks
+    WHEN {_HIGH_RISK_UNVERIFIED.format(row="NEW")}
+    BEGIN
+        UPDATE task_rollups SET count = count + 1 WHERE name = 'high_risk_unverified';
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_high_risk_delete
+    AFTER DELETE ON tasks
+    WHEN {_HIGH_RISK_UNVERIFIED.format(row="OLD")}
+    BEGIN
+        UPDATE task_rollups SET count = count - 1 WHERE name = 'high_risk_unverified';
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_high_risk_update
+    AFTER UPDATE OF risk, verified ON tasks
+    WHEN IFNULL({_HIGH_RISK_UNVERIFIED.format(row="OLD")}, 0) <> IFNULL({_HIGH_RISK_UNVERIFIED.format(row="NEW")}, 0)
+    BEGIN
+        UPDATE task_rollups
+        SET count = count + IFNULL({_HIGH_RISK_UNVERIFIED.format(row="NEW")}, 0)
+                          - IFNULL({_HIGH_RISK_UNVERIFIED.format(row="OLD")}, 0)
+        WHERE name = 'high_risk_unverified';
+    END
+    """,
+)
+
+
+# v37: Append-only status transition log. Triggers record every status change
+# (whatever code path wrote it); callers that know *why* set transition_context
+# through _execute_transition() so the row carries a "via" tag.
+TASK_TRANSITION_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_transition_insert
+    AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_transitions
+            (task_id, from_status, to_status, lane, type, archetype, worker_id, via, at)
+        VALUES (NEW.id, NULL, LOWER(NEW.status), NEW.lane, NEW.type, NEW.archetype, NEW.worker_id,
+                IFNULL((SELECT via FROM transition_context WHERE id = 1), ''),
+                CAST(strftime('%s', 'now') AS INTEGER));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_transition_update
+    AFTER UPDATE OF status ON tasks
+    WHEN LOWER(OLD.status) IS NOT LOWER(NEW.status)
+    BEGIN
+        INSERT INTO task_transitions
+            (task_id, from_status, to_status, lane, type, archetype, worker_id, via, at)
+        VALUES (NEW.id, LOWER(OLD.status), LOWER(NEW.status), NEW.lane, NEW.type, NEW.archetype,
+                COALESCE(NULLIF(NEW.worker_id, ''), OLD.worker_id),
+                IFNULL((SELECT via FROM transition_context WHERE id = 1), ''),
+                CAST(strftime('%s', 'now') AS INTEGER));
+    END
+    """,
+)
+
+# v37: Hot-table retention for archive_task_transitions (older rows move to
+# zlib-compressed monthly blobs in task_transitions_archive)
+TASK_TRANSITIONS_RETENTION_DAYS = int(os.getenv("MESH_TRANSITIONS_RETENTION_DAYS", "30"))
+TASK_TRANSITION_COLUMNS = (
+    "id", "task_id", "from_status", "to_status", "lane", "type", "archetype", "worker_id", "via", "at"
+)
+
+
+# v42: task_sources(task_id, source_id) mirrors the tasks.source_ids JSON array
+# so source lookups (paired tests, upsert fingerprinting) are indexed joins.
+# Triggers keep it exact for every writer; malformed JSON maps to no rows.
+_TASK_SOURCES_JSON = (
+    "json_each(CASE WHEN json_valid({row}.source_ids) AND json_type({row}.source_ids) = 'array' "
+    "THEN {row}.source_ids ELSE '[]' END) AS j"
+)
+_TASK_SOURCES_INSERT = (
+    "INSERT OR IGNORE INTO task_sources (task_id, source_id) "
+    "SELECT {row}.id, j.value FROM {source} WHERE j.type = 'text' AND j.value <> '';"
+)
+TASK_SOURCE_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_sources_insert
+    AFTER INSERT ON tasks
+    BEGIN
+        {_TASK_SOURCES_INSERT.format(row="NEW", source=_TASK_SOURCES_JSON.format(row="NEW"))}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_sources_update
+    AFTER UPDATE OF id, source_ids ON tasks
+    WHEN OLD.id IS NOT NEW.id OR OLD.source_ids IS NOT NEW.source_ids
+    BEGIN
+        DELETE FROM task_sources WHERE task_id = OLD.id;
+        {_TASK_SOURCES_INSERT.format(row="NEW", source=_TASK_SOURCES_JSON.format(row="NEW"))}
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_sources_delete
+    AFTER DELETE ON tasks
+    BEGIN
+        DELETE FROM task_sources WHERE task_id = OLD.id;
+    END
+    """,
+)
+
+
+def _rebuild_task_sources(conn) -> None:
+    """v42: Recompute task_sources from tasks.source_ids (backfill / repair)."""
+    conn.execute("DELETE FROM task_sources")
+    conn.execute(_TASK_SOURCES_INSERT.format(
+        row="tasks", source="tasks, " + _TASK_SOURCES_JSON.format(row="tasks")
+    ))
+
+
+def _tasks_sharing_sources(conn, source_ids, archetype: str = None) -> dict:
+    """
+    v42: {task_id: [shared source ids]} for tasks citing any of source_ids,
+    in id order. Falls back to parsing tasks.source_ids when task_sources is
+    missing (DB not yet initialized at schema v10).
+    """
+    wanted = [s for s in dict.fromkeys(source_ids or []) if s]
+    if not wanted:
+        return {}
+    archetype_sql = " AND t.archetype = ?" if archetype is not None else ""
+    params = wanted + ([archetype] if archetype is not None else [])
+    matches = {}
+    try:
+        rows = conn.execute(
+            f"""SELECT s.task_id, s.source_id FROM task_sources s
+                JOIN tasks t ON t.id = s.task_id
+                WHERE s.source_id IN ({",".join("?" * len(wanted))}){archetype_sql}
+                ORDER BY s.task_id""",
+            params,
+        ).fetchall()
+    except sqlite3.OperationalError:
+        wanted_set = set(wanted)
+        rows = []
+        where = " WHERE archetype = ?" if archetype is not None else ""
+        for task_id, raw in conn.execute(
+            f"SELECT id, source_ids FROM tasks{where} ORDER BY id", params[len(wanted):]
+        ):
+            try:
+                task_sources = json.loads(raw) if raw else []
+            except (TypeError, ValueError):
+                continue
+            if isinstance(task_sources, list):
+                rows.extend((task_id, src) for src in dict.fromkeys(task_sources) if src in wanted_set)
+    for task_id, source_id in rows:
+        matches.setdefault(task_id, []).append(source_id)
+    return matches
+
+
+def _rebuild_lane_status_counts(conn) -> int:
+    """v34: Recompute lane_status_counts from tasks. Returns rows changed (drift)."""
+    before = {
+        (r[0], r[1], r[2]): r[3]
+        for r in conn.execute("SELECT lane, type, status, count FROM lane_status_counts")
+    }
+    conn.execute("DELETE FROM lane_status_counts")
+    conn.execute("""
+        INSERT INTO lane_status_counts (lane, type, status, count)
+        SELECT IFNULL(lane, ''), IFNULL(type, ''), IFNULL(status, ''), COUNT(*)
+        FROM tasks
+        GROUP BY IFNULL(lane, ''), IFNULL(type, ''), IFNULL(status, '')
+    """)
+    after = {
+        (r[0], r[1], r[2]): r[3]
+        for r in conn.execute("SELECT lane, type, status, count FROM lane_status_counts")
+    }
+    return sum(1 for key in before.keys() | after.keys() if before.get(key) != after.get(key))
+
+
+def _rebuild_task_rollups(conn) -> int:
+    """v34: Recompute task_rollups from tasks. Returns rows changed (drift).
+
+    No-op (0) when the rollup is not installed (tasks.verified missing).
+    """
+    try:
+        row = conn.execute(
+            "SELECT count FROM task_rollups WHERE name = 'high_risk_unverified'"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    actual = conn.execute(
+        "SELECT COUNT(*) FROM tasks WHERE UPPER(risk) = 'HIGH' AND verified = 0"
+    ).fetchone()[0]
+    if row is not None and row[0] == actual:
+        return 0
+    conn.execute(
+        "INSERT INTO task_rollups (name, count) VALUES ('high_risk_unverified', ?) "
+        "ON CONFLICT (name) DO UPDATE SET count = excluded.count",
+        (actual,),
+    )
+    return 1
+
+
+def _lane_status_rows(conn) -> list:
+    """v34: (lane, type, status, count) rows from lane_status_counts.
+
+    Falls back to a GROUP BY over tasks when the table is missing (DB not yet
+    initialized at schema v4).
+    """
+    try:
+        return conn.execute(
+            "SELECT lane, type, status, count FROM lane_status_counts WHERE count <> 0"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return conn.execute("""
+            SELECT IFNULL(lane, '') AS lane, IFNULL(type, '') AS type,
+                   IFNULL(status, '') AS status, COUNT(*) AS count
+            FROM tasks GROUP BY 1, 2, 3
+        """).fetchall()
+
+
+def _status_counts(conn) -> dict:
+    """v34: {status: count} summed from lane_status_counts."""
+    counts = {}
+    for row in _lane_status_rows(conn):
+        counts[row[2]] = counts.get(row[2], 0) + row[3]
+    return counts
+
+
+def init_db(force: bool = False):
     """Initialize database schema. WAL mode is already set in get_db().
 
     v12.2.1: Only initializes if DB file already exists.
     This prevents health checks from hiding data loss by auto-creating empty DBs.
     To create a fresh DB, manually create an empty file first or use a setup tool.
+
+    v30: Skips all DDL/migrations when PRAGMA user_version is already at
+    MESH_SCHEMA_VERSION (one cheap read on warm starts). force=True re-runs.
     """
     # v12.2.1: Don't auto-create DB - prevents sentinel from lying about missing data
     if not os.path.exists(DB_PATH):
@@ -810,6 +1188,8 @@ def init_db():
     try:
         with get_db() as conn:
             # Note: WAL mode already enabled in get_db(), no duplicate needed (Issue #6)
+            if not force and conn.execute("PRAGMA user_version").fetchone()[0] >= MESH_SCHEMA_VERSION:
+                return
             
             conn.execute("""
             CREATE TABLE IF NOT EXISTS tasks (
@@ -882,6 +1262,10 @@ def init_db():
                 # v24.1: Ownership + Leases (prevents task stealing / zombie workers)
                 ("lease_expires_at", "INTEGER DEFAULT 0", "v24.1"),
                 ("attempt_count", "INTEGER DEFAULT 0", "v24.1"),
+                # v37: Transition log triggers record the owning worker
+                ("worker_id", "TEXT", "v37"),
+                # v39: Retry scheduling - not pickable before this timestamp
+                ("backoff_until", "INTEGER DEFAULT 0", "v39"),
             ]
 
             for col_name, col_type, version in migrations:
@@ -893,19 +1277,35 @@ def init_db():
                     except Exception:
                         pass  # Column already exists
 
+            # v39: Pick indexes carry backoff_until so the scheduler's backoff
+            # predicate is checked in the index, before any table lookup.
+            # Rebuild the pre-v39 definitions in place (same names).
+            if "backoff_until" in existing_cols:
+                for name in ("idx_tasks_pick_preempt", "idx_tasks_pick_lane"):
+                    index_cols = [r[2] for r in conn.execute(f"PRAGMA index_info({name})")]
+                    if index_cols and "backoff_until" not in index_cols:
+                        conn.execute(f"DROP INDEX {name}")
+
             # v19.10+: Create indexes for scheduler and dashboards (idempotent)
             index_defs = [
                 (
                     "idx_tasks_pick_preempt",
                     "CREATE INDEX IF NOT EXISTS idx_tasks_pick_preempt "
-                    "ON tasks(status, priority, lane_rank, created_at, id)",
-                    {"status", "priority", "lane_rank", "created_at", "id"},
+                    "ON tasks(status, priority, lane_rank, created_at, id, backoff_until)",
+                    {"status", "priority", "lane_rank", "created_at", "id", "backoff_until"},
                 ),
                 (
                     "idx_tasks_pick_lane",
                     "CREATE INDEX IF NOT EXISTS idx_tasks_pick_lane "
-                    "ON tasks(status, lane, priority, lane_rank, created_at, id)",
-                    {"status", "lane", "priority", "lane_rank", "created_at", "id"},
+                    "ON tasks(status, lane, priority, lane_rank, created_at, id, backoff_until)",
+                    {"status", "lane", "priority", "lane_rank", "created_at", "id", "backoff_until"},
+                ),
+                (
+                    # v39: "Backing off" diagnostics (count + next retry time)
+                    "idx_tasks_status_backoff",
+                    "CREATE INDEX IF NOT EXISTS idx_tasks_status_backoff "
+                    "ON tasks(status, backoff_until)",
+                    {"status", "backoff_until"},
                 ),
                 (
                     "idx_tasks_auditor_status_status",
@@ -925,6 +1325,13 @@ def init_db():
                     "ON tasks(status, updated_at)",
                     {"status", "updated_at"},
                 ),
+                (
+                    # v33: Covering index for GROUP BY lane, status header counters
+                    "idx_tasks_lane_status",
+                    "CREATE INDEX IF NOT EXISTS idx_tasks_lane_status "
+                    "ON tasks(lane, status)",
+                    {"lane", "status"},
+                ),
                 (
                     "idx_tasks_source_plan_hash",
                     "CREATE INDEX IF NOT EXISTS idx_tasks_source_plan_hash "
@@ -986,6 +1393,10 @@ def init_db():
                     created_at INTEGER
                 )
             """)
+            # v36: Keyset pagination for get_audit_log (newest first)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_audit_log_created_at ON audit_log(created_at, id)"
+            )
             # NEW: Librarian operations log
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS librarian_ops (
@@ -1022,9 +1433,14 @@ def init_db():
                     task_ids TEXT DEFAULT '[]',
                     status TEXT DEFAULT 'idle',
                     last_seen INTEGER,
-                    created_at INTEGER
+                    created_at INTEGER,
+                    capacity INTEGER
                 )
             """)
+            # v40: Per-worker concurrency limit reported by heartbeats
+            heartbeat_cols = {row[1] for row in conn.execute("PRAGMA table_info(worker_heartbeats)")}
+            if "capacity" not in heartbeat_cols:
+                conn.execute("ALTER TABLE worker_heartbeats ADD COLUMN capacity INTEGER")
             # v24.1: Task message log for multi-turn conversations
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS task_messages (
@@ -1041,9 +1457,141 @@ def init_db():
                 CREATE INDEX IF NOT EXISTS idx_task_messages_task_id 
                 ON task_messages(task_id, created_at)
             """)
+            # v32: Change counters - one row per tracked table, bumped by
+            # AFTER INSERT/UPDATE/DELETE triggers so every writer participates.
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS change_counters (
+                    name TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            for table in CHANGE_COUNTER_TABLES:
+                conn.execute(
+                    "INSERT OR IGNORE INTO change_counters (name, version) VALUES (?, 0)", (table,)
+                )
+                for op in ("INSERT", "UPDATE", "DELETE"):
+                    conn.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS trg_{table}_{op.lower()}_version
+                        AFTER {op} ON {table}
+                        BEGIN
+                            UPDATE change_counters SET version = version + 1 WHERE name = '{table}';
+                        END
+                    """)
+            # v33: Normalize tasks.status to lower case at write time so readers
+            # compare exact values (index-friendly, no LOWER(status)).
+            conn.execute("UPDATE tasks SET status = LOWER(status) WHERE status <> LOWER(status)")  # SAFETY-ALLOW: status-write
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_tasks_status_lower_insert
+                AFTER INSERT ON tasks
+                WHEN NEW.status <> LOWER(NEW.status)
+                BEGIN
+                    UPDATE tasks SET status = LOWER(NEW.status) WHERE id = NEW.id;  -- SAFETY-ALLOW: status-write
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_tasks_status_lower_update
+                AFTER UPDATE OF status ON tasks
+                WHEN NEW.status <> LOWER(NEW.status)
+                BEGIN
+                    UPDATE tasks SET status = LOWER(NEW.status) WHERE id = NEW.id;  -- SAFETY-ALLOW: status-write
+                END
+            """)
+            # v34: Materialized per-(lane, type, status) task counts kept exact
+            # by triggers, so status surfaces read O(lanes) rows, not all tasks.
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS lane_status_counts (
+                    lane TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (lane, type, status)
+                )
+            """)
+            for trigger in LANE_STATUS_COUNT_TRIGGERS:
+                conn.execute(trigger)
+            _rebuild_lane_status_counts(conn)
+            if "verified" in {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS task_rollups (
+                        name TEXT PRIMARY KEY,
+                        count INTEGER NOT NULL DEFAULT 0
+                    )
+                """)
+                for trigger in HIGH_RISK_ROLLUP_TRIGGERS:
+                    conn.execute(trigger)
+                _rebuild_task_rollups(conn)
+            # v37: Append-only task transition log + compressed monthly archive
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS task_transitions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    task_id INTEGER NOT NULL,
+                    from_status TEXT,
+                    to_status TEXT NOT NULL,
+                    lane TEXT,
+                    type TEXT,
+                    archetype TEXT,
+                    worker_id TEXT,
+                    via TEXT NOT NULL DEFAULT '',
+                    at INTEGER NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_task_transitions_at ON task_transitions(at)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_task_transitions_task ON task_transitions(task_id, at)"
+            )
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS task_transitions_archive (
+                    month TEXT PRIMARY KEY,
+                    row_count INTEGER NOT NULL,
+                    min_at INTEGER,
+                    max_at INTEGER,
+                    payload BLOB NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS transition_context (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    via TEXT NOT NULL DEFAULT ''
+                )
+            """)
+            conn.execute("INSERT OR IGNORE INTO transition_context (id, via) VALUES (1, '')")
+            for trigger in TASK_TRANSITION_TRIGGERS:
+                conn.execute(trigger)
+            # v42: Normalized task -> source links (indexed both ways)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS task_sources (
+                    task_id INTEGER NOT NULL,
+                    source_id TEXT NOT NULL,
+                    PRIMARY KEY (task_id, source_id)
+                ) WITHOUT ROWID
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_task_sources_source ON task_sources(source_id, task_id)"
+            )
+            for trigger in TASK_SOURCE_TRIGGERS:
+                conn.execute(trigger)
+            _rebuild_task_sources(conn)
+            # v41: Persistent '# Implements [ID]' tag index for the gatekeeper
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS provenance_files (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS provenance_tags (
+                    source_id TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    line INTEGER NOT NULL,
+                    PRIMARY KEY (source_id, path, line)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_provenance_tags_path ON provenance_tags(path)")
             # Initialize config if not exists
             conn.execute("INSERT OR IGNORE INTO config (key, value) VALUES ('mode', 'vibe')")
             conn.execute("INSERT OR IGNORE INTO config (key, value) VALUES ('last_review', ?)", (str(int(time.time())),))
+            conn.execute(f"PRAGMA user_version = {MESH_SCHEMA_VERSION}")
     
     except sqlite3.Error as e:
         server_logger.critical(f"Database initialization failed: {e}")
@@ -1054,6 +1602,66 @@ def init_db():
 
 init_db()
 
+# =============================================================================
+# v36: CURSOR PAGINATION FOR LIST TOOLS
+# =============================================================================
+# Shared contract of the list tools (get_task_history, get_audit_log,
+# get_route_history, get_ledger_entries, list_pending_reviews,
+# get_review_queue, list_snapshots):
+#   args:     limit = page size (clamped per tool), cursor ("" = first page)
+#   response: compact JSON with the tool's item list plus "next_cursor"
+#             (None on the last page), "page_size" and "total_estimate"
+# Cursors are opaque (urlsafe base64 of the last item's sort key) and the next
+# page is fetched by keyset (sort key strictly after the cursor), not OFFSET.
+
+def _compact_json(obj) -> str:
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _encode_cursor(tool: str, key: list) -> str:
+    raw = _compact_json({"t": tool, "k": key}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(tool: str, cursor: str):
+    """Sort key from a cursor issued by the same tool; None for the first page."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if data["t"] == tool and isinstance(data["k"], list):
+            return data["k"]
+    except Exception:
+        pass
+    raise ValueError(f"invalid cursor for {tool}")
+
+
+def _keyset_page(items: list, limit: int, tool: str, key_fn) -> tuple:
+    """Split a LIMIT limit+1 fetch into (page, next_cursor)."""
+    if len(items) <= limit:
+        return items, None
+    page = items[:limit]
+    return page, _encode_cursor(tool, key_fn(page[-1]))
+
+
+def _paged_response(items_key: str, page: list, limit: int, next_cursor, total_estimate,
+                    status: str = "OK", **fields) -> str:
+    return _compact_json({
+        "status": status,  # SAFETY-ALLOW: status-write
+        **fields,
+        "count": len(page),
+        items_key: page,
+        "next_cursor": next_cursor,
+        "page_size": limit,
+        "total_estimate": total_estimate,
+    })
+
+
+def _cursor_error(e: ValueError) -> str:
+    return _compact_json({"status": "ERROR", "error": str(e)})  # SAFETY-ALLOW: status-write
+
+
 # --- HEALTH CHECK (Issue #12) ---
 
 @mcp.tool()
@@ -1193,7 +1801,7 @@ def claim_task(task_id: int, worker_id: str, lease_duration_s: int = 300) -> str
         
         with get_db() as conn:
             # Atomic claim: only succeeds if pending AND (no lease OR lease expired)
-            result = conn.execute("""
+            result = _execute_transition(conn, "claim", """
                 UPDATE tasks SET 
                     status='in_progress',
                     worker_id=?,
@@ -1504,7 +2112,7 @@ def submit_for_review(task_id: int, summary: str, artifacts: str, worker_id: str
 
 
 @mcp.tool()
-def get_task_history(task_id: int, limit: int = 20) -> str:
+def get_task_history(task_id: int, limit: int = 20, cursor: str = "") -> str:
     """
     Retrieve conversation history for a task.
     Useful for context when resuming work or reviewing submissions.
@@ -1512,12 +2120,18 @@ def get_task_history(task_id: int, limit: int = 20) -> str:
     Args:
         task_id: The task ID
         limit: Maximum number of messages to return (default: 20)
+        cursor: v36: next_cursor of the previous page ("" = newest messages)
     
     Returns:
-        JSON array of messages in chronological order
+        JSON array of messages in chronological order. v36: next_cursor pages
+        back to older messages.
     """
     validate_task_id(task_id)
     limit = max(1, min(limit, 100))  # Clamp: 1 to 100
+    try:
+        before = _decode_cursor("task_history", cursor)
+    except ValueError as e:
+        return _cursor_error(e)
     
     try:
         with get_db() as conn:
@@ -1526,23 +2140,32 @@ def get_task_history(task_id: int, limit: int = 20) -> str:
             if not task:
                 return json.dumps({"status": "ERROR", "error": f"Task {task_id} not found"})
             
-            rows = conn.execute("""
-                SELECT role, msg_type, content, created_at 
+            # v36: Keyset on (created_at, id) via idx_task_messages_task_id
+            keyset, params = "", [task_id]
+            if before:
+                keyset = "AND (created_at < ? OR (created_at = ? AND id < ?))"
+                params += [before[0], before[0], before[1]]
+            rows = conn.execute(f"""
+                SELECT id, role, msg_type, content, created_at 
                 FROM task_messages 
-                WHERE task_id = ? 
-                ORDER BY created_at DESC 
+                WHERE task_id = ? {keyset}
+                ORDER BY created_at DESC, id DESC 
                 LIMIT ?
-            """, (task_id, limit)).fetchall()
+            """, (*params, limit + 1)).fetchall()
+            page, next_cursor = _keyset_page(
+                rows, limit, "task_history", lambda r: [r["created_at"], r["id"]]
+            )
+            total = conn.execute(
+                "SELECT COUNT(*) FROM task_messages WHERE task_id = ?", (task_id,)
+            ).fetchone()[0]
             
             # Reverse to get chronological order
-            messages = [dict(r) for r in reversed(rows)]
+            messages = [
+                {"role": r["role"], "msg_type": r["msg_type"], "content": r["content"], "created_at": r["created_at"]}
+                for r in reversed(page)
+            ]
             
-        return json.dumps({
-            "status": "OK",
-            "task_id": task_id,
-            "count": len(messages),
-            "messages": messages
-        })
+        return _paged_response("messages", messages, limit, next_cursor, total, task_id=task_id)
         
     except Exception as e:
         server_logger.error(f"get_task_history error: {e}")
@@ -1590,7 +2213,7 @@ def approve_work(task_id: int, notes: str = "") -> str:
                 })
             
             # Approve: set completed, clear lease
-            conn.execute(
+            _execute_transition(conn, "approve",
                 """UPDATE tasks SET 
                     status='completed', 
                     review_decision='approved',
@@ -1661,7 +2284,7 @@ def reject_work(task_id: int, feedback: str, reassign: bool = True) -> str:
                     (f"Task {task_id} rejected {new_attempt} times - needs human decision",
                      f"Last feedback: {feedback[:200]}", timestamp)
                 )
-                conn.execute(
+                _execute_transition(conn, "reject",
                     """UPDATE tasks SET 
                         status='blocked', 
                         attempt_count=?,
@@ -1686,7 +2309,7 @@ def reject_work(task_id: int, feedback: str, reassign: bool = True) -> str:
             new_status = "in_progress" if reassign else "pending"
             update_worker = "" if reassign else ", worker_id=NULL, lease_id=NULL, lease_expires_at=0"
             
-            conn.execute(
+            _execute_transition(conn, "reject",
                 f"""UPDATE tasks SET 
                     status='{new_status}', 
                     attempt_count=?,
@@ -1777,7 +2400,7 @@ def submit_for_review_with_evidence(
             
             # Update task with evidence in worker_output
             full_output = f"{artifacts.strip() if artifacts else ''}\n\nEVIDENCE: {evidence_json}"
-            conn.execute(
+            _execute_transition(conn, "submit_for_review",
                 """UPDATE tasks SET 
                     status='review_needed', 
                     worker_output=?, 
@@ -1835,12 +2458,19 @@ def requeue_task(task_id: int, reason: str = "") -> str:
             old_status = task["status"]
             old_worker = task["worker_id"] or "none"
             
-            conn.execute(
-                """UPDATE tasks SET 
+            # v39: Admin requeue skips any retry backoff; reviving a dead
+            # letter (or a pre-v39 'failed' task) also resets its retry budget
+            cols = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+            retry_sets = "backoff_until=0," if "backoff_until" in cols else ""
+            if old_status in ("dead_letter", "failed"):
+                retry_sets += " retry_count=0,"
+            _execute_transition(conn, "requeue",
+                f"""UPDATE tasks SET 
                     status='pending',
                     worker_id=NULL,
                     lease_id=NULL,
                     lease_expires_at=0,
+                    {retry_sets}
                     updated_at=?
                 WHERE id=?""",  # SAFETY-ALLOW: status-write
                 (timestamp, task_id)
@@ -1893,7 +2523,7 @@ def force_unblock(task_id: int, reason: str = "") -> str:
             # Set to in_progress if worker assigned, else pending
             new_status = "in_progress" if task["worker_id"] else "pending"
             
-            conn.execute(
+            _execute_transition(conn, "force_unblock",
                 """UPDATE tasks SET 
                     status=?,
                     blocker_msg=NULL,
@@ -1951,7 +2581,7 @@ def cancel_task(task_id: int, reason: str) -> str:
             
             old_status = task["status"]
             
-            conn.execute(
+            _execute_transition(conn, "cancel",
                 """UPDATE tasks SET 
                     status='cancelled',
                     worker_id=NULL,
@@ -1997,8 +2627,10 @@ def sweep_stale_leases(max_stale_seconds: int = 600) -> str:
         
         with get_db() as conn:
             # Find stale tasks
+            cols = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+            backoff_set = "backoff_until=?," if "backoff_until" in cols else ""
             stale = conn.execute("""
-                SELECT id, worker_id, lease_expires_at 
+                SELECT id, worker_id, lease_expires_at, lane, retry_count
                 FROM tasks 
                 WHERE status='in_progress' 
                 AND lease_expires_at > 0 
@@ -2006,17 +2638,39 @@ def sweep_stale_leases(max_stale_seconds: int = 600) -> str:
             """, (now,)).fetchall()
             
             requeued = []
+            dead_lettered = []
             for task in stale:
                 task_id = task["id"]
-                conn.execute(
-                    """UPDATE tasks SET 
+                retries = task["retry_count"] or 0
+                # v39: Out of retries -> dead letter; otherwise back off
+                if RETRY_MAX_ATTEMPTS > 0 and retries + 1 >= RETRY_MAX_ATTEMPTS:
+                    _execute_transition(conn, "dead_letter",
+                        """UPDATE tasks SET 
+                            status='dead_letter',
+                            worker_id=NULL,
+                            lease_id=NULL,
+                            lease_expires_at=0,
+                            retry_count=retry_count+1,
+                            updated_at=?
+                        WHERE id=?""",  # SAFETY-ALLOW: status-write
+                        (now, task_id)
+                    )
+                    _log_task_message(conn, task_id, "system", "dead_letter",
+                        f"Lease expired (was: {task['worker_id']}) after {retries + 1} attempts. Dead-lettered.")
+                    dead_lettered.append(task_id)
+                    continue
+                backoff_params = [now + _retry_backoff_s(task["lane"], retries)] if backoff_set else []
+                _execute_transition(conn, "reap",
+                    f"""UPDATE tasks SET 
                         status='pending',
                         worker_id=NULL,
                         lease_id=NULL,
                         lease_expires_at=0,
+                        retry_count=retry_count+1,
+                        {backoff_set}
                         updated_at=?
                     WHERE id=?""",  # SAFETY-ALLOW: status-write
-                    (now, task_id)
+                    (*backoff_params, now, task_id)
                 )
                 _log_task_message(conn, task_id, "system", "lease_expired",
                     f"Lease expired (was: {task['worker_id']}). Requeued.")
@@ -2026,11 +2680,14 @@ def sweep_stale_leases(max_stale_seconds: int = 600) -> str:
         
         if requeued:
             server_logger.info(f"Stale lease sweep: requeued {len(requeued)} tasks: {requeued}")
+        if dead_lettered:
+            server_logger.warning(f"Stale lease sweep: dead-lettered {len(dead_lettered)} tasks: {dead_lettered}")
         
         return json.dumps({
             "status": "OK",
             "requeued_count": len(requeued),
             "requeued_ids": requeued,
+            "dead_letter_ids": dead_lettered,
             "message": f"Sweep complete. {len(requeued)} tasks requeued."
         })
         
@@ -2194,9 +2851,7 @@ def get_system_status() -> str:
             ).fetchone()
             
             # Active streams
-            streams = conn.execute(
-                "SELECT COUNT(*) FROM tasks WHERE status='in_progress'"
-            ).fetchone()[0]
+            streams = _status_counts(conn).get("in_progress", 0)
             
             # QA pending
             qa_pending = conn.execute(
@@ -2228,8 +2883,268 @@ def get_system_status() -> str:
     })
 
 
+# v32: get_exec_snapshot section cache. DB sections are keyed by the
+# change_counters versions of the tables they read (bumped by triggers, see
+# init_db), so unchanged sections skip their queries. Time-relative fields
+# (age_s, last_seen_s, stale alert) are always derived fresh; the etag hashes
+# the raw timestamps instead of the ages. Without the counters table (older
+# schema) every call recomputes.
+_exec_snapshot_cache = {}
+EXEC_SNAPSHOT_GIT_TTL_S = 2.0
+EXEC_SNAPSHOT_GIT_WAIT_S = 1.0  # v35: First call waits for the initial git status
+
+
+def _read_change_counters(conn) -> dict:
+    try:
+        return {row[0]: row[1] for row in conn.execute("SELECT name, version FROM change_counters")}
+    except sqlite3.Error:
+        return {}
+
+
+def _exec_section(name: str, key, compute):
+    """Return compute(), reusing the cached value while key is unchanged (None = no caching)."""
+    entry = _exec_snapshot_cache.get(name)
+    if key is not None and entry is not None and entry[0] == key:
+        return entry[1]
+    value = compute()
+    if key is not None:
+        _exec_snapshot_cache[name] = (key, value)
+    return value
+
+
+def _exec_worktree_dirty() -> bool:
+    """git status --porcelain, cached for EXEC_SNAPSHOT_GIT_TTL_S.
+
+    v35: Reads the shared background git_state cache (never blocks on git);
+    the TTL'd subprocess below is the fallback when it can't be imported.
+    """
+    try:
+        from tools.git_state import read_git_state
+    except ImportError:
+        read_git_state = None
+    if read_git_state is not None:
+        # Without the bounded first wait, the first snapshot reports "clean"
+        # (pending state) and the next one flips, changing the etag.
+        state = read_git_state(BASE_DIR, wait_s=EXEC_SNAPSHOT_GIT_WAIT_S)
+        return state.ok and not state.clean
+    import subprocess
+    entry = _exec_snapshot_cache.get("git")
+    now = time.monotonic()
+    if entry is not None and now - entry[0] < EXEC_SNAPSHOT_GIT_TTL_S:
+        return entry[1]
+    dirty = False
+    try:
+        result = subprocess.run(
+            ["git", "status", "--porcelain"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            cwd=BASE_DIR,
+        )
+        dirty = result.returncode == 0 and bool(result.stdout.strip())
+    except Exception:
+        pass
+    _exec_snapshot_cache["git"] = (now, dirty)
+    return dirty
+
+
+def _exec_plan_scheduler(conn) -> tuple:
+    """Plan identity + scheduler state from config."""
+    plan = {"hash": None, "name": None, "version": None, "path": None}
+    scheduler = {"rotation_ptr": None, "last_pick": None}
+
+    # === PLAN IDENTITY ===
+    # Get latest accepted plan from config (if stored)
+    try:
+        row = conn.execute(
+            "SELECT value FROM config WHERE key='accepted_plan_path' LIMIT 1"
+        ).fetchone()
+        if row and row["value"]:
+            plan_path = row["value"]
+            plan["path"] = plan_path
+            # Extract name from filename
+            plan["name"] = os.path.basename(plan_path) if plan_path else None
+            # Generate hash from path (simple identity)
+            plan["hash"] = hashlib.md5(plan_path.encode()).hexdigest()[:8] if plan_path else None
+    except Exception:
+        pass
+
+    # Get version from config
+    try:
+        row = conn.execute(
+            "SELECT value FROM config WHERE key='plan_version' LIMIT 1"
+        ).fetchone()
+        if row and row["value"]:
+            plan["version"] = row["value"]
+    except Exception:
+        pass
+
+    # === SCHEDULER STATE ===
+    # Lane pointer
+    try:
+        row = conn.execute(
+            "SELECT value FROM config WHERE key='scheduler_lane_pointer' LIMIT 1"
+        ).fetchone()
+        if row and row["value"]:
+            ptr_data = json.loads(row["value"])
+            scheduler["rotation_ptr"] = ptr_data.get("index")
+    except Exception:
+        pass
+
+    # Last pick decision
+    try:
+        row = conn.execute(
+            "SELECT value FROM config WHERE key='scheduler_last_decision' LIMIT 1"
+        ).fetchone()
+        if row and row["value"]:
+            dec_data = json.loads(row["value"])
+            # v21.1: Include full scheduler decision for UI/ops diagnostics
+            scheduler["last_decision"] = dec_data
+            scheduler["last_pick"] = {
+                "task_id": dec_data.get("picked_id"),
+                "lane": dec_data.get("lane"),
+                "reason": dec_data.get("reason"),
+            }
+    except Exception:
+        pass
+
+    return plan, scheduler
+
+
+def _exec_lane_stats(conn) -> list:
+    lanes = []
+    try:
+        # v34: Task counts by lane and status from lane_status_counts
+        # (lane falls back to type, matching COALESCE(NULLIF(lane,''), type))
+        lane_stats = {}
+        for row in _lane_status_rows(conn):
+            lane_name = (row["lane"] or row["type"]).lower() or "unknown"
+            if lane_name not in lane_stats:
+                lane_stats[lane_name] = {
+                    "name": lane_name,
+                    "active": 0,
+                    "pending": 0,
+                    "done": 0,
+                    "total": 0,
+                    "blocked": 0,
+                }
+            count = int(row["count"])
+            lane_stats[lane_name]["total"] += count
+            status = (row["status"] or "").lower()
+            if status == "in_progress":
+                lane_stats[lane_name]["active"] += count
+            elif status == "pending":
+                lane_stats[lane_name]["pending"] += count
+            elif status == "completed":
+                lane_stats[lane_name]["done"] += count
+            elif status == "blocked":
+                lane_stats[lane_name]["blocked"] += count
+
+        # Convert to list ordered by standard lane order
+        lane_order = ["backend", "frontend", "qa", "ops", "docs"]
+        for lane_name in lane_order:
+            if lane_name in lane_stats:
+                lanes.append(lane_stats[lane_name])
+        # Add any extra lanes not in standard order
+        for lane_name, stats in lane_stats.items():
+            if lane_name not in lane_order:
+                lanes.append(stats)
+    except Exception:
+        pass
+    return lanes
+
+
+def _exec_active_tasks(conn) -> list:
+    """Active task entries without age_s; '_updated_at' carries the raw timestamp."""
+    active = []
+    try:
+        # v21.0: Check which columns exist in tasks table
+        task_cols_info = conn.execute("PRAGMA table_info(tasks)").fetchall()
+        task_cols = {col["name"] for col in task_cols_info} if task_cols_info else set()
+
+        # Build query with only existing columns
+        base_cols = ["id", "status"]
+        optional_cols = ["lane", "type", "desc", "updated_at", "worker_id", "deps"]
+        select_cols = base_cols + [c for c in optional_cols if c in task_cols]
+
+        rows = conn.execute(f"""
+            SELECT {', '.join(select_cols)}
+            FROM tasks
+            WHERE status = 'in_progress'
+            ORDER BY {'updated_at' if 'updated_at' in task_cols else 'id'} DESC
+            LIMIT 10
+        """).fetchall()
+        for row in rows:
+            # v21.0: Safe column access for schema compatibility
+            row_dict = dict(row)
+            lane_val = row_dict.get("lane") or row_dict.get("type") or "unknown"
+
+            # Count blocked deps (if deps column exists)
+            deps_blocked = 0
+            deps_val = row_dict.get("deps")
+            if deps_val:
+                try:
+                    deps_list = json.loads(deps_val)
+                    if deps_list:
+                        # Count incomplete deps
+                        dep_ids = [d for d in deps_list if isinstance(d, int) or (isinstance(d, str) and d.isdigit())]
+                        if dep_ids:
+                            placeholders = ",".join("?" * len(dep_ids))
+                            incomplete = conn.execute(
+                                f"SELECT COUNT(*) FROM tasks WHERE id IN ({placeholders}) AND status != 'completed'",
+                                [int(d) for d in dep_ids]
+                            ).fetchone()[0]
+                            deps_blocked = incomplete
+                except Exception:
+                    pass
+
+            active.append({
+                "id": row_dict.get("id"),
+                "lane": lane_val,
+                "status": row_dict.get("status"),
+                "title": (row_dict.get("desc") or "")[:50],
+                "_updated_at": row_dict.get("updated_at"),
+                "worker_id": row_dict.get("worker_id"),
+                "parent_id": None,  # parent_task_id column doesn't exist yet
+                "deps_blocked": deps_blocked,
+            })
+    except Exception as e:
+        # Log error for debugging but don't crash
+        server_logger.warning(f"get_exec_snapshot active_tasks error: {e}")
+    return active
+
+
+def _exec_task_alert_inputs(conn) -> dict:
+    """Blocked count + in_progress updated_at values (stale check is done per call)."""
+    inputs = {"blocked": 0, "in_progress_updated": []}
+    try:
+        inputs["blocked"] = conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE status='blocked'"
+        ).fetchone()[0]
+    except Exception:
+        pass
+    try:
+        inputs["in_progress_updated"] = sorted(
+            r[0] for r in conn.execute(
+                "SELECT updated_at FROM tasks WHERE status='in_progress' AND updated_at IS NOT NULL"
+            )
+        )
+    except Exception:
+        pass
+    return inputs
+
+
+def _exec_red_decisions(conn) -> int:
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM decisions WHERE status='pending' AND priority='red'"
+        ).fetchone()[0]
+    except Exception:
+        return 0
+
+
 @mcp.tool()
-def get_exec_snapshot() -> str:
+def get_exec_snapshot(if_none_match: str = "") -> str:
     """
     v21.0: Returns EXEC dashboard snapshot for live execution monitoring.
 
@@ -2245,9 +3160,14 @@ def get_exec_snapshot() -> str:
     - workers: [{id, type, allowed_lanes, status, last_seen_s, task_ids}] - worker roster
     - active_tasks: [{id, lane, status, title, age_s, worker_id, parent_id, deps_blocked}]
     - alerts: [{level, code, text}] - system alerts
+    - flow: {throughput_per_h, rework_rate, lanes: [{name, workers_needed, ...}]} (v38)
+    - etag: hash of the payload with raw timestamps in place of ages (v32)
+
+    v32: DB sections are cached per change_counters version. Pass the last
+    etag as if_none_match to get {"etag", "not_modified": true} instead of
+    the full payload when nothing changed.
     """
-    import time
-    import hashlib
+    import bisect
 
     snapshot = {
         "plan": {"hash": None, "name": None, "version": None, "path": None},
@@ -2258,115 +3178,30 @@ def get_exec_snapshot() -> str:
         "workers": [],
         "active_tasks": [],
         "alerts": [],
+        "flow": None,
     }
 
     try:
         with get_db() as conn:
             now = int(time.time())
+            versions = _read_change_counters(conn)
 
-            # === PLAN IDENTITY ===
-            # Get latest accepted plan from config (if stored)
-            try:
-                row = conn.execute(
-                    "SELECT value FROM config WHERE key='accepted_plan_path' LIMIT 1"
-                ).fetchone()
-                if row and row["value"]:
-                    plan_path = row["value"]
-                    snapshot["plan"]["path"] = plan_path
-                    # Extract name from filename
-                    snapshot["plan"]["name"] = os.path.basename(plan_path) if plan_path else None
-                    # Generate hash from path (simple identity)
-                    snapshot["plan"]["hash"] = hashlib.md5(plan_path.encode()).hexdigest()[:8] if plan_path else None
-            except Exception:
-                pass
+            def key(*tables):
+                if not all(t in versions for t in tables):
+                    return None
+                return (DB_PATH,) + tuple(versions[t] for t in tables)
 
-            # Get version from config
-            try:
-                row = conn.execute(
-                    "SELECT value FROM config WHERE key='plan_version' LIMIT 1"
-                ).fetchone()
-                if row and row["value"]:
-                    snapshot["plan"]["version"] = row["value"]
-            except Exception:
-                pass
+            plan, scheduler = _exec_section(
+                "plan_scheduler", key("config"), lambda: _exec_plan_scheduler(conn)
+            )
+            snapshot["plan"] = dict(plan)
+            snapshot["scheduler"] = dict(scheduler)
 
-            # === SCHEDULER STATE ===
-            # Lane pointer
-            try:
-                row = conn.execute(
-                    "SELECT value FROM config WHERE key='scheduler_lane_pointer' LIMIT 1"
-                ).fetchone()
-                if row and row["value"]:
-                    ptr_data = json.loads(row["value"])
-                    snapshot["scheduler"]["rotation_ptr"] = ptr_data.get("index")
-            except Exception:
-                pass
+            # === LANE STATISTICS ===
+            snapshot["lanes"] = _exec_section("lanes", key("tasks"), lambda: _exec_lane_stats(conn))
 
-            # Last pick decision
-            try:
-                row = conn.execute(
-                    "SELECT value FROM config WHERE key='scheduler_last_decision' LIMIT 1"
-                ).fetchone()
-                if row and row["value"]:
-                    dec_data = json.loads(row["value"])
-                    # v21.1: Include full scheduler decision for UI/ops diagnostics
-                    snapshot["scheduler"]["last_decision"] = dec_data
-                    snapshot["scheduler"]["last_pick"] = {
-                        "task_id": dec_data.get("picked_id"),
-                        "lane": dec_data.get("lane"),
-                        "reason": dec_data.get("reason"),
-                    }
-            except Exception:
-                pass
-
-            # === LANE STATISTICS ===
-            try:
-                # Query task counts by lane and status
-                lane_expr = "LOWER(COALESCE(NULLIF(lane,''), type))"
-                rows = conn.execute(f"""
-                    SELECT {lane_expr} as lane_name, status, COUNT(*) as c
-                    FROM tasks
-                    GROUP BY {lane_expr}, status
-                """).fetchall()
-
-                lane_stats = {}
-                for row in rows:
-                    lane_name = row["lane_name"] or "unknown"
-                    if lane_name not in lane_stats:
-                        lane_stats[lane_name] = {
-                            "name": lane_name,
-                            "active": 0,
-                            "pending": 0,
-                            "done": 0,
-                            "total": 0,
-                            "blocked": 0,
-                        }
-                    count = int(row["c"])
-                    lane_stats[lane_name]["total"] += count
-                    status = (row["status"] or "").lower()
-                    if status == "in_progress":
-                        lane_stats[lane_name]["active"] += count
-                    elif status == "pending":
-                        lane_stats[lane_name]["pending"] += count
-                    elif status == "completed":
-                        lane_stats[lane_name]["done"] += count
-                    elif status == "blocked":
-                        lane_stats[lane_name]["blocked"] += count
-
-                # Convert to list ordered by standard lane order
-                lane_order = ["backend", "frontend", "qa", "ops", "docs"]
-                for lane_name in lane_order:
-                    if lane_name in lane_stats:
-                        snapshot["lanes"].append(lane_stats[lane_name])
-                # Add any extra lanes not in standard order
-                for lane_name, stats in lane_stats.items():
-                    if lane_name not in lane_order:
-                        snapshot["lanes"].append(stats)
-            except Exception:
-                pass
-
-            # === WORKERS ===
-            # Query worker heartbeats table (if exists)
+            # === WORKERS ===
+            # Heartbeats change constantly; always read live (LIMIT 10)
             try:
                 # Check if worker_heartbeats table exists
                 tables = conn.execute(
@@ -2380,7 +3215,6 @@ def get_exec_snapshot() -> str:
                         LIMIT 10
                     """).fetchall()
                     for row in rows:
-                        last_seen_s = now - int(row["last_seen"]) if row["last_seen"] else None
                         allowed = json.loads(row["allowed_lanes"]) if row["allowed_lanes"] else []
                         task_ids = json.loads(row["task_ids"]) if row["task_ids"] else []
                         snapshot["workers"].append({
@@ -2388,127 +3222,63 @@ def get_exec_snapshot() -> str:
                             "type": row["worker_type"],
                             "allowed_lanes": allowed,
                             "status": row["status"] or "unknown",
-                            "last_seen_s": last_seen_s,
+                            "_last_seen": row["last_seen"],  # -> last_seen_s after the etag check
                             "task_ids": task_ids,
                         })
             except Exception:
                 pass
 
-            # === ACTIVE TASKS ===
+            # === FLOW (v38) ===
+            # Sliding window over 2x24h of transitions: recompute once per
+            # FLOW_EXEC_BUCKET_S, not on every task change (polls stay cheap)
+            flow_key = (DB_PATH, now // FLOW_EXEC_BUCKET_S)
             try:
-                # v21.0: Check which columns exist in tasks table
-                task_cols_info = conn.execute("PRAGMA table_info(tasks)").fetchall()
-                task_cols = {col["name"] for col in task_cols_info} if task_cols_info else set()
-
-                # Build query with only existing columns
-                base_cols = ["id", "status"]
-                optional_cols = ["lane", "type", "desc", "updated_at", "worker_id", "deps"]
-                select_cols = base_cols + [c for c in optional_cols if c in task_cols]
-
-                rows = conn.execute(f"""
-                    SELECT {', '.join(select_cols)}
-                    FROM tasks
-                    WHERE status = 'in_progress'
-                    ORDER BY {'updated_at' if 'updated_at' in task_cols else 'id'} DESC
-                    LIMIT 10
-                """).fetchall()
-                for row in rows:
-                    # v21.0: Safe column access for schema compatibility
-                    row_dict = dict(row)
-                    lane_val = row_dict.get("lane") or row_dict.get("type") or "unknown"
-                    updated_at = row_dict.get("updated_at")
-                    age_s = now - int(updated_at) if updated_at else 0
-
-                    # Count blocked deps (if deps column exists)
-                    deps_blocked = 0
-                    deps_val = row_dict.get("deps")
-                    if deps_val:
-                        try:
-                            deps_list = json.loads(deps_val)
-                            if deps_list:
-                                # Count incomplete deps
-                                dep_ids = [d for d in deps_list if isinstance(d, int) or (isinstance(d, str) and d.isdigit())]
-                                if dep_ids:
-                                    placeholders = ",".join("?" * len(dep_ids))
-                                    incomplete = conn.execute(
-                                        f"SELECT COUNT(*) FROM tasks WHERE id IN ({placeholders}) AND status != 'completed'",
-                                        [int(d) for d in dep_ids]
-                                    ).fetchone()[0]
-                                    deps_blocked = incomplete
-                        except Exception:
-                            pass
+                snapshot["flow"] = _exec_section("flow", flow_key, lambda: _exec_flow_summary(conn, now))
+            except Exception:
+                pass
 
-                    snapshot["active_tasks"].append({
-                        "id": row_dict.get("id"),
-                        "lane": lane_val,
-                        "status": row_dict.get("status"),
-                        "title": (row_dict.get("desc") or "")[:50],
-                        "age_s": age_s,
-                        "worker_id": row_dict.get("worker_id"),
-                        "parent_id": None,  # parent_task_id column doesn't exist yet
-                        "deps_blocked": deps_blocked,
-                    })
-            except Exception as e:
-                # Log error for debugging but don't crash
-                server_logger.warning(f"get_exec_snapshot active_tasks error: {e}")
+            # === ACTIVE TASKS ===
+            # '_updated_at' stays raw until after the etag check (age_s ticks every second)
+            snapshot["active_tasks"] = [
+                dict(entry)
+                for entry in _exec_section("active_tasks", key("tasks"), lambda: _exec_active_tasks(conn))
+            ]
 
             # === ALERTS ===
             # Check for various alert conditions
 
             # 1. Working tree dirty
-            try:
-                import subprocess
-                result = subprocess.run(
-                    ["git", "status", "--porcelain"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    cwd=BASE_DIR,
-                )
-                if result.returncode == 0 and result.stdout.strip():
-                    snapshot["alerts"].append({
-                        "level": "warn",
-                        "code": "WORKTREE_DIRTY",
-                        "text": "Working tree dirty (uncommitted changes)",
-                    })
-            except Exception:
-                pass
+            if _exec_worktree_dirty():
+                snapshot["alerts"].append({
+                    "level": "warn",
+                    "code": "WORKTREE_DIRTY",
+                    "text": "Working tree dirty (uncommitted changes)",
+                })
+
+            task_alerts = _exec_section("task_alerts", key("tasks"), lambda: _exec_task_alert_inputs(conn))
 
             # 2. Blocked tasks
-            try:
-                blocked_count = conn.execute(
-                    "SELECT COUNT(*) FROM tasks WHERE status='blocked'"
-                ).fetchone()[0]
-                if blocked_count > 0:
-                    snapshot["alerts"].append({
-                        "level": "warn",
-                        "code": "TASKS_BLOCKED",
-                        "text": f"{blocked_count} task(s) blocked",
-                    })
-            except Exception:
-                pass
+            blocked_count = task_alerts["blocked"]
+            if blocked_count > 0:
+                snapshot["alerts"].append({
+                    "level": "warn",
+                    "code": "TASKS_BLOCKED",
+                    "text": f"{blocked_count} task(s) blocked",
+                })
 
             # 3. RED decisions pending
-            try:
-                red_count = conn.execute(
-                    "SELECT COUNT(*) FROM decisions WHERE status='pending' AND priority='red'"
-                ).fetchone()[0]
-                if red_count > 0:
-                    snapshot["alerts"].append({
-                        "level": "error",
-                        "code": "RED_DECISION",
-                        "text": f"RED decision pending - work blocked",
-                    })
-            except Exception:
-                pass
+            red_count = _exec_section("red_decisions", key("decisions"), lambda: _exec_red_decisions(conn))
+            if red_count > 0:
+                snapshot["alerts"].append({
+                    "level": "error",
+                    "code": "RED_DECISION",
+                    "text": f"RED decision pending - work blocked",
+                })
 
             # 4. Stale tasks (in_progress for too long)
             try:
                 stale_threshold = 3600  # 1 hour
-                stale_count = conn.execute(
-                    "SELECT COUNT(*) FROM tasks WHERE status='in_progress' AND updated_at < ?",
-                    (now - stale_threshold,)
-                ).fetchone()[0]
+                stale_count = bisect.bisect_left(task_alerts["in_progress_updated"], now - stale_threshold)
                 if stale_count > 0:
                     snapshot["alerts"].append({
                         "level": "warn",
@@ -2526,6 +3296,21 @@ def get_exec_snapshot() -> str:
             "text": f"Database error: {str(e)[:50]}",
         })
 
+    # Etag over time-independent content (raw timestamps, not ages), so it
+    # only changes when the data does; ages are derived afterwards.
+    body = json.dumps(snapshot, sort_keys=True)
+    etag = hashlib.sha1(body.encode("utf-8")).hexdigest()[:16]
+    if if_none_match and if_none_match == etag:
+        return json.dumps({"etag": etag, "not_modified": True})
+
+    now = int(time.time())
+    for task in snapshot["active_tasks"]:
+        updated_at = task.pop("_updated_at", None)
+        task["age_s"] = now - int(updated_at) if updated_at else 0
+    for worker in snapshot["workers"]:
+        last_seen = worker.pop("_last_seen", None)
+        worker["last_seen_s"] = now - int(last_seen) if last_seen else None
+    snapshot["etag"] = etag
     return json.dumps(snapshot)
 
 
@@ -2575,6 +3360,47 @@ def _resolve_doc_path(doc_name: str, base_dir: str = None) -> str:
     return None
 
 
+# v43: Extractors query one shared tokenization per document (tools/doc_ast.py)
+# instead of each running whole-document DOTALL regexes; results are memoized
+# on the parsed doc, so unchanged PRD/SPEC/DECISION_LOG content is analyzed
+# once however many plan/preview calls ask. Callers get fresh copies.
+
+_STORY_AS_A_RE = re.compile(
+    r'(?:^|\n)\s*(?:[-*]\s*)?(?:\[[ xX]?\]\s*)?'  # Optional bullet/checkbox
+    r'(?:US[-_]?\d+[:\s]*)?'  # Optional US-01: prefix
+    r'(As an?\s+.+?(?:,\s*)?I\s+(?:want|need|can)\s+.+?)(?:\n|$)',
+    re.IGNORECASE | re.DOTALL
+)
+_STORY_SECTION_RE = re.compile(r'(?:#{1,3}\s*)?User\s*Stories?\s*$', re.IGNORECASE)
+_STORY_BULLET_RE = re.compile(r'\s*(?:[-*]|\d+\.)\s*(?:\[[ xX]?\]\s*)?(.+)$')
+_US_ID_RE = re.compile(r'US[-_]?(\d+)')
+
+_HTTP_METHODS = r'(?:GET|POST|PUT|DELETE|PATCH)'
+_ENDPOINT_TABLE_RE = re.compile(
+    rf'\|[^|]*({_HTTP_METHODS})[^|]*\|[^|]*(/[a-zA-Z0-9_/:{{}}.-]+)[^|]*\|'
+    rf'|\|[^|]*(/[a-zA-Z0-9_/:{{}}.-]+)[^|]*\|[^|]*({_HTTP_METHODS})[^|]*\|',
+    re.IGNORECASE
+)
+_ENDPOINT_PROSE_RE = re.compile(
+    rf'(?:^|\s|`)({_HTTP_METHODS})\s+(/[a-zA-Z0-9_/:{{}}.-]+)',
+    re.IGNORECASE
+)
+
+_ENTITY_SECTION_RE = re.compile(r'(?:#{1,3}\s*)?(?:Data\s*Model|Entities|Schema)\s*$', re.IGNORECASE)
+_ENTITY_TABLE_RE = re.compile(r'\s*\|\s*([A-Z][a-zA-Z0-9_]+)\s*\|(.+)\|')
+_ENTITY_BULLET_RE = re.compile(
+    r'\s*(?:[-*]|\[[ xX]?\])\s*\*?\*?([A-Z][a-zA-Z0-9_]+)\*?\*?\s*(?:\([^)]+\))?[:\s]'
+)
+_ENTITY_CODE_RE = re.compile(r'\b(?:class|type|interface|struct)\s+([A-Z][a-zA-Z0-9_]+)\b')
+
+
+def _memoized_extraction(text: str, key: str, extract) -> list:
+    """extract(doc) once per content version; returns copies of the rows."""
+    from tools.doc_ast import parse_markdown
+    doc = parse_markdown(text)
+    return [dict(row) for row in doc.cached(key, lambda: extract(doc))]
+
+
 def _extract_user_stories(prd_text: str) -> list:
     """
     Extract user stories from PRD text.
@@ -2587,18 +3413,18 @@ def _extract_user_stories(prd_text: str) -> list:
     Returns:
         List of dicts: [{"id": "US-01", "story": "...", "raw": "..."}]
     """
+    return _memoized_extraction(prd_text, "user_stories", _scan_user_stories)
+
+
+def _scan_user_stories(doc) -> list:
     stories = []
     seen = set()
+    # "\0"-joined stories: one substring search instead of a scan per story
+    haystack = ""
 
-    # Pattern 1: "As a ... I want ..." anywhere in text
-    as_a_pattern = re.compile(
-        r'(?:^|\n)\s*(?:[-*]\s*)?(?:\[[ xX]?\]\s*)?'  # Optional bullet/checkbox
-        r'(?:US[-_]?\d+[:\s]*)?'  # Optional US-01: prefix
-        r'(As an?\s+.+?(?:,\s*)?I\s+(?:want|need|can)\s+.+?)(?:\n|$)',
-        re.IGNORECASE | re.DOTALL
-    )
-
-    for i, match in enumerate(as_a_pattern.finditer(prd_text)):
+    # Pattern 1: "As a ... I want ..." anywhere in text. The one whole-text
+    # scan left: a story may wrap onto following lines.
+    for match in _STORY_AS_A_RE.finditer(doc.text):
         story_text = match.group(1).strip()
         # Clean up multiline
         story_text = re.sub(r'\s+', ' ', story_text)
@@ -2611,7 +3437,7 @@ def _extract_user_stories(prd_text: str) -> list:
             seen.add(story_text)
             # Try to extract ID from preceding text
             story_id = f"US-{len(stories)+1:02d}"
-            id_match = re.search(r'US[-_]?(\d+)', match.group(0))
+            id_match = _US_ID_RE.search(match.group(0))
             if id_match:
                 story_id = f"US-{id_match.group(1).zfill(2)}"
 
@@ -2620,45 +3446,39 @@ def _extract_user_stories(prd_text: str) -> list:
                 "story": story_text,
                 "raw": match.group(0).strip()[:200]
             })
+            haystack += "\0" + story_text
 
     # Pattern 2: Bullets under "User Stories" section
-    section_match = re.search(
-        r'(?:^|\n)(?:#{1,3}\s*)?User\s*Stories?\s*\n(.*?)(?=\n#{1,3}\s|\Z)',
-        prd_text,
-        re.IGNORECASE | re.DOTALL
-    )
-
-    if section_match:
-        section_text = section_match.group(1)
-        bullet_pattern = re.compile(
-            r'^\s*(?:[-*]|\d+\.)\s*(?:\[[ xX]?\]\s*)?(.+)$',
-            re.MULTILINE
-        )
+    section_lines = doc.section(_STORY_SECTION_RE, levels=(1, 2, 3))
 
-        for match in bullet_pattern.finditer(section_text):
-            line = match.group(1).strip()
-            # Skip sub-headers, empty, or already captured
-            if line.startswith('#') or len(line) < 15:
-                continue
-            if any(line in s["story"] or s["story"] in line for s in stories):
-                continue
-            # Skip template placeholders
-            if '[user]' in line.lower() or '[capability]' in line.lower():
-                continue
+    for raw_line in section_lines or ():
+        match = _STORY_BULLET_RE.match(raw_line)
+        if not match:
+            continue
+        line = match.group(1).strip()
+        # Skip sub-headers, empty, or already captured
+        if line.startswith('#') or len(line) < 15:
+            continue
+        if line in haystack or any(s["story"] in line for s in stories):
+            continue
+        # Skip template placeholders
+        if '[user]' in line.lower() or '[capability]' in line.lower():
+            continue
 
-            story_id = f"US-{len(stories)+1:02d}"
-            id_match = re.search(r'US[-_]?(\d+)', line)
-            if id_match:
-                story_id = f"US-{id_match.group(1).zfill(2)}"
-                line = re.sub(r'US[-_]?\d+[:\s]*', '', line).strip()
+        story_id = f"US-{len(stories)+1:02d}"
+        id_match = _US_ID_RE.search(line)
+        if id_match:
+            story_id = f"US-{id_match.group(1).zfill(2)}"
+            line = re.sub(r'US[-_]?\d+[:\s]*', '', line).strip()
 
-            if line not in seen:
-                seen.add(line)
-                stories.append({
-                    "id": story_id,
-                    "story": line,
-                    "raw": match.group(0).strip()[:200]
-                })
+        if line not in seen:
+            seen.add(line)
+            stories.append({
+                "id": story_id,
+                "story": line,
+                "raw": match.group(0).strip()[:200]
+            })
+            haystack += "\0" + line
 
     _plan_debug(f"Extracted {len(stories)} user stories")
     return stories
@@ -2676,65 +3496,62 @@ def _extract_api_endpoints(spec_text: str) -> list:
     Returns:
         List of dicts: [{"method": "GET", "path": "/api/users", "raw": "..."}]
     """
+    return _memoized_extraction(spec_text, "api_endpoints", _scan_api_endpoints)
+
+
+def _scan_api_endpoints(doc) -> list:
     endpoints = []
     seen = set()
 
-    methods = r'(?:GET|POST|PUT|DELETE|PATCH)'
-
     # Pattern 1: Table rows with | /api/... | and method
-    table_pattern = re.compile(
-        rf'\|[^|]*({methods})[^|]*\|[^|]*(/[a-zA-Z0-9_/:{{}}.-]+)[^|]*\|'
-        rf'|\|[^|]*(/[a-zA-Z0-9_/:{{}}.-]+)[^|]*\|[^|]*({methods})[^|]*\|',
-        re.IGNORECASE
-    )
-
-    for match in table_pattern.finditer(spec_text):
-        groups = match.groups()
-        if groups[0] and groups[1]:
-            method, path = groups[0].upper(), groups[1]
-        elif groups[2] and groups[3]:
-            path, method = groups[2], groups[3].upper()
-        else:
+    for line in doc.lines:
+        if '|' not in line:
             continue
+        for match in _ENDPOINT_TABLE_RE.finditer(line):
+            groups = match.groups()
+            if groups[0] and groups[1]:
+                method, path = groups[0].upper(), groups[1]
+            elif groups[2] and groups[3]:
+                path, method = groups[2], groups[3].upper()
+            else:
+                continue
 
-        # Clean path
-        path = path.strip()
-        if not path.startswith('/'):
-            continue
-        # Skip template placeholders
-        if '/resource' in path.lower() and 'api' not in path.lower():
-            continue
+            # Clean path
+            path = path.strip()
+            if not path.startswith('/'):
+                continue
+            # Skip template placeholders
+            if '/resource' in path.lower() and 'api' not in path.lower():
+                continue
 
-        key = f"{method} {path}"
-        if key not in seen:
-            seen.add(key)
-            endpoints.append({
-                "method": method,
-                "path": path,
-                "raw": match.group(0).strip()[:150]
-            })
+            key = f"{method} {path}"
+            if key not in seen:
+                seen.add(key)
+                endpoints.append({
+                    "method": method,
+                    "path": path,
+                    "raw": match.group(0).strip()[:150]
+                })
 
     # Pattern 2: Prose/code lines "GET /api/..."
-    prose_pattern = re.compile(
-        rf'(?:^|\s|`)({methods})\s+(/[a-zA-Z0-9_/:{{}}.-]+)',
-        re.IGNORECASE | re.MULTILINE
-    )
-
-    for match in prose_pattern.finditer(spec_text):
-        method = match.group(1).upper()
-        path = match.group(2).strip()
-
-        if not path.startswith('/'):
+    for line in doc.lines:
+        if '/' not in line:
             continue
+        for match in _ENDPOINT_PROSE_RE.finditer(line):
+            method = match.group(1).upper()
+            path = match.group(2).strip()
 
-        key = f"{method} {path}"
-        if key not in seen:
-            seen.add(key)
-            endpoints.append({
-                "method": method,
-                "path": path,
-                "raw": match.group(0).strip()[:150]
-            })
+            if not path.startswith('/'):
+                continue
+
+            key = f"{method} {path}"
+            if key not in seen:
+                seen.add(key)
+                endpoints.append({
+                    "method": method,
+                    "path": path,
+                    "raw": match.group(0).strip()[:150]
+                })
 
     _plan_debug(f"Extracted {len(endpoints)} API endpoints")
     return endpoints
@@ -2752,26 +3569,24 @@ def _extract_data_entities(spec_text: str) -> list:
     Returns:
         List of dicts: [{"name": "User", "fields": "...", "raw": "..."}]
     """
+    return _memoized_extraction(spec_text, "data_entities", _scan_data_entities)
+
+
+def _scan_data_entities(doc) -> list:
     entities = []
     seen = set()
 
-    # Pattern 1: Table rows under Data Model section
-    section_match = re.search(
-        r'(?:^|\n)(?:#{1,3}\s*)?(?:Data\s*Model|Entities|Schema)\s*\n(.*?)(?=\n#{1,3}\s|\n---|\Z)',
-        spec_text,
-        re.IGNORECASE | re.DOTALL
+    # Pattern 1: Table rows under Data Model section (ends at a heading or ---)
+    section_lines = doc.section(
+        _ENTITY_SECTION_RE, levels=(1, 2, 3), stop=lambda line: line.startswith('---')
     )
 
-    if section_match:
-        section_text = section_match.group(1)
-
+    if section_lines is not None:
         # Pattern 1a: Table rows | EntityName | fields |
-        table_row_pattern = re.compile(
-            r'^\s*\|\s*([A-Z][a-zA-Z0-9_]+)\s*\|(.+)\|',
-            re.MULTILINE
-        )
-
-        for match in table_row_pattern.finditer(section_text):
+        for line in section_lines:
+            match = _ENTITY_TABLE_RE.match(line)
+            if not match:
+                continue
             name = match.group(1).strip()
             rest = match.group(2).strip()
 
@@ -2791,12 +3606,11 @@ def _extract_data_entities(spec_text: str) -> list:
                 })
 
         # Pattern 1b: Bullet list items like "[ ] EntityName (filename.parquet)"
-        bullet_entity_pattern = re.compile(
-            r'^\s*(?:[-*]|\[[ xX]?\])\s*\*?\*?([A-Z][a-zA-Z0-9_]+)\*?\*?\s*(?:\([^)]+\))?[:\s]',
-            re.MULTILINE
-        )
-
-        for match in bullet_entity_pattern.finditer(section_text):
+        for line in section_lines:
+            # The trailing [:\s] may be the line break itself
+            match = _ENTITY_BULLET_RE.match(line + "\n")
+            if not match:
+                continue
             name = match.group(1).strip()
             # Skip common non-entity words including Security/API section items
             skip_words = ('key', 'note', 'field', 'type', 'input', 'output', 'description',
@@ -2807,9 +3621,8 @@ def _extract_data_entities(spec_text: str) -> list:
 
             if name not in seen:
                 seen.add(name)
-                # Try to extract fields from the rest of the line
-                line_end = spec_text.find('\n', match.end())
-                rest = spec_text[match.end():line_end] if line_end > 0 else ""
+                # Fields: the rest of the bullet line
+                rest = line[match.end():]
                 entities.append({
                     "name": name,
                     "fields": rest[:100].strip(),
@@ -2817,24 +3630,20 @@ def _extract_data_entities(spec_text: str) -> list:
                 })
 
     # Pattern 2: Code definitions (class/type/interface/struct)
-    code_pattern = re.compile(
-        r'\b(?:class|type|interface|struct)\s+([A-Z][a-zA-Z0-9_]+)\b',
-        re.MULTILINE
-    )
-
-    for match in code_pattern.finditer(spec_text):
-        name = match.group(1).strip()
-        skip_words = ('entity', 'table', 'model', 'base', 'abstract', 'interface')
-        if name.lower() in skip_words:
-            continue
+    for line in doc.lines:
+        for match in _ENTITY_CODE_RE.finditer(line):
+            name = match.group(1).strip()
+            skip_words = ('entity', 'table', 'model', 'base', 'abstract', 'interface')
+            if name.lower() in skip_words:
+                continue
 
-        if name not in seen:
-            seen.add(name)
-            entities.append({
-                "name": name,
-                "fields": "",
-                "raw": match.group(0).strip()[:100]
-            })
+            if name not in seen:
+                seen.add(name)
+                entities.append({
+                    "name": name,
+                    "fields": "",
+                    "raw": match.group(0).strip()[:100]
+                })
 
     _plan_debug(f"Extracted {len(entities)} data entities")
     return entities
@@ -2855,13 +3664,16 @@ def _extract_decisions(decision_log_text: str) -> list:
     Returns:
         List of dicts: [{"id": "005", "type": "SECURITY", "decision": "...", "status": "ACCEPTED"}]
     """
+    return _memoized_extraction(decision_log_text, "decisions", _scan_decisions)
+
+
+def _scan_decisions(doc) -> list:
     decisions = []
 
-    lines = decision_log_text.split('\n')
     in_table = False
     header_seen = False
 
-    for line in lines:
+    for line in doc.lines:
         line = line.strip()
 
         # Detect table start
@@ -2961,12 +3773,16 @@ def extract_project_context(base_dir: str = None) -> dict:
         "decision_log": decision_log_path
     }
 
+    # v44: Extraction results persist per document version across processes
+    from tools.doc_ast import AnalysisStore
+    store = AnalysisStore(os.path.join(base_dir, "control", "state"))
+
     # Extract from PRD
     if prd_path:
         try:
             with open(prd_path, 'r', encoding='utf-8', errors='ignore') as f:
                 prd_text = f.read()
-            ctx["user_stories"] = _extract_user_stories(prd_text)
+            ctx["user_stories"] = store.get(prd_path, prd_text, "user_stories", _extract_user_stories)
         except Exception as e:
             ctx["debug"]["errors"].append(f"PRD read error: {e}")
 
@@ -2975,8 +3791,8 @@ def extract_project_context(base_dir: str = None) -> dict:
         try:
             with open(spec_path, 'r', encoding='utf-8', errors='ignore') as f:
                 spec_text = f.read()
-            ctx["api_endpoints"] = _extract_api_endpoints(spec_text)
-            ctx["data_entities"] = _extract_data_entities(spec_text)
+            ctx["api_endpoints"] = store.get(spec_path, spec_text, "api_endpoints", _extract_api_endpoints)
+            ctx["data_entities"] = store.get(spec_path, spec_text, "data_entities", _extract_data_entities)
         except Exception as e:
             ctx["debug"]["errors"].append(f"SPEC read error: {e}")
 
@@ -2985,10 +3801,12 @@ def extract_project_context(base_dir: str = None) -> dict:
         try:
             with open(decision_log_path, 'r', encoding='utf-8', errors='ignore') as f:
                 decision_text = f.read()
-            ctx["decisions"] = _extract_decisions(decision_text)
+            ctx["decisions"] = store.get(decision_log_path, decision_text, "decisions", _extract_decisions)
         except Exception as e:
             ctx["debug"]["errors"].append(f"DECISION_LOG read error: {e}")
 
+    store.save()
+
     # Debug counts
     ctx["debug"]["counts"] = {
         "user_stories": len(ctx["user_stories"]),
@@ -4259,23 +5077,32 @@ def write_active_spec_snapshot(base_dir: str = None) -> dict:
     active_spec_path = os.path.join(docs_dir, "ACTIVE_SPEC.md")
     decision_log_path = os.path.join(docs_dir, "DECISION_LOG.md")
 
+    # v43: Sections come from one tokenization per document (tools/doc_ast.py)
+    # rather than a regex pass over the whole text per section lookup.
+    def section_body(content: str, section_pattern: str):
+        """
+        Lines from the end of the heading match to the next "## " header,
+        or None when no line starts with section_pattern.
+        """
+        from tools.doc_ast import parse_markdown
+        doc = parse_markdown(content)
+        found = doc.find(re.compile(section_pattern, re.IGNORECASE))
+        if found is None:
+            return None
+        start, match = found
+        end = doc.section_end(start, levels=(2,), stop=lambda line: line == "##")
+        return [doc.lines[start][match.end():]] + doc.lines[start + 1:end]
+
     # Helper: extract bullet lines from a section
     def extract_bullets(content: str, section_pattern: str, max_items: int = 10) -> list:
         """Extract bullet/checkbox lines from a markdown section."""
-        # Find section
-        match = re.search(section_pattern, content, re.IGNORECASE | re.MULTILINE)
-        if not match:
+        section_lines = section_body(content, section_pattern)
+        if section_lines is None:
             return []
 
-        start = match.end()
-        # Find next ## header or end of file
-        next_section = re.search(r'^##\s', content[start:], re.MULTILINE)
-        end = start + next_section.start() if next_section else len(content)
-        section_text = content[start:end]
-
         # Extract bullet lines (-, *, - [ ], - [x], 1., etc.)
         bullets = []
-        for line in section_text.split('\n'):
+        for line in section_lines:
             line = line.strip()
             # Match bullet patterns
             if re.match(r'^[-*]\s+\[[ xX]\]\s+', line):  # Checkbox
@@ -4309,17 +5136,12 @@ def write_active_spec_snapshot(base_dir: str = None) -> dict:
     def extract_table_targets(content: str, section_pattern: str) -> dict:
         """Extract NFR targets from a markdown table."""
         targets = {"latency": "—", "uptime": "—", "coverage": "—"}
-        match = re.search(section_pattern, content, re.IGNORECASE | re.MULTILINE)
-        if not match:
+        section_lines = section_body(content, section_pattern)
+        if section_lines is None:
             return targets
 
-        start = match.end()
-        next_section = re.search(r'^##\s', content[start:], re.MULTILINE)
-        end = start + next_section.start() if next_section else len(content)
-        section_text = content[start:end]
-
         # Parse table rows
-        for line in section_text.split('\n'):
+        for line in section_lines:
             line_lower = line.lower()
             if 'latency' in line_lower or 'response' in line_lower:
                 parts = [p.strip() for p in line.split('|') if p.strip()]
@@ -4802,340 +5624,834 @@ def classify_exec_class(lane: str, desc: str, override: str = None) -> str:
     return "exclusive"
 
 
-@mcp.tool()
-def accept_plan(path: str) -> str:
-    """
-    v18.0: Parses a plan markdown file and hydrates SQLite with tasks.
+# =============================================================================
+# v45: BULK PLAN INGESTION
+# =============================================================================
+# accept_plan parses plan records outside the write lock, then under BEGIN
+# IMMEDIATE: one indexed signature lookup, ids pre-assigned from the table's
+# high-water mark so plan-key deps resolve in memory, and a single
+# executemany INSERT that writes each task with its deps. No per-task UPDATE.
+#
+# v46: Streaming. The plan is hashed and parsed line by line (generator) and
+# ingested in transactions of PLAN_INGEST_CHUNK tasks, so memory stays flat
+# and workers can pick early tasks while later chunks load. Deps resolve in
+# two phases: per chunk against plan keys seen so far (forward refs stay as
+# blocking tokens), then one final transaction re-resolves keyed deps against
+# the whole plan (last K: wins, as before). A config marker
+# (plan_ingest_pending:<hash>) lets an interrupted ingest resume instead of
+# reporting ALREADY_ACCEPTED.
+
+# - [ ] Type: Description -- DoD: ... | Trace: ... | P:URGENT | X:PAR | K:docs:foo | Dep:docs:bar
+_PLAN_TASK_RE = re.compile(r"^-\s*\[\s*\]\s*(\w+):\s*(.+)$")
+_PLAN_TRACE_RE = re.compile(r'\|\s*Trace:\s*([^\|]+)')
+_PLAN_PRIORITY_RE = re.compile(r'\|\s*P:(URGENT|HIGH)\b', re.IGNORECASE)
+_PLAN_EXEC_RE = re.compile(r'\|\s*X:(EXC|PAR|ADD)\b', re.IGNORECASE)
+_PLAN_KEY_RE = re.compile(r'\|\s*K:\s*([^\|]+)')
+_PLAN_DEP_RE = re.compile(r'\|\s*Dep:\s*([^\|]+)')
+_PLAN_BLOCKED_BY_RE = re.compile(r'\|\s*BlockedBy:\s*([^\|]+)')
+
+# SQLite's default host-parameter limit is 999 on older builds
+_SQL_IN_CHUNK = 500
+
+PLAN_INGEST_CHUNK = int(os.getenv("MESH_PLAN_INGEST_CHUNK", "500") or "500")
+_PLAN_HASH_READ_CHARS = 1 << 16
+
+
+def _normalize_plan_key(raw_key: str, default_lane: str) -> str:
+    token = (raw_key or "").strip()
+    if not token:
+        return ""
+    if ":" in token:
+        prefix, rest = token.split(":", 1)
+        prefix = prefix.strip().lower()
+        rest = rest.strip()
+        return f"{prefix}:{rest}" if rest else ""
+    return f"{default_lane.lower()}:{token}"
 
-    Args:
-        path: Path to the plan markdown file
 
-    Expected format:
-        - [ ] Type: Description -- DoD: ... | Trace: ... [| P:URGENT|HIGH] [| X:EXC|PAR|ADD]
-              [| K:<lane:key>] [| Dep:<ref,...>] [| BlockedBy:<ref,...>]
-        - [x] Type: Description (already done, skipped)
+def _normalize_plan_dep_ref(raw_ref: str, default_lane: str):
+    token = (raw_ref or "").strip()
+    if not token:
+        return None
+    if token.isdigit():
+        return int(token)
+    return _normalize_plan_key(token, default_lane)
 
-    Returns summary of created tasks with v18.0 fields.
 
-    Idempotency:
-        - Plan hash computed from content; duplicate plans rejected (ALREADY_ACCEPTED)
-        - Task signature = sha1(lane:desc:trace); duplicate tasks within plan skipped
-    """
-    import traceback as tb
+def _parse_plan_task(line: str, source_plan_hash: str, now: int):
+    """One plan line -> task record (no id/lane_rank yet), or None."""
+    match = _PLAN_TASK_RE.match(line.strip())
+    if not match:
+        return None
 
-    # v14.0: CONTEXT GATE - Block in BOOTSTRAP mode
-    try:
-        readiness = json.loads(get_context_readiness())
-        if readiness.get("status") == "BOOTSTRAP":
-            return json.dumps({
-                "status": "BLOCKED",
-                "reason": "BOOTSTRAP_MODE",
-                "message": "Strategic planning blocked - complete PRD, SPEC, DECISION_LOG first",
-                "blocking_files": readiness.get("overall", {}).get("blocking_files", [])
-            })
-    except Exception:
-        pass  # Fail open if readiness check fails
+    task_type = match.group(1).lower()
+    full_desc = match.group(2).strip()
+
+    # v18.0: Normalize lane
+    lane = task_type if task_type in LANE_WEIGHTS else "backend"
+
+    # Extract Trace if present
+    trace_match = _PLAN_TRACE_RE.search(full_desc)
+    trace = trace_match.group(1).strip() if trace_match else ""
+
+    # Extract priority override (P:URGENT or P:HIGH)
+    priority_match = _PLAN_PRIORITY_RE.search(full_desc)
+    priority_override = priority_match.group(1).upper() if priority_match else None
+
+    # Extract exec_class override (X:EXC, X:PAR, X:ADD)
+    exec_match = _PLAN_EXEC_RE.search(full_desc)
+    exec_class_override = exec_match.group(1).upper() if exec_match else None
+
+    # Extract optional plan key (K:) for dependency wiring
+    key_match = _PLAN_KEY_RE.search(full_desc)
+    plan_key = _normalize_plan_key(key_match.group(1), lane) if key_match else ""
+
+    # Remove internal tags from stored description (keep DoD/Trace/etc)
+    desc = _PLAN_KEY_RE.sub('', full_desc).strip()
+
+    # v19.0+: Extract Dep: and BlockedBy:
+    deps_tokens = []
+    for dep_re in (_PLAN_DEP_RE, _PLAN_BLOCKED_BY_RE):
+        dep_match = dep_re.search(full_desc)
+        if dep_match:
+            deps_tokens.extend([d.strip() for d in dep_match.group(1).split(',') if d.strip()])
+
+    deps_norm = []
+    for tok in deps_tokens:
+        ref = _normalize_plan_dep_ref(tok, lane)
+        if ref is not None:
+            deps_norm.append(ref)
+
+    # v18.0: Compute priority
+    # URGENT=0, HIGH=5, else lane weight
+    if priority_override == "URGENT":
+        priority = 0
+    elif priority_override == "HIGH":
+        priority = 5
+    else:
+        priority = LANE_WEIGHTS.get(lane, 50)
 
-    # v21.2: Ensure DB schema exists before any queries.
-    # If DB file doesn't exist, create it first then initialize schema.
-    # This prevents "no such table: tasks" errors on first accept-plan.
-    try:
-        if not os.path.exists(DB_PATH):
-            # Touch the DB file so init_db() will run
-            open(DB_PATH, "a").close()
-        init_db()
-    except (OSError, sqlite3.Error) as e:
-        # Fail open but log for diagnostics (permission errors, corruption, etc.)
-        server_logger.warning(f"accept_plan: schema init failed ({type(e).__name__}: {e})")
+    # v18.0: Compute task_signature = sha1(lane:desc:trace)
+    sig_input = f"{lane}:{desc}:{trace}"
 
-    try:
-        # Resolve path (allow relative paths from docs/PLANS)
-        if not os.path.isabs(path):
-            plans_dir = os.path.join(DOCS_DIR, "PLANS")
-            path = os.path.join(plans_dir, path)
+    return {
+        "type": task_type,
+        "desc": desc,
+        "lane": lane,
+        "priority": priority,
+        "created_at": now,
+        "exec_class": classify_exec_class(lane, desc, exec_class_override),
+        "task_signature": hashlib.sha1(sig_input.encode("utf-8")).hexdigest(),
+        "source_plan_hash": source_plan_hash,
+        "trace": trace,
+        "plan_key": plan_key,
+        "deps_tokens": deps_norm,
+    }
 
-        if not os.path.exists(path):
-            return json.dumps({
-                "status": "ERROR",
-                "message": f"File not found: {path}"
-            })
 
-        # Read the file
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.read()
+def _iter_plan_tasks(lines, source_plan_hash: str, now: int):
+    """Yield task records for unchecked "- [ ]" plan lines (any line iterable)."""
+    for line in lines:
+        record = _parse_plan_task(line, source_plan_hash, now)
+        if record is not None:
+            yield record
+
+
+def _plan_file_hash(path: str) -> str:
+    """sha1 of the decoded plan text (== sha1(f.read().encode())) without holding it."""
+    digest = hashlib.sha1()
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(_PLAN_HASH_READ_CHARS)
+            if not chunk:
+                break
+            digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _existing_task_signatures(conn, signatures) -> set:
+    """Which of these signatures are already queued (idx_tasks_task_signature)."""
+    signatures = list(signatures)
+    found = set()
+    for i in range(0, len(signatures), _SQL_IN_CHUNK):
+        chunk = signatures[i:i + _SQL_IN_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        found.update(row[0] for row in conn.execute(
+            f"SELECT task_signature FROM tasks WHERE task_signature IN ({placeholders})", chunk
+        ))
+    return found
+
+
+def _next_task_id(conn) -> int:
+    """The id SQLite would assign next (honours AUTOINCREMENT's sqlite_sequence)."""
+    next_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM tasks").fetchone()[0] + 1
+    try:
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tasks'").fetchone()
+    except sqlite3.OperationalError:
+        row = None  # No AUTOINCREMENT table in this DB
+    if row and row[0] is not None:
+        next_id = max(next_id, row[0] + 1)
+    return next_id
+
+
+def _resolve_plan_deps(tokens, key_to_id: dict) -> list:
+    """Plan-key refs -> task ids; unknown tokens kept (they block). Order-preserving de-dup."""
+    deps = []
+    for ref in tokens:
+        if isinstance(ref, str) and ref in key_to_id:
+            ref = key_to_id[ref]
+        if ref not in deps:
+            deps.append(ref)
+    return deps
+
+
+def _plan_ingest_marker(source_plan_hash: str) -> str:
+    return f"plan_ingest_pending:{source_plan_hash}"
+
+
+def _start_plan_ingest(conn, source_plan_hash: str, existing: int) -> dict:
+    """
+    Ingest state for a plan. existing > 0 means an interrupted ingest of the
+    same plan is being resumed: lane ranks, plan keys and still-unresolved
+    deps are reloaded from its committed tasks (signatures skip the rest).
+    """
+    state = {
+        "source_plan_hash": source_plan_hash,
+        "lane_ranks": {lane: 0 for lane in LANE_ORDER},
+        "key_to_id": {},
+        "keyed": [],  # (id, dep tokens, deps written) - re-resolved in phase 2
+        "created": [],
+        "skipped_duplicates": 0,
+        "resumed": existing > 0,
+    }
+    try:
+        task_cols = {row[1] for row in conn.execute("PRAGMA table_info(tasks)").fetchall()}
+    except sqlite3.Error:
+        task_cols = set()
+    state["has_plan_key"] = "plan_key" in task_cols
+    if existing:
+        key_col = "plan_key" if state["has_plan_key"] else "''"
+        for row in conn.execute(
+            f"SELECT id, lane, lane_rank, deps, {key_col} FROM tasks WHERE source_plan_hash = ? ORDER BY id",
+            (source_plan_hash,),
+        ):
+            task_id, lane, lane_rank, deps_json, plan_key = tuple(row)
+            state["lane_ranks"][lane] = max(state["lane_ranks"].get(lane, 0), (lane_rank or 0) + 1)
+            if plan_key:
+                state["key_to_id"][plan_key] = task_id
+            try:
+                deps = json.loads(deps_json or "[]")
+            except ValueError:
+                continue
+            if isinstance(deps, list) and any(isinstance(d, str) for d in deps):
+                state["keyed"].append((task_id, deps, deps))
+    conn.execute(
+        "INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)",
+        (_plan_ingest_marker(source_plan_hash), str(int(time.time()))),
+    )
+    return state
 
-        # v18.0: Compute source_plan_hash for idempotency
-        source_plan_hash = hashlib.sha1(content.encode("utf-8")).hexdigest()
-
-        def _normalize_key(raw_key: str, default_lane: str) -> str:
-            token = (raw_key or "").strip()
-            if not token:
-                return ""
-            if ":" in token:
-                prefix, rest = token.split(":", 1)
-                prefix = prefix.strip().lower()
-                rest = rest.strip()
-                return f"{prefix}:{rest}" if rest else ""
-            return f"{default_lane.lower()}:{token}"
-
-        def _normalize_dep_ref(raw_ref: str, default_lane: str):
-            token = (raw_ref or "").strip()
-            if not token:
-                return None
-            if token.isdigit():
-                return int(token)
-            return _normalize_key(token, default_lane)
 
-        # v18.0: Enhanced task pattern with optional modifiers
-        # - [ ] Type: Description -- DoD: ... | Trace: ... | P:URGENT | X:PAR | K:docs:foo | Dep:docs:bar
-        task_pattern = r"^-\s*\[\s*\]\s*(\w+):\s*(.+)$"
+def _ingest_plan_tasks(conn, records: list, state: dict) -> None:
+    """
+    Phase 1: insert a chunk of parsed records inside the caller's write
+    transaction.
 
-        created = []
-        skipped_duplicates = 0
-        now = int(time.time())
+    Skips records whose task_signature is already queued (earlier chunks
+    included) or repeats within the chunk, assigns lane_rank per lane and
+    ids in plan order, resolves deps against plan keys seen so far and
+    writes the chunk with one executemany. Tasks whose deps name plan keys
+    are remembered for phase 2 (_finish_plan_ingest).
+    """
+    lane_ranks = state["lane_ranks"]
+    key_to_id = state["key_to_id"]
 
-        # Track lane_rank per lane for ordering within lane
-        lane_ranks = {lane: 0 for lane in LANE_ORDER}
+    seen_sigs = _existing_task_signatures(conn, {r["task_signature"] for r in records})
+    next_id = _next_task_id(conn)
+    inserted = []
 
-        tasks_to_insert = []
+    for task in records:
+        # v18.0: Skip duplicate tasks (same signature already exists or earlier in plan)
+        if task["task_signature"] in seen_sigs:
+            state["skipped_duplicates"] += 1
+            continue
+        seen_sigs.add(task["task_signature"])
 
-        # Single tight transaction: idempotency check + inserts + dep resolution
-        with get_db() as conn:
-            conn.execute("BEGIN IMMEDIATE")
+        # v18.0: Compute lane_rank (order within lane)
+        lane_rank = lane_ranks.get(task["lane"], 0)
+        lane_ranks[task["lane"]] = lane_rank + 1
 
-            # v21.1: Ensure config table exists (some test/minimal DBs only create tasks).
-            # Needed for accepted_plan_path and other lightweight scheduler metadata.
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS config (
-                    key TEXT PRIMARY KEY,
-                    value TEXT
-                )
-            """)
+        task = dict(task, id=next_id, lane_rank=lane_rank)
+        next_id += 1
+        inserted.append(task)
+        if task["plan_key"]:
+            # Last write wins; ambiguity is surfaced via unresolved deps during resolution.
+            key_to_id[task["plan_key"]] = task["id"]
 
-            existing = conn.execute(
-                "SELECT COUNT(*) FROM tasks WHERE source_plan_hash = ?",
-                (source_plan_hash,)
-            ).fetchone()[0]
-            if existing > 0:
-                return json.dumps({
-                    "status": "ALREADY_ACCEPTED",
-                    "plan_hash": source_plan_hash,
-                    "message": f"Plan already accepted ({existing} tasks from this plan)"
-                })
+    for task in inserted:
+        task["deps"] = _resolve_plan_deps(task["deps_tokens"], key_to_id)
+        if any(isinstance(ref, str) for ref in task["deps_tokens"]):
+            state["keyed"].append((task["id"], task["deps_tokens"], task["deps"]))
 
-            existing_sigs = set(
-                row[0] for row in conn.execute(
-                    "SELECT task_signature FROM tasks WHERE task_signature != ''"
-                ).fetchall()
-            )
+    columns = ["id", "type", "desc", "priority", "lane", "lane_rank", "created_at",
+               "exec_class", "task_signature", "source_plan_hash"]
+    if state["has_plan_key"]:
+        columns.append("plan_key")  # Feature-detected: minimal/legacy DBs lack it
 
-            # Feature-detect optional columns for forward/backward compatibility
-            try:
-                task_cols = {row[1] for row in conn.execute("PRAGMA table_info(tasks)").fetchall()}
-            except Exception:
-                task_cols = set()
-            has_plan_key_col = "plan_key" in task_cols
+    now = int(time.time())
+    conn.executemany(
+        f"INSERT INTO tasks (status, updated_at, deps, {', '.join(columns)}) "
+        f"VALUES ('pending', ?, ?, {', '.join('?' * len(columns))})",  # SAFETY-ALLOW: status-write (initial task creation)
+        (
+            [now, json.dumps(task["deps"])] + [task[col] for col in columns]
+            for task in inserted
+        ),
+    )
 
-            for line in content.split("\n"):
-                match = re.match(task_pattern, line.strip())
-                if not match:
-                    continue
+    state["created"].extend(
+        {
+            "id": task["id"],
+            "type": task["type"],
+            "desc": task["desc"],
+            "lane": task["lane"],
+            "priority": task["priority"],
+            "lane_rank": task["lane_rank"],
+            "created_at": task["created_at"],
+            "exec_class": task["exec_class"],
+            "task_signature": task["task_signature"],
+        }
+        for task in inserted
+    )
 
-                task_type = match.group(1).lower()
-                full_desc = match.group(2).strip()
-
-                # v18.0: Normalize lane
-                lane = task_type if task_type in LANE_WEIGHTS else "backend"
-
-                # Extract Trace if present
-                trace = ""
-                trace_match = re.search(r'\|\s*Trace:\s*([^\|]+)', full_desc)
-                if trace_match:
-                    trace = trace_match.group(1).strip()
-
-                # Extract priority override (P:URGENT or P:HIGH)
-                priority_override = None
-                priority_match = re.search(r'\|\s*P:(URGENT|HIGH)\b', full_desc, re.IGNORECASE)
-                if priority_match:
-                    priority_override = priority_match.group(1).upper()
-
-                # Extract exec_class override (X:EXC, X:PAR, X:ADD)
-                exec_class_override = None
-                exec_match = re.search(r'\|\s*X:(EXC|PAR|ADD)\b', full_desc, re.IGNORECASE)
-                if exec_match:
-                    exec_class_override = exec_match.group(1).upper()
-
-                # Extract optional plan key (K:) for dependency wiring
-                plan_key = ""
-                key_match = re.search(r'\|\s*K:\s*([^\|]+)', full_desc)
-                if key_match:
-                    plan_key = _normalize_key(key_match.group(1), lane)
-
-                # Remove internal tags from stored description (keep DoD/Trace/etc)
-                desc = re.sub(r'\|\s*K:\s*[^\|]+', '', full_desc).strip()
-
-                # v19.0+: Extract Dep: and BlockedBy:
-                deps_tokens = []
-                dep_match = re.search(r'\|\s*Dep:\s*([^\|]+)', full_desc)
-                if dep_match:
-                    deps_tokens.extend([d.strip() for d in dep_match.group(1).split(',') if d.strip()])
-                blocked_match = re.search(r'\|\s*BlockedBy:\s*([^\|]+)', full_desc)
-                if blocked_match:
-                    deps_tokens.extend([d.strip() for d in blocked_match.group(1).split(',') if d.strip()])
-
-                deps_norm = []
-                for tok in deps_tokens:
-                    ref = _normalize_dep_ref(tok, lane)
-                    if ref is not None:
-                        deps_norm.append(ref)
-
-                # v18.0: Compute priority
-                # URGENT=0, HIGH=5, else lane weight
-                if priority_override == "URGENT":
-                    priority = 0
-                elif priority_override == "HIGH":
-                    priority = 5
-                else:
-                    priority = LANE_WEIGHTS.get(lane, 50)
 
-                # v18.0: Classify exec_class
-                exec_class = classify_exec_class(lane, desc, exec_class_override)
+def _finish_plan_ingest(conn, state: dict) -> list:
+    """
+    Phase 2 (caller's write transaction): re-resolve keyed deps against every
+    plan key, rewrite the ones that changed in one executemany and clear the
+    resume marker. Returns [{"id", "unresolved"}] for deps that stay unknown.
+    """
+    updates = []
+    unresolved_deps = []
+    for task_id, tokens, written in state["keyed"]:
+        deps = _resolve_plan_deps(tokens, state["key_to_id"])
+        if deps != written:
+            updates.append((json.dumps(deps), task_id))
+        unresolved = [d for d in deps if isinstance(d, str)]
+        if unresolved:
+            unresolved_deps.append({"id": task_id, "unresolved": unresolved[:5]})
+    if updates:
+        conn.executemany("UPDATE tasks SET deps=? WHERE id=?", updates)
+    conn.execute("DELETE FROM config WHERE key = ?", (_plan_ingest_marker(state["source_plan_hash"]),))
+    return unresolved_deps
 
-                # v18.0: Compute task_signature = sha1(lane:desc:trace)
-                sig_input = f"{lane}:{desc}:{trace}"
-                task_signature = hashlib.sha1(sig_input.encode("utf-8")).hexdigest()
 
-                # v18.0: Skip duplicate tasks (same signature already exists)
-                if task_signature in existing_sigs:
-                    skipped_duplicates += 1
-                    continue
+# =============================================================================
+# v47: PLAN DIFFING / INCREMENTAL RE-ACCEPTANCE
+# =============================================================================
+# Re-accepting a changed plan from the same path diffs it against the tasks
+# of the previously accepted version (config accepted_plan_hash) instead of
+# ingesting it afresh. New plan lines match old tasks by task_signature
+# first, then by plan key (K:) for edited lines. In one transaction:
+#   - added lines are inserted (lane_rank appended after the lane's last)
+#   - edited lines whose task is still pending/blocked are updated in place
+#     (id kept, so deps on it stay valid); otherwise they count as added
+#   - old tasks no longer in the plan are cancelled if pending/blocked
+#     (active or finished work is left alone and reported)
+#   - lines matching a task an earlier re-accept cancelled (same signature,
+#     else same K:) revive it to pending instead of being skipped as dups
+#   - deps are re-resolved for the whole plan; only changed rows are written
+# Retained tasks are re-tagged with the new source_plan_hash so the next
+# diff (and ALREADY_ACCEPTED) sees the plan as one set. Writes scale with
+# the edit, not the plan.
+
+_PLAN_DIFF_MUTABLE = ("pending", "blocked")
+_PLAN_RETIRE_NOTE = "CANCELLED: removed from plan"  # Marks plan_retire cancellations (revivable)
+
+
+def _previous_plan_tasks(conn, source_plan_hash: str) -> list:
+    try:
+        task_cols = {row[1] for row in conn.execute("PRAGMA table_info(tasks)").fetchall()}
+    except sqlite3.Error:
+        task_cols = set()
+    key_col = "plan_key" if "plan_key" in task_cols else "''"
+    return [
+        dict(zip(("id", "status", "lane", "lane_rank", "deps", "task_signature", "plan_key"), tuple(row)))
+        for row in conn.execute(
+            f"SELECT id, status, lane, lane_rank, deps, task_signature, {key_col} "
+            "FROM tasks WHERE source_plan_hash = ? ORDER BY id",
+            (source_plan_hash,),
+        )
+    ]
 
-                # Add to existing_sigs to catch duplicates within same plan
-                existing_sigs.add(task_signature)
 
-                # v18.0: Compute lane_rank (order within lane)
-                lane_rank = lane_ranks.get(lane, 0)
-                lane_ranks[lane] = lane_rank + 1
+def _retired_plan_tasks(conn, signatures: set, plan_keys: set) -> list:
+    """Tasks cancelled by an earlier re-accept (plan_retire) matching these signatures or keys."""
+    try:
+        task_cols = {row[1] for row in conn.execute("PRAGMA table_info(tasks)").fetchall()}
+    except sqlite3.Error:
+        return []
+    if "review_notes" not in task_cols:
+        return []
+    has_key = "plan_key" in task_cols
+    key_col = "plan_key" if has_key else "''"
+    lookups = [("task_signature", sorted(signatures))]
+    if has_key:
+        lookups.append(("plan_key", sorted(plan_keys)))
+    found = {}
+    for column, values in lookups:
+        for i in range(0, len(values), _SQL_IN_CHUNK):
+            chunk = values[i:i + _SQL_IN_CHUNK]
+            for row in conn.execute(
+                f"SELECT id, status, lane, lane_rank, deps, task_signature, {key_col} FROM tasks "
+                f"WHERE status = 'cancelled' AND review_notes = ? AND {column} IN ({','.join('?' * len(chunk))})",
+                [_PLAN_RETIRE_NOTE] + chunk,
+            ):
+                found[row[0]] = dict(zip(
+                    ("id", "status", "lane", "lane_rank", "deps", "task_signature", "plan_key"), tuple(row)
+                ))
+    return [found[task_id] for task_id in sorted(found)]
+
+
+def _diff_plan(conn, previous: list, records: list) -> dict:
+    """
+    Match new plan records against the previous plan's tasks (no writes).
+
+    Returns {"kept": [(task, record)], "changed": [(task, record)],
+    "revived": [(task, record)], "added": [record], "removed": [task],
+    "skipped_duplicates": n}.
+    """
+    by_sig = {}
+    by_key = {}
+    for task in previous:
+        by_sig.setdefault(task["task_signature"], task)
+        if task["plan_key"]:
+            by_key[task["plan_key"]] = task  # Last write wins, as in ingestion
+
+    matched = set()
+    kept, changed, added = [], [], []
+    seen_sigs = set()
+    for record in records:
+        sig = record["task_signature"]
+        if sig in seen_sigs:
+            continue  # Repeats within the plan (counted below)
+        seen_sigs.add(sig)
+        task = by_sig.get(sig)
+        if task is not None and task["id"] not in matched:
+            matched.add(task["id"])
+            kept.append((task, record))
+            continue
+        task = by_key.get(record["plan_key"]) if record["plan_key"] else None
+        if task is not None and task["id"] not in matched and task["status"] in _PLAN_DIFF_MUTABLE:
+            matched.add(task["id"])
+            changed.append((task, record))
+            continue
+        added.append(record)
+
+    # Lines an earlier re-accept retired: revive that task (signature first, then K:)
+    revived = []
+    retired = _retired_plan_tasks(conn, {r["task_signature"] for r in added},
+                                  {r["plan_key"] for r in added if r["plan_key"]})
+    if retired:
+        retired_by_sig, retired_by_key = {}, {}
+        for task in retired:
+            retired_by_sig.setdefault(task["task_signature"], task)
+            if task["plan_key"]:
+                retired_by_key[task["plan_key"]] = task  # Latest retired task per key
+        remaining = []
+        for record in added:
+            task = retired_by_sig.get(record["task_signature"])
+            if task is None or task["id"] in matched:
+                task = retired_by_key.get(record["plan_key"]) if record["plan_key"] else None
+            if task is not None and task["id"] not in matched:
+                matched.add(task["id"])
+                revived.append((task, record))
+            else:
+                remaining.append(record)
+        added = remaining
+
+    # Signatures already queued outside this plan are skipped, as in a fresh accept.
+    # That includes the new signature of an edited/revived line: its task is
+    # then left unmatched (retired if still pending/blocked).
+    foreign = _existing_task_signatures(
+        conn, {r["task_signature"] for r in added} | {r["task_signature"] for _, r in changed + revived}
+    )
+    foreign -= {t["task_signature"] for t in previous}
+    skipped = len(records) - len(seen_sigs) + sum(1 for r in added if r["task_signature"] in foreign)
+    added = [r for r in added if r["task_signature"] not in foreign]
+    for pairs in (changed, revived):
+        for task, record in list(pairs):
+            if record["task_signature"] in foreign and record["task_signature"] != task["task_signature"]:
+                pairs.remove((task, record))
+                matched.discard(task["id"])
+                skipped += 1
 
-                tasks_to_insert.append({
-                    "type": task_type,
-                    "desc": desc,
-                    "lane": lane,
-                    "priority": priority,
-                    "lane_rank": lane_rank,
-                    "created_at": now,
-                    "exec_class": exec_class,
-                    "task_signature": task_signature,
-                    "source_plan_hash": source_plan_hash,
-                    "trace": trace,
-                    "plan_key": plan_key,
-                    "deps_tokens": deps_norm,
-                })
+    removed = [task for task in previous if task["id"] not in matched]
+    return {"kept": kept, "changed": changed, "revived": revived, "added": added, "removed": removed,
+            "skipped_duplicates": skipped}
 
-            inserted = []
-            key_to_id = {}
-            unresolved_deps = []
 
-            for task in tasks_to_insert:
-                if has_plan_key_col:
-                    cursor = conn.execute(
-                        """INSERT INTO tasks (
-                            type, desc, status, priority, updated_at,
-                            lane, lane_rank, created_at, exec_class, task_signature, source_plan_hash, deps, plan_key
-                        ) VALUES (?, ?, 'pending', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",  # SAFETY-ALLOW: status-write (initial task creation)
-                        (
-                            task["type"],
-                            task["desc"],
-                            task["priority"],
-                            now,
-                            task["lane"],
-                            task["lane_rank"],
-                            task["created_at"],
-                            task["exec_class"],
-                            task["task_signature"],
-                            task["source_plan_hash"],
-                            "[]",  # deps resolved after we know IDs
-                            task.get("plan_key", "") or "",
-                        )
-                    )
-                else:
-                    cursor = conn.execute(
-                        """INSERT INTO tasks (
-                            type, desc, status, priority, updated_at,
-                            lane, lane_rank, created_at, exec_class, task_signature, source_plan_hash, deps
-                        ) VALUES (?, ?, 'pending', ?, ?, ?, ?, ?, ?, ?, ?, ?)""",  # SAFETY-ALLOW: status-write (initial task creation)
-                        (
-                            task["type"],
-                            task["desc"],
-                            task["priority"],
-                            now,
-                            task["lane"],
-                            task["lane_rank"],
-                            task["created_at"],
-                            task["exec_class"],
-                            task["task_signature"],
-                            task["source_plan_hash"],
-                            "[]",  # deps resolved after we know IDs
-                        )
-                    )
+def _plan_diff_summary(diff: dict) -> dict:
+    retired = [t["id"] for t in diff["removed"] if t["status"] in _PLAN_DIFF_MUTABLE]
+    return {
+        "kept": len(diff["kept"]),
+        "changed": [task["id"] for task, _ in diff["changed"]],
+        "added": len(diff["added"]),
+        "revived": [task["id"] for task, _ in diff["revived"]],
+        "retired": retired,
+        "removed_active": [t["id"] for t in diff["removed"] if t["id"] not in set(retired)],
+    }
 
-                task_id = cursor.lastrowid
-                task["id"] = task_id
-                inserted.append(task)
-
-                if task.get("plan_key"):
-                    # Last write wins; ambiguity is surfaced via unresolved deps during resolution.
-                    key_to_id[task["plan_key"]] = task_id
-
-                created.append({
-                    "id": task_id,
-                    "type": task["type"],
-                    "desc": task["desc"],
-                    "lane": task["lane"],
-                    "priority": task["priority"],
-                    "lane_rank": task["lane_rank"],
-                    "created_at": task["created_at"],
-                    "exec_class": task["exec_class"],
-                    "task_signature": task["task_signature"],
-                })
 
-            # Resolve deps: key refs -> task IDs; keep unknown tokens to block + surface.
-            for task in inserted:
-                resolved = []
-                for ref in task.get("deps_tokens", []):
-                    if isinstance(ref, int):
-                        resolved.append(ref)
-                    elif isinstance(ref, str) and ref in key_to_id:
-                        resolved.append(key_to_id[ref])
-                    else:
-                        resolved.append(ref)
+def _apply_plan_diff(conn, diff: dict, source_plan_hash: str, previous_hash: str) -> dict:
+    """
+    Write a _diff_plan result inside the caller's write transaction.
+    Returns {"created": [...], "unresolved_deps": [...], "rewired": n, "summary": {...}}.
+    """
+    now = int(time.time())
+    summary = _plan_diff_summary(diff)
+    task_cols = {row[1] for row in conn.execute("PRAGMA table_info(tasks)").fetchall()}
+
+    retired = summary["retired"]
+    for i in range(0, len(retired), _SQL_IN_CHUNK):
+        chunk = retired[i:i + _SQL_IN_CHUNK]
+        notes_sql = ", review_notes=?" if "review_notes" in task_cols else ""
+        notes_arg = [_PLAN_RETIRE_NOTE] if notes_sql else []
+        _execute_transition(
+            conn, "plan_retire",
+            f"UPDATE tasks SET status='cancelled', updated_at=?{notes_sql} "  # SAFETY-ALLOW: status-write
+            f"WHERE id IN ({','.join('?' * len(chunk))}) AND status IN ('pending', 'blocked')",
+            [now] + notes_arg + chunk,
+        )
 
-                # De-duplicate while preserving order
-                seen = set()
-                deps_final = []
-                for ref in resolved:
-                    if ref in seen:
-                        continue
-                    seen.add(ref)
-                    deps_final.append(ref)
+    # Restored lines: back to pending, then updated in place like edits
+    revived = summary["revived"]
+    for i in range(0, len(revived), _SQL_IN_CHUNK):
+        chunk = revived[i:i + _SQL_IN_CHUNK]
+        _execute_transition(
+            conn, "plan_revive",
+            "UPDATE tasks SET status='pending', review_notes='', updated_at=? "  # SAFETY-ALLOW: status-write
+            f"WHERE id IN ({','.join('?' * len(chunk))}) AND status = 'cancelled'",
+            [now] + chunk,
+        )
 
-                conn.execute(
-                    "UPDATE tasks SET deps=? WHERE id=?",
-                    (json.dumps(deps_final), task["id"])
+    # Edited lines: update in place (status untouched)
+    lane_ranks = {}
+    for row in conn.execute(
+        "SELECT lane, MAX(lane_rank) FROM tasks WHERE source_plan_hash IN (?, ?) GROUP BY lane",
+        (previous_hash, source_plan_hash),
+    ):
+        lane_ranks[row[0]] = (row[1] or 0) + 1
+
+    def next_rank(lane):
+        rank = lane_ranks.get(lane, 0)
+        lane_ranks[lane] = rank + 1
+        return rank
+
+    state = {
+        "source_plan_hash": source_plan_hash,
+        "lane_ranks": lane_ranks,
+        "key_to_id": {},
+        "keyed": [],
+        "created": [],
+        "skipped_duplicates": 0,
+        "resumed": False,
+        "has_plan_key": "plan_key" in task_cols,
+    }
+    for task, record in diff["changed"] + diff["revived"]:
+        lane_rank = task["lane_rank"] if record["lane"] == task["lane"] else next_rank(record["lane"])
+        key_sql = ", plan_key=?" if state["has_plan_key"] else ""
+        key_arg = [record["plan_key"]] if state["has_plan_key"] else []
+        conn.execute(
+            f"UPDATE tasks SET type=?, desc=?, lane=?, lane_rank=?, priority=?, exec_class=?, "
+            f"task_signature=?, updated_at=?{key_sql} WHERE id=?",
+            [record["type"], record["desc"], record["lane"], lane_rank, record["priority"],
+             record["exec_class"], record["task_signature"], now] + key_arg + [task["id"]],
+        )
+
+    # Plan keys of retained tasks, then insert added lines (deps resolved below)
+    retained = diff["kept"] + diff["changed"] + diff["revived"]
+    for task, record in retained:
+        if record["plan_key"]:
+            state["key_to_id"][record["plan_key"]] = task["id"]
+    _ingest_plan_tasks(conn, [dict(r, deps_tokens=[]) for r in diff["added"]], state)
+    # Ingestion may skip records (signature queued meanwhile): map ids by signature
+    id_by_sig = {t["task_signature"]: t["id"] for t in state["created"]}
+    added = [(record, id_by_sig[record["task_signature"]])
+             for record in diff["added"] if record["task_signature"] in id_by_sig]
+    added_ids = [task_id for _, task_id in added]
+    for record, task_id in added:
+        if record["plan_key"]:
+            state["key_to_id"][record["plan_key"]] = task_id
+
+    # Deps: re-resolve the whole plan, write only what changed
+    updates = []
+    unresolved_deps = []
+    targets = [(task["id"], record, task["deps"]) for task, record in retained]
+    targets += [(task_id, record, "[]") for record, task_id in added]
+    for task_id, record, current in targets:
+        deps = _resolve_plan_deps(record["deps_tokens"], state["key_to_id"])
+        try:
+            written = json.loads(current or "[]")
+        except ValueError:
+            written = None
+        if deps != written:
+            updates.append((json.dumps(deps), task_id))
+        unresolved = [d for d in deps if isinstance(d, str)]
+        if unresolved:
+            unresolved_deps.append({"id": task_id, "unresolved": unresolved[:5]})
+    if updates:
+        conn.executemany("UPDATE tasks SET deps=? WHERE id=?", updates)
+
+    retained_ids = [task["id"] for task, _ in retained]
+    for i in range(0, len(retained_ids), _SQL_IN_CHUNK):
+        chunk = retained_ids[i:i + _SQL_IN_CHUNK]
+        conn.execute(
+            f"UPDATE tasks SET source_plan_hash=? WHERE id IN ({','.join('?' * len(chunk))}) "
+            "AND source_plan_hash != ?",
+            [source_plan_hash] + chunk + [source_plan_hash],
+        )
+
+    rewired = sum(1 for _, task_id in updates if task_id not in set(added_ids))
+    return {"created": state["created"], "unresolved_deps": sorted(unresolved_deps, key=lambda u: u["id"]),
+            "rewired": rewired, "summary": summary}
+
+
+def _previous_plan_hash(conn, path: str):
+    """Hash of the plan last accepted from path, if that is where path's tasks came from."""
+    try:
+        rows = dict(conn.execute(
+            "SELECT key, value FROM config WHERE key IN ('accepted_plan_path', 'accepted_plan_hash')"
+        ).fetchall())
+    except sqlite3.OperationalError:
+        return None
+    if rows.get("accepted_plan_path") != path:
+        return None
+    return rows.get("accepted_plan_hash") or None
+
+
+def _record_accepted_plan(conn, path: str, source_plan_hash: str) -> None:
+    conn.executemany(
+        "INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)",
+        [("accepted_plan_path", path), ("accepted_plan_hash", source_plan_hash)],
+    )
+
+
+def _reaccept_plan(path: str, source_plan_hash: str, previous_hash: str):
+    """
+    accept_plan's incremental path: diff + apply in one write transaction.
+    Returns the JSON response, or None when there is nothing to diff against
+    (the previous version's tasks are gone) so a fresh ingest runs instead.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        records = list(_iter_plan_tasks(f, source_plan_hash, int(time.time())))
+
+    with get_db() as conn:
+        lock_started = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        if _previous_plan_hash(conn, path) != previous_hash:
+            conn.rollback()
+            return None  # Another accept landed meanwhile; take the regular path
+        previous = _previous_plan_tasks(conn, previous_hash)
+        if not previous:
+            conn.rollback()
+            return None
+        diff = _diff_plan(conn, previous, records)
+        applied = _apply_plan_diff(conn, diff, source_plan_hash, previous_hash)
+        _record_accepted_plan(conn, path, source_plan_hash)
+        conn.commit()
+        write_lock_ms = int((time.perf_counter() - lock_started) * 1000)
+
+    if applied["unresolved_deps"]:
+        server_logger.warning(
+            f"accept_plan: {len(applied['unresolved_deps'])} task(s) have unresolved deps (will remain blocked)"
+        )
+    _write_plan_preview_from_sqlite()
+
+    summary = applied["summary"]
+    return json.dumps({
+        "status": "OK",
+        "incremental": True,
+        "previous_hash": previous_hash,
+        "created_count": len(applied["created"]),
+        "skipped_duplicates": diff["skipped_duplicates"],
+        "plan_hash": source_plan_hash,
+        "tasks": applied["created"],
+        "diff": dict(summary, rewired=applied["rewired"]),
+        "unresolved_deps": applied["unresolved_deps"][:10],
+        "write_lock_ms": write_lock_ms,
+        "message": (
+            f"Re-accepted {os.path.basename(path)}: +{summary['added'] + len(summary['revived'])} "
+            f"~{len(summary['changed'])} -{len(summary['retired'])}"
+        ),
+    })
+
+
+@mcp.tool()
+def diff_plan(path: str) -> str:
+    """
+    v47: Preview what re-accepting a changed plan would do (no writes).
+
+    Compares the plan file against the tasks of the version last accepted
+    from the same path: matched by task signature, then by plan key (K:).
+
+    Returns:
+        JSON {status, previous_hash, plan_hash, kept, changed, added, revived, retired, removed_active}
+    """
+    try:
+        if not os.path.isabs(path):
+            path = os.path.join(DOCS_DIR, "PLANS", path)
+        if not os.path.exists(path):
+            return json.dumps({"status": "ERROR", "message": f"File not found: {path}"})
+        source_plan_hash = _plan_file_hash(path)
+        with open(path, "r", encoding="utf-8") as f:
+            records = list(_iter_plan_tasks(f, source_plan_hash, int(time.time())))
+        with get_db() as conn:
+            previous_hash = _previous_plan_hash(conn, path)
+            if not previous_hash:
+                return json.dumps({"status": "NO_PREVIOUS_PLAN", "plan_hash": source_plan_hash,
+                                   "added": len(records)})
+            if previous_hash == source_plan_hash:
+                return json.dumps({"status": "UNCHANGED", "plan_hash": source_plan_hash})
+            diff = _diff_plan(conn, _previous_plan_tasks(conn, previous_hash), records)
+        return json.dumps({
+            "status": "OK",
+            "previous_hash": previous_hash,
+            "plan_hash": source_plan_hash,
+            "skipped_duplicates": diff["skipped_duplicates"],
+            **_plan_diff_summary(diff),
+        })
+    except Exception as e:
+        return json.dumps({"status": "ERROR", "message": f"Failed to diff plan: {e}"})
+
+
+@mcp.tool()
+def accept_plan(path: str) -> str:
+    """
+    v18.0: Parses a plan markdown file and hydrates SQLite with tasks.
+
+    Args:
+        path: Path to the plan markdown file
+
+    Expected format:
+        - [ ] Type: Description -- DoD: ... | Trace: ... [| P:URGENT|HIGH] [| X:EXC|PAR|ADD]
+              [| K:<lane:key>] [| Dep:<ref,...>] [| BlockedBy:<ref,...>]
+        - [x] Type: Description (already done, skipped)
+
+    Returns summary of created tasks with v18.0 fields.
+
+    Idempotency:
+        - Plan hash computed from content; duplicate plans rejected (ALREADY_ACCEPTED)
+        - Task signature = sha1(lane:desc:trace); duplicate tasks within plan skipped
+    """
+    import traceback as tb
+
+    # v14.0: CONTEXT GATE - Block in BOOTSTRAP mode
+    try:
+        readiness = json.loads(get_context_readiness())
+        if readiness.get("status") == "BOOTSTRAP":
+            return json.dumps({
+                "status": "BLOCKED",
+                "reason": "BOOTSTRAP_MODE",
+                "message": "Strategic planning blocked - complete PRD, SPEC, DECISION_LOG first",
+                "blocking_files": readiness.get("overall", {}).get("blocking_files", [])
+            })
+    except Exception:
+        pass  # Fail open if readiness check fails
+
+    # v21.2: Ensure DB schema exists before any queries.
+    # If DB file doesn't exist, create it first then initialize schema.
+    # This prevents "no such table: tasks" errors on first accept-plan.
+    try:
+        if not os.path.exists(DB_PATH):
+            # Touch the DB file so init_db() will run
+            open(DB_PATH, "a").close()
+        init_db()
+    except (OSError, sqlite3.Error) as e:
+        # Fail open but log for diagnostics (permission errors, corruption, etc.)
+        server_logger.warning(f"accept_plan: schema init failed ({type(e).__name__}: {e})")
+
+    try:
+        # Resolve path (allow relative paths from docs/PLANS)
+        if not os.path.isabs(path):
+            plans_dir = os.path.join(DOCS_DIR, "PLANS")
+            path = os.path.join(plans_dir, path)
+
+        if not os.path.exists(path):
+            return json.dumps({
+                "status": "ERROR",
+                "message": f"File not found: {path}"
+            })
+
+        # v18.0: Compute source_plan_hash for idempotency
+        # v46: Hashed and parsed as streams; never held in memory whole
+        source_plan_hash = _plan_file_hash(path)
+
+        # v47: A changed version of the plan last accepted from this path is
+        # diffed against it instead of ingested afresh
+        try:
+            with get_db() as conn:
+                previous_hash = _previous_plan_hash(conn, path)
+        except sqlite3.Error:
+            previous_hash = None
+        if previous_hash and previous_hash != source_plan_hash:
+            result = _reaccept_plan(path, source_plan_hash, previous_hash)
+            if result is not None:
+                return result
+
+        # v45: Parse (regexes, classification, signatures) outside the write
+        # lock; each locked section is signature checks + one executemany.
+        lock_ms = []
+        with open(path, "r", encoding="utf-8") as plan_file, get_db() as conn:
+            records = _iter_plan_tasks(plan_file, source_plan_hash, int(time.time()))
+            chunk = list(itertools.islice(records, PLAN_INGEST_CHUNK))
+
+            lock_started = time.perf_counter()
+            conn.execute("BEGIN IMMEDIATE")
+
+            # v21.1: Ensure config table exists (some test/minimal DBs only create tasks).
+            # Needed for accepted_plan_path and other lightweight scheduler metadata.
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS config (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
                 )
+            """)
+
+            existing = conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE source_plan_hash = ?",
+                (source_plan_hash,)
+            ).fetchone()[0]
+            if existing > 0 and not conn.execute(
+                "SELECT 1 FROM config WHERE key = ?", (_plan_ingest_marker(source_plan_hash),)
+            ).fetchone():
+                return json.dumps({
+                    "status": "ALREADY_ACCEPTED",
+                    "plan_hash": source_plan_hash,
+                    "message": f"Plan already accepted ({existing} tasks from this plan)"
+                })
+
+            state = _start_plan_ingest(conn, source_plan_hash, existing)
+            while True:
+                _ingest_plan_tasks(conn, chunk, state)
+                if len(chunk) < PLAN_INGEST_CHUNK:
+                    break  # Plan exhausted: phase 2 joins this transaction
+                conn.commit()
+                lock_ms.append((time.perf_counter() - lock_started) * 1000)
 
-                unresolved = [d for d in deps_final if isinstance(d, str)]
-                if unresolved:
-                    unresolved_deps.append({"id": task["id"], "unresolved": unresolved[:5]})
+                chunk = list(itertools.islice(records, PLAN_INGEST_CHUNK))
+                lock_started = time.perf_counter()
+                conn.execute("BEGIN IMMEDIATE")
 
-            conn.commit()
+            unresolved_deps = _finish_plan_ingest(conn, state)
 
             # v21.0: Store accepted plan path for EXEC dashboard
-            conn.execute(
-                "INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)",
-                ("accepted_plan_path", path)
-            )
+            # v47: ...and its hash, the baseline for diffing the next version
+            _record_accepted_plan(conn, path, source_plan_hash)
             conn.commit()
+            lock_ms.append((time.perf_counter() - lock_started) * 1000)
+
+        created = state["created"]
+        skipped_duplicates = state["skipped_duplicates"]
 
         if unresolved_deps:
             server_logger.warning(f"accept_plan: {len(unresolved_deps)} task(s) have unresolved deps (will remain blocked)")
@@ -5150,6 +6466,9 @@ def accept_plan(path: str) -> str:
             "plan_hash": source_plan_hash,
             "tasks": created,
             "unresolved_deps": unresolved_deps[:10],
+            "write_lock_ms": int(max(lock_ms)),
+            "transactions": len(lock_ms),
+            "resumed": state["resumed"],
             "message": f"Created {len(created)} tasks from {os.path.basename(path)}"
         })
     except Exception as e:
@@ -5399,10 +6718,60 @@ def _normalize_task_lane_fields(conn, now: int) -> dict:
     return result
 
 
+# =============================================================================
+# v39: RETRY BACKOFF + DEAD LETTER
+# =============================================================================
+# Crash-recovered tasks go back to 'pending' with backoff_until set. The first
+# retry is immediate (a single crash is usually the worker, not the task);
+# after that the delay doubles per retry from a per-lane base, capped.
+# pick_task_braided skips tasks still backing off. A task reaped or reported
+# failed (complete_task success=False) RETRY_MAX_ATTEMPTS times in total moves
+# to 'dead_letter' instead (requeue_task revives it with a fresh budget).
+
+RETRY_BACKOFF_BASE_S = int(os.getenv("MESH_RETRY_BACKOFF_BASE_S", "30"))
+RETRY_BACKOFF_LANE_BASE_S = {
+    "backend": 60,
+    "frontend": 60,
+    "qa": 30,
+    "ops": 120,
+    "docs": 30,
+}
+RETRY_BACKOFF_MAX_S = int(os.getenv("MESH_RETRY_BACKOFF_MAX_S", "3600"))
+RETRY_MAX_ATTEMPTS = int(os.getenv("MESH_RETRY_MAX_ATTEMPTS", "5"))
+
+
+def _retry_backoff_s(lane: str, retry_count: int) -> int:
+    """Delay before the next pick, given retry_count retries before this one."""
+    if not retry_count or retry_count <= 0:
+        return 0
+    base = RETRY_BACKOFF_LANE_BASE_S.get((lane or "").lower(), RETRY_BACKOFF_BASE_S)
+    return min(RETRY_BACKOFF_MAX_S, base * (2 ** min(retry_count - 1, 20)))
+
+
+def _retry_backoff_sql() -> str:
+    """SQL twin of _retry_backoff_s() over the row's lane / retry_count."""
+    cases = " ".join(
+        f"WHEN '{lane}' THEN {int(base)}" for lane, base in RETRY_BACKOFF_LANE_BASE_S.items()
+    )
+    return (
+        "(CASE WHEN IFNULL(retry_count, 0) <= 0 THEN 0 ELSE "
+        f"MIN({int(RETRY_BACKOFF_MAX_S)}, "
+        f"(CASE LOWER(IFNULL(lane, '')) {cases} ELSE {int(RETRY_BACKOFF_BASE_S)} END) "
+        "* (1 << MIN(retry_count - 1, 20))) END)"
+    )
+
+
 def _reap_stale_in_progress(conn, now: int) -> dict:
     """
     Crash recovery: requeue tasks stuck in_progress beyond a lease window.
     Uses updated_at as last-seen heartbeat (workers may be killed mid-task).
+
+    v39: Requeued tasks back off exponentially; tasks out of retries move
+    to 'dead_letter'.
+
+    v40: Tasks held by a worker whose heartbeat expired (older than
+    WORKER_HEARTBEAT_TTL_S) are reaped as soon as they also go unrenewed
+    for that long, instead of waiting for the full stale window.
     """
     try:
         stale_after_s = int(os.getenv("MESH_STALE_IN_PROGRESS_SECS", "1800") or "1800")
@@ -5414,16 +6783,33 @@ def _reap_stale_in_progress(conn, now: int) -> dict:
 
     cutoff = now - stale_after_s
 
+    stale_where = "status='in_progress' AND COALESCE(updated_at, 0) < ?"
+    stale_params: list[object] = [cutoff]
+    heartbeat_cutoff = now - WORKER_HEARTBEAT_TTL_S
+    try:
+        has_heartbeats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='worker_heartbeats'"
+        ).fetchone() is not None
+    except Exception:
+        has_heartbeats = False
+    if has_heartbeats and WORKER_HEARTBEAT_TTL_S > 0 and heartbeat_cutoff > cutoff:
+        stale_where = (
+            "status='in_progress' AND (COALESCE(updated_at, 0) < ? OR ("
+            "COALESCE(updated_at, 0) < ? AND worker_id IN "
+            "(SELECT worker_id FROM worker_heartbeats WHERE last_seen < ?)))"
+        )
+        stale_params = [cutoff, heartbeat_cutoff, heartbeat_cutoff]
+
     sample_ids: list[int] = []
     oldest_age_s: int | None = None
     try:
         rows = conn.execute(
-            """SELECT id, COALESCE(updated_at, 0) AS updated_at
+            f"""SELECT id, COALESCE(updated_at, 0) AS updated_at
                FROM tasks
-               WHERE status='in_progress' AND COALESCE(updated_at, 0) < ?
+               WHERE {stale_where}
                ORDER BY COALESCE(updated_at, 0) ASC
                LIMIT 10""",
-            (cutoff,)
+            stale_params
         ).fetchall()
         for r in rows[:5]:
             try:
@@ -5450,19 +6836,35 @@ def _reap_stale_in_progress(conn, now: int) -> dict:
         set_parts.append("lease_id=NULL")
     set_parts.append("updated_at=?")
     params: list[object] = [now]
+    if "backoff_until" in cols and "retry_count" in cols:
+        # Evaluated against the pre-update retry_count
+        set_parts.append(f"backoff_until=? + {_retry_backoff_sql()}")
+        params.append(now)
     if "retry_count" in cols:
         set_parts.append("retry_count=retry_count+1")
-    params.append(cutoff)
+    params.extend(stale_params)
 
     try:
-        cursor = conn.execute(
+        dead_lettered = 0
+        if "retry_count" in cols and RETRY_MAX_ATTEMPTS > 0:
+            lease_clear = ", lease_id=NULL" if "lease_id" in cols else ""
+            dead_lettered = _execute_transition(conn, "dead_letter",
+                f"""UPDATE tasks
+                    SET status='dead_letter', worker_id=NULL{lease_clear},  -- SAFETY-ALLOW: status-write
+                        retry_count=retry_count+1, updated_at=?
+                    WHERE {stale_where}
+                      AND IFNULL(retry_count, 0) + 1 >= ?""",
+                (now, *stale_params, RETRY_MAX_ATTEMPTS),
+            ).rowcount
+        cursor = _execute_transition(conn, "reap",
             f"""UPDATE tasks
                 SET {", ".join(set_parts)}  -- SAFETY-ALLOW: status-write
-                WHERE status='in_progress' AND COALESCE(updated_at, 0) < ?""",
+                WHERE {stale_where}""",
             params,
         )
         return {
             "reaped": cursor.rowcount,
+            "dead_lettered": dead_lettered,
             "stale_after_s": stale_after_s,
             "cutoff": cutoff,
             "sample_ids": sample_ids,
@@ -5608,12 +7010,161 @@ def _dependency_status(task_id: int, deps_json: str, conn) -> dict:
     }
 
 
+# =============================================================================
+# v40: WORKER REGISTRY + CAPACITY-AWARE DISPATCH
+# =============================================================================
+# worker_heartbeat feeds an in-memory registry (seeded from worker_heartbeats
+# after a restart). pick_task_braided consults it before handing out work:
+# - per-worker limit: a worker that heartbeated a capacity gets no more than
+#   that many in_progress tasks (no capacity reported = unlimited)
+# - per-lane limit: MESH_LANE_CONCURRENCY="backend=2,qa=1" caps in_progress
+#   tasks per lane (read from lane_status_counts)
+# - fairness: with live workers registered, lanes already holding their fair
+#   share of the online capacity are tried after lanes below it, so fast
+#   workers cycling through cheap lanes can't crowd out slow ones
+# Workers whose heartbeat is older than WORKER_HEARTBEAT_TTL_S are treated as
+# dead: the stale reaper requeues their unrenewed tasks (see
+# _reap_stale_in_progress) without waiting for the full stale window.
+
+WORKER_HEARTBEAT_TTL_S = int(os.getenv("MESH_WORKER_HEARTBEAT_TTL_S", "120"))
+PICK_TASK_BACKEND_THROTTLE = 2  # Legacy pick_task limit unless MESH_LANE_CONCURRENCY sets backend
+
+
+def _parse_lane_limits(spec: str) -> dict:
+    """'backend=2, qa=1' -> {"backend": 2, "qa": 1} (bad entries ignored)."""
+    limits = {}
+    for part in (spec or "").split(","):
+        lane, _, value = part.partition("=")
+        lane = lane.strip().lower()
+        try:
+            limit = int(value)
+        except ValueError:
+            continue
+        if lane and limit > 0:
+            limits[lane] = limit
+    return limits
+
+
+LANE_CONCURRENCY_LIMITS = _parse_lane_limits(os.getenv("MESH_LANE_CONCURRENCY", ""))
+
+
+class _WorkerRegistry:
+    """Last heartbeat per worker, kept in memory for dispatch decisions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._workers: Dict[str, dict] = {}
+        self._loaded_from = None
+
+    def update(self, worker_id: str, worker_type=None, allowed_lanes=None, task_ids=None,
+               capacity=None, last_seen: int = 0) -> None:
+        with self._lock:
+            self._workers[worker_id] = {
+                "worker_id": worker_id,
+                "worker_type": worker_type,
+                "allowed_lanes": list(allowed_lanes or []),
+                "task_ids": list(task_ids or []),
+                "capacity": capacity if capacity and capacity > 0 else None,
+                "last_seen": int(last_seen or 0),
+            }
+
+    def ensure_loaded(self, conn) -> None:
+        """Seed from worker_heartbeats once per DB (e.g. after a server restart)."""
+        if self._loaded_from == DB_PATH:
+            return
+        try:
+            rows = conn.execute(
+                "SELECT worker_id, worker_type, allowed_lanes, task_ids, capacity, last_seen FROM worker_heartbeats"
+            ).fetchall()
+        except sqlite3.Error:
+            rows = []
+        with self._lock:
+            self._workers.clear()
+            self._loaded_from = DB_PATH
+        for row in rows:
+            try:
+                allowed = json.loads(row[2]) if row[2] else []
+                task_ids = json.loads(row[3]) if row[3] else []
+            except (TypeError, ValueError):
+                allowed, task_ids = [], []
+            self.update(row[0], row[1], allowed, task_ids, row[4], row[5])
+
+    def get(self, worker_id: str):
+        with self._lock:
+            entry = self._workers.get(worker_id)
+            return dict(entry) if entry else None
+
+    def live(self, now: int, ttl_s: int = None) -> list:
+        ttl_s = WORKER_HEARTBEAT_TTL_S if ttl_s is None else ttl_s
+        with self._lock:
+            return [dict(w) for w in self._workers.values() if now - w["last_seen"] <= ttl_s]
+
+
+_worker_registry = _WorkerRegistry()
+
+
+def _lane_load(conn) -> dict:
+    """{lane: {"in_progress": n, "pending": n}} from the materialized lane counts."""
+    load = {}
+    for row in _lane_status_rows(conn):
+        if row[2] in ("in_progress", "pending"):
+            counts = load.setdefault((row[0] or "").lower(), {"in_progress": 0, "pending": 0})
+            counts[row[2]] += row[3]
+    return load
+
+
+def _dispatch_capacity(conn, worker_id, now: int, lanes: list) -> dict:
+    """
+    Capacity view for one pick: whether the worker is full, which lanes are at
+    their concurrency limit, and which are at/over their fair share.
+    """
+    _worker_registry.ensure_loaded(conn)
+    worker = _worker_registry.get(worker_id) if worker_id else None
+    capacity = worker["capacity"] if worker else None
+    worker_in_flight = 0
+    if capacity:
+        worker_in_flight = conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE status='in_progress' AND worker_id=?", (worker_id,)
+        ).fetchone()[0]
+
+    load = _lane_load(conn)
+    in_flight = {lane: counts["in_progress"] for lane, counts in load.items()}
+    lanes_full = {
+        lane for lane in lanes
+        if lane in LANE_CONCURRENCY_LIMITS and in_flight.get(lane, 0) >= LANE_CONCURRENCY_LIMITS[lane]
+    }
+
+    # Fair share = online capacity split evenly across lanes with pending work
+    over_share, fair_share = set(), None
+    live = _worker_registry.live(now)
+    if live:
+        online = sum(w["capacity"] or 1 for w in live)
+        waiting = [
+            lane for lane in lanes
+            if lane not in lanes_full and load.get(lane, {}).get("pending", 0) > 0
+        ]
+        if len(waiting) > 1:
+            fair_share = max(1, -(-online // len(waiting)))
+            over_share = {lane for lane in waiting if in_flight.get(lane, 0) >= fair_share}
+
+    return {
+        "worker_capacity": capacity,
+        "worker_in_flight": worker_in_flight,
+        "worker_full": bool(capacity) and worker_in_flight >= capacity,
+        "lane_in_flight": in_flight,
+        "lanes_full": lanes_full,
+        "over_share": over_share,
+        "fair_share": fair_share,
+    }
+
+
 @mcp.tool()
 def worker_heartbeat(
     worker_id: str,
     worker_type: str = None,
     allowed_lanes: list[str] = None,
     task_ids: list[int] = None,
+    capacity: int = None,
 ) -> str:
     """
     v21.0: Update worker heartbeat for EXEC dashboard monitoring.
@@ -5626,6 +7177,7 @@ def worker_heartbeat(
         worker_type: Worker type (e.g., "backend", "frontend", "qa")
         allowed_lanes: List of lanes this worker can process
         task_ids: List of task IDs currently being processed by this worker
+        capacity: Max concurrent tasks for this worker (v40; omitted = unlimited)
 
     Returns:
         JSON with status (OK or ERROR)
@@ -5646,7 +7198,8 @@ def worker_heartbeat(
                     task_ids TEXT,
                     status TEXT DEFAULT 'ok',
                     last_seen INTEGER,
-                    created_at INTEGER
+                    created_at INTEGER,
+                    capacity INTEGER
                 )
             """)
 
@@ -5656,16 +7209,19 @@ def worker_heartbeat(
 
             # Upsert heartbeat
             conn.execute("""
-                INSERT INTO worker_heartbeats (worker_id, worker_type, allowed_lanes, task_ids, status, last_seen, created_at)
-                VALUES (?, ?, ?, ?, 'ok', ?, ?)
+                INSERT INTO worker_heartbeats (worker_id, worker_type, allowed_lanes, task_ids, status, last_seen, created_at, capacity)
+                VALUES (?, ?, ?, ?, 'ok', ?, ?, ?)
                 ON CONFLICT(worker_id) DO UPDATE SET
                     worker_type = excluded.worker_type,
                     allowed_lanes = excluded.allowed_lanes,
                     task_ids = excluded.task_ids,
                     status = 'ok',
-                    last_seen = excluded.last_seen
-            """, (worker_id, worker_type, allowed_json, task_json, now, now))
+                    last_seen = excluded.last_seen,
+                    capacity = excluded.capacity
+            """, (worker_id, worker_type, allowed_json, task_json, now, now, capacity))
             conn.commit()
+            _worker_registry.ensure_loaded(conn)
+            _worker_registry.update(worker_id, worker_type, allowed_lanes, task_ids, capacity, now)
 
             server_logger.debug(f"HEARTBEAT | worker={worker_id} type={worker_type} tasks={task_ids}")
             return json.dumps({"status": "OK", "worker_id": worker_id, "last_seen": now})
@@ -6009,6 +7565,12 @@ def pick_task_braided(worker_id: str = None, blocked_lanes: list[str] = None, wo
 
             reap = _reap_stale_in_progress(conn, now)
             _increment_config_counter(conn, "scheduler_reaper_runs_total", 1)
+            if reap.get("dead_lettered", 0):
+                _increment_config_counter(conn, "scheduler_reaper_dead_letter_total", int(reap["dead_lettered"]))
+                server_logger.warning(
+                    f"Crash recovery: moved {reap['dead_lettered']} task(s) to dead_letter "
+                    f"after {RETRY_MAX_ATTEMPTS} attempts"
+                )
             if reap.get("reaped", 0):
                 _increment_config_counter(conn, "scheduler_reaper_reaped_total", int(reap.get("reaped", 0)))
                 _write_config_json(conn, "scheduler_reaper_last", {"ts": now, **reap})
@@ -6018,6 +7580,53 @@ def pick_task_braided(worker_id: str = None, blocked_lanes: list[str] = None, wo
                     f"oldest_age_s={reap.get('oldest_age_s')}, sample_ids={reap.get('sample_ids')})"
                 )
 
+            # v40: Capacity-aware dispatch (worker limit, lane limits, fair share)
+            capacity = _dispatch_capacity(conn, worker_id, now, eligible_lanes)
+            if capacity["worker_full"]:
+                _increment_config_counter(conn, "scheduler_no_work_worker_capacity_total", 1)
+                _write_scheduler_last_decision(conn, {
+                    "picked_id": None,
+                    "reason": "no_work",
+                    "no_work_reason": "worker_at_capacity",
+                    "worker_id": worker_id,
+                    "ts": now,
+                })
+                return json.dumps({
+                    "status": "NO_WORK",
+                    "message": f"Worker at capacity ({capacity['worker_in_flight']}/{capacity['worker_capacity']} in progress)",
+                    "no_work_reason": "worker_at_capacity",
+                    "in_flight": capacity["worker_in_flight"],
+                    "capacity": capacity["worker_capacity"],
+                })
+            if capacity["lanes_full"]:
+                blocked_lane_set |= capacity["lanes_full"]
+                eligible_lanes = [lane for lane in eligible_lanes if lane not in blocked_lane_set]
+                if not eligible_lanes:
+                    _increment_config_counter(conn, "scheduler_no_work_lane_capacity_total", 1)
+                    _write_scheduler_last_decision(conn, {
+                        "picked_id": None,
+                        "reason": "no_work",
+                        "no_work_reason": "lanes_at_capacity",
+                        "worker_id": worker_id,
+                        "ts": now,
+                    })
+                    return json.dumps({
+                        "status": "NO_WORK",
+                        "message": "All eligible lanes are at their concurrency limit",
+                        "no_work_reason": "lanes_at_capacity",
+                        "lanes_full": sorted(capacity["lanes_full"]),
+                    })
+
+            # v39: Skip tasks still backing off after a failure (fail-open on older schemas)
+            try:
+                has_backoff = any(
+                    row[1] == "backoff_until" for row in conn.execute("PRAGMA table_info(tasks)")
+                )
+            except Exception:
+                has_backoff = False
+            backoff_filter = "AND backoff_until <= ?" if has_backoff else ""
+            backoff_params = [now] if has_backoff else []
+
             # =========================================================
             # Step 1: PREEMPTION CHECK (URGENT=0, HIGH=5)
             # =========================================================
@@ -6029,9 +7638,10 @@ def pick_task_braided(worker_id: str = None, blocked_lanes: list[str] = None, wo
                         FROM tasks
                         WHERE status = 'pending' AND priority IN (0, 5)
                           AND lane IN ({placeholders})
+                          {backoff_filter}
                         ORDER BY priority ASC, lane_rank ASC, created_at ASC, id ASC
                         LIMIT 10""",
-                    eligible_lanes
+                    [*eligible_lanes, *backoff_params]
                 ).fetchall()
 
             # Find first preempt task with satisfied dependencies
@@ -6042,7 +7652,7 @@ def pick_task_braided(worker_id: str = None, blocked_lanes: list[str] = None, wo
                 if dep_status.get("satisfied"):
                     lease_id = uuid.uuid4().hex
                     # Atomic claim: UPDATE only if still pending (prevents double-claim)
-                    cursor = conn.execute(
+                    cursor = _execute_transition(conn, "claim",
                         "UPDATE tasks SET status='in_progress', worker_id=?, lease_id=?, updated_at=? WHERE id=? AND status='pending'  -- SAFETY-ALLOW: status-write",
                         (worker_id, lease_id, now, task["id"])
                     )
@@ -6102,9 +7712,12 @@ def pick_task_braided(worker_id: str = None, blocked_lanes: list[str] = None, wo
 
             lane_debug = {}
 
-            # Try each lane starting from pointer position
-            for offset in range(len(LANE_ORDER)):
-                lane_index = (start_index + offset) % len(LANE_ORDER)
+            # Try each lane starting from pointer position. v40: lanes already
+            # holding their fair share go after the others (stable: pointer
+            # order is kept within each group).
+            lane_indexes = [(start_index + offset) % len(LANE_ORDER) for offset in range(len(LANE_ORDER))]
+            lane_indexes.sort(key=lambda i: LANE_ORDER[i] in capacity["over_share"])
+            for lane_index in lane_indexes:
                 lane = LANE_ORDER[lane_index]
 
                 # Skip blocked lanes
@@ -6113,12 +7726,12 @@ def pick_task_braided(worker_id: str = None, blocked_lanes: list[str] = None, wo
 
                 # Find best pending task in this lane
                 task = conn.execute(
-                    """SELECT id, type, desc, lane, priority, lane_rank, created_at, exec_class, deps, strictness, archetype
+                    f"""SELECT id, type, desc, lane, priority, lane_rank, created_at, exec_class, deps, strictness, archetype
                        FROM tasks
-                       WHERE status = 'pending' AND lane = ?
+                       WHERE status = 'pending' AND lane = ? {backoff_filter}
                        ORDER BY priority ASC, lane_rank ASC, created_at ASC, id ASC
                        LIMIT 10""",
-                    (lane,)
+                    [lane, *backoff_params]
                 ).fetchall()
 
                 # Find first task with satisfied dependencies
@@ -6127,7 +7740,7 @@ def pick_task_braided(worker_id: str = None, blocked_lanes: list[str] = None, wo
                     if dep_status.get("satisfied"):
                         lease_id = uuid.uuid4().hex
                         # Atomic claim: UPDATE only if still pending (prevents double-claim)
-                        cursor = conn.execute(
+                        cursor = _execute_transition(conn, "claim",
                             "UPDATE tasks SET status='in_progress', worker_id=?, lease_id=?, updated_at=? WHERE id=? AND status='pending'  -- SAFETY-ALLOW: status-write",
                             (worker_id, lease_id, now, candidate["id"])
                         )
@@ -6198,8 +7811,23 @@ def pick_task_braided(worker_id: str = None, blocked_lanes: list[str] = None, wo
             except Exception:
                 pending_total = 0
 
+            # v39: Pending tasks still inside their retry backoff window
+            backoff_total, next_retry_at = 0, None
+            if has_backoff:
+                try:
+                    row = conn.execute(
+                        "SELECT COUNT(*), MIN(backoff_until) FROM tasks WHERE status='pending' AND backoff_until > ?",
+                        (now,),
+                    ).fetchone()
+                    backoff_total, next_retry_at = int(row[0]), row[1]
+                except Exception:
+                    pass
+
             message = "No pending tasks available"
-            if pending_total > 0:
+            if pending_total > 0 and backoff_total >= pending_total:
+                _increment_config_counter(conn, "scheduler_no_work_backoff_total", 1)
+                message = f"No runnable tasks ({backoff_total} pending task(s) backing off after failures)"
+            elif pending_total > 0:
                 _increment_config_counter(conn, "scheduler_no_work_blocked_by_deps_total", 1)
                 message = "No runnable tasks (pending tasks are blocked by dependencies)"
                 server_logger.warning(f"Scheduler idle: {pending_total} pending task(s) blocked by deps")
@@ -6212,6 +7840,7 @@ def pick_task_braided(worker_id: str = None, blocked_lanes: list[str] = None, wo
                 "reason": "no_work",
                 "pointer_index": start_index,
                 "pending_total": pending_total,
+                "backoff_total": backoff_total,
                 "blocked_lanes": lane_debug,
                 "worker_id": worker_id,
                 "ts": now,
@@ -6222,6 +7851,8 @@ def pick_task_braided(worker_id: str = None, blocked_lanes: list[str] = None, wo
                 "status": "NO_WORK",
                 "message": message,
                 "pending_total": pending_total,
+                "backoff_total": backoff_total,
+                "next_retry_at": next_retry_at,
                 "blocked_lanes": lane_debug,
                 "pointer_index": start_index,
             })
@@ -6663,6 +8294,7 @@ def generate_coverage_report() -> str:
     else:
         tasks = {}
 
+    orphan_ids = set()  # v42: O(1) de-dup of orphans
     for tid, task in tasks.items():
         source_ids = task.get("source_ids", [])
 
@@ -6670,7 +8302,8 @@ def generate_coverage_report() -> str:
             # Orphan Check - ID referenced but doesn't exist in sources
             if src_id not in coverage_data["sources"]:
                 # Avoid duplicates
-                if not any(o['id'] == src_id for o in coverage_data["orphans"]):
+                if src_id not in orphan_ids:
+                    orphan_ids.add(src_id)
                     coverage_data["orphans"].append({
                         "id": src_id,
                         "task": tid,
@@ -6925,6 +8558,8 @@ def get_context_readiness() -> str:
     """
     # Delegate to tools/readiness.py implementation (v14.1 with stub detection)
     # Pass base_dir to ensure it uses the correct project root
+    from tools.readiness import get_context_readiness as _get_readiness_impl
+
     base_dir = os.path.dirname(DOCS_DIR)
     result = _get_readiness_impl(base_dir=base_dir)
     return json.dumps(result, indent=2)
@@ -7195,33 +8830,43 @@ def restore_snapshot(zip_name: str) -> str:
 
 
 @mcp.tool()
-def list_snapshots() -> str:
+def list_snapshots(limit: int = 10, cursor: str = "") -> str:
     """
     v11.3: Lists available snapshots for restore.
 
+    Args:
+        limit: v36: Page size (default 10, newest first)
+        cursor: v36: next_cursor of the previous page ("" = newest)
+
     Returns:
-        List of snapshot files with dates
+        JSON page of snapshot files ({name, size_kb}); v36: was plain text
     """
+    limit = max(1, min(limit, 200))
+    try:
+        before = _decode_cursor("snapshots", cursor)
+    except ValueError as e:
+        return _cursor_error(e)
+
     snap_dir = os.path.join(CONTROL_DIR, "snapshots")
     if not os.path.exists(snap_dir):
-        return "📁 No snapshots directory found."
+        return _paged_response("snapshots", [], limit, None, 0, status="EMPTY",  # SAFETY-ALLOW: status-write
+                               message="No snapshots directory found.")
 
     zips = [f for f in os.listdir(snap_dir) if f.endswith(".zip")]
-    if not zips:
-        return "📁 No snapshots found."
+    total = len(zips)
 
-    # Sort by name (timestamp is embedded)
+    # Sort by name (timestamp is embedded); keyset: names before the cursor
     zips.sort(reverse=True)
+    if before:
+        zips = [z for z in zips if z < before[0]]
+    page, next_cursor = _keyset_page(zips[:limit + 1], limit, "snapshots", lambda z: [z])
 
-    lines = ["📁 AVAILABLE SNAPSHOTS:", "─" * 40]
-    for z in zips[:10]:  # Show last 10
-        size_kb = os.path.getsize(os.path.join(snap_dir, z)) // 1024
-        lines.append(f"  {z} ({size_kb} KB)")
-
-    if len(zips) > 10:
-        lines.append(f"  ... and {len(zips) - 10} more")
-
-    return "\n".join(lines)
+    snapshots = [
+        {"name": z, "size_kb": os.path.getsize(os.path.join(snap_dir, z)) // 1024}
+        for z in page
+    ]
+    return _paged_response("snapshots", snapshots, limit, next_cursor, total,
+                           status="OK" if total else "EMPTY")  # SAFETY-ALLOW: status-write
 
 
 @mcp.tool()
@@ -7571,6 +9216,15 @@ def verify_db_integrity() -> str:
         if stale_wip > 0:
             issues.append(f"⚠️ {stale_wip} tasks stuck in_progress >24h")
 
+        # 5. v34: Materialized lane/status counters must match the tasks table
+        try:
+            c.execute("SELECT status, SUM(count) FROM lane_status_counts GROUP BY status")
+            materialized = {row[0] or "NULL": row[1] for row in c.fetchall() if row[1]}
+            if materialized != stats:
+                issues.append("⚠️ lane_status_counts drift detected (run /repair_lane_status_counts)")
+        except sqlite3.OperationalError:
+            pass
+
         conn.close()
 
         # Build report
@@ -7594,7 +9248,223 @@ def verify_db_integrity() -> str:
 
 
 @mcp.tool()
-def sync_db_statuses_from_state(limit: int = 0) -> str:
+def repair_lane_status_counts() -> str:
+    """
+    v34: Maintenance - Rebuilds the trigger-maintained lane_status_counts table
+    (and the task_rollups high-risk counter) from tasks. Only needed if rows
+    were written with triggers disabled.
+
+    Returns:
+        Number of (lane, type, status) / rollup rows that were corrected.
+    """
+    try:
+        with get_db() as conn:
+            drift = _rebuild_lane_status_counts(conn) + _rebuild_task_rollups(conn)
+    except sqlite3.Error as e:
+        return f"❌ Repair failed: {e}"
+    if drift:
+        return f"✅ Rebuilt lane_status_counts ({drift} rows corrected)."
+    return "✅ lane_status_counts already consistent."
+
+
+# =============================================================================
+# v37: TASK TRANSITION LOG ARCHIVAL
+# =============================================================================
+# task_transitions is append-only and grows with every claim/reap/gavel. Rows
+# older than the retention window move into one zlib-compressed JSON-lines blob
+# per UTC month (task_transitions_archive). Reads that need the full history go
+# through _iter_task_transitions(), which stitches archive + hot rows together.
+
+def _transition_month(at: int) -> str:
+    return time.strftime("%Y-%m", time.gmtime(at))
+
+
+def _decode_transition_payload(payload) -> List[Dict]:
+    if not payload:
+        return []
+    text = zlib.decompress(payload).decode("utf-8")
+    return [json.loads(line) for line in text.splitlines() if line]
+
+
+def _encode_transition_payload(rows: List[Dict]) -> bytes:
+    text = "\n".join(_compact_json(row) for row in rows)
+    return zlib.compress(text.encode("utf-8"), 9)
+
+
+def _iter_task_transitions(conn, since_at: int = 0, until_at: int = None):
+    """
+    Yield transition dicts with since_at <= at < until_at in (at, id) order,
+    reading archived months first, then the hot table.
+    """
+    until_at = until_at if until_at is not None else 2 ** 62
+    has_archive = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='task_transitions_archive'"
+    ).fetchone()
+    if has_archive:
+        archived = conn.execute(
+            """SELECT payload FROM task_transitions_archive
+               WHERE max_at >= ? AND min_at < ? ORDER BY month""",
+            (since_at, until_at),
+        ).fetchall()
+        for (payload,) in archived:
+            rows = [r for r in _decode_transition_payload(payload) if since_at <= r["at"] < until_at]
+            rows.sort(key=lambda r: (r["at"], r["id"]))
+            yield from rows
+    cursor = conn.execute(
+        f"""SELECT {", ".join(TASK_TRANSITION_COLUMNS)} FROM task_transitions
+            WHERE at >= ? AND at < ? ORDER BY at, id""",
+        (since_at, until_at),
+    )
+    for row in cursor:
+        yield dict(zip(TASK_TRANSITION_COLUMNS, row))
+
+
+def _archive_task_transitions(conn, cutoff_at: int) -> Dict[str, int]:
+    """Move task_transitions rows with at < cutoff_at into monthly archive blobs."""
+    rows = conn.execute(
+        f"""SELECT {", ".join(TASK_TRANSITION_COLUMNS)} FROM task_transitions
+            WHERE at < ? ORDER BY at, id""",
+        (cutoff_at,),
+    ).fetchall()
+    by_month: Dict[str, List[Dict]] = {}
+    for row in rows:
+        entry = dict(zip(TASK_TRANSITION_COLUMNS, row))
+        by_month.setdefault(_transition_month(entry["at"]), []).append(entry)
+
+    for month, entries in by_month.items():
+        existing = conn.execute(
+            "SELECT payload FROM task_transitions_archive WHERE month = ?", (month,)
+        ).fetchone()
+        merged = _decode_transition_payload(existing[0]) if existing else []
+        seen = {r["id"] for r in merged}
+        merged.extend(r for r in entries if r["id"] not in seen)
+        conn.execute(
+            """INSERT INTO task_transitions_archive (month, row_count, min_at, max_at, payload)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(month) DO UPDATE SET
+                   row_count = excluded.row_count,
+                   min_at = excluded.min_at,
+                   max_at = excluded.max_at,
+                   payload = excluded.payload""",
+            (month, len(merged), min(r["at"] for r in merged), max(r["at"] for r in merged),
+             _encode_transition_payload(merged)),
+        )
+    if rows:
+        conn.execute("DELETE FROM task_transitions WHERE at < ?", (cutoff_at,))
+    return {month: len(entries) for month, entries in by_month.items()}
+
+
+@mcp.tool()
+def archive_task_transitions(retention_days: int = TASK_TRANSITIONS_RETENTION_DAYS) -> str:
+    """
+    v37: Maintenance - Rolls task_transitions rows older than retention_days
+    into compressed monthly archives. Safe to re-run; each month is merged
+    and the hot rows deleted in the same transaction.
+
+    Args:
+        retention_days: Rows newer than this stay in the hot table.
+
+    Returns:
+        JSON summary: archived row counts per month and rows left hot.
+    """
+    cutoff_at = int(time.time()) - max(0, retention_days) * 86400
+    try:
+        with get_db() as conn:
+            moved = _archive_task_transitions(conn, cutoff_at)
+            hot = conn.execute("SELECT COUNT(*) FROM task_transitions").fetchone()[0]
+    except sqlite3.Error as e:
+        return _compact_json({"status": "ERROR", "message": str(e)})
+    return _compact_json({
+        "status": "OK",
+        "cutoff_at": cutoff_at,
+        "archived": moved,
+        "archived_total": sum(moved.values()),
+        "hot_rows": hot,
+    })
+
+
+# =============================================================================
+# v38: FLOW METRICS (lead time / throughput / fleet sizing)
+# =============================================================================
+
+FLOW_WINDOW_HOURS = 24
+FLOW_TARGET_WAIT_S = int(os.getenv("MESH_FLOW_TARGET_WAIT_S", "900"))
+FLOW_EXEC_BUCKET_S = 300  # get_exec_snapshot flow: recomputed once per bucket (up to this stale)
+
+
+def _flow_metrics(conn, now: int, window_hours: float, target_wait_s: float) -> Dict:
+    """Flow metrics for [now - window_hours, now) from the transition log."""
+    from tools.flow_metrics import compute_flow_metrics
+
+    window_s = int(window_hours * 3600)
+    window_end = now + 1  # Include transitions stamped this second
+    window_start = window_end - window_s
+    # Intervals ending in the window may start before it: read one extra window
+    transitions = list(_iter_task_transitions(conn, since_at=window_start - window_s, until_at=window_end))
+    completed_ids = {r["task_id"] for r in transitions if r["to_status"] == "completed"}
+    created_at = {}
+    ids = sorted(completed_ids)
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        for row in conn.execute(
+            f"SELECT id, created_at FROM tasks WHERE id IN ({placeholders}) AND created_at > 0", chunk
+        ):
+            created_at[row[0]] = row[1]
+    return compute_flow_metrics(transitions, window_start, window_end, target_wait_s, created_at)
+
+
+def _exec_flow_summary(conn, now: int) -> dict:
+    """Compact per-lane flow numbers for the EXEC dashboard."""
+    metrics = _flow_metrics(conn, now, FLOW_WINDOW_HOURS, FLOW_TARGET_WAIT_S)
+    return {
+        "window_hours": FLOW_WINDOW_HOURS,
+        "target_wait_s": FLOW_TARGET_WAIT_S,
+        "throughput_per_h": metrics["overall"]["throughput_per_h"],
+        "rework_rate": metrics["overall"]["rework_rate"],
+        "lanes": [
+            {
+                "name": lane,
+                "arrival_rate_per_h": stats["arrival_rate_per_h"],
+                "throughput_per_h": stats["throughput_per_h"],
+                "wait_p90_s": stats["wait"]["p90_s"],
+                "service_p50_s": stats["service"]["p50_s"],
+                "workers_needed": stats["workers_needed"],
+            }
+            for lane, stats in metrics["lanes"].items()
+        ],
+    }
+
+
+@mcp.tool()
+def get_flow_metrics(window_hours: float = FLOW_WINDOW_HOURS, target_wait_s: int = FLOW_TARGET_WAIT_S) -> str:
+    """
+    v38: Queue-theory numbers for sizing the worker fleet, over a rolling window.
+
+    Computed from task_transitions (hot + archived): arrival rate, throughput,
+    wait before claim, service time, review dwell and lead time percentiles
+    per lane and archetype, rework rate (reject/reopen), and per lane the
+    workers needed to keep mean claim wait under target_wait_s (M/M/c).
+
+    Args:
+        window_hours: Rolling window length (default 24)
+        target_wait_s: Target mean wait before claim, in seconds
+
+    Returns:
+        JSON metrics document.
+    """
+    if window_hours <= 0:
+        return _compact_json({"status": "ERROR", "message": "window_hours must be > 0"})
+    try:
+        with get_db() as conn:
+            metrics = _flow_metrics(conn, int(time.time()), window_hours, target_wait_s)
+    except sqlite3.Error as e:
+        return _compact_json({"status": "ERROR", "message": str(e)})
+    return _compact_json({"status": "OK", **metrics})
+
+
+@mcp.tool()
+def sync_db_statuses_from_state(limit: int = 0) -> str:
     """
     v12.2: Maintenance - Aligns SQLite status column with JSON Source of Truth.
     Uses 'finally' block to ensure DB locks are released.
@@ -7643,6 +9513,323 @@ def sync_db_statuses_from_state(limit: int = 0) -> str:
             conn.close()
 
 
+# =============================================================================
+# v41: PERSISTENT PROVENANCE TAG INDEX
+# =============================================================================
+# generate_provenance_report() walks and reads the whole codebase. The
+# gatekeeper only asks "does [ID] have a code tag" for a task's few sources, so
+# it answers from provenance_tags and first rescans just the task's
+# files_changed plus the files changed since the last full build:
+#   - git repo: `git diff --name-only <index head>` (commits + worktree edits)
+#     and untracked files from the shared git_state cache (`git ls-files -o`
+#     while that is still pending). The index head then advances to HEAD, so
+#     the diff covers commits since the last refresh, not since the build;
+#     the last refresh's paths are rechecked once more (catches reverts).
+#   - otherwise: a stat-only walk; only files whose mtime/size moved are read
+# Index scope is the default report scope (PROVENANCE_SCAN_DIRS).
+
+PROVENANCE_SCAN_DIRS = ("src", "lib", "app", "api", "services", "core")
+PROVENANCE_CODE_EXTENSIONS = (".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".go", ".rs")
+PROVENANCE_SKIP_DIRS = frozenset(("node_modules", "__pycache__", ".git", "venv", ".venv"))
+PROVENANCE_GIT_TIMEOUT_S = 5.0
+
+# Regex: Find # Implements [ID] or # Implements [ID, ID2]
+# Also matches // Implements [ID] for JS/TS
+PROVENANCE_IMPLEMENTS_RE = re.compile(r'[#/]+\s*Implements\s*\[([A-Z0-9,\s\-_]+)\]', re.IGNORECASE)
+
+
+def _scan_provenance_tags(file_path: str) -> list:
+    """(source_id, line) for every Implements tag in one file, in file order."""
+    tags = []
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        for line_num, line in enumerate(f, start=1):
+            # Fast path: avoid regex work when marker absent
+            if "implements" not in line.lower():
+                continue
+            for match in PROVENANCE_IMPLEMENTS_RE.finditer(line):
+                for raw_id in match.group(1).split(","):
+                    src_id = raw_id.strip().upper()
+                    if src_id:
+                        tags.append((src_id, line_num))
+    return tags
+
+
+def _provenance_walk_paths(scan_dirs=PROVENANCE_SCAN_DIRS) -> list:
+    """Relative paths of every code file under scan_dirs (no reads)."""
+    paths = []
+    for scan_path in scan_dirs:
+        full_path = os.path.join(BASE_DIR, scan_path)
+        if not os.path.exists(full_path):
+            continue
+        for root, dirs, files in os.walk(full_path):
+            # Skip common non-code directories
+            dirs[:] = [d for d in dirs if d not in PROVENANCE_SKIP_DIRS]
+            for file in files:
+                if file.endswith(PROVENANCE_CODE_EXTENSIONS):
+                    paths.append(os.path.relpath(os.path.join(root, file), BASE_DIR))
+    return paths
+
+
+def _provenance_rel_path(path: str):
+    """Index key for path (relative or absolute), or None when out of scope."""
+    rel_path = os.path.relpath(os.path.join(BASE_DIR, path), BASE_DIR)
+    parts = rel_path.replace("\\", "/").split("/")
+    if parts[0] not in PROVENANCE_SCAN_DIRS or not rel_path.endswith(PROVENANCE_CODE_EXTENSIONS):
+        return None
+    if PROVENANCE_SKIP_DIRS.intersection(parts[:-1]):
+        return None
+    return rel_path
+
+
+def _git_head():
+    """Current HEAD commit of BASE_DIR, or None outside a git repo."""
+    import subprocess
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BASE_DIR, capture_output=True, text=True, timeout=PROVENANCE_GIT_TIMEOUT_S,
+        )
+    except Exception:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def _provenance_index_meta(conn) -> dict:
+    rows = conn.execute(
+        "SELECT key, value FROM config WHERE key IN "
+        "('provenance_index_built_at', 'provenance_index_head', 'provenance_index_recent')"
+    ).fetchall()
+    return {row[0].replace("provenance_index_", ""): row[1] for row in rows}
+
+
+def _set_provenance_index_meta(conn, head) -> None:
+    conn.executemany(
+        "INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)",
+        [("provenance_index_built_at", str(int(time.time()))), ("provenance_index_head", head or ""),
+         ("provenance_index_recent", "[]")],
+    )
+
+
+def _advance_provenance_index(conn, meta: dict, head, changed) -> None:
+    """After an incremental refresh: move the index head, remember changed paths."""
+    recent = json.dumps(sorted(changed))
+    updates = []
+    if head and head != meta.get("head"):
+        updates.append(("provenance_index_head", head))
+    if recent != (meta.get("recent") or "[]"):
+        updates.append(("provenance_index_recent", recent))
+    if updates:
+        conn.executemany("INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)", updates)
+
+
+def _write_provenance_index(conn, files: dict, replace_all: bool = False) -> None:
+    """
+    Store scan results. files maps rel_path -> (mtime_ns, size, tags), or
+    None for a file that no longer exists.
+    """
+    if replace_all:
+        conn.execute("DELETE FROM provenance_tags")
+        conn.execute("DELETE FROM provenance_files")
+    else:
+        keys = [(path,) for path in files]
+        conn.executemany("DELETE FROM provenance_tags WHERE path = ?", keys)
+        conn.executemany("DELETE FROM provenance_files WHERE path = ?", keys)
+    conn.executemany(
+        "INSERT INTO provenance_files (path, mtime_ns, size) VALUES (?, ?, ?)",
+        [(path, entry[0], entry[1]) for path, entry in files.items() if entry is not None],
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO provenance_tags (source_id, path, line) VALUES (?, ?, ?)",
+        [
+            (src_id, path, line_num)
+            for path, entry in files.items() if entry is not None
+            for src_id, line_num in entry[2]
+        ],
+    )
+
+
+def _provenance_changed_paths(head: str):
+    """
+    Paths changed since the index head (committed, worktree or untracked;
+    a rename lists both paths), or None when git can't answer (not a
+    repo, unknown commit) and the caller must stat-walk.
+    """
+    if not head:
+        return None
+    import subprocess
+    try:
+        result = subprocess.run(
+            ["git", "--no-optional-locks", "diff", "--name-only", "--no-renames", "--relative", head,
+             "--", *PROVENANCE_SCAN_DIRS],
+            cwd=BASE_DIR, capture_output=True, text=True, timeout=PROVENANCE_GIT_TIMEOUT_S,
+        )
+    except Exception:
+        return None
+    if result.returncode != 0:
+        return None
+    changed = set(result.stdout.splitlines())
+
+    # Untracked files come from the background git status cache (never blocks)
+    try:
+        from tools.git_state import read_git_state
+    except ImportError:
+        read_git_state = None
+    state = read_git_state(BASE_DIR) if read_git_state is not None else None
+    if state is None or not state.ok:
+        # Cache pending/failed: ask git directly, or an untracked tagged file is missed
+        try:
+            result = subprocess.run(
+                ["git", "--no-optional-locks", "ls-files", "-o", "--exclude-standard", "--", *PROVENANCE_SCAN_DIRS],
+                cwd=BASE_DIR, capture_output=True, text=True, timeout=PROVENANCE_GIT_TIMEOUT_S,
+            )
+        except Exception:
+            return None
+        if result.returncode != 0:
+            return None
+        changed.update(result.stdout.splitlines())
+        return changed
+    for entry in state.entries:
+        if not entry.startswith("?? "):
+            continue
+        path = entry[3:].strip('"')
+        if path.endswith("/"):
+            changed.update(_provenance_walk_paths([path.rstrip("/")]))  # New directory
+        else:
+            changed.add(path)
+    return changed
+
+
+def _refresh_provenance_index(conn, paths) -> int:
+    """Rescan paths whose mtime/size differ from the index; returns files rescanned."""
+    updates = {}
+    for path in paths:
+        rel_path = _provenance_rel_path(path)
+        if rel_path is None or rel_path in updates:
+            continue
+        row = conn.execute(
+            "SELECT mtime_ns, size FROM provenance_files WHERE path = ?", (rel_path,)
+        ).fetchone()
+        file_path = os.path.join(BASE_DIR, rel_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            if row is not None:
+                updates[rel_path] = None  # Deleted since indexed
+            continue
+        if row is not None and (row[0], row[1]) == (stat.st_mtime_ns, stat.st_size):
+            continue
+        try:
+            updates[rel_path] = (stat.st_mtime_ns, stat.st_size, _scan_provenance_tags(file_path))
+        except OSError:
+            continue
+    if updates:
+        _write_provenance_index(conn, updates)
+    return len(updates)
+
+
+def _provenance_evidence(source_ids: list, files_changed=()):
+    """
+    Gatekeeper lookup: source_id -> code files carrying its Implements tag,
+    after a targeted index refresh. The first call (no build yet) runs one
+    full generate_provenance_report(). None when the DB has no index tables.
+    """
+    try:
+        with get_db() as conn:
+            meta = _provenance_index_meta(conn)
+            conn.execute("SELECT 1 FROM provenance_tags LIMIT 1")
+    except sqlite3.Error:
+        return None
+
+    if not meta.get("built_at"):
+        generate_provenance_report()
+        with get_db() as conn:
+            meta = _provenance_index_meta(conn)
+
+    # HEAD is read before the diff: anything committed after it shows up in
+    # the next diff against the advanced head
+    head = _git_head() if meta.get("head") else None
+    changed = _provenance_changed_paths(meta.get("head")) if head else None
+    with get_db() as conn:
+        if changed is None:
+            # No git: stat every file in scope (plus indexed ones, to catch
+            # deletions) and read only those whose mtime/size moved
+            paths = _provenance_walk_paths()
+            paths += [row[0] for row in conn.execute("SELECT path FROM provenance_files")]
+            _refresh_provenance_index(conn, [*files_changed, *paths])
+        else:
+            try:
+                recent = json.loads(meta.get("recent") or "[]")
+            except ValueError:
+                recent = []
+            _refresh_provenance_index(conn, [*files_changed, *changed, *recent])
+            _advance_provenance_index(conn, meta, head, changed)
+
+        evidence = {src_id: [] for src_id in source_ids}
+        if source_ids:
+            placeholders = ",".join("?" * len(source_ids))
+            for row in conn.execute(
+                f"SELECT DISTINCT source_id, path FROM provenance_tags "
+                f"WHERE source_id IN ({placeholders}) ORDER BY path",
+                list(source_ids),
+            ):
+                evidence[row[0]].append(row[1])
+    return evidence
+
+
+def _parse_files_changed(files_changed) -> list:
+    """files_changed as a list: JSON array, comma-separated string or list."""
+    if not files_changed:
+        return []
+    if isinstance(files_changed, (list, tuple)):
+        return [str(f) for f in files_changed if f]
+    try:
+        parsed = json.loads(files_changed)
+    except (TypeError, ValueError):
+        parsed = str(files_changed).split(",")
+    if not isinstance(parsed, list):
+        return []
+    return [str(f).strip() for f in parsed if str(f).strip()]
+
+
+def _index_submitted_files(files_changed) -> None:
+    """Refresh the tag index for a completion's files_changed (fail-open)."""
+    paths = _parse_files_changed(files_changed)
+    if not paths:
+        return
+    try:
+        with get_db() as conn:
+            _refresh_provenance_index(conn, paths)
+    except sqlite3.Error as e:
+        server_logger.debug(f"v41: Provenance index not updated: {e}")
+
+
+_source_registry_cache: dict = {}
+
+
+def _load_source_registry() -> dict:
+    """
+    v41: SOURCE_REGISTRY.json, re-parsed only when its mtime/size change.
+    Callers must treat the result as read-only.
+    """
+    registry_path = get_source_path("SOURCE_REGISTRY.json")
+    try:
+        stat = os.stat(registry_path)
+    except OSError:
+        return {}
+    key = (registry_path, stat.st_mtime_ns, stat.st_size)
+    if _source_registry_cache.get("key") != key:
+        registry = {}
+        try:
+            with open(registry_path, "r", encoding="utf-8") as f:
+                registry = json.load(f)
+        except Exception:
+            pass
+        _source_registry_cache.update(key=key, registry=registry)
+    return _source_registry_cache["registry"]
+
+
 @mcp.tool()
 def generate_provenance_report(scan_dir: str = "src") -> str:
     """
@@ -7674,75 +9861,61 @@ def generate_provenance_report(scan_dir: str = "src") -> str:
             pass
 
     # 2. Scan Codebase (multiple directories)
-    scan_dirs = [scan_dir, "lib", "app", "api", "services", "core"]
-    code_extensions = (".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".go", ".rs")
-
-    # Regex: Find # Implements [ID] or # Implements [ID, ID2]
-    # Also matches // Implements [ID] for JS/TS
-    implements_re = re.compile(r'[#/]+\s*Implements\s*\[([A-Z0-9,\s\-_]+)\]', re.IGNORECASE)
+    scan_dirs = [scan_dir, *PROVENANCE_SCAN_DIRS[1:]]
+    # v41: The default scan covers exactly the gatekeeper's index scope, so it
+    # doubles as a full index build (head captured before the walk).
+    index_files = {} if tuple(scan_dirs) == PROVENANCE_SCAN_DIRS else None
+    index_head = _git_head() if index_files is not None else None
 
     # Internal caches to keep de-dup O(1) while preserving output format
     seen_line_entries = {}  # src_id -> set("rel/path:line")
     seen_orphans = set()    # (src_id, rel_path, line_num)
 
-    for scan_path in scan_dirs:
-        full_path = os.path.join(BASE_DIR, scan_path)
-        if not os.path.exists(full_path):
+    for rel_path in _provenance_walk_paths(scan_dirs):
+        file_path = os.path.join(BASE_DIR, rel_path)
+        try:
+            stat = os.stat(file_path)
+            tags = _scan_provenance_tags(file_path)
+        except Exception:
             continue
+        if index_files is not None:
+            index_files[rel_path] = (stat.st_mtime_ns, stat.st_size, tags)
+
+        for src_id, line_num in tags:
+            # Init entry
+            if src_id not in provenance_data["sources"]:
+                provenance_data["sources"][src_id] = {"files": [], "lines": [], "tasks": []}
+
+            # Record hit (avoid duplicates)
+            file_entry = f"{rel_path}:{line_num}"
+            src_seen = seen_line_entries.get(src_id)
+            if src_seen is None:
+                src_seen = set()
+                seen_line_entries[src_id] = src_seen
+
+            if file_entry not in src_seen:
+                src_seen.add(file_entry)
+                provenance_data["sources"][src_id]["files"].append(rel_path)
+                provenance_data["sources"][src_id]["lines"].append(file_entry)
+
+            # Orphan check: Code claims source that doesn't exist
+            if valid_ids and src_id not in valid_ids:
+                orphan_key = (src_id, rel_path, line_num)
+                if orphan_key not in seen_orphans:
+                    seen_orphans.add(orphan_key)
+                    provenance_data["orphans"].append({
+                        "id": src_id,
+                        "file": rel_path,
+                        "line": line_num
+                    })
 
-        for root, dirs, files in os.walk(full_path):
-            # Skip common non-code directories
-            dirs[:] = [d for d in dirs if d not in ['node_modules', '__pycache__', '.git', 'venv', '.venv']]
-
-            for file in files:
-                if not file.endswith(code_extensions):
-                    continue
-
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, BASE_DIR)
-
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        for line_num, line in enumerate(f, start=1):
-                            # Fast path: avoid regex work when marker absent
-                            if "implements" not in line.lower():
-                                continue
-
-                            for match in implements_re.finditer(line):
-                                raw_ids = match.group(1)
-
-                                # Split "ID1, ID2"
-                                ids = [i.strip().upper() for i in raw_ids.split(",") if i.strip()]
-
-                                for src_id in ids:
-                                    # Init entry
-                                    if src_id not in provenance_data["sources"]:
-                                        provenance_data["sources"][src_id] = {"files": [], "lines": [], "tasks": []}
-
-                                    # Record hit (avoid duplicates)
-                                    file_entry = f"{rel_path}:{line_num}"
-                                    src_seen = seen_line_entries.get(src_id)
-                                    if src_seen is None:
-                                        src_seen = set()
-                                        seen_line_entries[src_id] = src_seen
-
-                                    if file_entry not in src_seen:
-                                        src_seen.add(file_entry)
-                                        provenance_data["sources"][src_id]["files"].append(rel_path)
-                                        provenance_data["sources"][src_id]["lines"].append(file_entry)
-
-                                    # Orphan check: Code claims source that doesn't exist
-                                    if valid_ids and src_id not in valid_ids:
-                                        orphan_key = (src_id, rel_path, line_num)
-                                        if orphan_key not in seen_orphans:
-                                            seen_orphans.add(orphan_key)
-                                            provenance_data["orphans"].append({
-                                                "id": src_id,
-                                                "file": rel_path,
-                                                "line": line_num
-                                            })
-                except Exception:
-                    continue
+    if index_files is not None and os.path.exists(DB_PATH):
+        try:
+            with get_db() as conn:
+                _write_provenance_index(conn, index_files, replace_all=True)
+                _set_provenance_index_meta(conn, index_head)
+        except sqlite3.Error as e:
+            server_logger.debug(f"v41: Provenance index not updated: {e}")
 
     # 3. Link Tasks (The Intent)
     if STATE_MACHINE_AVAILABLE:
@@ -7904,7 +10077,7 @@ def ingest_file_to_source(file_path: str, domain_prefix: str, min_clause_length:
 
     try:
         if ext == '.pdf':
-            reader = pypdf.PdfReader(file_path)
+            reader = _optional_module("pypdf").PdfReader(file_path)
             page_count = len(reader.pages)
             for page in reader.pages:
                 extracted = page.extract_text()
@@ -7912,7 +10085,7 @@ def ingest_file_to_source(file_path: str, domain_prefix: str, min_clause_length:
                     text_content += extracted + "\n\n"
 
         elif ext == '.docx':
-            doc = docx.Document(file_path)
+            doc = _optional_module("docx").Document(file_path)
             page_count = len(doc.paragraphs) // 20  # Rough estimate
             for para in doc.paragraphs:
                 if para.text.strip():
@@ -8111,13 +10284,13 @@ Output format: ## [PRO-CATEGORY-SEQ] Title
             content = ""
 
             if ext == '.pdf' and PYPDF_AVAILABLE:
-                reader = pypdf.PdfReader(file_path)
+                reader = _optional_module("pypdf").PdfReader(file_path)
                 for page in reader.pages:
                     extracted = page.extract_text()
                     if extracted:
                         content += extracted + "\n\n"
             elif ext == '.docx' and DOCX_AVAILABLE:
-                doc = docx.Document(file_path)
+                doc = _optional_module("docx").Document(file_path)
                 for para in doc.paragraphs:
                     if para.text.strip():
                         content += para.text + "\n\n"
@@ -8817,20 +10990,12 @@ def upsert_task(
 
     if sources_list:
         # Semantic check: Find tasks with overlapping sources AND same archetype
+        # (v42: indexed task_sources join)
         with get_db() as conn:
-            rows = conn.execute(
-                "SELECT id, source_ids, archetype FROM tasks WHERE archetype = ?",
-                (archetype,)
-            ).fetchall()
-
-            for row in rows:
-                task_sources = json.loads(row[1]) if row[1] else []
-                # Check for intersection of source IDs
-                common_sources = set(sources_list).intersection(set(task_sources))
-                if common_sources:
-                    existing_id = row[0]
-                    match_reason = f"Source+Archetype match: {list(common_sources)}"
-                    break
+            matches = _tasks_sharing_sources(conn, sources_list, archetype=archetype)
+        if matches:
+            existing_id, common_sources = next(iter(matches.items()))
+            match_reason = f"Source+Archetype match: {common_sources}"
 
     # Fallback: If no source-based match, check by exact title + archetype
     if not existing_id:
@@ -10349,19 +12514,20 @@ def dispatch_to_worker(task: str, project_profile: str, worker_type: str = "back
 
 
 @mcp.tool()
-def run_preflight_check(project_profile: str = "") -> str:
+def run_preflight_check(project_profile: str = "", full_run: bool = False) -> str:
     """
     Runs pre-flight tests for the current project.
     
     Args:
         project_profile: Project profile (auto-detected if not provided)
+        full_run: Skip impact-aware selection and run the whole suite
     
     Returns:
         JSON with test results.
     """
     from qa_protocol import run_preflight_tests
     
-    result = run_preflight_tests(project_profile or None)
+    result = run_preflight_tests(project_profile or None, incremental=False if full_run else None)
     
     return json.dumps({
         "preflight_result": result,
@@ -10464,11 +12630,11 @@ def get_mode() -> str:
 def run_watchdog(conn):
     """Resets tasks stuck 'in_progress'."""
     now = int(time.time())
-    conn.execute("""
+    _execute_transition(conn, "reap", """
         UPDATE tasks SET status='pending', worker_id=NULL, retry_count=retry_count+1  -- SAFETY-ALLOW: status-write
         WHERE status='in_progress' AND type IN ('frontend', 'qa') AND updated_at < ?
     """, (now - 300,))
-    conn.execute("""
+    _execute_transition(conn, "reap", """
         UPDATE tasks SET status='pending', worker_id=NULL, retry_count=retry_count+1  -- SAFETY-ALLOW: status-write
         WHERE status='in_progress' AND type = 'backend' AND updated_at < ?
     """, (now - 600,))
@@ -10610,12 +12776,15 @@ def pick_task(worker_type: TaskType, worker_id: str) -> str:
                 f"(cutoff={reap.get('cutoff')}, stale_after_s={reap.get('stale_after_s')})"
             )
         
-        # 1. THROTTLING
-        if worker_type == TaskType.BACKEND:
+        # 1. THROTTLING (v40: per-lane limit from MESH_LANE_CONCURRENCY when set)
+        limit = LANE_CONCURRENCY_LIMITS.get(worker_type.value)
+        if limit is None and worker_type == TaskType.BACKEND:
+            limit = PICK_TASK_BACKEND_THROTTLE
+        if limit:
             active = conn.execute(
-                "SELECT count(*) FROM tasks WHERE type='backend' AND status='in_progress'"
+                "SELECT count(*) FROM tasks WHERE type=? AND status='in_progress'", (worker_type.value,)
             ).fetchone()[0]
-            if active >= 2:
+            if active >= limit:
                 return "NO_WORK (Throttled)"
 
         # 2. SEARCH (include 'blocked' to check for auto-recovery)
@@ -10729,7 +12898,7 @@ def pick_task(worker_type: TaskType, worker_id: str) -> str:
             claimed_at = int(time.time())
             import uuid
             lease_id = uuid.uuid4().hex
-            cursor = conn.execute(
+            cursor = _execute_transition(conn, "claim",
                 "UPDATE tasks SET status='in_progress', worker_id=?, lease_id=?, updated_at=? WHERE id=? AND status IN ('pending', 'blocked')",  # SAFETY-ALLOW: status-write
                 (worker_id, lease_id, claimed_at, task["id"])
             )
@@ -10852,35 +13021,28 @@ def find_paired_test(source_ids: list, task_archetype: str = None) -> dict:
     if not source_ids:
         return {"found": False, "task": None, "status": None}  # SAFETY-ALLOW: status-write
 
-    req_sources = set(source_ids)
-
     with get_db() as conn:
         # Find TEST tasks that share at least one source with the given sources
-        test_tasks = conn.execute("""
-            SELECT id, source_ids, status, desc, archetype
-            FROM tasks
-            WHERE archetype = 'TEST'
-        """).fetchall()
-
-        for test in test_tasks:
-            test_sources_raw = test["source_ids"] if test["source_ids"] else "[]"
-            try:
-                test_sources = set(json.loads(test_sources_raw))
-            except Exception:
-                test_sources = set()
+        # (v42: indexed task_sources join instead of parsing every TEST row)
+        matches = _tasks_sharing_sources(conn, source_ids, archetype="TEST")
+        test = None
+        if matches:
+            test = conn.execute(
+                "SELECT id, status, desc, archetype FROM tasks WHERE id = ?",
+                (next(iter(matches)),),
+            ).fetchone()
 
-            # Check if they share at least one relevant source
-            if not req_sources.isdisjoint(test_sources):
-                return {
-                    "found": True,
-                    "task": {
-                        "id": test["id"],
-                        "status": test["status"],  # SAFETY-ALLOW: status-write
-                        "desc": test["desc"],
-                        "archetype": test["archetype"]
-                    },
-                    "status": test["status"]  # SAFETY-ALLOW: status-write
-                }
+    if test is not None:
+        return {
+            "found": True,
+            "task": {
+                "id": test["id"],
+                "status": test["status"],  # SAFETY-ALLOW: status-write
+                "desc": test["desc"],
+                "archetype": test["archetype"]
+            },
+            "status": test["status"]  # SAFETY-ALLOW: status-write
+        }
 
     return {"found": False, "task": None, "status": None}  # SAFETY-ALLOW: status-write
 
@@ -10889,6 +13051,9 @@ def validate_task_completion(task_id: int) -> dict:
     """
     v10.11: The Gatekeeper - Validates authority rules before allowing completion.
     v10.11.2: Enhanced with Test Gate enforcement.
+    v41: Code evidence comes from the persistent tag index, refreshed for the
+    task's files_changed plus files changed since the last index build - not
+    a full repo scan.
 
     Returns: {"ok": bool, "errors": list, "warnings": list}
 
@@ -10898,15 +13063,11 @@ def validate_task_completion(task_id: int) -> dict:
     - DEFAULT/ADVISORY: No enforcement (pass through).
     - TEST GATE: LOGIC/API/SEC/DB tasks with domain/professional sources MUST have paired TEST.
     """
-    errors = []
     warnings = []
 
     # 1. Load task data
     with get_db() as conn:
-        task = conn.execute(
-            "SELECT source_ids, override_justification, desc, archetype FROM tasks WHERE id=?",
-            (task_id,)
-        ).fetchone()
+        task = conn.execute("SELECT * FROM tasks WHERE id=?", (task_id,)).fetchone()
 
     if not task:
         return {"ok": False, "errors": ["Task not found."], "warnings": []}
@@ -10925,32 +13086,41 @@ def validate_task_completion(task_id: int) -> dict:
 
     justification = task["override_justification"] if task["override_justification"] else ""
 
-    # 2. Refresh provenance data (scan for # Implements tags)
+    # 2. Code evidence for this task's sources (v41: targeted index refresh)
+    files_changed = task["files_changed"] if "files_changed" in task.keys() else None
+    changed_paths = _parse_files_changed(files_changed)
+    provenance_sources = {}
     try:
-        generate_provenance_report()
+        evidence_by_id = _provenance_evidence(source_ids, changed_paths)
+        if evidence_by_id is None:
+            # 3. Index unavailable (uninitialized DB): full scan + report
+            generate_provenance_report()
+            prov_path = get_state_path("provenance.json")
+            if os.path.exists(prov_path):
+                with open(prov_path, "r", encoding="utf-8") as f:
+                    provenance_sources = json.load(f).get("sources", {})
+        else:
+            provenance_sources = {src_id: {"files": files} for src_id, files in evidence_by_id.items()}
     except Exception as e:
         warnings.append(f"Could not refresh provenance: {e}")
 
-    # 3. Load provenance
-    prov_path = get_state_path("provenance.json")
-    provenance_sources = {}
-    if os.path.exists(prov_path):
-        try:
-            with open(prov_path, "r", encoding="utf-8") as f:
-                prov_data = json.load(f)
-                provenance_sources = prov_data.get("sources", {})
-        except Exception:
-            pass
-
     # 4. Load registry for smart resolution
-    registry_path = get_source_path("SOURCE_REGISTRY.json")
-    registry = {}
-    if os.path.exists(registry_path):
-        try:
-            with open(registry_path, "r", encoding="utf-8") as f:
-                registry = json.load(f)
-        except Exception:
-            pass
+    registry = _load_source_registry()
+
+    return _gatekeeper_verdict(
+        task_id, source_ids, archetype, justification, provenance_sources, registry,
+        lambda: find_paired_test(source_ids, archetype), warnings,
+    )
+
+
+def _gatekeeper_verdict(task_id: int, source_ids: list, archetype: str, justification: str,
+                        provenance_sources: dict, registry: dict, paired_test, warnings: list) -> dict:
+    """
+    v48: validate_task_completion's rules over already-gathered evidence, so
+    batch callers (create_review_packets) load provenance, the registry and
+    paired tests once. paired_test is a callable, only invoked by the test gate.
+    """
+    errors = []
 
     # 5. Track if any source requires testing
     needs_test_check = False
@@ -10999,7 +13169,7 @@ def validate_task_completion(task_id: int) -> dict:
     testable_archetypes = ["LOGIC", "API", "SEC", "DB"]
 
     if archetype in testable_archetypes and has_domain_or_professional:
-        paired_test = find_paired_test(source_ids, archetype)
+        paired_test = paired_test()
 
         if not paired_test["found"]:
             errors.append(
@@ -11281,6 +13451,8 @@ def complete_task(
     # v10.11: THE GATEKEEPER CHECK
     # Validates authority rules before allowing completion
     if success:
+        # v41: The files being submitted aren't stored yet; index them first
+        _index_submitted_files(files_changed)
         validation = validate_task_completion(task_id)
 
         if not validation["ok"]:
@@ -11428,7 +13600,7 @@ def complete_task(
                 where_tail += " AND (worker_id IS NULL OR worker_id=?)"
                 params.append(str(worker_id))
 
-            cursor = conn.execute(
+            cursor = _execute_transition(conn, "complete",
                 f"""UPDATE tasks
                     SET {", ".join(set_parts)}
                     WHERE id=? {where_tail}""",  # SAFETY-ALLOW: status-write
@@ -11483,7 +13655,8 @@ def complete_task(
             except Exception:
                 current_retries = 0
 
-            if current_retries < 3:
+            # v39: Same budget and terminal state as the lease reaper
+            if RETRY_MAX_ATTEMPTS <= 0 or current_retries + 1 < RETRY_MAX_ATTEMPTS:
                 now = int(time.time())
                 where_tail = "AND status='in_progress'"
                 params = [f"Retry #{current_retries + 1}: {output}", now, task_id]
@@ -11496,10 +13669,15 @@ def complete_task(
                     params.append(str(worker_id))
 
                 lease_clear = ",\n                            lease_id=NULL" if has_lease_id else ""
-                cursor = conn.execute(
+                # v39: Failed attempts back off before the next pick
+                backoff_set = (
+                    f",\n                            backoff_until={now} + {_retry_backoff_sql()}"
+                    if "backoff_until" in cols else ""
+                )
+                cursor = _execute_transition(conn, "complete",
                     f"""UPDATE tasks
                         SET status='pending',
-                            worker_id=NULL{lease_clear},
+                            worker_id=NULL{lease_clear}{backoff_set},
                             retry_count=retry_count+1,
                             output=?,
                             updated_at=?
@@ -11516,7 +13694,7 @@ def complete_task(
                         "message": "Task claim no longer valid (may have been reaped/reassigned)",
                         "task_id": task_id,
                     })
-                return f"Task Failed. Auto-retrying ({current_retries + 1}/3)..."
+                return f"Task Failed. Auto-retrying ({current_retries + 1}/{RETRY_MAX_ATTEMPTS})..."
             else:
                 now = int(time.time())
                 where_tail = "AND status='in_progress'"
@@ -11529,10 +13707,12 @@ def complete_task(
                     where_tail += " AND (worker_id IS NULL OR worker_id=?)"
                     params.append(str(worker_id))
 
-                cursor = conn.execute(
+                cursor = _execute_transition(conn, "dead_letter",
                     f"""UPDATE tasks
-                        SET status='failed',
+                        SET status='dead_letter',
+                            worker_id=NULL,
                             {"lease_id=NULL," if has_lease_id else ""}
+                            retry_count=retry_count+1,
                             output=?,
                             updated_at=?
                         WHERE id=? {where_tail}""",  # SAFETY-ALLOW: status-write
@@ -11548,6 +13728,8 @@ def complete_task(
                         "message": "Task claim no longer valid (may have been reaped/reassigned)",
                         "task_id": task_id,
                     })
+                _log_task_message(conn, task_id, "system", "dead_letter",
+                    f"Worker reported failure after {current_retries + 1} attempts. Dead-lettered.")
                 # v10.5: Sync failure status to JSON state machine
                 if STATE_MACHINE_AVAILABLE:
                     try:
@@ -11555,7 +13737,7 @@ def complete_task(
                         server_logger.debug(f"v10.5: Task {task_id} marked FAILED in state machine")
                     except Exception as e:
                         server_logger.warning(f"v10.5: Failed to sync failure to state machine: {e}")
-                return "Task Failed. Max retries exceeded."
+                return f"Task Failed. Max retries exceeded ({RETRY_MAX_ATTEMPTS}); dead-lettered."
 
 
 @mcp.tool()
@@ -11646,14 +13828,7 @@ def check_gatekeeper(task_id: int) -> str:
         archetype = task["archetype"] if task["archetype"] else "GENERIC"
 
     # Load registry for smart resolution
-    registry_path = get_source_path("SOURCE_REGISTRY.json")
-    registry = {}
-    if os.path.exists(registry_path):
-        try:
-            with open(registry_path, "r", encoding="utf-8") as f:
-                registry = json.load(f)
-        except Exception:
-            pass
+    registry = _load_source_registry()
 
     # Build authority breakdown with smart resolution
     authority_breakdown = []
@@ -11714,6 +13889,10 @@ def hash_dict(d: dict) -> str:
     return hashlib.sha256(json.dumps(d, sort_keys=True).encode("utf-8")).hexdigest()
 
 
+# v48: Worker threads for create_review_packets (packet assembly + writes)
+REVIEW_PACKET_WORKERS = int(os.getenv("MESH_REVIEW_PACKET_WORKERS", "8") or "8")
+
+
 def create_review_packet(task_id: int) -> dict:
     """
     v10.12: Generates a frozen 'Evidence Brief' with freshness hash.
@@ -11727,96 +13906,264 @@ def create_review_packet(task_id: int) -> dict:
     Returns:
         dict with status and packet info, or error
     """
-    # 1. Load task from database
-    with get_db() as conn:
-        task = conn.execute("""
-            SELECT id, desc, source_ids, archetype, dependencies,
-                   override_justification, status
-            FROM tasks WHERE id = ?
-        """, (task_id,)).fetchone()
+    return create_review_packets([task_id])[task_id]
+
+
+def _paired_tests_for(conn, sources_by_task: dict) -> dict:
+    """
+    v48: find_paired_test for many tasks with one task_sources lookup:
+    {task_id: {"found", "task", "status"}} (first TEST task by id sharing a source).
+    """
+    wanted = list(dict.fromkeys(s for sources in sources_by_task.values() for s in sources))
+    shared = {}
+    for i in range(0, len(wanted), _SQL_IN_CHUNK):
+        for test_id, srcs in _tasks_sharing_sources(conn, wanted[i:i + _SQL_IN_CHUNK], archetype="TEST").items():
+            shared.setdefault(test_id, set()).update(srcs)
+    test_ids = sorted(shared)
+
+    rows = {}
+    for i in range(0, len(test_ids), _SQL_IN_CHUNK):
+        chunk = test_ids[i:i + _SQL_IN_CHUNK]
+        for row in conn.execute(
+            f"SELECT id, status, desc, archetype FROM tasks WHERE id IN ({','.join('?' * len(chunk))})", chunk
+        ):
+            rows[row["id"]] = row
+
+    paired = {}
+    for task_id, sources in sources_by_task.items():
+        sources = set(sources)
+        test = next((rows[t] for t in test_ids if t in rows and shared[t] & sources), None)
+        if test is None:
+            paired[task_id] = {"found": False, "task": None, "status": None}  # SAFETY-ALLOW: status-write
+            continue
+        paired[task_id] = {
+            "found": True,
+            "task": {
+                "id": test["id"],
+                "status": test["status"],  # SAFETY-ALLOW: status-write
+                "desc": test["desc"],
+                "archetype": test["archetype"]
+            },
+            "status": test["status"]  # SAFETY-ALLOW: status-write
+        }
+    return paired
 
-        if not task:
-            return {"status": "ERROR", "message": f"Task {task_id} not found"}  # SAFETY-ALLOW: status-write
 
-        # Parse JSON fields
-        source_ids = json.loads(task["source_ids"]) if task["source_ids"] else []
-        dependencies = json.loads(task["dependencies"]) if task["dependencies"] else []
-        archetype = task["archetype"] or "GENERIC"
+def _gatekeeper_verdicts(tasks: dict, paired_tests: dict = None) -> dict:
+    """
+    v48: validate_task_completion for many tasks ({task_id: tasks row}) with
+    shared inputs: one code-evidence refresh for all their sources and
+    files_changed, one registry load and one paired-test lookup.
+    Returns {task_id: {"ok", "errors", "warnings"}}.
+    """
+    verdicts = {}
+    parsed = {}
+    for task_id, task in tasks.items():
+        try:
+            source_ids = json.loads(task["source_ids"] or "[]")
+        except json.JSONDecodeError:
+            source_ids = []
+        if not source_ids:
+            # No sources to validate - plumbing task
+            verdicts[task_id] = {"ok": True, "errors": [], "warnings": []}
+        else:
+            parsed[task_id] = source_ids
+    if not parsed:
+        return verdicts
+
+    all_sources = list(dict.fromkeys(s for sources in parsed.values() for s in sources))
+    all_files = []
+    for task_id in parsed:
+        task = tasks[task_id]
+        all_files.extend(_parse_files_changed(task["files_changed"] if "files_changed" in task.keys() else None))
+    provenance_sources = {}
+    evidence_warning = None
+    try:
+        evidence_by_id = _provenance_evidence(all_sources, list(dict.fromkeys(all_files)))
+        if evidence_by_id is None:
+            # Index unavailable (uninitialized DB): full scan + report
+            generate_provenance_report()
+            prov_path = get_state_path("provenance.json")
+            if os.path.exists(prov_path):
+                with open(prov_path, "r", encoding="utf-8") as f:
+                    provenance_sources = json.load(f).get("sources", {})
+        else:
+            provenance_sources = {src_id: {"files": files} for src_id, files in evidence_by_id.items()}
+    except Exception as e:
+        evidence_warning = f"Could not refresh provenance: {e}"
+
+    registry = _load_source_registry()
+    if paired_tests is None:
+        with get_db() as conn:
+            paired_tests = _paired_tests_for(conn, parsed)
+
+    for task_id, source_ids in parsed.items():
+        task = tasks[task_id]
+        paired = paired_tests[task_id]
+        verdicts[task_id] = _gatekeeper_verdict(
+            task_id, source_ids, task["archetype"] or "GENERIC", task["override_justification"] or "",
+            provenance_sources, registry, lambda paired=paired: paired,
+            [evidence_warning] if evidence_warning else [],
+        )
+    return verdicts
+
+
+def create_review_packets(task_ids, max_workers: int = None) -> dict:
+    """
+    v48: Batch review-packet builder (create_review_packet for many tasks).
+
+    Shared inputs are loaded once for the whole batch: task rows, provenance.json,
+    the source registry, paired [TEST] tasks and the gatekeeper's code evidence
+    (one targeted index refresh for every task's sources and files_changed).
+    Per-task assembly, gatekeeping and packet writes (temp file + os.replace)
+    run in a thread pool; the REVIEWING transitions commit in one transaction.
+
+    Returns:
+        {task_id: result} with each result shaped as create_review_packet's
+    """
+    task_ids = list(dict.fromkeys(int(t) for t in task_ids))
+    results = {}
+    if not task_ids:
+        return results
+
+    # 1. Load tasks from database
+    claims = {}
+    with get_db() as conn:
+        rows = {}
+        for i in range(0, len(task_ids), _SQL_IN_CHUNK):
+            chunk = task_ids[i:i + _SQL_IN_CHUNK]
+            for row in conn.execute(
+                f"SELECT * FROM tasks WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ):
+                rows[row["id"]] = row
+
+        for task_id in task_ids:
+            task = rows.get(task_id)
+            if not task:
+                results[task_id] = {"status": "ERROR", "message": f"Task {task_id} not found"}  # SAFETY-ALLOW: status-write
+                continue
+            try:
+                # Parse JSON fields
+                source_ids = json.loads(task["source_ids"]) if task["source_ids"] else []
+                dependencies = json.loads(task["dependencies"]) if task["dependencies"] else []
+            except (TypeError, ValueError) as e:
+                results[task_id] = {"status": "ERROR", "message": f"Task {task_id} has malformed fields: {e}"}  # SAFETY-ALLOW: status-write
+                continue
+            claims[task_id] = (task, source_ids, dependencies, task["archetype"] or "GENERIC")
+
+        # 3. Gather Evidence - Paired Test (one lookup for the batch)
+        paired_tests = _paired_tests_for(conn, {t: c[1] for t, c in claims.items()})
 
     # 2. Gather Evidence - Provenance (code refs)
-    prov_data = {}
+    prov_raw = {}
     prov_path = get_state_path("provenance.json")
-    if os.path.exists(prov_path):
+    if claims and os.path.exists(prov_path):
         try:
             with open(prov_path, "r", encoding="utf-8") as f:
                 prov_raw = json.load(f).get("sources", {})
-                for src_id in source_ids:
-                    if src_id in prov_raw:
-                        prov_data[src_id] = prov_raw[src_id].get("files", [])
         except Exception as e:
             server_logger.warning(f"v10.12: Failed to load provenance: {e}")
 
-    # 3. Gather Evidence - Paired Test
-    paired_test_info = find_paired_test(source_ids, archetype)
+    # Gatekeeper verdicts (validate_task_completion's, inputs gathered once)
+    verdicts = _gatekeeper_verdicts({t: c[0] for t, c in claims.items()}, paired_tests)
 
-    # 4. Create Snapshot Hash (v10.12.2 - Freshness Detection)
-    snapshot = {
-        "description": task["desc"],
-        "source_ids": sorted(source_ids),
-        "archetype": archetype,
-        "dependencies": sorted(dependencies),
-        "override_justification": task["override_justification"] or ""
-    }
-    snap_hash = hash_dict(snapshot)
+    packets_dir = get_state_path("reviews")
+    os.makedirs(packets_dir, exist_ok=True)
+
+    def build(task_id):
+        task, source_ids, dependencies, archetype = claims[task_id]
+        paired_test_info = paired_tests[task_id]
+
+        # 4. Create Snapshot Hash (v10.12.2 - Freshness Detection)
+        snapshot = {
+            "description": task["desc"],
+            "source_ids": sorted(source_ids),
+            "archetype": archetype,
+            "dependencies": sorted(dependencies),
+            "override_justification": task["override_justification"] or ""
+        }
+        snap_hash = hash_dict(snapshot)
+
+        gatekeeper = verdicts[task_id]
+
+        # 5. Assemble Packet
+        packet = {
+            "meta": {
+                "task_id": task_id,
+                "generated_at": datetime.now().isoformat(),
+                "snapshot_hash": snap_hash,
+                "version": "10.12.2"
+            },
+            "claims": snapshot,
+            "evidence": {
+                "code_refs": {src_id: prov_raw[src_id].get("files", []) for src_id in source_ids if src_id in prov_raw},
+                "paired_test": {
+                    "id": paired_test_info["task"]["id"] if paired_test_info["found"] else None,
+                    "status": paired_test_info["status"] if paired_test_info["found"] else "N/A"  # SAFETY-ALLOW: status-write
+                }
+            },
+            "gatekeeper": gatekeeper
+        }
 
-    # 5. Assemble Packet
-    packet = {
-        "meta": {
+        # 6. Save to reviews directory (v48: atomic, readers never see half a packet)
+        packet_path = os.path.join(packets_dir, f"T-{task_id}.json")
+        temp_path = f"{packet_path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(packet, f, indent=2)
+            os.replace(temp_path, packet_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return {
+            "status": "SUCCESS",  # SAFETY-ALLOW: status-write
+            "packet_path": packet_path,
             "task_id": task_id,
-            "generated_at": datetime.now().isoformat(),
             "snapshot_hash": snap_hash,
-            "version": "10.12.2"
-        },
-        "claims": snapshot,
-        "evidence": {
-            "code_refs": prov_data,
-            "paired_test": {
-                "id": paired_test_info["task"]["id"] if paired_test_info["found"] else None,
-                "status": paired_test_info["status"] if paired_test_info["found"] else "N/A"  # SAFETY-ALLOW: status-write
-            }
-        },
-        "gatekeeper": validate_task_completion(task_id)
-    }
-
-    # 6. Save to reviews directory
-    packets_dir = get_state_path("reviews")
-    os.makedirs(packets_dir, exist_ok=True)
-    packet_path = os.path.join(packets_dir, f"T-{task_id}.json")
+            "gatekeeper_ok": gatekeeper["ok"]
+        }
 
-    with open(packet_path, "w", encoding="utf-8") as f:
-        json.dump(packet, f, indent=2)
+    workers = max(1, min(max_workers or REVIEW_PACKET_WORKERS, len(claims) or 1))
+    if workers == 1:
+        built = {t: _packet_result(build, t) for t in claims}
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="review-packet") as pool:
+            built = dict(zip(claims, pool.map(lambda t: _packet_result(build, t), claims)))
 
-    # 7. Update task status to REVIEWING
-    with get_db() as conn:
-        conn.execute(
-            "UPDATE tasks SET status = 'reviewing', updated_at = ? WHERE id = ?",  # SAFETY-ALLOW: status-write
-            (int(time.time()), task_id)
-        )
+    # 7. Update task status to REVIEWING (one transaction for the batch)
+    written = [t for t, r in built.items() if r["status"] == "SUCCESS"]  # SAFETY-ALLOW: status-write
+    if written:
+        now = int(time.time())
+        with get_db() as conn:
+            for i in range(0, len(written), _SQL_IN_CHUNK):
+                chunk = written[i:i + _SQL_IN_CHUNK]
+                conn.execute(
+                    f"UPDATE tasks SET status = 'reviewing', updated_at = ? "  # SAFETY-ALLOW: status-write
+                    f"WHERE id IN ({','.join('?' * len(chunk))})",
+                    [now] + chunk,
+                )
 
     # Sync to state machine if available
     if STATE_MACHINE_AVAILABLE:
-        try:
-            update_task_status(str(task_id), "REVIEWING")
-        except Exception as e:
-            server_logger.warning(f"v10.12: Failed to sync REVIEWING to state machine: {e}")
+        for task_id in written:
+            try:
+                update_task_status(str(task_id), "REVIEWING")
+            except Exception as e:
+                server_logger.warning(f"v10.12: Failed to sync REVIEWING to state machine: {e}")
 
-    return {
-        "status": "SUCCESS",  # SAFETY-ALLOW: status-write
-        "packet_path": packet_path,
-        "task_id": task_id,
-        "snapshot_hash": snap_hash,
-        "gatekeeper_ok": packet["gatekeeper"]["ok"]
-    }
+    results.update(built)
+    return {task_id: results[task_id] for task_id in task_ids}
+
+
+def _packet_result(build, task_id) -> dict:
+    try:
+        return build(task_id)
+    except Exception as e:
+        server_logger.warning(f"v48: Review packet for task {task_id} failed: {e}")
+        return {"status": "ERROR", "message": f"Failed to write packet: {e}"}  # SAFETY-ALLOW: status-write
 
 
 @mcp.tool()
@@ -11859,11 +14206,6 @@ def append_ledger_entry(task_id: int, decision: str, notes: str, actor: str = "H
         actor: Who made the decision (HUMAN, AUTO, BATCH)
         meta: Optional packet metadata (snapshot_hash, etc.)
     """
-    # 1. Ensure Directory (Self-Healing)
-    ledger_dir = STATE_DIR
-    os.makedirs(ledger_dir, exist_ok=True)
-    ledger_path = os.path.join(ledger_dir, "release_ledger.jsonl")
-
     # 2. Load task data
     with get_db() as conn:
         task = conn.execute(
@@ -11875,6 +14217,12 @@ def append_ledger_entry(task_id: int, decision: str, notes: str, actor: str = "H
         server_logger.warning(f"v10.16: Cannot log task {task_id} - not found")
         return
 
+    if _write_ledger_entries([_ledger_entry(task, decision, notes, actor, meta)]):
+        server_logger.info(f"v10.16: Ledger entry written for task {task_id} ({actor})")
+
+
+def _ledger_entry(task, decision: str, notes: str, actor: str, meta: dict = None) -> dict:
+    """v49: One Release Ledger record for a tasks row (id, desc, source_ids, archetype, override_justification)."""
     # Parse source_ids
     source_ids = []
     if task["source_ids"]:
@@ -11893,9 +14241,9 @@ def append_ledger_entry(task_id: int, decision: str, notes: str, actor: str = "H
         })
 
     # 4. Construct Entry
-    entry = {
+    return {
         "timestamp": datetime.now().isoformat(),
-        "task_id": task_id,
+        "task_id": task["id"],
         "decision": decision.upper(),
         "actor": actor,
         "notes": notes,
@@ -11909,13 +14257,40 @@ def append_ledger_entry(task_id: int, decision: str, notes: str, actor: str = "H
         "snapshot_hash": (meta or {}).get("snapshot_hash", "N/A")
     }
 
+
+def _write_ledger_entries(entries: list, durability: str = None) -> bool:
+    """
+    v49: Append entries to release_ledger.jsonl in one buffered write
+    (JSON Lines - Write-Only).
+    v50: Through the shared group-commit writer (tools/ledger_writer.py):
+    concurrent decisions share writes and fsyncs, a torn last line from a
+    crash is repaired first, and durability follows MESH_LEDGER_DURABILITY
+    ("sync" default) unless overridden. Returns False (logged) if the write
+    failed.
+    """
+    # 1. Ensure Directory (Self-Healing)
+    ledger_dir = STATE_DIR
+    os.makedirs(ledger_dir, exist_ok=True)
+    ledger_path = os.path.join(ledger_dir, "release_ledger.jsonl")
+
+    try:
+        from tools.ledger_writer import get_writer
+    except ImportError:
+        get_writer = None
+
     # 5. Append (JSON Lines - Write-Only)
     try:
-        with open(ledger_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-        server_logger.info(f"v10.16: Ledger entry written for task {task_id} ({actor})")
+        if get_writer is not None:
+            get_writer(ledger_path).append(entries, durability)
+        else:
+            with open(ledger_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+                f.flush()
+                os.fsync(f.fileno())
+        return True
     except Exception as e:
         server_logger.error(f"v10.16: Failed to write ledger entry: {e}")
+        return False
 
 
 @mcp.tool()
@@ -11952,199 +14327,356 @@ def submit_review_decision(task_id: int, decision: str, notes: str, actor: str)
             "message": "Actor must be 'HUMAN', 'AUTO', or 'BATCH'"
         })
 
-    # 1. Load task
-    with get_db() as conn:
-        task = conn.execute(
-            "SELECT id, desc, status, source_ids, risk FROM tasks WHERE id = ?",
-            (task_id,)
-        ).fetchone()
+    return json.dumps(_gavel([task_id], decision, notes, actor)[0])
 
-        if not task:
-            return json.dumps({
-                "status": "ERROR",  # SAFETY-ALLOW: status-write
-                "message": f"Task {task_id} not found"
-            })
 
-        # v10.12.2: Safety Lock - Status Check
-        if task["status"] != "reviewing":
-            return json.dumps({
-                "status": "REJECTED",  # SAFETY-ALLOW: status-write
-                "reason": "INVALID_STATE",
-                "message": f"Task {task_id} is in '{task['status']}', not 'reviewing'. "
-                           f"Use generate_review_packet() first."
-            })
+@mcp.tool()
+def submit_review_decisions(task_ids: list[int], decision: str, notes: str, actor: str) -> str:
+    """
+    v49: The Batch Gavel - submit_review_decision for a set of tasks.
+
+    Every task goes through the same gates as a single decision (state lock,
+    entropy/confidence gates, Gatekeeper re-check); the passing ones change
+    status in ONE transaction and their ledger entries (one per task, full
+    authority snapshot) are appended in one write with a single fsync.
+
+    Args:
+        task_ids: The task IDs being reviewed
+        decision: 'APPROVE' or 'REJECT' (applies to all)
+        notes: Review notes (applies to all)
+        actor: 'HUMAN', 'AUTO', or 'BATCH'
+
+    Returns:
+        JSON {status, decision, decided_count, blocked_count, results: [per-task gavel result]}
+    """
+    decision = decision.upper().strip()
+    actor = actor.upper().strip()
+
+    if decision not in ["APPROVE", "REJECT"]:
+        return json.dumps({
+            "status": "ERROR",  # SAFETY-ALLOW: status-write
+            "message": "Decision must be 'APPROVE' or 'REJECT'"
+        })
+
+    if actor not in ["HUMAN", "AUTO", "BATCH"]:
+        return json.dumps({
+            "status": "ERROR",  # SAFETY-ALLOW: status-write
+            "message": "Actor must be 'HUMAN', 'AUTO', or 'BATCH'"
+        })
+
+    results = _gavel(task_ids, decision, notes, actor)
+    decided = sum(1 for r in results if r["status"] == "SUCCESS")  # SAFETY-ALLOW: status-write
+    return json.dumps({
+        "status": "OK" if decided else "NONE_DECIDED",  # SAFETY-ALLOW: status-write
+        "decision": decision,
+        "decided_count": decided,
+        "blocked_count": len(results) - decided,
+        "results": results,
+        "ledger": f"Recorded {decided} ({actor})"
+    })
+
+
+def _log_gavel_override(line: str) -> None:
+    try:
+        log_dir = os.path.join(BASE_DIR, "logs")
+        os.makedirs(log_dir, exist_ok=True)
+        log_path = os.path.join(log_dir, "decisions.log")
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(f"{datetime.now().isoformat()} | {line}\n")
+    except Exception:
+        pass  # Silent fail on logging
+
+
+def _gavel_note_gates(task, decision: str, notes: str, actor: str):
+    """
+    v49: The Gavel's notes-based approval gates for one task (v14.0 entropy,
+    v14.1 confidence). Returns the BLOCKED response, or None to proceed.
+    """
+    if decision != "APPROVE":
+        return None
+    task_id = task["id"]
 
     # v14.0: OPTIMIZATION GATE - Enforce entropy check before approval
-    if decision == "APPROVE":
-        notes_lower = notes.lower()
-        has_entropy_check = "entropy check:" in notes_lower and "passed" in notes_lower
-        has_waiver = "optimization waived:" in notes_lower
-        has_override = "captain_override:" in notes_lower and "entropy" in notes_lower
+    notes_lower = notes.lower()
+    has_entropy_check = "entropy check:" in notes_lower and "passed" in notes_lower
+    has_waiver = "optimization waived:" in notes_lower
+    has_override = "captain_override:" in notes_lower and "entropy" in notes_lower
 
-        if not (has_entropy_check or has_waiver or has_override):
-            return json.dumps({
-                "status": "BLOCKED",  # SAFETY-ALLOW: status-write
-                "reason": "MISSING_ENTROPY_CHECK",
-                "message": "Approval blocked - must include one of: 'Entropy Check: Passed', 'OPTIMIZATION WAIVED: <reason>', or 'CAPTAIN_OVERRIDE: ENTROPY'",
-                "hint": "Run /simplify <task-id> first, or document why optimization is waived"
-            })
+    if not (has_entropy_check or has_waiver or has_override):
+        return {
+            "status": "BLOCKED",  # SAFETY-ALLOW: status-write
+            "reason": "MISSING_ENTROPY_CHECK",
+            "message": "Approval blocked - must include one of: 'Entropy Check: Passed', 'OPTIMIZATION WAIVED: <reason>', or 'CAPTAIN_OVERRIDE: ENTROPY'",
+            "hint": "Run /simplify <task-id> first, or document why optimization is waived"
+        }
 
-        # Log captain override if used
-        if has_override:
-            server_logger.warning(f"v14.0: CAPTAIN_OVERRIDE: ENTROPY used for task {task_id} by {actor}")
-            try:
-                log_dir = os.path.join(BASE_DIR, "logs")
-                os.makedirs(log_dir, exist_ok=True)
-                log_path = os.path.join(log_dir, "decisions.log")
-                with open(log_path, "a", encoding="utf-8") as f:
-                    f.write(f"{datetime.now().isoformat()} | ENTROPY_OVERRIDE | Task {task_id} | Actor: {actor} | CAPTAIN overrode entropy gate\n")
-            except Exception:
-                pass  # Silent fail on logging
+    # Log captain override if used
+    if has_override:
+        server_logger.warning(f"v14.0: CAPTAIN_OVERRIDE: ENTROPY used for task {task_id} by {actor}")
+        _log_gavel_override(f"ENTROPY_OVERRIDE | Task {task_id} | Actor: {actor} | CAPTAIN overrode entropy gate")
 
     # v14.1: CONFIDENCE GATE - Enforce verify score for MEDIUM/HIGH risk before approval
-    if decision == "APPROVE":
-        task_risk = (task["risk"] or "LOW").upper()
-        notes_lower = notes.lower()
+    task_risk = (task["risk"] or "LOW").upper()
 
-        # Only enforce for MEDIUM/HIGH risk
-        if task_risk in ("MEDIUM", "MED", "HIGH"):
-            # Check for captain override first
-            has_confidence_override = "captain_override:" in notes_lower and "confidence" in notes_lower
+    # Only enforce for MEDIUM/HIGH risk
+    if task_risk in ("MEDIUM", "MED", "HIGH"):
+        # Check for captain override first
+        has_confidence_override = "captain_override:" in notes_lower and "confidence" in notes_lower
 
-            if not has_confidence_override:
-                # Parse verify score from notes using pattern: Verify: XX/100
-                verify_match = re.search(r'verify:\s*(\d{1,3})/100', notes_lower)
-                verify_score = int(verify_match.group(1)) if verify_match else None
+        if not has_confidence_override:
+            # Parse verify score from notes using pattern: Verify: XX/100
+            verify_match = re.search(r'verify:\s*(\d{1,3})/100', notes_lower)
+            verify_score = int(verify_match.group(1)) if verify_match else None
 
-                # Determine required threshold
-                required_threshold = 95 if task_risk == "HIGH" else 90
+            # Determine required threshold
+            required_threshold = 95 if task_risk == "HIGH" else 90
 
-                if verify_score is None:
-                    return json.dumps({
-                        "status": "BLOCKED",  # SAFETY-ALLOW: status-write
-                        "reason": "MISSING_CONFIDENCE_PROOF",
-                        "message": f"Approval blocked for {task_risk} risk task - missing 'Verify: XX/100' score in notes",
-                        "hint": f"Run /verify {task_id} first, or add 'CAPTAIN_OVERRIDE: CONFIDENCE' to notes"
-                    })
+            if verify_score is None:
+                return {
+                    "status": "BLOCKED",  # SAFETY-ALLOW: status-write
+                    "reason": "MISSING_CONFIDENCE_PROOF",
+                    "message": f"Approval blocked for {task_risk} risk task - missing 'Verify: XX/100' score in notes",
+                    "hint": f"Run /verify {task_id} first, or add 'CAPTAIN_OVERRIDE: CONFIDENCE' to notes"
+                }
 
-                if verify_score < required_threshold:
-                    return json.dumps({
-                        "status": "BLOCKED",  # SAFETY-ALLOW: status-write
-                        "reason": "INSUFFICIENT_CONFIDENCE",
-                        "message": f"Approval blocked for {task_risk} risk task - Verify score {verify_score}/100 below threshold {required_threshold}",
-                        "hint": f"Fix issues and re-run /verify {task_id}, or add 'CAPTAIN_OVERRIDE: CONFIDENCE' to notes"
-                    })
-            else:
-                # Log captain confidence override
-                server_logger.warning(f"v14.1: CAPTAIN_OVERRIDE: CONFIDENCE used for task {task_id} by {actor}")
-                try:
-                    log_dir = os.path.join(BASE_DIR, "logs")
-                    os.makedirs(log_dir, exist_ok=True)
-                    log_path = os.path.join(log_dir, "decisions.log")
-                    with open(log_path, "a", encoding="utf-8") as f:
-                        f.write(f"{datetime.now().isoformat()} | CONFIDENCE_OVERRIDE | Task {task_id} | Actor: {actor} | Risk: {task_risk} | CAPTAIN overrode confidence gate\n")
-                except Exception:
-                    pass  # Silent fail on logging
+            if verify_score < required_threshold:
+                return {
+                    "status": "BLOCKED",  # SAFETY-ALLOW: status-write
+                    "reason": "INSUFFICIENT_CONFIDENCE",
+                    "message": f"Approval blocked for {task_risk} risk task - Verify score {verify_score}/100 below threshold {required_threshold}",
+                    "hint": f"Fix issues and re-run /verify {task_id}, or add 'CAPTAIN_OVERRIDE: CONFIDENCE' to notes"
+                }
+        else:
+            # Log captain confidence override
+            server_logger.warning(f"v14.1: CAPTAIN_OVERRIDE: CONFIDENCE used for task {task_id} by {actor}")
+            _log_gavel_override(
+                f"CONFIDENCE_OVERRIDE | Task {task_id} | Actor: {actor} | Risk: {task_risk} | CAPTAIN overrode confidence gate"
+            )
+    return None
 
-    # v10.12.2: Safety Lock - Re-Run Gatekeeper on APPROVE (Prevent drift)
-    if decision == "APPROVE":
-        validation = validate_task_completion(task_id)
-        if not validation["ok"]:
-            return json.dumps({
-                "status": "BLOCKED",  # SAFETY-ALLOW: status-write
-                "reason": "GATEKEEPER_DRIFT",
-                "message": "Approval blocked - state changed since packet was generated",
-                "errors": validation["errors"]
-            })
 
-    # 2. Record decision notes first
+def _invalid_state(task_id: int, status: str) -> dict:
+    return {
+        "status": "REJECTED",  # SAFETY-ALLOW: status-write
+        "reason": "INVALID_STATE",
+        "message": f"Task {task_id} is in '{status}', not 'reviewing'. "
+                   f"Use generate_review_packet() first."
+    }
+
+
+def _gavel(task_ids, decision: str, notes: str, actor: str) -> list:
+    """
+    v49: The Gavel proper, for one or many tasks (decision/actor already
+    validated). Only path to 'completed' (update_task_states via_gavel).
+
+    Per task: state lock, notes gates and (on APPROVE) the Gatekeeper re-check,
+    with shared inputs loaded once. Passing tasks record notes and change
+    status in one transaction, re-checked under the write lock; then the
+    state machine is synced, one ledger entry per task is appended in a
+    single buffered write + fsync, and packets are cleaned up.
+
+    Returns the per-task submit_review_decision responses, in task_ids order.
+    """
+    task_ids = list(dict.fromkeys(int(t) for t in task_ids))
+    results = {}
+
+    # 1. Load tasks
     with get_db() as conn:
-        conn.execute("""
-            UPDATE tasks
-            SET review_decision = ?,
-                review_notes = ?
-            WHERE id = ?
-        """, (decision, notes, task_id))
+        rows = {}
+        for i in range(0, len(task_ids), _SQL_IN_CHUNK):
+            chunk = task_ids[i:i + _SQL_IN_CHUNK]
+            for row in conn.execute(f"SELECT * FROM tasks WHERE id IN ({','.join('?' * len(chunk))})", chunk):
+                rows[row["id"]] = row
+
+    eligible = []
+    for task_id in task_ids:
+        task = rows.get(task_id)
+        if not task:
+            results[task_id] = {
+                "status": "ERROR",  # SAFETY-ALLOW: status-write
+                "message": f"Task {task_id} not found"
+            }
+        elif task["status"] != "reviewing":
+            # v10.12.2: Safety Lock - Status Check
+            results[task_id] = _invalid_state(task_id, task["status"])
+        else:
+            blocked = _gavel_note_gates(task, decision, notes, actor)
+            if blocked:
+                results[task_id] = blocked
+            else:
+                eligible.append(task_id)
 
-    # 3. Update status via centralized emitter (v12.1.1)
-    new_status = "completed" if decision == "APPROVE" else "in_progress"
-    ok, emitter_msg = update_task_state(task_id, new_status, via_gavel=True)
-    if not ok:
-        return json.dumps({
-            "status": "ERROR",  # SAFETY-ALLOW: status-write
-            "message": emitter_msg
-        })
+    # v10.12.2: Safety Lock - Re-Run Gatekeeper on APPROVE (Prevent drift)
+    if decision == "APPROVE" and eligible:
+        verdicts = _gatekeeper_verdicts({t: rows[t] for t in eligible})
+        for task_id in eligible:
+            if not verdicts[task_id]["ok"]:
+                results[task_id] = {
+                    "status": "BLOCKED",  # SAFETY-ALLOW: status-write
+                    "reason": "GATEKEEPER_DRIFT",
+                    "message": "Approval blocked - state changed since packet was generated",
+                    "errors": verdicts[task_id]["errors"]
+                }
+        eligible = [t for t in eligible if t not in results]
 
-    msg = f"Task {task_id} APPROVED & COMPLETED." if decision == "APPROVE" else f"Task {task_id} REJECTED -> returned to IN_PROGRESS for rework."
+    # 2. Record decision notes + 3. status, one transaction (v12.1.1 emitter rules)
+    new_status = "completed" if decision == "APPROVE" else "in_progress"
+    decided = []
+    if eligible:
+        try:
+            with get_db() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                decided = update_task_states(conn, eligible, new_status, via_gavel=True, expect_status="reviewing")
+                conn.executemany(
+                    "UPDATE tasks SET review_decision = ?, review_notes = ? WHERE id = ?",
+                    [(decision, notes, task_id) for task_id in decided],
+                )
+        except Exception as e:
+            for task_id in eligible:
+                results[task_id] = {
+                    "status": "ERROR",  # SAFETY-ALLOW: status-write
+                    "message": f"DB Error: {e}"
+                }
+            decided = []
+        decided_set = set(decided)
+        with get_db() as conn:
+            for task_id in eligible:
+                if task_id not in decided_set and task_id not in results:
+                    # Moved by someone else between the checks and the write lock
+                    current = conn.execute("SELECT status FROM tasks WHERE id = ?", (task_id,)).fetchone()
+                    results[task_id] = _invalid_state(task_id, current["status"] if current else "missing")
 
     # 3. Sync to state machine
     if STATE_MACHINE_AVAILABLE:
-        try:
-            state_status = "COMPLETE" if decision == "APPROVE" else "IN_PROGRESS"
-            update_task_status(str(task_id), state_status)
-        except Exception as e:
-            server_logger.warning(f"v10.12.2: Failed to sync decision to state machine: {e}")
+        state_status = "COMPLETE" if decision == "APPROVE" else "IN_PROGRESS"
+        for task_id in decided:
+            try:
+                update_task_status(str(task_id), state_status)
+            except Exception as e:
+                server_logger.warning(f"v10.12.2: Failed to sync decision to state machine: {e}")
 
     # 4. v10.16.1: Write to Release Ledger (BEFORE cleanup)
     # Actor is now an EXPLICIT parameter - no heuristics
+    entries = []
+    for task_id in decided:
+        # Load packet meta for snapshot hash (if available)
+        packet_path = os.path.join(STATE_DIR, "reviews", f"T-{task_id}.json")
+        packet_meta = {}
+        if os.path.exists(packet_path):
+            try:
+                with open(packet_path, "r", encoding="utf-8") as f:
+                    packet_meta = json.load(f).get("meta", {})
+            except Exception:
+                pass
+        entries.append(_ledger_entry(rows[task_id], decision, notes, actor, packet_meta))
+    if entries and _write_ledger_entries(entries):
+        server_logger.info(f"v10.16: Ledger entries written for {len(entries)} task(s) ({actor})")
+
+    for task_id in decided:
+        # 5. v10.12.2: Auto-Cleanup - Remove review packet
+        packet_path = os.path.join(STATE_DIR, "reviews", f"T-{task_id}.json")
+        if os.path.exists(packet_path):
+            try:
+                os.remove(packet_path)
+                server_logger.info(f"v10.12.2: Cleaned up review packet for task {task_id}")
+            except Exception as e:
+                server_logger.warning(f"v10.12.2: Failed to cleanup packet: {e}")
 
-    # Load packet meta for snapshot hash (if available)
-    packet_path = os.path.join(STATE_DIR, "reviews", f"T-{task_id}.json")
-    packet_meta = {}
-    if os.path.exists(packet_path):
-        try:
-            with open(packet_path, "r", encoding="utf-8") as f:
-                packet_meta = json.load(f).get("meta", {})
-        except Exception:
-            pass
+        msg = f"Task {task_id} APPROVED & COMPLETED." if decision == "APPROVE" else f"Task {task_id} REJECTED -> returned to IN_PROGRESS for rework."
+        results[task_id] = {
+            "status": "SUCCESS",  # SAFETY-ALLOW: status-write
+            "decision": decision,
+            "task_id": task_id,
+            "new_status": new_status,  # SAFETY-ALLOW: status-write
+            "message": msg,
+            "ledger": f"Recorded ({actor})"
+        }
 
-    # Write the immutable ledger entry with explicit actor
-    append_ledger_entry(task_id, decision, notes, actor, packet_meta)
+    return [results[task_id] for task_id in task_ids]
 
-    # 5. v10.12.2: Auto-Cleanup - Remove review packet
-    packet_path = os.path.join(STATE_DIR, "reviews", f"T-{task_id}.json")
-    if os.path.exists(packet_path):
+
+def _pending_review_risk(source_ids: list) -> tuple:
+    """v10.12.3: (risk_score, risk_tier) from source ID prefixes."""
+    risk_score = 1  # Default: STD
+    risk_tier = "STD"
+    for src in source_ids:
+        src_upper = src.upper()
+        if any(x in src_upper for x in ["HIPAA", "LAW", "GDPR", "DR-"]):
+            risk_score = 3
+            risk_tier = "MANDATORY"
+            break
+        elif "PRO" in src_upper and risk_score < 2:
+            risk_score = 2
+            risk_tier = "STRONG"
+    return risk_score, risk_tier
+
+
+def _review_packet_page(packets_dir: str, tool: str, cursor: str, limit: int, risk_fn) -> dict:
+    """
+    v36: Risk-ordered keyset page over review packets.
+
+    Pass 1 parses every packet for its sort key (-risk, generated_at, task_id),
+    i.e. MANDATORY first, then oldest first. Only the page's packets go on to
+    the per-packet DB/evidence work in the caller. Raises ValueError on a bad
+    cursor.
+    """
+    after = _decode_cursor(tool, cursor)
+    items = []
+    for filename in os.listdir(packets_dir):
+        if not filename.endswith(".json"):
+            continue
+        packet_path = os.path.join(packets_dir, filename)
         try:
-            os.remove(packet_path)
-            server_logger.info(f"v10.12.2: Cleaned up review packet for task {task_id}")
+            with open(packet_path, "r", encoding="utf-8") as f:
+                packet = json.load(f)
+            risk_score, risk_tier = risk_fn(packet["claims"]["source_ids"])
+            key = (-risk_score, packet["meta"]["generated_at"], packet["meta"]["task_id"])
         except Exception as e:
-            server_logger.warning(f"v10.12.2: Failed to cleanup packet: {e}")
-
-    return json.dumps({
-        "status": "SUCCESS",  # SAFETY-ALLOW: status-write
-        "decision": decision,
-        "task_id": task_id,
-        "new_status": new_status,  # SAFETY-ALLOW: status-write
-        "message": msg,
-        "ledger": f"Recorded ({actor})"
-    })
+            server_logger.warning(f"v10.12: Failed to read packet {filename}: {e}")
+            continue
+        items.append((key, packet_path, packet, risk_score, risk_tier))
+
+    items.sort(key=lambda item: item[0])
+    total = len(items)
+    mandatory = sum(1 for item in items if item[4] == "MANDATORY")
+    if after:
+        after_key = (-after[0], after[1], after[2])
+        items = [item for item in items if item[0] > after_key]
+    page, next_cursor = _keyset_page(
+        items, limit, tool, lambda item: [-item[0][0], item[0][1], item[0][2]]
+    )
+    return {"page": page, "next_cursor": next_cursor, "total": total, "mandatory_count": mandatory}
 
 
 @mcp.tool()
-def list_pending_reviews() -> str:
+def list_pending_reviews(limit: int = 50, cursor: str = "") -> str:
     """
     v10.12.3: Lists all tasks awaiting review with stale detection and risk sorting.
 
+    Args:
+        limit: v36: Page size (default 50)
+        cursor: v36: next_cursor of the previous page ("" = first page)
+
     Returns:
-        JSON list of pending reviews sorted by risk (MANDATORY first)
+        JSON list of pending reviews sorted by risk (MANDATORY first).
+        v36: stale_count covers the returned page; mandatory_count all packets.
     """
     packets_dir = get_state_path("reviews")
+    limit = max(1, min(limit, 500))
 
     if not os.path.exists(packets_dir):
         return json.dumps({"status": "EMPTY", "reviews": [], "count": 0})  # SAFETY-ALLOW: status-write
 
+    try:
+        selection = _review_packet_page(packets_dir, "pending_reviews", cursor, limit, _pending_review_risk)
+    except ValueError as e:
+        return _cursor_error(e)
+
     reviews = []
     now = datetime.now()
 
-    for filename in os.listdir(packets_dir):
-        if not filename.endswith(".json"):
-            continue
-
-        packet_path = os.path.join(packets_dir, filename)
+    for _key, packet_path, packet, risk_score, risk_tier in selection["page"]:
         try:
-            with open(packet_path, "r", encoding="utf-8") as f:
-                packet = json.load(f)
-
             # Calculate age
             generated_at = datetime.fromisoformat(packet["meta"]["generated_at"])
             age_hours = (now - generated_at).total_seconds() / 3600
@@ -12170,19 +14702,7 @@ def list_pending_reviews() -> str:
                     current_hash = hash_dict(current_snapshot)
                     is_stale = current_hash != packet["meta"]["snapshot_hash"]
 
-            # v10.12.3: Calculate risk score from sources
             source_ids = packet["claims"]["source_ids"]
-            risk_score = 1  # Default: STD
-            risk_tier = "STD"
-            for src in source_ids:
-                src_upper = src.upper()
-                if any(x in src_upper for x in ["HIPAA", "LAW", "GDPR", "DR-"]):
-                    risk_score = 3
-                    risk_tier = "MANDATORY"
-                    break
-                elif "PRO" in src_upper and risk_score < 2:
-                    risk_score = 2
-                    risk_tier = "STRONG"
 
             # v10.12.3: Generate badges
             badges = []
@@ -12219,18 +14739,15 @@ def list_pending_reviews() -> str:
             })
 
         except Exception as e:
-            server_logger.warning(f"v10.12: Failed to read packet {filename}: {e}")
-
-    # v10.12.3: Sort by risk (MANDATORY first), then by age
-    reviews.sort(key=lambda x: (-x["risk_score"], -x["age_hours"]))
-
-    return json.dumps({
-        "status": "OK" if reviews else "EMPTY",  # SAFETY-ALLOW: status-write
-        "reviews": reviews,
-        "count": len(reviews),
-        "stale_count": sum(1 for r in reviews if r["is_stale"]),
-        "mandatory_count": sum(1 for r in reviews if r["risk_tier"] == "MANDATORY")
-    }, indent=2)
+            server_logger.warning(f"v10.12: Failed to read packet {os.path.basename(packet_path)}: {e}")
+
+    # v10.12.3: Sorted by risk (MANDATORY first), then by age (v36: in pass 1)
+    return _paged_response(
+        "reviews", reviews, limit, selection["next_cursor"], selection["total"],
+        status="OK" if reviews else "EMPTY",  # SAFETY-ALLOW: status-write
+        stale_count=sum(1 for r in reviews if r["is_stale"]),
+        mandatory_count=selection["mandatory_count"],
+    )
 
 
 # =============================================================================
@@ -12277,8 +14794,8 @@ def get_source_authority(source_id: str) -> str:
         return "DEFAULT"
 
     try:
-        with open(registry_path, "r", encoding="utf-8") as f:
-            registry = json.load(f)
+        # v49: mtime-cached parse (ledger batches resolve many sources)
+        registry = _load_source_registry()
 
         # Check sources by ID pattern matching
         for source_key, source_info in registry.get("sources", {}).items():
@@ -12359,8 +14876,21 @@ def is_packet_stale(task_id: int) -> tuple[bool, str]:
         return True, f"Check failed: {e}"
 
 
+def _authority_review_risk(source_ids: list) -> tuple:
+    """v10.12.3: (risk, authority) of the highest-authority registry source."""
+    max_authority = "DEFAULT"
+    max_risk = 1
+    for src_id in source_ids:
+        authority = get_source_authority(src_id)
+        risk = authority_to_risk(authority)
+        if risk > max_risk:
+            max_risk = risk
+            max_authority = authority
+    return max_risk, max_authority
+
+
 @mcp.tool()
-def get_review_queue(auto_heal: bool = True) -> str:
+def get_review_queue(auto_heal: bool = True, limit: int = 50, cursor: str = "") -> str:
     """
     v10.12.3: Smart Review Queue with Registry-Backed Authority and Self-Healing.
 
@@ -12372,11 +14902,16 @@ def get_review_queue(auto_heal: bool = True) -> str:
 
     Args:
         auto_heal: If True, regenerate stale packets automatically
+        limit: v36: Page size (default 50)
+        cursor: v36: next_cursor of the previous page ("" = first page)
 
     Returns:
-        JSON with sorted review queue
+        JSON with sorted review queue. v36: staleness checks and healing run
+        for the returned page only; a packet healed on one page may show up
+        once more later (its generated_at moved).
     """
     packets_dir = get_state_path("reviews")
+    limit = max(1, min(limit, 500))
 
     if not os.path.exists(packets_dir):
         return json.dumps({
@@ -12386,28 +14921,44 @@ def get_review_queue(auto_heal: bool = True) -> str:
             "healed_count": 0
         })
 
+    try:
+        selection = _review_packet_page(packets_dir, "review_queue", cursor, limit, _authority_review_risk)
+    except ValueError as e:
+        return _cursor_error(e)
+
     reviews = []
     healed_count = 0
     now = datetime.now()
 
-    for filename in os.listdir(packets_dir):
-        if not filename.endswith(".json"):
-            continue
-
-        packet_path = os.path.join(packets_dir, filename)
+    # v10.12.3: Check staleness with helper
+    staleness = {}
+    for _key, packet_path, packet, _risk, _authority in selection["page"]:
         try:
-            with open(packet_path, "r", encoding="utf-8") as f:
-                packet = json.load(f)
-
             task_id = packet["meta"]["task_id"]
+            staleness[task_id] = is_packet_stale(task_id)
+        except Exception:
+            continue  # Reported by the loop below
+
+    # v10.12.3: Self-healing - regenerate stale packets
+    # v48: in one batch (shared inputs loaded once, packets built in parallel)
+    healed = {}
+    if auto_heal:
+        stale_ids = [task_id for task_id, (stale, _) in staleness.items() if stale]
+        if stale_ids:
+            server_logger.info(f"v10.12.3: Self-healing {len(stale_ids)} stale packet(s)")
+            try:
+                healed = create_review_packets(stale_ids)
+            except Exception as e:
+                server_logger.warning(f"v48: Batch packet healing failed: {e}")
 
-            # v10.12.3: Check staleness with helper
-            stale, stale_reason = is_packet_stale(task_id)
+    for _key, packet_path, packet, max_risk, max_authority in selection["page"]:
+        filename = os.path.basename(packet_path)
+        try:
+            task_id = packet["meta"]["task_id"]
+            stale, stale_reason = staleness[task_id]
 
-            # v10.12.3: Self-healing - regenerate stale packets
             if stale and auto_heal:
-                server_logger.info(f"v10.12.3: Self-healing stale packet for task {task_id}")
-                heal_result = create_review_packet(task_id)
+                heal_result = healed.get(task_id, {})
                 if heal_result.get("status") == "SUCCESS":
                     healed_count += 1
                     # Reload the freshly generated packet
@@ -12415,22 +14966,14 @@ def get_review_queue(auto_heal: bool = True) -> str:
                         packet = json.load(f)
                     stale = False
                     stale_reason = "Packet was regenerated"
+                    max_risk, max_authority = _authority_review_risk(packet["claims"]["source_ids"])
 
             # Calculate age
             generated_at = datetime.fromisoformat(packet["meta"]["generated_at"])
             age_hours = (now - generated_at).total_seconds() / 3600
 
-            # v10.12.3: Registry-backed authority lookup
+            # v10.12.3: Registry-backed authority lookup (v36: done in pass 1)
             source_ids = packet["claims"]["source_ids"]
-            max_authority = "DEFAULT"
-            max_risk = 1
-
-            for src_id in source_ids:
-                authority = get_source_authority(src_id)
-                risk = authority_to_risk(authority)
-                if risk > max_risk:
-                    max_risk = risk
-                    max_authority = authority
 
             # v10.12.3: Generate badges
             badges = []
@@ -12476,17 +15019,14 @@ def get_review_queue(auto_heal: bool = True) -> str:
         except Exception as e:
             server_logger.warning(f"v10.12.3: Failed to process packet {filename}: {e}")
 
-    # v10.12.3: Sort by risk (MANDATORY first), then by age (oldest first)
-    reviews.sort(key=lambda x: (-x["risk_score"], -x["age_hours"]))
-
-    return json.dumps({
-        "status": "OK" if reviews else "EMPTY",  # SAFETY-ALLOW: status-write
-        "reviews": reviews,
-        "count": len(reviews),
-        "stale_count": sum(1 for r in reviews if r["is_stale"]),
-        "mandatory_count": sum(1 for r in reviews if r["risk_tier"] == "MANDATORY"),
-        "healed_count": healed_count
-    }, indent=2)
+    # v10.12.3: Sorted by risk (MANDATORY first), then by age (v36: in pass 1)
+    return _paged_response(
+        "reviews", reviews, limit, selection["next_cursor"], selection["total"],
+        status="OK" if reviews else "EMPTY",  # SAFETY-ALLOW: status-write
+        stale_count=sum(1 for r in reviews if r["is_stale"]),
+        mandatory_count=selection["mandatory_count"],
+        healed_count=healed_count,
+    )
 
 
 @mcp.tool()
@@ -12658,6 +15198,46 @@ def auto_approve_safe_std(limit: int = 10, dry_run: bool = False) -> str:
     # Get list of files first (avoid modifying dir while iterating)
     packet_files = [f for f in os.listdir(packets_dir) if f.endswith(".json")]
 
+    # v49: Safe candidates go to the Gavel in batches, each sized to what is
+    # left of the limit (a blocked task frees its slot for the next batch)
+    candidates = []
+
+    def flush():
+        # ============================================================
+        # THE CONSTITUTIONAL ACT: Call the Official Gavel
+        # This ensures:
+        #   1. Same validation as manual approval
+        #   2. Same state transitions
+        #   3. Same packet cleanup
+        #   4. Same audit trail
+        #   5. Future rule changes (e.g., "no Sunday deploys") auto-apply
+        # v49: One transaction + one ledger fsync for the whole batch
+        # ============================================================
+        results = _gavel(
+            [task_id for task_id, _ in candidates],
+            decision="APPROVE",
+            notes="AUTO-APPROVED: Safe DEFAULT/Plumbing Task (v10.14)",
+            actor="AUTO"  # v10.16.1: Explicit Actor Channel
+        )
+
+        # Parse the Gavel's response
+        for (task_id, desc), result in zip(candidates, results):
+            if result.get("status") == "SUCCESS":
+                approved_list.append({
+                    "task_id": task_id,
+                    "description": desc,
+                    "action": "APPROVED"
+                })
+                server_logger.info(f"v10.14: Auto-approved task {task_id} via Gavel: {desc}")
+            else:
+                # Gavel rejected - could be drift, state change, etc.
+                skipped_list.append({
+                    "task_id": task_id,
+                    "reason": f"Gavel rejected: {result.get('message', result.get('reason', 'Unknown'))}"
+                })
+                server_logger.warning(f"v10.14: Gavel rejected task {task_id}: {result}")
+        candidates.clear()
+
     for filename in packet_files:
         # Safety limit on processing
         if processed_count >= 100:
@@ -12692,49 +15272,17 @@ def auto_approve_safe_std(limit: int = 10, dry_run: bool = False) -> str:
                 "action": "WOULD_APPROVE"
             })
         else:
-            # ============================================================
-            # THE CONSTITUTIONAL ACT: Call the Official Gavel
-            # This ensures:
-            #   1. Same validation as manual approval
-            #   2. Same state transitions
-            #   3. Same packet cleanup
-            #   4. Same audit trail
-            #   5. Future rule changes (e.g., "no Sunday deploys") auto-apply
-            # ============================================================
-            gavel_result = submit_review_decision(
-                task_id=task_id,
-                decision="APPROVE",
-                notes="AUTO-APPROVED: Safe DEFAULT/Plumbing Task (v10.14)",
-                actor="AUTO"  # v10.16.1: Explicit Actor Channel
-            )
-
-            # Parse the Gavel's response
-            try:
-                result = json.loads(gavel_result)
-                if result.get("status") == "SUCCESS":
-                    approved_list.append({
-                        "task_id": task_id,
-                        "description": desc,
-                        "action": "APPROVED"
-                    })
-                    server_logger.info(f"v10.14: Auto-approved task {task_id} via Gavel: {desc}")
-                else:
-                    # Gavel rejected - could be drift, state change, etc.
-                    skipped_list.append({
-                        "task_id": task_id,
-                        "reason": f"Gavel rejected: {result.get('message', result.get('reason', 'Unknown'))}"
-                    })
-                    server_logger.warning(f"v10.14: Gavel rejected task {task_id}: {result}")
-            except json.JSONDecodeError:
-                skipped_list.append({
-                    "task_id": task_id,
-                    "reason": f"Gavel returned invalid response"
-                })
+            candidates.append((task_id, desc))
+            if len(approved_list) + len(candidates) >= limit:
+                flush()
 
         # Stop if we've hit the limit
         if len(approved_list) >= limit:
             break
 
+    if candidates:
+        flush()
+
     # Build result
     if dry_run:
         status_msg = "DRY_RUN"
@@ -12920,8 +15468,9 @@ def approve_review_case(root: str, notes: str = "") -> str:
     """
     v10.15: The Mass Gavel - Approves ALL tasks in a specific Case Root.
 
-    Strictly calls submit_review_decision for EACH task individually,
+    Strictly runs EACH task through the Gavel's per-task checks,
     ensuring every single task goes through the Gatekeeper re-check.
+    v49: As one Gavel batch (one transaction, one ledger fsync).
 
     Args:
         root: The authority root to approve (e.g., "HIPAA", "PRO-SEC")
@@ -12941,6 +15490,7 @@ def approve_review_case(root: str, notes: str = "") -> str:
     approved = []
     blocked = []
     root_upper = root.upper()
+    case_tasks = []
 
     # Get list of files first (avoid modifying dir while iterating)
     packet_files = [f for f in os.listdir(packets_dir) if f.endswith(".json")]
@@ -12966,39 +15516,34 @@ def approve_review_case(root: str, notes: str = "") -> str:
         # Does this task belong to the requested Root?
         if root_upper not in [r.upper() for r in task_roots]:
             continue
-
-        # ============================================================
-        # THE CONSTITUTIONAL ACT: Call the Official Gavel
-        # Each task still gets individually validated by Gatekeeper
-        # ============================================================
-        gavel_result = submit_review_decision(
-            task_id=task_id,
-            decision="APPROVE",
-            notes=f"BATCH APPROVE [{root}]: {notes}" if notes else f"BATCH APPROVE [{root}]",
-            actor="BATCH"  # v10.16.1: Explicit Actor Channel
-        )
-
-        try:
-            result = json.loads(gavel_result)
-            if result.get("status") == "SUCCESS":
-                approved.append({
-                    "task_id": task_id,
-                    "description": desc
-                })
-                server_logger.info(f"v10.15: Batch approved task {task_id} in case [{root}]")
-            else:
-                blocked.append({
-                    "task_id": task_id,
-                    "description": desc,
-                    "reason": result.get("message", result.get("reason", "Unknown"))
-                })
-                server_logger.warning(f"v10.15: Gavel blocked task {task_id} in case [{root}]: {result}")
-        except json.JSONDecodeError:
+        case_tasks.append((task_id, desc))
+
+    # ============================================================
+    # THE CONSTITUTIONAL ACT: Call the Official Gavel
+    # Each task still gets individually validated by Gatekeeper
+    # v49: ...in one batch (one transaction, one ledger fsync)
+    # ============================================================
+    results = _gavel(
+        [task_id for task_id, _ in case_tasks],
+        decision="APPROVE",
+        notes=f"BATCH APPROVE [{root}]: {notes}" if notes else f"BATCH APPROVE [{root}]",
+        actor="BATCH"  # v10.16.1: Explicit Actor Channel
+    ) if case_tasks else []
+
+    for (task_id, desc), result in zip(case_tasks, results):
+        if result.get("status") == "SUCCESS":
+            approved.append({
+                "task_id": task_id,
+                "description": desc
+            })
+            server_logger.info(f"v10.15: Batch approved task {task_id} in case [{root}]")
+        else:
             blocked.append({
                 "task_id": task_id,
                 "description": desc,
-                "reason": "Invalid Gavel response"
+                "reason": result.get("message", result.get("reason", "Unknown"))
             })
+            server_logger.warning(f"v10.15: Gavel blocked task {task_id} in case [{root}]: {result}")
 
     if not approved and not blocked:
         return json.dumps({
@@ -13022,19 +15567,75 @@ def approve_review_case(root: str, notes: str = "") -> str:
 # =============================================================================
 
 
+LEDGER_READ_BLOCK = 64 * 1024
+
+
+def _iter_jsonl_reverse(path: str, end: int = None):
+    """
+    v36: Yield (line_offset, line_bytes) from a JSONL file, newest line first,
+    reading fixed-size blocks backwards from byte offset `end` (default EOF).
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell() if end is None else min(end, f.tell())
+        tail = b""
+        while pos > 0:
+            step = min(LEDGER_READ_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + tail
+            lines = chunk.split(b"\n")
+            tail = lines[0]  # May continue in the previous block
+            # Emit this block's complete lines newest first
+            offsets = []
+            offset = pos + len(tail) + 1
+            for line in lines[1:]:
+                offsets.append((offset, line))
+                offset += len(line) + 1
+            for line_offset, line in reversed(offsets):
+                if line.strip():
+                    yield line_offset, line
+        if tail.strip():
+            yield 0, tail
+
+
+def _ledger_entry_matches(e: dict, filter_lower: str) -> bool:
+    """get_ledger_entries filter: task_id, actor, source_ids or decision."""
+    # Match task_id
+    if filter_lower in str(e.get("task_id", "")).lower():
+        return True
+    # Match actor
+    if filter_lower in e.get("actor", "").lower():
+        return True
+    # Match source_ids
+    sources = e.get("claims", {}).get("source_ids", [])
+    if any(filter_lower in s.lower() for s in sources):
+        return True
+    # Match decision
+    return filter_lower in e.get("decision", "").lower()
+
+
 @mcp.tool()
-def get_ledger_entries(limit: int = 20, filter_text: str = "") -> str:
+def get_ledger_entries(limit: int = 20, filter_text: str = "", cursor: str = "") -> str:
     """
     v10.16: View the Release Ledger - Forensic Audit Trail.
 
     Args:
         limit: Maximum entries to return (default 20)
         filter_text: Optional filter (matches task_id, source_ids, actor)
+        cursor: v36: next_cursor of the previous page ("" = most recent)
 
     Returns:
-        JSON list of ledger entries (most recent first)
+        JSON list of ledger entries (most recent first). v36: the ledger is
+        read backwards from the cursor's byte offset, so a page only parses
+        the lines it needs; the summary covers the returned page.
     """
     ledger_path = get_state_path("release_ledger.jsonl")
+    limit = max(1, min(limit, 500))
+    try:
+        before = _decode_cursor("ledger", cursor)
+    except ValueError as e:
+        return _cursor_error(e)
 
     if not os.path.exists(ledger_path):
         return json.dumps({
@@ -13043,51 +15644,42 @@ def get_ledger_entries(limit: int = 20, filter_text: str = "") -> str:
             "entries": []
         })
 
-    # Read all entries
+    filter_lower = filter_text.lower()
     entries = []
+    offsets = []
+    scanned = scanned_bytes = 0
     try:
-        with open(ledger_path, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        entries.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
+        for line_offset, line in _iter_jsonl_reverse(ledger_path, before[0] if before else None):
+            scanned += 1
+            scanned_bytes += len(line) + 1
+            try:
+                e = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            # Apply filter
+            if filter_lower and not _ledger_entry_matches(e, filter_lower):
+                continue
+            entries.append(e)
+            offsets.append(line_offset)
+            if len(entries) > limit:
+                break
+        file_size = os.path.getsize(ledger_path)
     except Exception as e:
         return json.dumps({
             "status": "ERROR",  # SAFETY-ALLOW: status-write
             "message": f"Failed to read ledger: {e}"
         })
 
-    # Reverse to get most recent first
-    entries.reverse()
-
-    # Apply filter
-    if filter_text:
-        filter_lower = filter_text.lower()
-        filtered = []
-        for e in entries:
-            # Match task_id
-            if filter_lower in str(e.get("task_id", "")).lower():
-                filtered.append(e)
-                continue
-            # Match actor
-            if filter_lower in e.get("actor", "").lower():
-                filtered.append(e)
-                continue
-            # Match source_ids
-            sources = e.get("claims", {}).get("source_ids", [])
-            if any(filter_lower in s.lower() for s in sources):
-                filtered.append(e)
-                continue
-            # Match decision
-            if filter_lower in e.get("decision", "").lower():
-                filtered.append(e)
-                continue
-        entries = filtered
-
     # Apply limit
-    entries = entries[:limit]
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = _encode_cursor("ledger", [offsets[limit - 1]])
+
+    # Estimate total matches from the scanned sample (avg line size, match rate)
+    total_estimate = len(entries)
+    if scanned:
+        total_estimate = int(file_size / (scanned_bytes / scanned) * len(offsets) / scanned)
 
     # Summary statistics
     approvals = sum(1 for e in entries if e.get("decision") == "APPROVE")
@@ -13096,11 +15688,10 @@ def get_ledger_entries(limit: int = 20, filter_text: str = "") -> str:
     batch_count = sum(1 for e in entries if e.get("actor") == "BATCH")
     human_count = sum(1 for e in entries if e.get("actor") == "HUMAN")
 
-    return json.dumps({
-        "status": "OK",  # SAFETY-ALLOW: status-write
-        "count": len(entries),
-        "filter": filter_text or "(none)",
-        "summary": {
+    return _paged_response(
+        "entries", entries, limit, next_cursor, total_estimate,
+        filter=filter_text or "(none)",
+        summary={
             "approvals": approvals,
             "rejections": rejections,
             "by_actor": {
@@ -13109,8 +15700,7 @@ def get_ledger_entries(limit: int = 20, filter_text: str = "") -> str:
                 "BATCH": batch_count
             }
         },
-        "entries": entries
-    }, indent=2)
+    )
 
 
 @mcp.tool()
@@ -13125,7 +15715,7 @@ def reopen_task(task_id: int, reason: str = "") -> str:
         if reason:
             new_desc += f"\n\nREASON: {reason}"
 
-        conn.execute(
+        _execute_transition(conn, "reopen",
             "UPDATE tasks SET status='pending', worker_id=NULL, desc=?, updated_at=? WHERE id=?",  # SAFETY-ALLOW: status-write
             (new_desc, int(time.time()), task_id)
         )
@@ -13335,16 +15925,14 @@ def get_project_status() -> str:
             pass
     
     with get_db() as conn:
-        stats = conn.execute("""
-            SELECT status, COUNT(*) as c FROM tasks GROUP BY status
-        """).fetchall()
-        
+        # v34: Read the trigger-maintained counters instead of scanning tasks
+        status_counts = _status_counts(conn)
+
         decisions = conn.execute("""
             SELECT priority, COUNT(*) as c FROM decisions 
             WHERE status='pending' GROUP BY priority
         """).fetchall()
     
-    status_counts = {s[0]: s[1] for s in stats}
     decision_counts = {d[0]: d[1] for d in decisions}
 
     # v10.5: Add dependency system status
@@ -13521,19 +16109,32 @@ def reset_task_auditor(task_id: int) -> str:
     return f"Task {task_id} auditor state reset. Ready for retry."
 
 @mcp.tool()
-def get_audit_log(limit: int = 10) -> str:
-    """Get recent audit log entries."""
+def get_audit_log(limit: int = 10, cursor: str = "") -> str:
+    """Get recent audit log entries (v36: newest first, paged by next_cursor)."""
+    limit = max(1, min(limit, 200))
+    try:
+        before = _decode_cursor("audit_log", cursor)
+    except ValueError as e:
+        return _cursor_error(e)
+    keyset, params = "", []
+    if before:
+        keyset = "WHERE a.created_at < ? OR (a.created_at = ? AND a.id < ?)"
+        params = [before[0], before[0], before[1]]
     with get_db() as conn:
-        logs = conn.execute("""
+        logs = conn.execute(f"""
             SELECT a.id, a.task_id, t.desc, a.action, a.strictness, a.reason, a.retry_count, a.created_at
             FROM audit_log a
             LEFT JOIN tasks t ON a.task_id = t.id
-            ORDER BY a.created_at DESC
+            {keyset}
+            ORDER BY a.created_at DESC, a.id DESC
             LIMIT ?
-        """, (limit,)).fetchall()
+        """, (*params, limit + 1)).fetchall()
+        # Append-only table: rowid span is a cheap, close estimate
+        span = conn.execute("SELECT MAX(id) - MIN(id) + 1 FROM audit_log").fetchone()[0] or 0
     
+    page, next_cursor = _keyset_page(list(logs), limit, "audit_log", lambda l: [l[7], l[0]])
     result = []
-    for l in logs:
+    for l in page:
         result.append({
             "id": l[0],
             "task_id": l[1],
@@ -13545,7 +16146,7 @@ def get_audit_log(limit: int = 10) -> str:
             "at": l[7]
         })
     
-    return json.dumps(result)
+    return _paged_response("entries", result, limit, next_cursor, span)
 
 # --- PATCH 2: CONTEXT FLUSH (Force Auditor Re-read) ---
 
@@ -13730,12 +16331,8 @@ def get_port_status(ports: str = "3000,3001,5000,8000,8080") -> str:
 
 # --- SEMANTIC ROUTER ---
 
-# Import router
-try:
-    from router import SemanticRouter, IntentExecutor, create_router, route_and_execute
-    ROUTER_AVAILABLE = True
-except ImportError:
-    ROUTER_AVAILABLE = False
+# v30: Router is imported on first use (regex tables compile at import)
+ROUTER_AVAILABLE = importlib.util.find_spec("router") is not None
 
 # Create global router instance
 _router = None
@@ -13744,6 +16341,7 @@ _executor = None
 def get_router():
     global _router, _executor
     if _router is None and ROUTER_AVAILABLE:
+        from router import create_router
         _router, _executor = create_router(DB_PATH)
     return _router, _executor
 
@@ -13796,7 +16394,10 @@ def get_jit_context() -> Dict:
         if notes:
             context["notes"].append(notes[0])
     
-    # 5. Session context (from router)
+    # 5. Session context (from router; in-memory copy is newest under write-behind)
+    if _router is not None:
+        context["session"] = _router.get_all_context()
+        return context
     try:
         with get_db() as conn:
             session = conn.execute(
@@ -13884,7 +16485,13 @@ def execute_routed_intent(user_input: str) -> str:
     if not ROUTER_AVAILABLE:
         return json.dumps({"error": "Router not available"})
     
-    result = route_and_execute(DB_PATH, user_input)
+    router, executor = get_router()
+    if not router:
+        return json.dumps({"error": "Router initialization failed"})
+    
+    route = router.route(user_input)
+    result = executor.execute(route)
+    result["route"] = route.to_dict()
     return json.dumps(result)
 
 @mcp.tool()
@@ -13905,16 +16512,27 @@ def update_task_context(task_id: int, context_type: str = "shown") -> str:
     return json.dumps({"success": True, "task_id": task_id, "type": context_type})
 
 @mcp.tool()
-def get_route_history(limit: int = 10) -> str:
-    """Get recent routing decisions for debugging."""
+def get_route_history(limit: int = 10, cursor: str = "") -> str:
+    """Get recent routing decisions for debugging (v36: paged by next_cursor)."""
+    limit = max(1, min(limit, 200))
+    try:
+        before = _decode_cursor("route_history", cursor)
+    except ValueError as e:
+        return _cursor_error(e)
+    keyset, params = "", []
+    if before:
+        keyset = "WHERE created_at < ? OR (created_at = ? AND id < ?)"
+        params = [before[0], before[0], before[1]]
     with get_db() as conn:
-        rows = conn.execute("""
-            SELECT input, intent, action, parameters, confidence, source, created_at
-            FROM route_log ORDER BY created_at DESC LIMIT ?
-        """, (limit,)).fetchall()
+        rows = conn.execute(f"""
+            SELECT input, intent, action, parameters, confidence, source, created_at, id
+            FROM route_log {keyset} ORDER BY created_at DESC, id DESC LIMIT ?
+        """, (*params, limit + 1)).fetchall()
+        span = conn.execute("SELECT MAX(id) - MIN(id) + 1 FROM route_log").fetchone()[0] or 0
     
+    page, next_cursor = _keyset_page(list(rows), limit, "route_history", lambda r: [r[6], r[7]])
     result = []
-    for r in rows:
+    for r in page:
         result.append({
             "input": r[0],
             "intent": r[1],
@@ -13925,7 +16543,7 @@ def get_route_history(limit: int = 10) -> str:
             "at": r[6]
         })
     
-    return json.dumps(result)
+    return _paged_response("entries", result, limit, next_cursor, span)
 
 @mcp.tool()
 def reorder_task_by_keyword(keyword: str, position: str = "top") -> str:
@@ -14548,6 +17166,7 @@ try:
         CLARIFICATION_SAFE_TOOLS,
         get_next_question_id,
         append_to_clarification_queue,
+        enqueue_question,
         get_open_questions as _get_open_questions,
         count_open_questions,
         mark_question_closed,
@@ -15044,8 +17663,9 @@ def ask_question(question: str, context: str = "", round_num: int = 1) -> str:
     if not CLARIFICATION_AVAILABLE:
         return "Error: Clarification system not available"
     
-    qid = get_next_question_id()
-    result = append_to_clarification_queue(qid, question, context, round_num)
+    # Allocate + store in one transaction (no ID race between agents)
+    qid = enqueue_question(question, context, round_num)
+    result = f"⛔ Question {qid} logged. Waiting for user input via /answer"
     
     # v9.8: Link question to active task in state machine
     if STATE_MACHINE_AVAILABLE:
@@ -186,5 +186,51 @@ CREATE TABLE IF NOT EXISTS task_history_archive (
 CREATE INDEX IF NOT EXISTS idx_backoff_ready 
 ON tasks(status, backoff_until);
 
+-- ============================================================
+-- 11. V3.4: Materialized Lane/Status Counts
+-- ============================================================
+-- Kept exact by triggers so status surfaces (vibe_chatops, dashboard.py)
+-- read O(lanes) rows instead of scanning tasks.
+-- Repair: DELETE FROM lane_status_counts; then re-run the backfill below.
+
+CREATE TABLE IF NOT EXISTS lane_status_counts (
+    lane TEXT NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (lane, status)
+);
+
+INSERT OR IGNORE INTO lane_status_counts (lane, status, count)
+SELECT IFNULL(lane, ''), IFNULL(status, ''), COUNT(*) FROM tasks
+GROUP BY IFNULL(lane, ''), IFNULL(status, '');
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_lane_status_insert
+AFTER INSERT ON tasks
+BEGIN
+    INSERT INTO lane_status_counts (lane, status, count)
+    VALUES (IFNULL(NEW.lane, ''), IFNULL(NEW.status, ''), 1)
+    ON CONFLICT (lane, status) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_lane_status_delete
+AFTER DELETE ON tasks
+BEGIN
+    UPDATE lane_status_counts SET count = count - 1
+    WHERE lane = IFNULL(OLD.lane, '') AND status = IFNULL(OLD.status, '');
+    DELETE FROM lane_status_counts WHERE count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_lane_status_update
+AFTER UPDATE OF lane, status ON tasks
+WHEN OLD.lane IS NOT NEW.lane OR OLD.status IS NOT NEW.status
+BEGIN
+    UPDATE lane_status_counts SET count = count - 1
+    WHERE lane = IFNULL(OLD.lane, '') AND status = IFNULL(OLD.status, '');
+    INSERT INTO lane_status_counts (lane, status, count)
+    VALUES (IFNULL(NEW.lane, ''), IFNULL(NEW.status, ''), 1)
+    ON CONFLICT (lane, status) DO UPDATE SET count = count + 1;
+    DELETE FROM lane_status_counts WHERE count <= 0;
+END;
+
 -- Update schema version
 INSERT OR REPLACE INTO schema_version (version) VALUES ('v25_3.3');
@@ -18,11 +18,14 @@ Code is only APPROVED when:
 """
 
 import os
+import ast
 import json
 import asyncio
 import subprocess
 import shutil
 import shlex
+import fnmatch
+import importlib.util
 from typing import Dict, List, Optional
 from datetime import datetime
 
@@ -139,21 +142,276 @@ def detect_project_type() -> str:
     
     return "general"
 
-def run_preflight_tests(project_profile: str = None) -> Dict:
+def _run_cmd(cmd, *, timeout_s: int):
+    """
+    SECURITY: No shell=True. If a command needs shell operators, it must be
+    modeled explicitly (argv list) instead of a single string.
+    Returns subprocess.CompletedProcess.
+    """
+    if isinstance(cmd, (list, tuple)):
+        return subprocess.run(
+            list(cmd),
+            shell=False,
+            capture_output=True,
+            text=True,
+            timeout=timeout_s,
+            cwd=os.getcwd(),
+        )
+
+    cmd_str = str(cmd).strip()
+    # If the config contains shell operators, refuse rather than falling back to shell=True.
+    if any(op in cmd_str for op in ["|", "&", ";", ">", "<"]):
+        raise ValueError(
+            f"Refusing to run command containing shell operators: {cmd_str!r}. "
+            "Use an argv list in config (no shell=True)."
+        )
+
+    argv = shlex.split(cmd_str, posix=(os.name != "nt"))
+    return subprocess.run(argv, shell=False, capture_output=True, text=True, timeout=timeout_s, cwd=os.getcwd())
+
+
+# =============================================================================
+# INCREMENTAL PRE-FLIGHT (Impact-Aware Test Selection)
+# =============================================================================
+# Full format + lint + test on every QA submission costs minutes per task.
+# Incremental mode formats/lints only the changed files and runs only the
+# tests that (transitively) import a changed module. Every Nth run is still a
+# full run as a safety net (config: incremental.full_run_every).
+#
+# Selection fails closed: an empty or unknown change set, a deleted/renamed
+# file, or any non-.py change (config, fixtures, requirements) runs the full
+# suite, since the import graph cannot see what those affect.
+# =============================================================================
+
+# Files whose change can affect any test -> always force a full run
+GLOBAL_IMPACT_FILES = {
+    "conftest.py", "pytest.ini", "pyproject.toml", "setup.cfg", "setup.py",
+    "tox.ini", "requirements.txt", "requirements-dev.txt",
+}
+GRAPH_SKIP_DIRS = {".git", "__pycache__", "node_modules", ".venv", "venv", ".tox", ".mypy_cache", ".ruff_cache"}
+
+_incremental_runs_since_full = 0
+
+
+def get_changed_files(base_ref: str = "HEAD") -> Optional[List[str]]:
+    """
+    Lists files changed relative to base_ref (tracked diffs + untracked files).
+
+    Deleted files are kept and renames are reported as delete + add
+    (--no-renames), so select_affected_tests can see them and run full.
+
+    Returns:
+        Repo-relative paths, or None if git is unavailable (caller runs full).
+    """
+    if not shutil.which("git"):
+        return None
+    try:
+        diff = _run_cmd(["git", "diff", "--name-only", "--no-renames", base_ref], timeout_s=15)
+        untracked = _run_cmd(["git", "ls-files", "--others", "--exclude-standard"], timeout_s=15)
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    if diff.returncode != 0 or untracked.returncode != 0:
+        return None
+
+    changed = []
+    for line in (diff.stdout + "\n" + untracked.stdout).splitlines():
+        path = line.strip()
+        if path and path not in changed:
+            changed.append(path)
+    return changed
+
+
+def _is_test_file(rel_path: str) -> bool:
+    name = os.path.basename(rel_path)
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def _module_name_for(rel_path: str) -> str:
+    """src/pkg/mod.py -> src.pkg.mod ; pkg/__init__.py -> pkg"""
+    mod = rel_path[:-3].replace(os.sep, ".").replace("/", ".")
+    if mod.endswith(".__init__"):
+        mod = mod[: -len(".__init__")]
+    return mod
+
+
+def _imported_modules(rel_path: str, code: str) -> List[str]:
+    """
+    Dotted module names a file may load, resolved for the import graph.
+
+    - "import a.b"          -> a.b (callers also match the a package)
+    - "from a import b"     -> a.b and a (b may be a submodule or a name)
+    - "from . import b"     -> resolved against the importing package
+    A file that does not parse yields no edges (its own change still
+    selects it if it is a test).
+
+    Walks the AST itself rather than using compliance_tools.ast_extract_imports:
+    that helper drops relative imports (node.module is None / level is ignored)
+    and records only the module of "from X import Y", never X.Y, so test
+    files importing a submodule by name would lose their edge.
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return []
+
+    parts = _module_name_for(rel_path).split(".")
+    package = parts if os.path.basename(rel_path) == "__init__.py" else parts[:-1]
+
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                if node.level - 1 > len(package):
+                    continue  # Beyond the top-level package
+                base = package[: len(package) - (node.level - 1)]
+                module = ".".join(base + ([node.module] if node.module else []))
+            else:
+                module = node.module or ""
+            if module:
+                names.append(module)
+            names.extend(f"{module}.{alias.name}" if module else alias.name
+                         for alias in node.names if alias.name != "*")
+    return names
+
+
+def build_import_graph(root: str = ".") -> Dict[str, set]:
+    """
+    Builds a reverse import graph: module path -> set of files importing it.
+
+    Imports are resolved against every dotted suffix of the file's module
+    path, so both "import utils" (script-style) and "import pkg.utils"
+    resolve to pkg/utils.py. Importing a.b.c also counts as importing the
+    a and a.b packages (their __init__ runs first).
+    """
+    modules: Dict[str, str] = {}
+    sources: Dict[str, str] = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in GRAPH_SKIP_DIRS]
+        for fname in filenames:
+            if not fname.endswith(".py"):
+                continue
+            rel = os.path.relpath(os.path.join(dirpath, fname), root)
+            try:
+                with open(os.path.join(root, rel), "r", encoding="utf-8", errors="ignore") as f:
+                    sources[rel] = f.read()
+            except OSError:
+                continue
+            parts = _module_name_for(rel).split(".")
+            # Register every suffix: "src.pkg.mod", "pkg.mod", "mod" (first writer wins)
+            for i in range(len(parts)):
+                modules.setdefault(".".join(parts[i:]), rel)
+
+    importers: Dict[str, set] = {rel: set() for rel in sources}
+    for rel, code in sources.items():
+        for name in _imported_modules(rel, code):
+            dotted = name.split(".")
+            for i in range(1, len(dotted) + 1):
+                target = modules.get(".".join(dotted[:i]))
+                if target and target != rel:
+                    importers[target].add(rel)
+    return importers
+
+
+def select_affected_tests(changed_files: List[str], root: str = ".") -> Optional[List[str]]:
+    """
+    Maps changed files to the test files that transitively import them.
+
+    Returns:
+        Sorted list of test file paths, or None when the caller must run the
+        full suite: empty change set, a global-impact or non-.py file
+        changed, or a changed file no longer exists (deleted/renamed).
+    """
+    if not changed_files:
+        return None
+    py_changed = []
+    for path in changed_files:
+        if os.path.basename(path) in GLOBAL_IMPACT_FILES or not path.endswith(".py"):
+            return None
+        if not os.path.exists(os.path.join(root, path)):
+            return None
+        py_changed.append(os.path.normpath(path))
+
+    importers = build_import_graph(root)
+    affected = set()
+    seen = set()
+    queue = list(py_changed)
+    while queue:
+        current = queue.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        if _is_test_file(current):
+            affected.add(current)
+        queue.extend(importers.get(current, ()))
+    return sorted(affected)
+
+
+def _should_run_full(incremental_cfg: Dict) -> bool:
+    """Every Nth incremental pre-flight becomes a full run (safety net)."""
+    global _incremental_runs_since_full
+    full_every = int(incremental_cfg.get("full_run_every", 0) or 0)
+    if full_every and _incremental_runs_since_full + 1 >= full_every:
+        _incremental_runs_since_full = 0
+        return True
+    _incremental_runs_since_full += 1
+    return False
+
+
+def _with_xdist(argv: List[str], test_count: int, workers) -> List[str]:
+    """Appends pytest-xdist flags when configured, installed and worthwhile."""
+    if not workers or test_count < 2 or "pytest" not in " ".join(argv[:3]):
+        return argv
+    if importlib.util.find_spec("xdist") is None:
+        return argv
+    return argv + ["-n", str(workers)]
+
+
+def run_preflight_tests(project_profile: str = None, incremental: Optional[bool] = None,
+                        changed_files: Optional[List[str]] = None) -> Dict:
     """
     Runs local test suite based on project profile.
     
     v8.6: Now includes AUTO-FORMATTING before tests (Gap #2)
+    Incremental mode: formats/lints only changed files and runs only the
+    tests affected by them (import graph). Falls back to a full run when the
+    change set is unknown or empty, touches a global-impact or non-.py file,
+    deletes/renames a file, or every Nth run.
     
     Args:
         project_profile: The project profile (e.g., "python_backend")
+        incremental: Force incremental on/off (default: config incremental.enabled)
+        changed_files: Explicit change set (default: git diff against HEAD)
     
     Returns:
-        {"passed": bool, "message": str, "output": str}
+        {"passed": bool, "message": str, "output": str, "mode": "full"|"incremental"}
     """
     if not project_profile:
         project_profile = detect_project_type()
     
+    config = load_preflight_config()
+    incremental_cfg = config.get("incremental", {})
+    if incremental is None:
+        incremental = bool(incremental_cfg.get("enabled", False))
+    
+    # Resolve the change set; any uncertainty (unknown or empty) degrades to a full run
+    changed = None
+    if incremental and not _should_run_full(incremental_cfg):
+        if changed_files is None:
+            changed_files = get_changed_files(incremental_cfg.get("base_ref", "HEAD"))
+        changed = changed_files or None
+    # skip_patterns only scope the formatters; test selection sees every change
+    targets = None
+    if changed is not None:
+        skip_patterns = config.get("skip_patterns", [])
+        targets = [
+            f for f in changed
+            if os.path.exists(f)
+            and not any(fnmatch.fnmatch(f.replace(os.sep, "/"), pat) for pat in skip_patterns)
+        ]
+    mode = "full" if changed is None else "incremental"
+    
     # =========================================================================
     # v8.6 GAP #2: AUTO-FORMATTING (Runs BEFORE tests)
     # =========================================================================
@@ -162,55 +420,32 @@ def run_preflight_tests(project_profile: str = None) -> Dict:
     # =========================================================================
     print("🧹 Pre-Flight: Running Auto-Formatters...")
 
-    def _run_cmd(cmd, *, timeout_s: int):
-        """
-        SECURITY: No shell=True. If a command needs shell operators, it must be
-        modeled explicitly (argv list) instead of a single string.
-        Returns subprocess.CompletedProcess.
-        """
-        if isinstance(cmd, (list, tuple)):
-            return subprocess.run(
-                list(cmd),
-                shell=False,
-                capture_output=True,
-                text=True,
-                timeout=timeout_s,
-                cwd=os.getcwd(),
-            )
-
-        cmd_str = str(cmd).strip()
-        # If the config contains shell operators, refuse rather than falling back to shell=True.
-        if any(op in cmd_str for op in ["|", "&", ";", ">", "<"]):
-            raise ValueError(
-                f"Refusing to run command containing shell operators: {cmd_str!r}. "
-                "Use an argv list in config (no shell=True)."
-            )
-
-        argv = shlex.split(cmd_str, posix=(os.name != "nt"))
-        return subprocess.run(argv, shell=False, capture_output=True, text=True, timeout=timeout_s, cwd=os.getcwd())
-
     try:
         if "python" in project_profile:
             # Ruff: Fast Python formatter + linter
-            if shutil.which("ruff"):
-                _run_cmd(["ruff", "format", ".", "--quiet"], timeout_s=30)
-                _run_cmd(["ruff", "check", "--fix", "--quiet", "."], timeout_s=30)
-                print("   ✅ Python formatted (ruff)")
+            py_targets = ["."] if targets is None else [f for f in targets if f.endswith(".py")]
+            if not py_targets:
+                print("   ✅ No changed Python files to format")
+            elif shutil.which("ruff"):
+                _run_cmd(["ruff", "format", "--quiet", *py_targets], timeout_s=30)
+                _run_cmd(["ruff", "check", "--fix", "--quiet", *py_targets], timeout_s=30)
+                print(f"   ✅ Python formatted (ruff, {mode})")
             else:
                 print("   ⚠️ ruff not installed (pip install ruff)")
                 
         elif "typescript" in project_profile or "node" in project_profile:
             # Prettier: Standard TS/JS formatter
-            if os.path.exists("package.json"):
-                _run_cmd(["npx", "prettier", "--write", ".", "--log-level", "warn"], timeout_s=60)
-                print("   ✅ TypeScript formatted (prettier)")
+            fmt_targets = ["."] if targets is None else targets
+            if os.path.exists("package.json") and fmt_targets:
+                _run_cmd(["npx", "prettier", "--write", "--ignore-unknown", "--log-level", "warn", *fmt_targets],
+                         timeout_s=60)
+                print(f"   ✅ TypeScript formatted (prettier, {mode})")
     except subprocess.TimeoutExpired:
         print("   ⚠️ Formatter timed out (continuing)")
     except Exception as e:
         print(f"   ⚠️ Formatter warning: {e}")
     # =========================================================================
     
-    config = load_preflight_config()
     test_commands = config.get("test_commands", {})
     timeout = config.get("timeout_seconds", 120)
     
@@ -243,7 +478,21 @@ def run_preflight_tests(project_profile: str = None) -> Dict:
     if not cmd:
         return {"passed": True, "message": "No test suite detected (skipped)", "output": ""}
     
-    print(f"🧪 Pre-Flight: Running '{cmd}'...")
+    # Impact-aware selection (Python only; JS runners own their own selection)
+    if changed is not None and project_profile.startswith("python"):
+        affected = select_affected_tests(changed)
+        if affected is None:
+            mode = "full"
+        elif not affected:
+            print("   ✅ No tests affected by changed files (skipped)")
+            return {"passed": True, "message": "No affected tests (skipped)", "output": "", "mode": mode}
+        else:
+            argv = shlex.split(cmd, posix=(os.name != "nt")) if isinstance(cmd, str) else list(cmd)
+            cmd = _with_xdist(argv, len(affected), incremental_cfg.get("xdist_workers")) + affected
+    elif project_profile.startswith("typescript"):
+        mode = "full"
+    
+    print(f"🧪 Pre-Flight: Running '{cmd}' ({mode})...")
     
     try:
         result = _run_cmd(cmd, timeout_s=timeout)
@@ -253,7 +502,8 @@ def run_preflight_tests(project_profile: str = None) -> Dict:
             return {
                 "passed": True,
                 "message": "Tests Passed",
-                "output": result.stdout[:500] if result.stdout else ""
+                "output": result.stdout[:500] if result.stdout else "",
+                "mode": mode
             }
         else:
             error_output = result.stderr[:500] if result.stderr else result.stdout[:500]
@@ -262,7 +512,8 @@ def run_preflight_tests(project_profile: str = None) -> Dict:
                 "passed": False,
                 "message": "Tests Failed",
                 "error": error_output,
-                "exit_code": result.returncode
+                "exit_code": result.returncode,
+                "mode": mode
             }
             
     except subprocess.TimeoutExpired:
@@ -279,9 +530,9 @@ def run_preflight_tests(project_profile: str = None) -> Dict:
             "error": str(e)
         }
 
-async def run_preflight_tests_async(project_profile: str = None) -> Dict:
+async def run_preflight_tests_async(project_profile: str = None, incremental: Optional[bool] = None) -> Dict:
     """Async wrapper for run_preflight_tests."""
-    return run_preflight_tests(project_profile)
+    return run_preflight_tests(project_profile, incremental=incremental)
 
 # =============================================================================
 # QA AGENT DEFINITIONS (v8.0 - with Intent Check)
@@ -6,9 +6,12 @@
 import os
 import re
 import json
+import atexit
 import sqlite3
 import time
 import logging
+import threading
+from collections import deque
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
@@ -18,6 +21,13 @@ from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeou
 # Configurable timeout via environment variable (default 3.0s)
 SMART_PATH_TIMEOUT = float(os.getenv("ROUTER_TIMEOUT", "3.0"))
 
+# Write-behind persistence: session context + route_log are flushed in one
+# batched transaction every ROUTER_FLUSH_INTERVAL seconds (or when the log
+# buffer fills). The log buffer is bounded; oldest entries drop when full.
+ROUTER_FLUSH_INTERVAL = float(os.getenv("ROUTER_FLUSH_INTERVAL", "1.0"))
+ROUTER_LOG_QUEUE_MAX = int(os.getenv("ROUTER_LOG_QUEUE_MAX", "1000"))
+ROUTER_LOG_BATCH_SIZE = 100
+
 # Logging setup
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("SemanticRouter")
@@ -97,6 +107,58 @@ COMPILED_FAST_PATH_PATTERNS = [
     for pattern, intent, action, extractor in FAST_PATH_PATTERNS
 ]
 
+
+def _combine_alternation(patterns: List[str], prefix: str) -> Tuple[str, Dict[str, int]]:
+    """
+    Joins patterns into one alternation of named groups (?P<prefix{i}>...).
+
+    Returns:
+        (combined pattern, {group name: index of the alternative's group 0})
+        so each alternative's own numbered groups can be addressed by offset.
+    """
+    parts = []
+    offsets = {}
+    next_group = 1
+    for i, pattern in enumerate(patterns):
+        name = f"{prefix}{i}"
+        parts.append(f"(?P<{name}>{pattern})")
+        offsets[name] = next_group
+        next_group += 1 + re.compile(pattern).groups
+    return "|".join(parts), offsets
+
+
+class _AlternativeMatch:
+    """
+    Match view for one alternative of a combined regex: group(n) maps to the
+    alternative's own numbering, so extractors written for the standalone
+    pattern work unchanged.
+    """
+    __slots__ = ("_match", "_offset", "_lower")
+
+    def __init__(self, match: "re.Match", offset: int, lower: bool):
+        self._match = match
+        self._offset = offset
+        self._lower = lower
+
+    def group(self, n: int = 0):
+        value = self._match.group(self._offset + n)
+        if self._lower and value is not None:
+            return value.lower()
+        return value
+
+
+# v29: One combined alternation = one regex execution per input. Alternatives
+# are tried left to right at position 0, so the first pattern in
+# FAST_PATH_PATTERNS order still wins (same semantics as the sequential loop).
+_FAST_PATH_COMBINED, _FAST_PATH_OFFSETS = _combine_alternation(
+    [pattern for pattern, _, _, _ in FAST_PATH_PATTERNS], "fp"
+)
+COMBINED_FAST_PATH_REGEX = re.compile(_FAST_PATH_COMBINED, re.IGNORECASE)
+FAST_PATH_DISPATCH = {
+    f"fp{i}": (intent, action, extractor)
+    for i, (_, intent, action, extractor) in enumerate(FAST_PATH_PATTERNS)
+}
+
 # Pronoun patterns for resolution
 PRONOUN_PATTERNS = [
     r"\b(it|that|this)\b",
@@ -106,6 +168,7 @@ PRONOUN_PATTERNS = [
 
 # Pre-compiled pronoun patterns
 COMPILED_PRONOUN_PATTERNS = [re.compile(p, re.IGNORECASE) for p in PRONOUN_PATTERNS]
+COMBINED_PRONOUN_REGEX = re.compile("|".join(PRONOUN_PATTERNS), re.IGNORECASE)
 
 
 @dataclass
@@ -145,15 +208,40 @@ class SemanticRouter:
         (r"(AKIA[A-Z0-9]{16})", "AKIA***"),  # AWS keys
     ]
     
+    # v29: One combined scan screens out clean text (the common case); text
+    # with a hit goes through the ordered chain, since one leftmost-match
+    # pass differs when secrets are adjacent (sk-...password=x)
+    _SANITIZE_REGEX = re.compile(
+        _combine_alternation([pattern for pattern, _ in SENSITIVE_PATTERNS], "s")[0], re.IGNORECASE
+    )
+    _SANITIZE_CHAIN = [
+        (re.compile(pattern, re.IGNORECASE), replacement) for pattern, replacement in SENSITIVE_PATTERNS
+    ]
+    
     def __init__(self, db_path: str, llm_client=None):
         self.db_path = db_path
         self.llm_client = llm_client  # Optional LLM for Smart Path
         self._executor = ThreadPoolExecutor(max_workers=1)  # For timeout handling
+        
+        # In-memory session context (source of truth while running) + write-behind state
+        self._lock = threading.Lock()
+        self._context: Dict[str, Any] = {}
+        self._dirty_context: Dict[str, int] = {}  # key -> updated_at
+        self._route_log_buffer = deque(maxlen=ROUTER_LOG_QUEUE_MAX)
+        self.dropped_route_logs = 0
+        self._flush_wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        
         self._init_session_tables()
+        self._load_context()
     
     # FIX #5: Destructor to prevent zombie threads
     def __del__(self):
         """Cleanup ThreadPoolExecutor on shutdown to prevent resource leaks."""
+        if hasattr(self, '_stop'):
+            self._stop.set()
+            self._flush_wakeup.set()
         if hasattr(self, '_executor') and self._executor:
             try:
                 self._executor.shutdown(wait=False)
@@ -163,11 +251,12 @@ class SemanticRouter:
     
     # FIX #8: Log sanitization to prevent credential leaks
     def _sanitize_for_log(self, text: str) -> str:
-        """Masks secrets in text before logging."""
-        sanitized = text
-        for pattern, replacement in self.SENSITIVE_PATTERNS:
-            sanitized = re.sub(pattern, replacement, sanitized, flags=re.IGNORECASE)
-        return sanitized
+        """Masks secrets in text before logging (one scan when there are none)."""
+        if not self._SANITIZE_REGEX.search(text):
+            return text
+        for compiled, replacement in self._SANITIZE_CHAIN:
+            text = compiled.sub(replacement, text)
+        return text
     
     def _init_session_tables(self):
         """Create session context and route log tables."""
@@ -195,32 +284,131 @@ class SemanticRouter:
             )
         """)
         
+        # v36: Keyset pagination for get_route_history (newest first)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_route_log_created_at ON route_log(created_at, id)"
+        )
+        
         conn.commit()
         conn.close()
     
+    def _load_context(self):
+        """Warm the in-memory session context from the last persisted state."""
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=1.0)
+            try:
+                rows = conn.execute("SELECT key, value FROM session_context").fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Session context load skipped: {e}")
+            return
+        for key, value in rows:
+            try:
+                self._context[key] = json.loads(value)
+            except (TypeError, ValueError):
+                continue
+    
+    # === WRITE-BEHIND PERSISTENCE ===
+    
+    def _ensure_flusher(self):
+        """Start the background flusher on first buffered write."""
+        if self._stop.is_set():
+            # Closed router: no background thread, persist synchronously
+            self.flush()
+            return
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="RouterFlusher", daemon=True
+            )
+            self._flusher.start()
+            # Daemon thread dies with the process - flush what's left on exit
+            atexit.register(self.close)
+    
+    def _flush_loop(self):
+        while not self._stop.is_set():
+            self._flush_wakeup.wait(ROUTER_FLUSH_INTERVAL)
+            self._flush_wakeup.clear()
+            self.flush()
+    
+    def flush(self) -> bool:
+        """
+        Persist pending context + route_log entries in ONE transaction.
+        On a busy/locked DB the batch is re-queued for the next cycle, so
+        routing never waits on scheduler writes.
+        
+        Returns:
+            True if everything pending was written
+        """
+        with self._lock:
+            if not self._dirty_context and not self._route_log_buffer:
+                return True
+            dirty = self._dirty_context
+            self._dirty_context = {}
+            ctx_rows = [
+                (key, json.dumps(self._context.get(key)), updated_at)
+                for key, updated_at in dirty.items()
+            ]
+            log_rows = list(self._route_log_buffer)
+            self._route_log_buffer.clear()
+        
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=1.0)
+            try:
+                with conn:
+                    if ctx_rows:
+                        conn.executemany("""
+                            INSERT OR REPLACE INTO session_context (key, value, updated_at)
+                            VALUES (?, ?, ?)
+                        """, ctx_rows)
+                    if log_rows:
+                        conn.executemany("""
+                            INSERT INTO route_log (input, intent, action, parameters, confidence, source, created_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """, log_rows)
+            finally:
+                conn.close()
+            return True
+        except sqlite3.Error as e:
+            logger.debug(f"Router flush deferred: {e}")
+            with self._lock:
+                # Newer in-memory writes win over the failed batch
+                for key, updated_at in dirty.items():
+                    self._dirty_context.setdefault(key, updated_at)
+                free = self._route_log_buffer.maxlen - len(self._route_log_buffer)
+                requeue = log_rows[-free:] if free > 0 else []
+                self.dropped_route_logs += len(log_rows) - len(requeue)
+                self._route_log_buffer.extendleft(reversed(requeue))
+            return False
+    
+    def close(self):
+        """Flush pending writes and stop the background flusher."""
+        self._stop.set()
+        self._flush_wakeup.set()
+        if self._flusher is not None:
+            atexit.unregister(self.close)
+            if self._flusher is not threading.current_thread():
+                self._flusher.join(timeout=ROUTER_FLUSH_INTERVAL + 1.0)
+        self.flush()
+    
     # === SESSION CONTEXT (Refinement 2) ===
     
     def set_context(self, key: str, value: Any):
-        """Update session context (for pronoun resolution)."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO session_context (key, value, updated_at)
-            VALUES (?, ?, ?)
-        """, (key, json.dumps(value), int(time.time())))
-        conn.commit()
-        conn.close()
+        """Update session context (for pronoun resolution). Persisted write-behind."""
+        with self._lock:
+            self._context[key] = value
+            self._dirty_context[key] = int(time.time())
+        self._ensure_flusher()
     
     def get_context(self, key: str) -> Any:
-        """Get value from session context."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT value FROM session_context WHERE key=?", (key,))
-        row = cursor.fetchone()
-        conn.close()
-        if row:
-            return json.loads(row[0])
-        return None
+        """Get value from session context (in-memory, no DB round-trip)."""
+        with self._lock:
+            return self._context.get(key)
+    
+    def get_all_context(self) -> Dict[str, Any]:
+        """Snapshot of the full session context."""
+        with self._lock:
+            return dict(self._context)
     
     def update_last_shown_task(self, task_id: int):
         """Call this when displaying a task to user (Refinement 2)."""
@@ -238,7 +426,7 @@ class SemanticRouter:
         resolved_params = params.copy() if params else {}
         
         # Check if input contains pronouns
-        has_pronoun = any(re.search(p, text, re.IGNORECASE) for p in PRONOUN_PATTERNS)
+        has_pronoun = COMBINED_PRONOUN_REGEX.search(text) is not None
         
         if has_pronoun and "task_id" not in resolved_params:
             # Try to resolve from context
@@ -308,37 +496,37 @@ class SemanticRouter:
         Try to match input against Fast Path patterns.
         
         v8.5.1: Uses pre-compiled patterns for O(1) matching.
+        v29: One execution of the combined alternation; the named group that
+        matched dispatches to (intent, action, extractor).
         """
-        text_lower = text.lower()
+        match = COMBINED_FAST_PATH_REGEX.match(text)
+        if not match:
+            return None
         
-        # v8.5.1: Use pre-compiled patterns (compiled_pattern.match() vs re.match())
-        for compiled_pattern, intent, action, param_extractor in COMPILED_FAST_PATH_PATTERNS:
-            # CONTEXT_SET needs original case, others use lowercase
-            target_text = text if intent == "CONTEXT_SET" else text_lower
-            match = compiled_pattern.match(target_text)
-            
-            if match:
-                params = None
-                if param_extractor:
-                    if callable(param_extractor):
-                        params = param_extractor(match)
-                    else:
-                        params = param_extractor
-                
-                # Track task mentions (Refinement 2)
-                if params and "task_id" in params:
-                    self.update_last_mentioned_task(params["task_id"])
-                
-                return RouteResult(
-                    intent=intent,
-                    action=action,
-                    parameters=params,
-                    confidence=1.0,
-                    source="fast_path",
-                    raw_input=text
-                )
+        name = match.lastgroup
+        intent, action, param_extractor = FAST_PATH_DISPATCH[name]
         
-        return None
+        params = None
+        if param_extractor:
+            if callable(param_extractor):
+                # CONTEXT_SET needs original case, others use lowercase
+                view = _AlternativeMatch(match, _FAST_PATH_OFFSETS[name], lower=intent != "CONTEXT_SET")
+                params = param_extractor(view)
+            else:
+                params = param_extractor
+        
+        # Track task mentions (Refinement 2)
+        if params and "task_id" in params:
+            self.update_last_mentioned_task(params["task_id"])
+        
+        return RouteResult(
+            intent=intent,
+            action=action,
+            parameters=params,
+            confidence=1.0,
+            source="fast_path",
+            raw_input=text
+        )
     
     def _smart_path_with_timeout(self, text: str) -> Optional[RouteResult]:
         """
@@ -411,14 +599,9 @@ class SemanticRouter:
         return None
     
     def _log_route(self, result: RouteResult):
-        """Log routing decision for debugging."""
+        """Buffer routing decision for debugging (flushed in batches)."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO route_log (input, intent, action, parameters, confidence, source, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
+            row = (
                 result.raw_input,
                 result.intent,
                 result.action,
@@ -426,11 +609,17 @@ class SemanticRouter:
                 result.confidence,
                 result.source,
                 int(time.time())
-            ))
-            conn.commit()
-            conn.close()
+            )
         except Exception:
-            pass  # Don't fail on logging errors
+            return  # Don't fail on logging errors
+        with self._lock:
+            if len(self._route_log_buffer) == self._route_log_buffer.maxlen:
+                self.dropped_route_logs += 1  # deque drops the oldest entry
+            self._route_log_buffer.append(row)
+            pending = len(self._route_log_buffer)
+        self._ensure_flusher()
+        if pending >= ROUTER_LOG_BATCH_SIZE:
+            self._flush_wakeup.set()
 
 
 class IntentExecutor:
@@ -706,10 +895,13 @@ def create_router(db_path: str, llm_api_key: str = None) -> Tuple[SemanticRouter
 def route_and_execute(db_path: str, user_input: str) -> Dict[str, Any]:
     """One-shot route and execute for simple integration."""
     router, executor = create_router(db_path)
-    route = router.route(user_input)
-    result = executor.execute(route)
-    result["route"] = route.to_dict()
-    return result
+    try:
+        route = router.route(user_input)
+        result = executor.execute(route)
+        result["route"] = route.to_dict()
+        return result
+    finally:
+        router.close()
 
 
 if __name__ == "__main__":
@@ -274,15 +274,166 @@ function Get-AsyncSnapshotResult {
     }
 }
 
+# =============================================================================
+# v31: Resident snapshot daemon (tools/snapshot.py --serve)
+# =============================================================================
+# One long-lived python process answers JSON-lines snapshot requests over
+# stdin/stdout and returns a cached payload when nothing changed. Any failure
+# stops the daemon and Get-RealSnapshot falls back to the one-shot spawn.
+# Set ATOMIC_MESH_SNAPSHOT_DAEMON=0 to always use the one-shot path.
+#
+# A fresh daemon must answer a "warmup" handshake (cold imports + first git
+# status) within WarmupTimeoutMs before the short per-refresh timeout
+# applies; a failed warmup backs off for RetryAfterS instead of respawning
+# on every refresh.
+$script:SnapshotDaemon = @{
+    Process = $null
+    RepoRoot = $null
+    NextId = 0
+    # v32: Conditional refresh - reuse the last payload while the etag matches
+    LastEtag = $null
+    LastPayload = $null
+    WarmupTimeoutMs = if ($env:ATOMIC_MESH_SNAPSHOT_DAEMON_WARMUP_MS) { [int]$env:ATOMIC_MESH_SNAPSHOT_DAEMON_WARMUP_MS } else { 15000 }
+    RetryAfterS = 60
+    RetryAt = $null
+}
+
+function Stop-SnapshotDaemon {
+    $proc = $script:SnapshotDaemon.Process
+    $script:SnapshotDaemon.Process = $null
+    $script:SnapshotDaemon.RepoRoot = $null
+    $script:SnapshotDaemon.LastEtag = $null
+    $script:SnapshotDaemon.LastPayload = $null
+    if (-not $proc) { return }
+    try {
+        if (-not $proc.HasExited) {
+            $proc.StandardInput.Close()  # EOF ends the serve loop
+            if (-not $proc.WaitForExit(500)) { $proc.Kill() }
+        }
+    } catch {}
+    try { $proc.Dispose() } catch {}
+}
+
+function Send-SnapshotDaemonRequest {
+    param(
+        $Process,
+        [hashtable]$Request,
+        [int]$TimeoutMs
+    )
+
+    # Returns the parsed response, or $null on timeout / id mismatch
+    $script:SnapshotDaemon.NextId++
+    $Request.id = $script:SnapshotDaemon.NextId
+    $Process.StandardInput.WriteLine(($Request | ConvertTo-Json -Compress))
+    $Process.StandardInput.Flush()
+
+    $readTask = $Process.StandardOutput.ReadLineAsync()
+    if (-not $readTask.Wait($TimeoutMs) -or -not $readTask.Result) {
+        return $null
+    }
+    $response = $readTask.Result | ConvertFrom-Json -ErrorAction Stop
+    if ($response.id -ne $Request.id) { return $null }  # Out of sync
+    return $response
+}
+
+function Get-SnapshotDaemon {
+    param([string]$RepoRoot)
+
+    $proc = $script:SnapshotDaemon.Process
+    if ($proc -and -not $proc.HasExited -and $script:SnapshotDaemon.RepoRoot -eq $RepoRoot) {
+        return $proc
+    }
+    Stop-SnapshotDaemon
+
+    # Backing off after a failed warmup: callers use the one-shot path
+    if ($script:SnapshotDaemon.RetryAt -and [datetime]::UtcNow -lt $script:SnapshotDaemon.RetryAt) {
+        return $null
+    }
+
+    $scriptPath = Get-SnapshotScriptPath
+    if (-not (Test-Path $scriptPath)) { return $null }
+
+    $psi = [System.Diagnostics.ProcessStartInfo]::new()
+    $psi.FileName = "python"
+    $psi.Arguments = "-u `"$scriptPath`" --serve `"$RepoRoot`""
+    $psi.WorkingDirectory = $RepoRoot
+    $psi.UseShellExecute = $false
+    $psi.RedirectStandardInput = $true
+    $psi.RedirectStandardOutput = $true
+    $psi.RedirectStandardError = $true
+    $psi.CreateNoWindow = $true
+
+    $proc = [System.Diagnostics.Process]::Start($psi)
+    if (-not $proc) { return $null }
+    $proc.BeginErrorReadLine()  # Drain stderr so the pipe never blocks the daemon
+    $script:SnapshotDaemon.Process = $proc
+    $script:SnapshotDaemon.RepoRoot = $RepoRoot
+
+    # Readiness handshake: pay the cold start once, under a generous timeout
+    $ready = $null
+    try {
+        $ready = Send-SnapshotDaemonRequest -Process $proc -Request @{ op = "warmup" } -TimeoutMs $script:SnapshotDaemon.WarmupTimeoutMs
+    } catch {}
+    if (-not $ready -or -not $ready.ok -or -not $ready.ready) {
+        Stop-SnapshotDaemon
+        $script:SnapshotDaemon.RetryAt = [datetime]::UtcNow.AddSeconds($script:SnapshotDaemon.RetryAfterS)
+        return $null
+    }
+    $script:SnapshotDaemon.RetryAt = $null
+    return $proc
+}
+
+function Invoke-SnapshotDaemon {
+    param(
+        [string]$RepoRoot,
+        [int]$TimeoutMs = 1200
+    )
+
+    # Returns the raw snapshot object, or $null if the daemon is unavailable
+    if ($env:ATOMIC_MESH_SNAPSHOT_DAEMON -eq "0") { return $null }
+
+    try {
+        $proc = Get-SnapshotDaemon -RepoRoot $RepoRoot
+        if (-not $proc) { return $null }
+
+        $request = @{ op = "snapshot" }
+        if ($script:SnapshotDaemon.LastEtag -and $script:SnapshotDaemon.LastPayload) {
+            $request.if_none_match = $script:SnapshotDaemon.LastEtag
+        }
+        $response = Send-SnapshotDaemonRequest -Process $proc -Request $request -TimeoutMs $TimeoutMs
+        if (-not $response -or -not $response.ok) {
+            # Timeout, out of sync or backend error: one-shot path reports the error
+            Stop-SnapshotDaemon
+            return $null
+        }
+        if ($response.not_modified) {
+            return $script:SnapshotDaemon.LastPayload
+        }
+        $script:SnapshotDaemon.LastEtag = $response.etag
+        $script:SnapshotDaemon.LastPayload = $response.payload
+        return $response.payload
+    }
+    catch {
+        Stop-SnapshotDaemon
+        return $null
+    }
+}
+
 function Get-RealSnapshot {
     param(
         [string]$RepoRoot
     )
 
-    # Synchronous fallback (used for initial load)
     $timeoutMs = 1200
     $resolvedRoot = if ($RepoRoot) { (Resolve-Path $RepoRoot).Path } else { (Get-Location).Path }
 
+    # v31: Prefer the resident daemon (single-digit ms when nothing changed)
+    $daemonSnapshot = Invoke-SnapshotDaemon -RepoRoot $resolvedRoot -TimeoutMs $timeoutMs
+    if ($daemonSnapshot) {
+        return $daemonSnapshot
+    }
+
+    # Synchronous one-shot fallback
     $scriptPath = Get-SnapshotScriptPath
 
     if (-not (Test-Path $scriptPath)) {
@@ -226,18 +226,12 @@ function Invoke-CommandRouter {
                 }
             }
 
-            # Refresh snapshot from tools/snapshot.py to avoid stale readiness/docs state
+            # Refresh snapshot to avoid stale readiness/docs state
+            # v31: Via the resident daemon (Get-RealSnapshot falls back to a one-shot spawn)
             try {
-                $moduleRootFresh = $PSScriptRoot | Split-Path -Parent | Split-Path -Parent | Split-Path -Parent
-                $snapScript = Join-Path $moduleRootFresh "tools\snapshot.py"
-                if (Test-Path $snapScript) {
-                    $rawSnapText = python $snapScript "$projectPath" 2>$null | Out-String
-                    if ($rawSnapText) {
-                        try {
-                            $rawSnapObj = $rawSnapText | ConvertFrom-Json -ErrorAction Stop
-                            $snapshotRef = Convert-RawSnapshotToUi -Raw $rawSnapObj
-                        } catch {}
-                    }
+                $rawSnapObj = Get-RealSnapshot -RepoRoot $projectPath
+                if ($rawSnapObj) {
+                    $snapshotRef = Convert-RawSnapshotToUi -Raw $rawSnapObj
                 }
             } catch {}
 
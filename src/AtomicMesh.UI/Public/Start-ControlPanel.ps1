@@ -804,7 +804,8 @@ function Start-ControlPanel {
         Start-Sleep -Milliseconds $RenderIntervalMs
     }
 
-    # Cleanup: restore console state
+    # Cleanup: stop resident snapshot daemon (v31), restore console state
+    try { Stop-SnapshotDaemon } catch {}
     try {
         [Console]::CursorVisible = $true
         [Console]::TreatControlCAsInput = $false  # Restore normal Ctrl+C behavior
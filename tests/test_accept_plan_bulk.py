@@ -0,0 +1,144 @@
+"""
+v45: Bulk accept_plan ingestion.
+
+- Plan keys resolve in memory; each task is written once with its final deps
+- Pre-assigned ids follow SQLite's AUTOINCREMENT high-water mark
+- 10k-task plans ingest with a bounded write-lock hold
+- v46: plans stream in chunked transactions; forward refs wire up at the
+  end and an interrupted ingest resumes
+"""
+import hashlib
+import importlib
+import json
+import os
+import sqlite3
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LANES = ["backend", "frontend", "qa", "docs", "ops"]
+
+
+@pytest.fixture
+def mesh(tmp_path, monkeypatch):
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    import mesh_server
+    mesh_server = importlib.reload(mesh_server)
+    monkeypatch.setattr(mesh_server, "get_context_readiness", lambda: '{"status": "OK"}')
+    return mesh_server
+
+
+def _accept(mesh, tmp_path, lines):
+    plan = tmp_path / "plan.md"
+    plan.write_text("# Plan\n" + "\n".join(lines) + "\n", encoding="utf-8")
+    return json.loads(mesh.accept_plan(str(plan)))
+
+
+def _deps(mesh):
+    with mesh.get_db() as conn:
+        rows = conn.execute("SELECT desc, deps FROM tasks").fetchall()
+    return {r["desc"].split(" -")[0].split(" |")[0]: json.loads(r["deps"]) for r in rows}
+
+
+def test_deps_resolve_in_memory(mesh, tmp_path):
+    with mesh.get_db() as conn:
+        conn.execute("INSERT INTO tasks (id, type, desc, status) VALUES (40, 'backend', 'gone', 'completed')")
+        conn.execute("DELETE FROM tasks WHERE id = 40")  # AUTOINCREMENT never reuses 40
+
+    result = _accept(mesh, tmp_path, [
+        "- [ ] Backend: Wire API | K:api | Dep:docs:guide, 7, api-missing, docs:guide",
+        "- [ ] Docs: Write guide | K:guide",
+        "- [ ] Backend: Wire API | K:dup | Dep:docs:guide, 7, api-missing, docs:guide",  # Same signature
+        "- [x] QA: Already done",
+    ])
+    assert result["status"] == "OK" and result["skipped_duplicates"] == 1
+    assert [t["id"] for t in result["tasks"]] == [41, 42]
+    assert [t["lane_rank"] for t in result["tasks"]] == [0, 0]
+    assert _deps(mesh) == {"Wire API": [42, 7, "backend:api-missing"], "Write guide": []}
+    assert result["unresolved_deps"] == [{"id": 41, "unresolved": ["backend:api-missing"]}]
+
+    with mesh.get_db() as conn:
+        assert conn.execute("SELECT plan_key FROM tasks WHERE id = 42").fetchone()[0] == "docs:guide"
+        conn.execute("INSERT INTO tasks (type, desc, status) VALUES ('qa', 'next', 'pending')")
+        assert conn.execute("SELECT MAX(id) FROM tasks").fetchone()[0] == 43
+
+
+def test_ten_thousand_tasks_bounded_lock(mesh, tmp_path):
+    lines = []
+    for i in range(10_000):
+        dep = f" | Dep:{LANES[(i - 1) % 5]}:k{i - 1}" if i else ""
+        lines.append(f"- [ ] {LANES[i % 5].title()}: Feature {i} -- DoD: done | Trace: SPEC-{i} | K:k{i}{dep}")
+
+    result = _accept(mesh, tmp_path, lines)
+    assert result["status"] == "OK" and result["created_count"] == 10_000
+    assert result["write_lock_ms"] < 5_000, result["write_lock_ms"]
+    ids = [t["id"] for t in result["tasks"]]
+    assert ids == list(range(ids[0], ids[0] + 10_000))
+
+    deps = _deps(mesh)
+    assert deps["Feature 0"] == [] and deps["Feature 9999"] == [ids[9998]]
+    assert not result["unresolved_deps"]
+    assert _accept(mesh, tmp_path, lines)["status"] == "ALREADY_ACCEPTED"
+
+
+# v46: streaming + chunked transactions
+
+def test_chunked_ingest_wires_forward_refs(mesh, tmp_path, monkeypatch):
+    monkeypatch.setattr(mesh, "PLAN_INGEST_CHUNK", 2)
+    result = _accept(mesh, tmp_path, [
+        "- [ ] Backend: First | Dep:docs:guide",  # Forward ref into a later chunk
+        "- [ ] Docs: Old guide | K:guide",
+        "- [ ] QA: Check | Dep:backend:api",
+        "- [ ] Backend: Api | K:api",
+        "- [ ] Docs: New guide | K:guide",  # Last K: wins, as in a single pass
+    ])
+    assert result["status"] == "OK" and result["created_count"] == 5
+    assert result["transactions"] == 3 and not result["unresolved_deps"]
+    ids = {t["desc"].split(" |")[0]: t["id"] for t in result["tasks"]}
+    deps = _deps(mesh)
+    assert deps["First"] == [ids["New guide"]] and deps["Check"] == [ids["Api"]]
+    assert [t["lane_rank"] for t in result["tasks"]] == [0, 0, 0, 1, 1]
+
+
+def test_interrupted_ingest_resumes(mesh, tmp_path, monkeypatch):
+    monkeypatch.setattr(mesh, "PLAN_INGEST_CHUNK", 2)
+    lines = [f"- [ ] Backend: Step {i} | K:s{i}" + (f" | Dep:s{i + 1}" if i < 4 else "") for i in range(5)]
+    original = mesh._ingest_plan_tasks
+    calls = []
+
+    def flaky(conn, records, state):
+        calls.append(len(records))
+        if len(calls) == 2:
+            raise sqlite3.OperationalError("disk I/O error")
+        return original(conn, records, state)
+
+    monkeypatch.setattr(mesh, "_ingest_plan_tasks", flaky)
+    assert _accept(mesh, tmp_path, lines)["status"] == "ERROR"
+
+    # The committed first chunk is already visible (its forward dep keeps Step 1 blocked)
+    with mesh.get_db() as conn:
+        rows = conn.execute("SELECT id, deps FROM tasks ORDER BY id").fetchall()
+    assert [json.loads(r[1]) for r in rows] == [[rows[1][0]], ["backend:s2"]]
+
+    result = _accept(mesh, tmp_path, lines)
+    assert result["status"] == "OK" and result["resumed"]
+    assert result["created_count"] == 3 and result["skipped_duplicates"] == 2
+    deps = _deps(mesh)
+    with mesh.get_db() as conn:
+        ids = {r[0].split(" |")[0]: r[1] for r in conn.execute("SELECT desc, id FROM tasks")}
+    assert deps == {f"Step {i}": ([ids[f"Step {i + 1}"]] if i < 4 else []) for i in range(5)}
+    assert _accept(mesh, tmp_path, lines)["status"] == "ALREADY_ACCEPTED"
+
+
+def test_plan_hash_streams_decoded_text(mesh, tmp_path):
+    plan = tmp_path / "crlf.md"
+    plan.write_bytes(("- [ ] Docs: é\r\n" * 40_000).encode("utf-8"))
+    with open(plan, encoding="utf-8") as f:
+        expected = hashlib.sha1(f.read().encode("utf-8")).hexdigest()
+    assert mesh._plan_file_hash(str(plan)) == expected
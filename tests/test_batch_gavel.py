@@ -0,0 +1,116 @@
+"""
+v49: Batch Gavel (submit_review_decisions).
+
+- Each task gets the single-decision gates; passing ones change status in
+  one transaction and get one ledger entry each from a single fsync'd write
+- 'completed' stays reachable only through the Gavel
+- auto_approve_safe_std / approve_review_case decide through one batch
+"""
+import importlib
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+NOTES = "Entropy Check: Passed. Verify: 96/100"
+
+
+@pytest.fixture
+def mesh(tmp_path, monkeypatch):
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    import mesh_server
+    return importlib.reload(mesh_server)
+
+
+def _insert(mesh, task_id, sources=(), status="reviewing", risk="LOW", archetype="PLUMBING"):
+    with mesh.get_db() as conn:
+        conn.execute(
+            "INSERT INTO tasks (id, type, desc, status, source_ids, archetype, risk) "
+            "VALUES (?, 'backend', ?, ?, ?, ?, ?)",
+            (task_id, f"task {task_id}", status, json.dumps(list(sources)), archetype, risk),
+        )
+
+
+def _ledger(mesh):
+    path = mesh.get_state_path("release_ledger.jsonl")
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _statuses(mesh):
+    with mesh.get_db() as conn:
+        return dict(conn.execute("SELECT id, status FROM tasks").fetchall())
+
+
+def test_batch_applies_single_decision_gates(mesh, monkeypatch):
+    _insert(mesh, 1, ["STD-CODE-01"])
+    _insert(mesh, 2)
+    _insert(mesh, 3, status="in_progress")  # Not under review
+    _insert(mesh, 4, ["HIPAA-SEC-01"], archetype="SEC")  # MANDATORY without code evidence
+    _insert(mesh, 5, risk="HIGH")  # Verify 96 >= 95
+    _insert(mesh, 6, risk="HIGH")
+    mesh.create_review_packets([1, 2, 4, 5])
+    with mesh.get_db() as conn:
+        conn.execute("UPDATE tasks SET risk = 'HIGH' WHERE id = 6")
+
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(mesh.os, "fsync", lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+
+    result = json.loads(mesh.submit_review_decisions([1, 2, 3, 4, 5, 99], "approve", NOTES, "batch"))
+    assert result["decided_count"] == 3 and result["blocked_count"] == 3
+    by_id = {t: r for t, r in zip([1, 2, 3, 4, 5, 99], result["results"])}
+    assert by_id[3]["reason"] == "INVALID_STATE" and by_id[99]["status"] == "ERROR"
+    assert by_id[4]["reason"] == "GATEKEEPER_DRIFT" and "HIPAA-SEC-01" in by_id[4]["errors"][0]
+    assert by_id[1] == {"status": "SUCCESS", "decision": "APPROVE", "task_id": 1, "new_status": "completed",
+                        "message": "Task 1 APPROVED & COMPLETED.", "ledger": "Recorded (BATCH)"}
+
+    statuses = _statuses(mesh)
+    assert [statuses[t] for t in (1, 2, 3, 4, 5)] == ["completed", "completed", "in_progress", "reviewing", "completed"]
+    with mesh.get_db() as conn:
+        vias = {r[0] for r in conn.execute("SELECT via FROM task_transitions WHERE to_status = 'completed'")}
+        notes = conn.execute("SELECT review_decision, review_notes FROM tasks WHERE id = 2").fetchone()
+    assert vias == {"gavel"} and tuple(notes) == ("APPROVE", NOTES)
+
+    entries = _ledger(mesh)
+    assert [e["task_id"] for e in entries] == [1, 2, 5] and len(fsyncs) == 1
+    assert entries[0]["resolved_authority"] == [{"source_id": "STD-CODE-01", "authority": "DEFAULT"}]
+    assert entries[0]["snapshot_hash"] != "N/A" and {e["actor"] for e in entries} == {"BATCH"}
+    assert not os.path.exists(os.path.join(mesh.get_state_path("reviews"), "T-1.json"))
+    assert os.path.exists(os.path.join(mesh.get_state_path("reviews"), "T-4.json"))
+
+    # Single decisions are batches of one (same response shape)
+    single = json.loads(mesh.submit_review_decision(6, "APPROVE", "Entropy Check: Passed", "HUMAN"))
+    assert single["reason"] == "MISSING_CONFIDENCE_PROOF"
+    assert json.loads(mesh.submit_review_decision(6, "REJECT", "redo", "HUMAN"))["new_status"] == "in_progress"
+
+
+def test_completed_only_through_the_gavel(mesh):
+    _insert(mesh, 1)
+    with mesh.get_db() as conn:
+        with pytest.raises(PermissionError):
+            mesh.update_task_states(conn, [1], "completed")
+        assert mesh.update_task_states(conn, [1], "blocked", expect_status="pending") == []
+    assert _statuses(mesh)[1] == "reviewing"
+
+
+def test_case_approval_is_one_batch(mesh, monkeypatch):
+    for task_id in range(1, 6):
+        _insert(mesh, task_id, ["STD-CODE-01"])
+    mesh.create_review_packets(range(1, 6))
+
+    calls = []
+    gavel = mesh._gavel
+    monkeypatch.setattr(mesh, "_gavel", lambda ids, *a, **k: (calls.append(list(ids)), gavel(ids, *a, **k))[1])
+    result = json.loads(mesh.approve_review_case("STD", notes="Entropy Check: Passed"))
+    assert result["approved_count"] == 5 and len(calls) == 1
+    assert sorted(e["task_id"] for e in _ledger(mesh)) == [1, 2, 3, 4, 5]
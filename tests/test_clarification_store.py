@@ -0,0 +1,135 @@
+"""
+Clarification queue store: atomic IDs, indexed reads, markdown as an export.
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dynamic_rigor
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_enqueue_allocates_sequential_ids(workspace):
+    assert dynamic_rigor.get_next_question_id() == "Q1"
+    assert dynamic_rigor.enqueue_question("Which DB?", "src/db.py") == "Q1"
+    assert dynamic_rigor.enqueue_question("Which auth?", "src/auth.py", round_num=2) == "Q2"
+    assert dynamic_rigor.get_next_question_id() == "Q3"
+
+    open_qs = dynamic_rigor.get_open_questions()
+    assert [q["id"] for q in open_qs] == ["Q1", "Q2"]
+    assert open_qs[1]["question"] == "Which auth?"
+    assert open_qs[1]["round"] == 2
+    assert dynamic_rigor.count_open_questions() == 2
+
+
+def test_taken_id_is_reallocated(workspace):
+    dynamic_rigor.append_to_clarification_queue("Q1", "first", "ctx")
+    msg = dynamic_rigor.append_to_clarification_queue("Q1", "second", "ctx")
+    assert "Q2" in msg
+
+
+def test_concurrent_enqueue_has_no_duplicate_ids(workspace):
+    ids = []
+    lock = threading.Lock()
+
+    def worker(n):
+        qid = dynamic_rigor.enqueue_question(f"question {n}", "ctx")
+        with lock:
+            ids.append(qid)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(ids, key=lambda q: int(q[1:])) == [f"Q{n}" for n in range(1, 9)]
+
+
+def test_close_updates_store_and_markdown_export(workspace):
+    dynamic_rigor.enqueue_question("Which DB?", "src/db.py")
+    dynamic_rigor.enqueue_question("Which cache?", "src/cache.py")
+
+    assert dynamic_rigor.mark_question_closed("Q1", "Postgres") is True
+    assert dynamic_rigor.mark_question_closed("Q99", "nope") is False
+    assert [q["id"] for q in dynamic_rigor.get_open_questions()] == ["Q2"]
+
+    content = (workspace / "docs" / "CLARIFICATION_QUEUE.md").read_text(encoding="utf-8")
+    assert "## Q1 [CLOSED]" in content
+    assert "**Answer:** Postgres" in content
+    assert "## Q2 [OPEN]" in content
+
+
+def test_render_replaces_the_export_under_the_write_lock(workspace, monkeypatch):
+    dynamic_rigor.enqueue_question("Which DB?", "src/db.py")
+    db_path = dynamic_rigor._get_clarification_db_path()
+    real_replace = os.replace
+    blocked = []
+
+    def replace_while_probing(src, dst):
+        # A concurrent enqueue (or render) must wait until this file is in place
+        probe = dynamic_rigor.sqlite3.connect(db_path, timeout=0, isolation_level=None)
+        try:
+            probe.execute("BEGIN IMMEDIATE")
+            probe.execute("ROLLBACK")
+        except dynamic_rigor.sqlite3.OperationalError:
+            blocked.append(dst)
+        finally:
+            probe.close()
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(dynamic_rigor.os, "replace", replace_while_probing)
+    dynamic_rigor.enqueue_question("Which cache?", "src/cache.py")
+    dynamic_rigor.render_clarification_queue()
+    assert len(blocked) == 2
+
+
+def test_legacy_markdown_queue_is_imported(workspace):
+    docs = workspace / "docs"
+    docs.mkdir()
+    (docs / "CLARIFICATION_QUEUE.md").write_text(
+        "# Clarification Queue\n\n"
+        '<!--QUESTION_META:{"id": "Q4", "status": "OPEN", "round": 1, "task_id": null, "timestamp": 1.0}-->\n'
+        "## Q4 [OPEN]\n"
+        "**Round:** 1 (Requirements)\n"
+        "**Context:** `api.py`\n"
+        "**Question:** Legacy question?\n\n---\n",
+        encoding="utf-8",
+    )
+
+    open_qs = dynamic_rigor.get_open_questions()
+    assert [(q["id"], q["question"]) for q in open_qs] == [("Q4", "Legacy question?")]
+    assert dynamic_rigor.enqueue_question("New one", "ctx") == "Q5"
+
+
+def test_status_reads_do_not_take_the_write_lock(workspace, monkeypatch):
+    dynamic_rigor.enqueue_question("Which DB?", "src/db.py")  # Store + markdown export exist
+
+    statements = []
+    connect = dynamic_rigor.sqlite3.connect
+
+    def traced(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(dynamic_rigor.sqlite3, "connect", traced)
+    for _ in range(3):
+        assert dynamic_rigor.count_open_questions() == 1
+        assert [q["id"] for q in dynamic_rigor.get_open_questions()] == ["Q1"]
+        assert dynamic_rigor.get_next_question_id() == "Q2"
+        dynamic_rigor.get_clarification_status()
+
+    assert statements
+    writes = [s for s in statements if s.split()[0].upper() in ("BEGIN", "CREATE", "INSERT", "UPDATE")]
+    assert writes == []
@@ -0,0 +1,113 @@
+"""
+v30: mesh_server cold start guards.
+
+- `python -X importtime -c "import mesh_server"` stays within a time budget
+  and does not pull in the MCP SDK or heavy optional dependencies.
+- Deferred tool registration still exposes every @mcp.tool().
+- init_db() skips migrations when PRAGMA user_version is current.
+"""
+import asyncio
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Cumulative import time budget for mesh_server in microseconds
+IMPORT_BUDGET_US = int(os.getenv("MESH_IMPORT_BUDGET_US", "1000000"))
+
+# Modules that must only load on first use
+LAZY_MODULES = {
+    "mcp", "pydantic", "pypdf", "docx", "markdownify",
+    "router", "tools.readiness",
+}
+
+
+def _importtime(tmp_path):
+    env = dict(os.environ)
+    env["MESH_BASE_DIR"] = str(tmp_path)
+    env["ATOMIC_MESH_DB"] = str(tmp_path / "mesh.db")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import mesh_server"],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            modules[name.strip()] = int(cumulative.strip())
+        except ValueError:
+            continue  # header row
+    return modules
+
+
+def test_import_time_budget_and_lazy_modules(tmp_path):
+    _importtime(tmp_path)  # warm .pyc caches
+    modules = _importtime(tmp_path)
+
+    eager = LAZY_MODULES & set(modules)
+    assert not eager, f"Imported eagerly at startup: {sorted(eager)}"
+    assert modules["mesh_server"] <= IMPORT_BUDGET_US, (
+        f"import mesh_server took {modules['mesh_server']}us (budget {IMPORT_BUDGET_US}us)"
+    )
+
+
+@pytest.fixture
+def mesh_module(tmp_path, monkeypatch):
+    """Reload mesh_server with an isolated workspace and an existing DB file."""
+    (tmp_path / "mesh.db").touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(tmp_path / "mesh.db"))
+    monkeypatch.chdir(tmp_path)
+
+    if "mesh_server" in sys.modules:
+        del sys.modules["mesh_server"]
+    import importlib
+    import mesh_server
+
+    return importlib.reload(mesh_server)
+
+
+def test_deferred_tools_are_all_registered(mesh_module):
+    pytest.importorskip("mcp")
+    with open(os.path.join(ROOT, "mesh_server.py"), "r", encoding="utf-8") as f:
+        decorated = sum(1 for line in f if line.strip() == "@mcp.tool()")
+
+    tools = asyncio.run(mesh_module.mcp.list_tools())
+    names = {t.name for t in tools}
+    assert len(names) == decorated
+    assert "route_input" in names
+
+
+def test_init_db_skips_when_schema_current(mesh_module, tmp_path):
+    db_path = str(tmp_path / "mesh.db")
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == mesh_module.MESH_SCHEMA_VERSION
+        conn.execute("DROP INDEX idx_tasks_task_signature")
+        conn.commit()
+    finally:
+        conn.close()
+
+    def index_exists():
+        c = sqlite3.connect(db_path)
+        try:
+            return c.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_tasks_task_signature'"
+            ).fetchone() is not None
+        finally:
+            c.close()
+
+    mesh_module.init_db()
+    assert not index_exists()  # current version: DDL skipped
+
+    mesh_module.init_db(force=True)
+    assert index_exists()
@@ -0,0 +1,116 @@
+"""
+v44: Document-analysis results persisted under control/state.
+
+- Readiness scores and plan extractions are reused across processes while a
+  doc's (path, size, mtime, sha1) is unchanged
+- Any edit (or a new DECISION_LOG template) recomputes
+- Concurrent writers merge instead of clobbering each other
+"""
+import importlib
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tools import doc_ast
+from tools import readiness
+
+PRD = """# PRD
+## Goals
+- As a clinician, I want to export audit trails so that reviews are fast
+## User Stories
+- As an admin, I need to revoke sessions so that stolen devices are locked out
+"""
+
+SPEC = """## Data Model
+| Entity | Fields |
+| Patient | id, mrn |
+## API
+GET /api/patients
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "PRD.md").write_text(PRD, encoding="utf-8")
+    (docs / "SPEC.md").write_text(SPEC, encoding="utf-8")
+    doc_ast.clear_caches()
+    return tmp_path
+
+
+def _store(project):
+    with open(project / "control" / "state" / doc_ast.ANALYSIS_STORE_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_readiness_reuses_scores_across_processes(project, monkeypatch):
+    first = readiness.get_context_readiness(base_dir=str(project))
+    prd_entry = _store(project)["docs"][str(project / "docs" / "PRD.md")]
+    assert set(prd_entry["results"]) == {f"readiness:PRD:{readiness.THRESHOLDS['PRD']}:missing"}
+
+    # A separate process (the snapshot's readiness subprocess) gets pure cache hits
+    script = (
+        "import json, sys; sys.path.insert(0, sys.argv[1]); "
+        "import tools.readiness as r; "
+        "r.strip_llm_blocks = None; "  # Any recompute would fail
+        "print(json.dumps(r.get_context_readiness(base_dir=sys.argv[2])))"
+    )
+    out = subprocess.run([sys.executable, "-c", script, ROOT, str(project)],
+                         capture_output=True, text=True, check=True).stdout
+    assert json.loads(out) == first
+
+    def boom(*args, **kwargs):
+        raise AssertionError("recomputed")
+
+    # Only the edited doc is rescored (the failure lands in the read-error path)
+    monkeypatch.setattr(readiness, "strip_llm_blocks", boom)
+    (project / "docs" / "PRD.md").write_text(PRD + "- [ ] More\n", encoding="utf-8")
+    rescored = readiness.get_context_readiness(base_dir=str(project))
+    assert rescored["files"]["PRD"]["score"] == 10
+    assert rescored["files"]["SPEC"] == first["files"]["SPEC"]
+    monkeypatch.undo()
+    assert readiness.get_context_readiness(base_dir=str(project))["files"]["PRD"]["bullets"] == 3
+
+
+def test_extractions_persist_per_document_version(project, monkeypatch):
+    monkeypatch.setenv("MESH_BASE_DIR", str(project))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(project / "mesh.db"))
+    import mesh_server
+    mesh = importlib.reload(mesh_server)
+
+    ctx = mesh.extract_project_context(base_dir=str(project))
+    assert ctx["debug"]["counts"] == {"user_stories": 2, "api_endpoints": 1, "data_entities": 1, "decisions": 0}
+
+    def boom(_text):
+        raise AssertionError("re-extracted an unchanged doc")
+
+    for name in ("_extract_user_stories", "_extract_api_endpoints", "_extract_data_entities"):
+        monkeypatch.setattr(mesh, name, boom)
+    doc_ast.clear_caches()  # As in a fresh process
+    again = mesh.extract_project_context(base_dir=str(project))
+    assert again["user_stories"] == ctx["user_stories"] and not again["debug"]["errors"]
+
+    (project / "docs" / "SPEC.md").write_text(SPEC + "POST /api/patients\n", encoding="utf-8")
+    errors = mesh.extract_project_context(base_dir=str(project))["debug"]["errors"]
+    assert errors == ["SPEC read error: re-extracted an unchanged doc"]
+
+
+def test_concurrent_saves_merge(project):
+    prd = project / "docs" / "PRD.md"
+    state = project / "control" / "state"
+    a, b = doc_ast.AnalysisStore(state), doc_ast.AnalysisStore(state)
+    a.put(prd, PRD, "first", [1])
+    b.put(prd, PRD, "second", {"x": 2})
+    assert a.save() and b.save()
+    assert not b.save()  # Nothing new
+
+    fresh = doc_ast.AnalysisStore(state)
+    assert fresh.lookup(prd, PRD, "first") == [1] and fresh.lookup(prd, PRD, "second") == {"x": 2}
+    assert fresh.lookup(prd, PRD + "edited", "first") is None
@@ -0,0 +1,119 @@
+"""
+v43: Single-pass markdown tokenizer behind the plan extractors and readiness.
+
+- Sections keep the original regex semantics (heading levels, "---" stops)
+- Each document is tokenized and analyzed once per content version
+- Readiness header/bullet checks agree with the per-line regexes they replace
+"""
+import importlib
+import re
+import sys
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tools import doc_ast
+
+PRD = """# PRD
+
+## User Stories
+### Must Have (MVP)
+- US1: As a developer, I can see pipeline status at a glance
+      **Acceptance:** All 6 stages visible with coloring
+- [ ] Operators can export the audit trail as CSV
+
+### Should Have (vNext)
+- US4: As a team lead, I can review pipeline snapshots
+
+## Goals
+- Ship it
+"""
+
+SPEC = """## Data Model
+| Entity | Fields |
+|--------|--------|
+| User | id, email |
+- **Invoice** (invoices.parquet): id, total, due_date
+---
+- Payment: outside the section
+
+## API
+| Method | Path |
+| GET | /api/users |
+POST /api/invoices
+class LedgerEntry:
+"""
+
+
+@pytest.fixture
+def mesh(tmp_path, monkeypatch):
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    doc_ast.clear_caches()
+    import mesh_server
+    return importlib.reload(mesh_server)
+
+
+def test_sections_keep_regex_semantics():
+    doc = doc_ast.parse_markdown(PRD)
+    assert [(level, title) for _, level, title in doc.headings] == [
+        (1, "PRD"), (2, "User Stories"), (3, "Must Have (MVP)"), (3, "Should Have (vNext)"), (2, "Goals"),
+    ]
+    # A sub-heading right under the section heading opens the body
+    body = doc.section(re.compile(r"(?:#{1,3}\s*)?User\s*Stories?\s*$", re.I))
+    assert body[0] == "### Must Have (MVP)" and body[-1] == ""
+    assert doc.section(re.compile("Nope")) is None
+
+    spec = doc_ast.parse_markdown(SPEC)
+    body = spec.section(re.compile(r"(?:#{1,3}\s*)?Data\s*Model\s*$", re.I),
+                        stop=lambda line: line.startswith("---"))
+    assert body[-1].startswith("- **Invoice**")
+
+
+def test_extractors_parse_each_version_once(mesh, monkeypatch):
+    stories = mesh._extract_user_stories(PRD)
+    assert [s["id"] for s in stories] == ["US-01", "US-04", "US-03", "US-04"]
+    assert stories[3]["story"] == "Operators can export the audit trail as CSV"
+
+    entities = mesh._extract_data_entities(SPEC)
+    assert [e["name"] for e in entities] == ["User", "Invoice", "LedgerEntry"]
+    assert entities[1]["fields"] == "id, total, due_date"
+    assert [(e["method"], e["path"]) for e in mesh._extract_api_endpoints(SPEC)] == [
+        ("GET", "/users"), ("POST", "/api/invoices"),  # Table cells keep their greedy last-slash match
+    ]
+
+    calls = []
+    original = doc_ast.MarkdownDoc.__init__
+
+    def counting(self, *args, **kwargs):
+        calls.append(1)
+        original(self, *args, **kwargs)
+
+    monkeypatch.setattr(doc_ast.MarkdownDoc, "__init__", counting)
+    again = mesh._extract_user_stories(PRD)
+    assert again == stories and again[0] is not stories[0]  # Callers get copies
+    again[0]["story"] = "mutated"
+    assert mesh._extract_user_stories(PRD)[0]["story"] != "mutated"
+    mesh._extract_data_entities(SPEC)
+    assert calls == []
+    mesh._extract_user_stories(PRD + "\n")
+    assert calls == [1]
+
+
+def test_readiness_queries_match_line_regexes():
+    text = "\n".join([
+        "## Goals", "# Goals (v2)", "Users:", "  - item", "1. numbered", "[x] done",
+        "-", "*bold*", "- [ ] task", "##NoSpace", "Tech Stack (draft)",
+    ])
+    doc = doc_ast.parse_markdown(text)
+    for header in ("Goals", "Users", "Tech Stack", "NoSpace", "Missing"):
+        expected = bool(re.search(rf"^(?:#{{1,6}}\s+)?{re.escape(header)}(?:[\s:]*$|\s*\()", text,
+                                  re.MULTILINE | re.IGNORECASE))
+        assert doc.has_header(header) == expected, header
+    assert len(doc.bullets) == len(re.findall(r"^[\s]*(?:(?:[-*]|\d+\.)\s+(?:\[[ xX]\]\s+)?|\[[ xX]\]\s+)",
+                                              text, re.MULTILINE))
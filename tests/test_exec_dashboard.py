@@ -262,6 +262,68 @@ class TestGetExecSnapshot:
         assert isinstance(result["lanes"], list)
         assert isinstance(result["alerts"], list)
 
+    def test_sections_cached_until_change_counters_move(self, exec_workspace, monkeypatch):
+        """v32: unchanged tables skip their queries; writes (via triggers) invalidate."""
+        import mesh_server
+        from mesh_server import get_exec_snapshot, get_db
+
+        first = json.loads(get_exec_snapshot())
+
+        def fail(conn):
+            raise AssertionError("lane stats recomputed without a tasks write")
+
+        original = mesh_server._exec_lane_stats
+        monkeypatch.setattr(mesh_server, "_exec_lane_stats", fail)
+        assert json.loads(get_exec_snapshot())["lanes"] == first["lanes"]
+
+        monkeypatch.setattr(mesh_server, "_exec_lane_stats", original)
+        with get_db() as conn:
+            conn.execute(
+                "INSERT INTO tasks (type, lane, desc, status, updated_at) VALUES (?, ?, ?, ?, ?)",
+                ("backend", "backend", "New", "pending", int(time.time()))
+            )
+        lanes = json.loads(get_exec_snapshot())["lanes"]
+        assert next(l for l in lanes if l["name"] == "backend")["pending"] == 1
+
+    def test_if_none_match_returns_not_modified(self, exec_workspace):
+        """v32: matching etag returns a tiny not_modified response."""
+        from mesh_server import get_exec_snapshot, get_db
+
+        first = json.loads(get_exec_snapshot())
+        assert json.loads(get_exec_snapshot(if_none_match=first["etag"])) == {
+            "etag": first["etag"], "not_modified": True,
+        }
+
+        with get_db() as conn:
+            conn.execute("INSERT INTO tasks (type, desc, status) VALUES ('backend', 'x', 'blocked')")
+        changed = json.loads(get_exec_snapshot(if_none_match=first["etag"]))
+        assert changed["etag"] != first["etag"]
+        assert any(a["code"] == "TASKS_BLOCKED" for a in changed["alerts"])
+
+    def test_etag_ignores_passing_time(self, exec_workspace, monkeypatch):
+        """v32: ages tick every second but the etag only moves with the data."""
+        import mesh_server
+        from mesh_server import get_exec_snapshot, get_db, worker_heartbeat
+
+        start = int(time.time())
+        with get_db() as conn:
+            conn.execute(
+                "INSERT INTO tasks (type, lane, desc, status, updated_at) VALUES (?, ?, ?, ?, ?)",
+                ("backend", "backend", "Active", "in_progress", start - 30)
+            )
+        worker_heartbeat(worker_id="w1", worker_type="backend", allowed_lanes=["backend"])
+        first = json.loads(get_exec_snapshot())
+
+        monkeypatch.setattr(mesh_server.time, "time", lambda: start + 7)
+        assert json.loads(get_exec_snapshot(if_none_match=first["etag"])) == {
+            "etag": first["etag"], "not_modified": True,
+        }
+        later = json.loads(get_exec_snapshot())
+        assert later["etag"] == first["etag"]
+        assert later["active_tasks"][0]["age_s"] == 37
+        assert later["workers"][0]["last_seen_s"] >= 7
+        assert "_updated_at" not in later["active_tasks"][0] and "_last_seen" not in later["workers"][0]
+
 
 class TestWorkerHeartbeat:
     """Tests for worker_heartbeat MCP tool."""
@@ -0,0 +1,124 @@
+"""
+v38: Flow metrics (tools/flow_metrics.py + get_flow_metrics / exec snapshot).
+
+- Wait / service / review / lead intervals come from consecutive transitions
+- Rework counts reject/reopen transitions against completions
+- Erlang C sizing: more load or a tighter target needs more workers
+"""
+import importlib
+import json
+import sys
+import os
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tools import flow_metrics
+
+
+def _t(task_id, frm, to, at, lane="backend", via="", archetype="GENERIC"):
+    return {"task_id": task_id, "from_status": frm, "to_status": to, "at": at,
+            "lane": lane, "via": via, "archetype": archetype}
+
+
+def test_intervals_and_rework():
+    rows = [
+        _t(1, None, "pending", 0),
+        _t(1, "pending", "in_progress", 100, via="claim"),
+        _t(1, "in_progress", "review_needed", 400),
+        _t(1, "review_needed", "in_progress", 500, via="reject"),
+        _t(1, "in_progress", "completed", 700, via="complete"),
+        _t(2, None, "pending", 3000, lane="frontend", archetype="UI"),
+        _t(2, "pending", "in_progress", 3300, lane="frontend", archetype="UI", via="claim"),
+        _t(3, "in_progress", "completed", 3500, lane="frontend", via="complete"),  # Pre-log task
+    ]
+    metrics = flow_metrics.compute_flow_metrics(rows, 0, 3600, target_wait_s=600, created_at={3: 500})
+
+    overall = metrics["overall"]
+    assert overall["arrivals"] == 2 and overall["completed"] == 2 and overall["rework"] == 1
+    assert overall["rework_rate"] == round(1 / 3, 3)
+    assert overall["wait"]["count"] == 2 and overall["wait"]["p90_s"] == 300
+    assert overall["service"]["count"] == 2 and sorted([overall["service"]["p50_s"], overall["service"]["p95_s"]]) == [200, 300]
+    assert overall["review_dwell"]["p50_s"] == 100
+    assert sorted([overall["lead_time"]["p50_s"], overall["lead_time"]["p95_s"]]) == [700, 3000]
+    assert metrics["lanes"]["frontend"]["arrivals"] == 1
+    assert metrics["archetypes"]["UI"]["wait"]["p50_s"] == 300
+
+
+def test_window_only_counts_intervals_ending_inside():
+    rows = [_t(1, None, "pending", 50), _t(1, "pending", "in_progress", 150)]
+    metrics = flow_metrics.compute_flow_metrics(rows, 100, 200, target_wait_s=60)
+    assert metrics["overall"]["arrivals"] == 0
+    assert metrics["overall"]["wait"]["p50_s"] == 100
+
+
+def test_workers_needed_erlang_c():
+    assert flow_metrics.erlang_c_wait(1.0, 1.0, 1) is None  # rho = 1: unstable
+    # M/M/1 with rho = 0.5: Wq = rho / (mu - lambda) = 1s
+    assert flow_metrics.erlang_c_wait(0.5, 1.0, 1) == pytest.approx(1.0)
+    # Offered load 0.5: one worker waits 300s on average, two wait 20s
+    assert flow_metrics.workers_needed(1 / 600, 300, target_wait_s=600) == 1
+    assert flow_metrics.workers_needed(1 / 600, 300, target_wait_s=60) == 2
+    heavy = flow_metrics.workers_needed(1 / 60, 300, target_wait_s=60)
+    assert heavy > 5
+    assert flow_metrics.workers_needed(1 / 60, 300, target_wait_s=1) > heavy - 1
+    assert flow_metrics.workers_needed(0, None, 60) == 0
+
+
+@pytest.fixture
+def mesh(tmp_path, monkeypatch):
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    import mesh_server
+    return importlib.reload(mesh_server)
+
+
+def test_tool_and_exec_snapshot_read_transition_log(mesh):
+    now = int(time.time())
+    with mesh.get_db() as conn:
+        for task_id in range(1, 5):
+            conn.execute(
+                "INSERT INTO tasks (id, type, lane, desc, status) VALUES (?, 'backend', 'backend', 'x', 'pending')",
+                (task_id,),
+            )
+        # Backdate the arrivals the insert trigger logged
+        conn.execute("UPDATE task_transitions SET at = ? - 7200 + task_id * 60", (now,))
+        for task_id in range(1, 4):
+            for frm, to, offset in (("pending", "in_progress", 600), ("in_progress", "completed", 1800)):
+                conn.execute(
+                    "INSERT INTO task_transitions (task_id, from_status, to_status, lane, via, at) "
+                    "VALUES (?, ?, ?, 'backend', 'x', ?)", (task_id, frm, to, now - 7200 + task_id * 60 + offset),
+                )
+
+    metrics = json.loads(mesh.get_flow_metrics(window_hours=4, target_wait_s=300))
+    backend = metrics["lanes"]["backend"]
+    assert metrics["status"] == "OK"
+    assert backend["arrivals"] == 4 and backend["completed"] == 3
+    assert backend["wait"]["p50_s"] == 600 and backend["service"]["p50_s"] == 1200
+    assert backend["workers_needed"] >= 1
+
+    snapshot = json.loads(mesh.get_exec_snapshot())
+    lanes = {lane["name"]: lane for lane in snapshot["flow"]["lanes"]}
+    assert lanes["backend"]["service_p50_s"] == 1200
+    assert "window_hours must be" in mesh.get_flow_metrics(window_hours=0)
+
+
+def test_exec_snapshot_flow_refreshes_per_bucket_not_per_write(mesh, monkeypatch):
+    calls = []
+    summary = mesh._exec_flow_summary
+    monkeypatch.setattr(mesh, "_exec_flow_summary", lambda conn, now: (calls.append(now), summary(conn, now))[1])
+    monkeypatch.setattr(mesh.time, "time", lambda: 1_000_000)
+    for n in range(3):
+        with mesh.get_db() as conn:
+            conn.execute("INSERT INTO tasks (type, desc, status) VALUES ('backend', ?, 'pending')", (f"t{n}",))
+        assert json.loads(mesh.get_exec_snapshot())["flow"] is not None
+    assert len(calls) == 1  # Task churn reuses the bucket's metrics
+
+    monkeypatch.setattr(mesh.time, "time", lambda: 1_000_000 + mesh.FLOW_EXEC_BUCKET_S)
+    mesh.get_exec_snapshot()
+    assert len(calls) == 2
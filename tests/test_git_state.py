@@ -0,0 +1,171 @@
+"""
+v35: Shared background git-status cache (tools/git_state.py).
+
+- Background refresh picks up commits via the .git/index poller
+- invalidate() + max_age_s forces a fresh answer; plain reads never run git
+- Non-repos fail open (clean) with the error kept
+- The watchdog branch schedules off the caller's thread and ignores DB/WAL and .git noise
+- snapshot / librarian / vibe_mcp.git_server read the shared cache
+"""
+import subprocess
+import sys
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tools import git_state
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo, capture_output=True, check=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "a.txt").write_text("a\n", encoding="utf-8")
+    _git(tmp_path, "add", "a.txt")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    return tmp_path
+
+
+@pytest.fixture
+def service(repo):
+    s = git_state.GitStateService(str(repo), max_age_s=60, poll_interval_s=0.05, use_watchdog=False)
+    s.start()
+    yield s
+    s.stop()
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_background_refresh_tracks_index_changes(repo, service):
+    first = service.get(wait_s=5)
+    assert first.ok and first.clean and first.branch
+
+    (repo / "b.txt").write_text("b\n", encoding="utf-8")
+    _git(repo, "add", "b.txt")  # Touches .git/index -> poller refreshes
+    assert _wait_for(lambda: any("b.txt" in e for e in service.get().entries))
+
+    _git(repo, "commit", "-q", "-m", "b")
+    assert _wait_for(lambda: service.get().clean)
+    assert service.get().age_s < 5
+
+
+def test_reads_are_cached_until_invalidated(repo, service, monkeypatch):
+    service.get(wait_s=5)
+    calls = []
+    real = git_state.run_git_status
+    monkeypatch.setattr(git_state, "run_git_status", lambda *a: calls.append(a) or real(*a))
+
+    (repo / "a.txt").write_text("changed\n", encoding="utf-8")  # Worktree edit: not polled
+    for _ in range(5):
+        assert service.get(max_age_s=60).clean
+    assert calls == []
+
+    service.invalidate()
+    state = service.get(max_age_s=60)
+    assert not state.clean and state.entries == (" M a.txt",)
+
+
+def test_non_repo_fails_open(tmp_path):
+    state = git_state.run_git_status(str(tmp_path))
+    assert not state.ok and state.error and state.clean
+    assert git_state.PENDING_STATE.age_s is None
+
+
+class _FakeObserver:
+    """Stands in for watchdog's Observer; schedule() blocks like a big recursive walk."""
+    instances = []
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.handler = None
+        self.started = self.stopped = False
+        _FakeObserver.instances.append(self)
+
+    def schedule(self, handler, path, recursive=False):
+        assert recursive and threading.current_thread() is not threading.main_thread()
+        self.release.wait(5)
+        self.handler = handler
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.stopped = True
+
+
+def test_watchdog_setup_runs_off_the_caller_and_filters_events(repo, monkeypatch):
+    _FakeObserver.instances = []
+    monkeypatch.setattr(git_state, "WATCHDOG_AVAILABLE", True)
+    monkeypatch.setattr(git_state, "Observer", _FakeObserver, raising=False)
+    s = git_state.GitStateService(str(repo), max_age_s=60, poll_interval_s=60, use_watchdog=True)
+
+    started = time.monotonic()
+    s.start()
+    try:
+        assert time.monotonic() - started < 1  # schedule() is still blocked
+        assert s.get(wait_s=5).ok and s.watching == "poll"
+
+        fake = _FakeObserver.instances[0]
+        fake.release.set()
+        assert _wait_for(lambda: s.watching == "watchdog") and fake.started
+
+        def fire(*paths):
+            with s._lock:
+                s._dirty = False
+            fake.handler.on_any_event(SimpleNamespace(src_path=paths[0], dest_path=paths[1] if paths[1:] else ""))
+            return s._dirty
+
+        git_dir = s.git_dir
+        for noise in ("mesh.db", "mesh.db-wal", "mesh.db-shm"):
+            assert not fire(os.path.join(str(repo), noise))
+        assert not fire(os.path.join(git_dir, "objects", "ab", "cdef"))
+        assert not fire(os.path.join(git_dir, "logs", "HEAD.lock"))
+        assert fire(os.path.join(str(repo), "a.txt"))
+        assert fire(os.path.join(git_dir, "index.lock"), os.path.join(git_dir, "index"))
+    finally:
+        s.stop()
+    assert fake.stopped and s.watching == "poll"
+
+
+def test_callers_share_the_cache(repo, monkeypatch):
+    from tools import snapshot
+    import librarian_tools
+    from vibe_mcp import git_server
+
+    git_state.stop_all()  # Drop services other tests started
+    (repo / "a.txt").write_text("changed\n", encoding="utf-8")
+    (repo / "new.txt").write_text("n\n", encoding="utf-8")
+    try:
+        assert snapshot.check_git_clean(repo) is False
+        lib = librarian_tools.check_git_status(str(repo))
+        assert lib["modified_files"] == ["a.txt"] and lib["untracked_files"] == ["new.txt"]
+        status = git_server.git_status(str(repo))
+        assert status["modified"] == ["a.txt"] and status["untracked"] == ["new.txt"]
+        assert status["age_s"] >= 0
+
+        calls = []
+        monkeypatch.setattr(git_state, "run_git_status", lambda *a: calls.append(a))
+        assert snapshot.check_git_clean(repo) is False
+        assert calls == []  # Served from the shared service
+        assert list(git_state._services) == [os.path.realpath(repo)]
+    finally:
+        git_state.stop_all()
@@ -0,0 +1,117 @@
+"""
+v34: Materialized lane_status_counts maintained by triggers on tasks.
+
+- Random inserts/updates/deletes keep the table equal to GROUP BY over tasks
+- repair_lane_status_counts() rebuilds after drift; verify_db_integrity reports it
+- Status surfaces (exec lane stats, project status, snapshot) read the table
+"""
+import importlib
+import json
+import random
+import sqlite3
+import sys
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STATUSES = ["pending", "in_progress", "blocked", "completed", "BLOCKED", "Failed"]
+LANES = ["backend", "frontend", "qa", "", None]
+
+
+@pytest.fixture
+def mesh(tmp_path, monkeypatch):
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    import mesh_server
+    return importlib.reload(mesh_server), db
+
+
+def _materialized(conn):
+    return sorted(tuple(r) for r in conn.execute("SELECT lane, type, status, count FROM lane_status_counts"))
+
+
+def _expected(conn):
+    return sorted(tuple(r) for r in conn.execute("""
+        SELECT IFNULL(lane, ''), IFNULL(type, ''), IFNULL(status, ''), COUNT(*)
+        FROM tasks GROUP BY 1, 2, 3
+    """))
+
+
+def test_triggers_track_random_writes(mesh):
+    mesh_server, db = mesh
+    rng = random.Random(34)
+    with mesh_server.get_db() as conn:
+        for i in range(400):
+            op = rng.random()
+            ids = [r[0] for r in conn.execute("SELECT id FROM tasks")]
+            if op < 0.5 or not ids:
+                conn.execute(
+                    "INSERT INTO tasks (type, lane, desc, status) VALUES (?, ?, ?, ?)",
+                    (rng.choice(["backend", "frontend"]), rng.choice(LANES), f"t{i}", rng.choice(STATUSES)),
+                )
+            elif op < 0.8:
+                conn.execute(
+                    "UPDATE tasks SET status = ?, lane = ? WHERE id = ?",
+                    (rng.choice(STATUSES), rng.choice(LANES), rng.choice(ids)),
+                )
+            elif op < 0.9:
+                conn.execute("UPDATE tasks SET priority = priority + 1 WHERE id = ?", (rng.choice(ids),))
+            else:
+                conn.execute("DELETE FROM tasks WHERE id = ?", (rng.choice(ids),))
+
+        assert _materialized(conn) == _expected(conn)
+        assert all(row[3] > 0 for row in _materialized(conn))
+
+
+def test_repair_rebuilds_after_drift(mesh):
+    mesh_server, db = mesh
+    with mesh_server.get_db() as conn:
+        conn.execute("INSERT INTO tasks (type, lane, desc, status) VALUES ('backend', 'backend', 'a', 'pending')")
+        conn.execute("UPDATE lane_status_counts SET count = 42")
+
+    assert "drift" in mesh_server.verify_db_integrity()
+    assert "1 rows corrected" in mesh_server.repair_lane_status_counts()
+    assert "drift" not in mesh_server.verify_db_integrity()
+    assert "already consistent" in mesh_server.repair_lane_status_counts()
+
+
+def test_surfaces_read_materialized_counts(mesh):
+    mesh_server, db = mesh
+    with mesh_server.get_db() as conn:
+        conn.execute("INSERT INTO tasks (type, lane, desc, status) VALUES ('backend', '', 'a', 'in_progress')")
+        conn.execute("INSERT INTO tasks (type, lane, desc, status) VALUES ('frontend', 'qa', 'b', 'pending')")
+        # Skew the table so a tasks scan would disagree with it
+        conn.execute("UPDATE lane_status_counts SET count = 7 WHERE lane = 'qa'")
+
+    with mesh_server.get_db() as conn:
+        lanes = {lane["name"]: lane for lane in mesh_server._exec_lane_stats(conn)}
+    assert lanes["backend"]["active"] == 1
+    assert lanes["qa"]["pending"] == 7
+
+    project = json.loads(mesh_server.get_project_status())
+    assert project["pending"] == 7
+
+    from tools import snapshot
+    agg = snapshot.load_task_aggregates(db)
+    assert agg["pending"] == 7 and agg["active"] == 1
+    assert {"Lane": "UNKNOWN", "Status": "in_progress", "Count": 1} in agg["lane_counts"]
+
+
+def test_init_db_backfills_existing_tasks(mesh):
+    mesh_server, db = mesh
+    conn = sqlite3.connect(db)  # Simulate a pre-v34 DB
+    for op in ("insert", "update", "delete"):
+        conn.execute(f"DROP TRIGGER trg_tasks_lane_status_{op}")
+    conn.execute("DROP TABLE lane_status_counts")
+    conn.execute("INSERT INTO tasks (type, lane, desc, status) VALUES ('backend', 'backend', 'old', 'completed')")
+    conn.commit()
+    conn.close()
+
+    mesh_server.init_db(force=True)
+    with mesh_server.get_db() as conn:
+        assert _materialized(conn) == _expected(conn) == [("backend", "backend", "completed", 1)]
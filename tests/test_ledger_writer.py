@@ -0,0 +1,122 @@
+"""
+v50: Group-commit Release Ledger writer (tools/ledger_writer.py).
+
+- Concurrent appends share writes/fsyncs; every entry lands exactly once, whole
+- A torn last line from a crash is terminated or moved to .partial
+- Durability levels: sync waits for fsync, batch for write(), async for nothing
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tools import ledger_writer
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    path = tmp_path / "state" / "release_ledger.jsonl"
+    writers = []
+
+    def make(**kwargs):
+        writer = ledger_writer.LedgerWriter(str(path), **kwargs)
+        writers.append(writer)
+        return writer
+
+    yield path, make
+    for writer in writers:
+        writer.stop()
+
+
+def _lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_concurrent_appends_group_commit(ledger, monkeypatch):
+    path, make = ledger
+    writer = make()
+    real_fsync = os.fsync
+
+    def fsync(fd):
+        time.sleep(0.002)  # A real disk: decisions queue up behind each fsync
+        real_fsync(fd)
+
+    monkeypatch.setattr(ledger_writer.os, "fsync", fsync)
+
+    def worker(n):
+        for i in range(40):
+            writer.append([{"task_id": n * 1000 + i, "notes": "é" * (i % 7)}])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    ids = [e["task_id"] for e in _lines(path)]
+    assert sorted(ids) == sorted(n * 1000 + i for n in range(16) for i in range(40))
+    assert writer.stats["entries"] == 640
+    assert writer.stats["fsyncs"] == writer.stats["writes"] < 640 // 2  # Groups, not one per entry
+
+
+def test_recovers_torn_tail(ledger):
+    path, make = ledger
+    path.parent.mkdir()
+    path.write_bytes(b'{"task_id": 1}\n{"task_id": 2, "deci')
+    make().append([{"task_id": 3}])
+    assert [e["task_id"] for e in _lines(path)] == [1, 3]
+    assert (path.parent / (path.name + ".partial")).read_bytes() == b'{"task_id": 2, "deci\n'
+
+    # A complete entry that only lost its newline is kept
+    with open(path, "ab") as f:
+        f.write(b'{"task_id": 4}')  # Another process crashed after this write
+    writer = make()
+    writer.append([{"task_id": 5}])
+    assert [e["task_id"] for e in _lines(path)] == [1, 3, 4, 5]
+    assert writer.last_recovery == "terminated"
+    assert ledger_writer.recover_partial_tail(str(path)) is None
+
+
+def test_durability_levels(ledger):
+    path, make = ledger
+    writer = make(durability="batch", fsync_interval_ms=60_000, fsync_entries=3)
+    writer.append([{"task_id": 1}])
+    assert _lines(path) == [{"task_id": 1}] and writer.stats["fsyncs"] == 0
+    writer.append([{"task_id": 2}, {"task_id": 3}])  # Third entry reaches fsync_entries
+    deadline = time.monotonic() + 5
+    while writer.stats["fsyncs"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer.stats["fsyncs"] == 1
+
+    writer.append([{"task_id": 4}], durability="sync")
+    assert writer.stats["fsyncs"] == 2
+
+    gate = threading.Event()
+    write = writer._write
+    writer._write = lambda group: (gate.wait(5), write(group))
+    writer.append([{"task_id": 5}], durability="async")  # Returns while the writer is held
+    assert len(_lines(path)) == 4
+    gate.set()
+    assert writer.flush(timeout=5)
+    assert [e["task_id"] for e in _lines(path)] == [1, 2, 3, 4, 5]
+
+    with pytest.raises(ValueError):
+        writer.append([{"task_id": 6}], durability="eventually")
+
+
+def test_write_errors_reach_sync_callers(ledger):
+    path, make = ledger
+    writer = make()
+    writer.append([{"task_id": 1}])
+    writer._file.close()  # Next write fails (handle gone)
+    writer._open = lambda: (_ for _ in ()).throw(OSError("disk full"))
+    with pytest.raises(OSError, match="disk full"):
+        writer.append([{"task_id": 2}])
+    assert writer.stats["errors"] == 1 and _lines(path) == [{"task_id": 1}]
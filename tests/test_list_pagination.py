@@ -0,0 +1,134 @@
+"""
+v36: Cursor pagination contract for MCP list tools.
+
+- Walking next_cursor visits every item exactly once, in the tool's order
+- Responses are compact JSON with next_cursor / page_size / total_estimate
+- Foreign or malformed cursors are rejected
+"""
+import importlib
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def mesh(tmp_path, monkeypatch):
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    import mesh_server
+    return importlib.reload(mesh_server)
+
+
+def _walk(tool, items_key, **kwargs):
+    pages, cursor = [], ""
+    while True:
+        raw = tool(cursor=cursor, **kwargs)
+        page = json.loads(raw)
+        assert raw == json.dumps(page, separators=(",", ":"))  # Compact JSON
+        assert page["status"] in ("OK", "EMPTY"), page
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if not cursor:
+            return pages, [item for p in pages for item in p[items_key]]
+
+
+def test_task_history_pages_back_in_time(mesh):
+    with mesh.get_db() as conn:
+        conn.execute("INSERT INTO tasks (id, type, desc, status) VALUES (1, 'backend', 'x', 'pending')")
+        for i in range(25):
+            # Duplicate timestamps exercise the (created_at, id) tie-break
+            conn.execute(
+                "INSERT INTO task_messages (task_id, role, msg_type, content, created_at) "
+                "VALUES (1, 'worker', 'note', ?, ?)",
+                (f"m{i}", 1000 + i // 3),
+            )
+
+    pages, _ = _walk(mesh.get_task_history, "messages", task_id=1, limit=10)
+    assert [len(p["messages"]) for p in pages] == [10, 10, 5]
+    assert pages[0]["total_estimate"] == 25 and pages[0]["page_size"] == 10
+    # Each page is chronological; pages go newest -> oldest
+    contents = [m["content"] for p in reversed(pages) for m in p["messages"]]
+    assert contents == [f"m{i}" for i in range(25)]
+
+
+def test_audit_log_and_route_history_keyset(mesh):
+    with mesh.get_db() as conn:
+        for i in range(7):
+            conn.execute(
+                "INSERT INTO audit_log (task_id, action, strictness, reason, retry_count, created_at) "
+                "VALUES (?, 'approve', 'normal', 'ok', 0, ?)", (i, 500 + i // 2),
+            )
+        conn.execute("""CREATE TABLE route_log (id INTEGER PRIMARY KEY AUTOINCREMENT, input TEXT,
+            intent TEXT, action TEXT, parameters TEXT, confidence REAL, source TEXT, created_at INTEGER)""")
+        for i in range(5):
+            conn.execute("INSERT INTO route_log (input, created_at) VALUES (?, 9)", (f"r{i}",))
+
+    pages, entries = _walk(mesh.get_audit_log, "entries", limit=3)
+    assert len(pages) == 3 and pages[0]["total_estimate"] == 7
+    assert [e["task_id"] for e in entries] == [6, 5, 4, 3, 2, 1, 0]
+
+    _, routes = _walk(mesh.get_route_history, "entries", limit=2)
+    assert [r["input"] for r in routes] == ["r4", "r3", "r2", "r1", "r0"]
+
+
+def test_ledger_reads_backwards_with_filter(mesh, monkeypatch):
+    monkeypatch.setattr(mesh, "LEDGER_READ_BLOCK", 64)  # Force lines across blocks
+    path = mesh.get_state_path("release_ledger.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(40):
+            actor = "HUMAN" if i % 2 else "AUTO"
+            f.write(json.dumps({"task_id": i, "actor": actor, "decision": "APPROVE"}) + "\n")
+        f.write("not json\n")
+
+    _, entries = _walk(mesh.get_ledger_entries, "entries", limit=7)
+    assert [e["task_id"] for e in entries] == list(range(39, -1, -1))
+
+    pages, humans = _walk(mesh.get_ledger_entries, "entries", limit=6, filter_text="human")
+    assert [e["task_id"] for e in humans] == list(range(39, 0, -2))
+    assert pages[0]["summary"]["by_actor"]["HUMAN"] == 6
+    assert 10 <= pages[0]["total_estimate"] <= 30
+
+
+def test_review_queues_risk_order_across_pages(mesh):
+    reviews = mesh.get_state_path("reviews")
+    base = datetime(2026, 1, 1)
+    for task_id in range(1, 8):
+        sources = ["HIPAA-1"] if task_id % 3 == 0 else ["STD-1"]
+        packet = {
+            "meta": {"task_id": task_id, "generated_at": (base + timedelta(hours=task_id)).isoformat(),
+                     "snapshot_hash": "x"},
+            "claims": {"source_ids": sources, "description": f"t{task_id}"},
+        }
+        with open(os.path.join(reviews, f"T-{task_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(packet, f)
+
+    pages, items = _walk(mesh.list_pending_reviews, "reviews", limit=3)
+    assert [r["task_id"] for r in items] == [3, 6, 1, 2, 4, 5, 7]
+    assert pages[0]["mandatory_count"] == 2 and pages[0]["total_estimate"] == 7
+
+    _, queue = _walk(mesh.get_review_queue, "reviews", limit=4, auto_heal=False)
+    assert sorted(r["task_id"] for r in queue) == list(range(1, 8))
+
+
+def test_snapshots_page_newest_first(mesh):
+    snap_dir = os.path.join(mesh.CONTROL_DIR, "snapshots")
+    os.makedirs(snap_dir)
+    for i in range(5):
+        open(os.path.join(snap_dir, f"snap_2026010{i}.zip"), "wb").close()
+
+    _, snaps = _walk(mesh.list_snapshots, "snapshots", limit=2)
+    assert [s["name"] for s in snaps] == [f"snap_2026010{i}.zip" for i in range(4, -1, -1)]
+
+
+def test_cursor_is_bound_to_its_tool(mesh):
+    cursor = mesh._encode_cursor("audit_log", [1, 2])
+    assert "invalid cursor" in mesh.get_route_history(cursor=cursor)
+    assert "invalid cursor" in mesh.get_audit_log(cursor="not-a-cursor!")
@@ -0,0 +1,179 @@
+"""
+v47: Plan diffing / incremental re-acceptance.
+
+- A changed plan re-accepted from the same path is diffed against the
+  previously accepted version instead of ingested afresh
+- Edited lines (same K:) keep their task id while still pending/blocked
+- Removed lines cancel pending work and leave active/finished work alone
+- diff_plan previews the same result without writing
+- Signatures queued outside the plan are skipped for added and edited lines alike
+"""
+import importlib
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PLAN = [
+    "- [ ] Backend: Build API | K:api",
+    "- [ ] Frontend: Build page | K:page | Dep:backend:api",
+    "- [ ] Docs: Write guide | K:guide",
+    "- [ ] QA: Smoke test | K:smoke | Dep:frontend:page",
+]
+
+
+@pytest.fixture
+def mesh(tmp_path, monkeypatch):
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    import mesh_server
+    mesh_server = importlib.reload(mesh_server)
+    monkeypatch.setattr(mesh_server, "get_context_readiness", lambda: '{"status": "OK"}')
+    return mesh_server
+
+
+def _write(tmp_path, lines):
+    plan = tmp_path / "plan.md"
+    plan.write_text("# Plan\n" + "\n".join(lines) + "\n", encoding="utf-8")
+    return str(plan)
+
+
+def _tasks(mesh):
+    with mesh.get_db() as conn:
+        rows = conn.execute("SELECT id, desc, status, deps, lane_rank, source_plan_hash FROM tasks").fetchall()
+    return {r["desc"].split(" |")[0]: dict(r, deps=json.loads(r["deps"])) for r in rows}
+
+
+def test_reaccept_applies_only_the_edit(mesh, tmp_path):
+    first = json.loads(mesh.accept_plan(_write(tmp_path, PLAN)))
+    ids = {t["desc"].split(" |")[0]: t["id"] for t in first["tasks"]}
+    with mesh.get_db() as conn:
+        conn.execute("UPDATE tasks SET status='in_progress' WHERE id = ?",  # SAFETY-ALLOW: status-write
+                     (ids["Smoke test"],))
+
+    edited = [
+        "- [ ] Backend: Build API v2 | K:api",  # Edited in place
+        "- [ ] Frontend: Build page | K:page | Dep:backend:api",  # Unchanged
+        "- [ ] Backend: Add auth | K:auth",  # New
+        "- [ ] Frontend: Settings | Dep:backend:auth",  # New, depends on a new key
+    ]  # Guide removed (pending -> cancelled), Smoke test removed (active -> kept)
+    path = _write(tmp_path, edited)
+    preview = json.loads(mesh.diff_plan(path))
+    assert preview["status"] == "OK"
+    assert preview["changed"] == [ids["Build API"]] and preview["added"] == 2 and preview["kept"] == 1
+    assert preview["retired"] == [ids["Write guide"]] and preview["removed_active"] == [ids["Smoke test"]]
+    assert _tasks(mesh)["Write guide"]["status"] == "pending"  # Preview wrote nothing
+
+    result = json.loads(mesh.accept_plan(path))
+    assert result["status"] == "OK" and result["incremental"]
+    assert {k: v for k, v in result["diff"].items() if k != "rewired"} == {
+        k: v for k, v in preview.items() if k in result["diff"]
+    }
+    tasks = _tasks(mesh)
+    assert tasks["Build API v2"]["id"] == ids["Build API"]
+    assert tasks["Build page"]["deps"] == [ids["Build API"]]  # Still points at the edited task
+    assert tasks["Settings"]["deps"] == [tasks["Add auth"]["id"]]
+    assert tasks["Add auth"]["lane_rank"] == 1 and tasks["Settings"]["lane_rank"] == 1
+    assert tasks["Write guide"]["status"] == "cancelled"
+    assert tasks["Smoke test"]["status"] == "in_progress"
+    new_hash = result["plan_hash"]
+    assert {tasks[d]["source_plan_hash"] for d in ("Build API v2", "Build page", "Add auth", "Settings")} == {new_hash}
+
+    assert json.loads(mesh.accept_plan(path))["status"] == "ALREADY_ACCEPTED"
+    assert json.loads(mesh.diff_plan(path))["status"] == "UNCHANGED"
+
+
+def test_edit_of_started_task_is_added(mesh, tmp_path):
+    first = json.loads(mesh.accept_plan(_write(tmp_path, PLAN[:2])))
+    api_id = first["tasks"][0]["id"]
+    with mesh.get_db() as conn:
+        conn.execute("UPDATE tasks SET status='completed' WHERE id = ?", (api_id,))  # SAFETY-ALLOW: status-write
+
+    result = json.loads(mesh.accept_plan(_write(tmp_path, ["- [ ] Backend: Build API v2 | K:api", PLAN[1]])))
+    assert result["diff"]["changed"] == [] and result["created_count"] == 1
+    assert result["diff"]["removed_active"] == [api_id] and result["diff"]["rewired"] == 1
+    tasks = _tasks(mesh)
+    assert tasks["Build API"]["status"] == "completed"
+    assert tasks["Build page"]["deps"] == [tasks["Build API v2"]["id"]]
+
+
+def test_other_paths_ingest_afresh(mesh, tmp_path):
+    json.loads(mesh.accept_plan(_write(tmp_path, PLAN[:1])))
+    other = tmp_path / "other.md"
+    other.write_text("\n".join(PLAN[2:3]) + "\n", encoding="utf-8")
+    assert json.loads(mesh.diff_plan(str(other)))["status"] == "NO_PREVIOUS_PLAN"
+    result = json.loads(mesh.accept_plan(str(other)))
+    assert result["status"] == "OK" and "incremental" not in result
+    assert _tasks(mesh)["Build API"]["status"] == "pending"
+
+
+def test_restored_line_revives_retired_task(mesh, tmp_path):
+    first = json.loads(mesh.accept_plan(_write(tmp_path, PLAN[:2])))
+    page_id = first["tasks"][1]["id"]
+    assert json.loads(mesh.accept_plan(_write(tmp_path, PLAN[:1])))["diff"]["retired"] == [page_id]
+    assert _tasks(mesh)["Build page"]["status"] == "cancelled"
+
+    path = _write(tmp_path, PLAN[:2])
+    assert json.loads(mesh.diff_plan(path))["revived"] == [page_id]
+    result = json.loads(mesh.accept_plan(path))
+    assert result["diff"]["revived"] == [page_id] and result["skipped_duplicates"] == 0
+    tasks = _tasks(mesh)
+    assert tasks["Build page"]["id"] == page_id and tasks["Build page"]["status"] == "pending"
+    assert tasks["Build page"]["source_plan_hash"] == result["plan_hash"]
+
+    # Restored under the same K: with new text: revived and edited in place
+    json.loads(mesh.accept_plan(_write(tmp_path, PLAN[:1])))
+    result = json.loads(mesh.accept_plan(_write(tmp_path, [PLAN[0], "- [ ] Frontend: Build page v2 | K:page"])))
+    assert result["diff"]["revived"] == [page_id] and result["created_count"] == 0
+    assert _tasks(mesh)["Build page v2"] == dict(_tasks(mesh)["Build page v2"], id=page_id, status="pending", deps=[])
+
+    # Tasks cancelled for other reasons still count as duplicates
+    with mesh.get_db() as conn:
+        conn.execute("UPDATE tasks SET status='cancelled', review_notes='user' WHERE id = ?",  # SAFETY-ALLOW: status-write
+                     (page_id,))
+    json.loads(mesh.accept_plan(_write(tmp_path, PLAN[:1])))
+    result = json.loads(mesh.accept_plan(_write(tmp_path, [PLAN[0], "- [ ] Frontend: Build page v2 | K:page"])))
+    assert result["diff"]["revived"] == [] and _tasks(mesh)["Build page v2"]["status"] == "cancelled"
+
+
+def test_edit_onto_foreign_signature_is_skipped(mesh, tmp_path):
+    first = json.loads(mesh.accept_plan(_write(tmp_path, PLAN[:2])))
+    page_id = first["tasks"][1]["id"]
+    settings = mesh._parse_plan_task("- [ ] Frontend: Settings", "other", 0)
+    with mesh.get_db() as conn:
+        conn.execute("INSERT INTO tasks (type, desc, status, task_signature) VALUES ('frontend', 'Settings', 'pending', ?)",
+                     (settings["task_signature"],))
+
+    # K:page now carries the text of a task queued outside this plan
+    result = json.loads(mesh.accept_plan(_write(tmp_path, [PLAN[0], "- [ ] Frontend: Settings | K:page"])))
+    assert result["diff"]["changed"] == [] and result["diff"]["retired"] == [page_id]
+    assert result["skipped_duplicates"] == 1 and result["created_count"] == 0
+    with mesh.get_db() as conn:
+        sigs = [r[0] for r in conn.execute("SELECT task_signature FROM tasks WHERE status != 'cancelled'")]
+    assert len(sigs) == len(set(sigs))
+
+
+def test_added_ids_follow_signatures_when_ingest_skips(mesh, tmp_path):
+    json.loads(mesh.accept_plan(_write(tmp_path, PLAN[:1])))
+    path = _write(tmp_path, PLAN[:1] + [
+        "- [ ] Docs: Write guide | K:guide",
+        "- [ ] Backend: Add auth | K:auth",
+        "- [ ] Frontend: Settings | Dep:backend:auth",
+    ])
+    with mesh.get_db() as conn:
+        previous_hash = mesh._previous_plan_hash(conn, path)
+        records = [r for r in (mesh._parse_plan_task(line, "h2", 0) for line in open(path, encoding="utf-8")) if r]
+        diff = mesh._diff_plan(conn, mesh._previous_plan_tasks(conn, previous_hash), records)
+        # The guide's signature gets queued between the diff and the apply
+        conn.execute("INSERT INTO tasks (type, desc, status, task_signature) VALUES ('docs', 'elsewhere', 'pending', ?)",
+                     (diff["added"][0]["task_signature"],))
+        applied = mesh._apply_plan_diff(conn, diff, "h2", previous_hash)
+    tasks = _tasks(mesh)
+    assert [t["id"] for t in applied["created"]] == [tasks["Add auth"]["id"], tasks["Settings"]["id"]]
+    assert tasks["Settings"]["deps"] == [tasks["Add auth"]["id"]]
@@ -0,0 +1,134 @@
+"""
+Incremental pre-flight: changed files -> affected tests via the import graph.
+"""
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import qa_protocol
+
+
+@pytest.fixture
+def sample_repo(tmp_path, monkeypatch):
+    """Tiny project: app/core.py <- app/api.py <- tests/test_api.py; tests/test_other.py isolated."""
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "__init__.py").write_text("", encoding="utf-8")
+    (tmp_path / "app" / "core.py").write_text("VALUE = 1\n", encoding="utf-8")
+    (tmp_path / "app" / "api.py").write_text("from app.core import VALUE\n", encoding="utf-8")
+    (tmp_path / "app" / "unused.py").write_text("X = 2\n", encoding="utf-8")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_api.py").write_text("import app.api\n", encoding="utf-8")
+    (tmp_path / "tests" / "test_other.py").write_text("import os\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_transitive_dependency_selects_test(sample_repo):
+    affected = qa_protocol.select_affected_tests([os.path.join("app", "core.py")])
+    assert affected == [os.path.join("tests", "test_api.py")]
+
+
+def test_changed_test_file_selects_itself(sample_repo):
+    affected = qa_protocol.select_affected_tests([os.path.join("tests", "test_other.py")])
+    assert affected == [os.path.join("tests", "test_other.py")]
+
+
+def test_unimported_module_selects_nothing(sample_repo):
+    assert qa_protocol.select_affected_tests([os.path.join("app", "unused.py")]) == []
+
+
+def test_from_package_import_submodule(sample_repo):
+    (sample_repo / "tests" / "test_core.py").write_text("from app import core\n", encoding="utf-8")
+    affected = qa_protocol.select_affected_tests([os.path.join("app", "core.py")])
+    assert os.path.join("tests", "test_core.py") in affected
+    # A name (not a submodule) falls back to the package itself
+    (sample_repo / "tests" / "test_init.py").write_text("from app import VALUE\n", encoding="utf-8")
+    assert qa_protocol.select_affected_tests([os.path.join("app", "__init__.py")]) == sorted(
+        os.path.join("tests", t) for t in ("test_api.py", "test_core.py", "test_init.py")
+    )
+
+
+def test_relative_imports_resolve_against_package(sample_repo):
+    (sample_repo / "app" / "api.py").write_text("from .core import VALUE\n", encoding="utf-8")
+    (sample_repo / "app" / "sub").mkdir()
+    (sample_repo / "app" / "sub" / "__init__.py").write_text("from .. import unused\n", encoding="utf-8")
+    (sample_repo / "tests" / "test_sub.py").write_text("import app.sub\n", encoding="utf-8")
+    assert qa_protocol.select_affected_tests([os.path.join("app", "core.py")]) == [os.path.join("tests", "test_api.py")]
+    assert qa_protocol.select_affected_tests([os.path.join("app", "unused.py")]) == [os.path.join("tests", "test_sub.py")]
+
+
+def test_uncertain_change_sets_run_full(sample_repo):
+    core = os.path.join("app", "core.py")
+    assert qa_protocol.select_affected_tests([]) is None  # Clean tree (work already committed)
+    assert qa_protocol.select_affected_tests(["README.md"]) is None
+    assert qa_protocol.select_affected_tests([core, os.path.join("tests", "fixtures", "data.json")]) is None
+    assert qa_protocol.select_affected_tests([core, "requirements-test.txt"]) is None
+    assert qa_protocol.select_affected_tests([core, os.path.join("app", "removed.py")]) is None  # Deleted/renamed
+
+
+def test_get_changed_files_keeps_deleted_paths(sample_repo, monkeypatch):
+    class Result:
+        def __init__(self, stdout):
+            self.stdout, self.returncode = stdout, 0
+
+    calls = []
+
+    def fake_run(cmd, timeout_s):
+        calls.append(cmd)
+        return Result("app/old.py\napp/core.py\n" if cmd[1] == "diff" else "app/new.py\n")
+
+    monkeypatch.setattr(qa_protocol, "_run_cmd", fake_run)
+    monkeypatch.setattr(qa_protocol.shutil, "which", lambda name: "/usr/bin/git")
+    assert qa_protocol.get_changed_files() == ["app/old.py", "app/core.py", "app/new.py"]
+    assert "--no-renames" in calls[0]
+
+
+def test_global_impact_file_forces_full_run(sample_repo):
+    assert qa_protocol.select_affected_tests(["conftest.py", os.path.join("app", "core.py")]) is None
+
+
+def test_full_run_every_n(monkeypatch):
+    monkeypatch.setattr(qa_protocol, "_incremental_runs_since_full", 0)
+    decisions = [qa_protocol._should_run_full({"full_run_every": 3}) for _ in range(6)]
+    assert decisions == [False, False, True, False, False, True]
+    assert qa_protocol._should_run_full({}) is False
+
+
+def test_incremental_skips_when_no_tests_affected(sample_repo, monkeypatch):
+    monkeypatch.setattr(qa_protocol, "load_preflight_config", lambda: {
+        "test_commands": {"python_backend": {"unit": "pytest -q"}},
+        "incremental": {"enabled": True},
+    })
+    calls = []
+    monkeypatch.setattr(qa_protocol, "_run_cmd", lambda cmd, timeout_s: calls.append(cmd))
+
+    result = qa_protocol.run_preflight_tests("python_backend", changed_files=[os.path.join("app", "unused.py")])
+
+    assert result["passed"] is True
+    assert result["mode"] == "incremental"
+    # Only formatter/linter ran, scoped to the changed file
+    assert all(cmd[-1] == os.path.join("app", "unused.py") for cmd in calls)
+
+
+def test_incremental_runs_full_suite_for_config_and_clean_tree(sample_repo, monkeypatch):
+    monkeypatch.setattr(qa_protocol, "load_preflight_config", lambda: {
+        "test_commands": {"python_backend": {"unit": "pytest -q"}},
+        "incremental": {"enabled": True},
+        "skip_patterns": ["*.json", "*.txt"],
+    })
+
+    class Passed:
+        returncode, stdout, stderr = 0, "", ""
+
+    calls = []
+    monkeypatch.setattr(qa_protocol, "_run_cmd", lambda cmd, timeout_s: (calls.append(cmd), Passed())[1])
+
+    for changed in ([os.path.join("app", "settings.json")], []):
+        calls.clear()
+        result = qa_protocol.run_preflight_tests("python_backend", changed_files=changed)
+        assert result["passed"] is True and result["mode"] == "full"
+        assert calls[-1] == "pytest -q"  # Whole suite, not a skip
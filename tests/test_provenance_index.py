@@ -0,0 +1,175 @@
+"""
+v41: Persistent provenance tag index behind the completion gatekeeper.
+
+- The first gatekeeper call builds the index with one full report scan
+- Later calls refresh only files_changed plus files changed since the last
+  refresh (git diff against an advancing head in a repo, an mtime/size stat
+  walk otherwise)
+- SOURCE_REGISTRY.json is re-parsed only when it changes
+"""
+import importlib
+import json
+import subprocess
+import sys
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def mesh(tmp_path, monkeypatch):
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    import mesh_server
+    mesh_server = importlib.reload(mesh_server)
+    registry = {"sources": {"HIPAA": {"tier": "domain", "authority": "MANDATORY", "title": "HIPAA"}}}
+    with open(mesh_server.get_source_path("SOURCE_REGISTRY.json"), "w", encoding="utf-8") as f:
+        json.dump(registry, f)
+    (tmp_path / "src").mkdir(exist_ok=True)
+    with mesh_server.get_db() as conn:
+        conn.execute(
+            "INSERT INTO tasks (id, type, desc, status, source_ids, archetype) "
+            "VALUES (1, 'backend', 'Encrypt PHI', 'in_progress', '[\"HIPAA-SEC-01\"]', 'GENERIC')"
+        )
+    return mesh_server
+
+
+def _count_full_scans(mesh, monkeypatch):
+    calls = []
+    original = mesh.generate_provenance_report
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(mesh, "generate_provenance_report", counting)
+    return calls
+
+
+def test_gatekeeper_scans_once_then_refreshes_changed_files(mesh, tmp_path, monkeypatch):
+    full_scans = _count_full_scans(mesh, monkeypatch)
+    assert not mesh.validate_task_completion(1)["ok"]
+    assert len(full_scans) == 1
+
+    tagged = tmp_path / "src" / "phi.py"
+    tagged.write_text("# Implements [HIPAA-SEC-01]\n", encoding="utf-8")
+    with mesh.get_db() as conn:
+        conn.execute("UPDATE tasks SET files_changed = '[\"src/phi.py\"]' WHERE id = 1")
+    assert mesh.validate_task_completion(1)["ok"]
+    assert json.loads(mesh.check_gatekeeper(1))["would_complete"]
+
+    # Deleting the file (not a git repo: stat walk) removes its tags
+    tagged.unlink()
+    assert not mesh.validate_task_completion(1)["ok"]
+    assert len(full_scans) == 1
+    with mesh.get_db() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM provenance_files").fetchone()[0] == 0
+
+
+def test_git_repo_refresh_skips_the_walk(mesh, tmp_path, monkeypatch):
+    git = ["git", "-c", "user.email=t@example.com", "-c", "user.name=t"]
+    tracked = tmp_path / "src" / "crypto.py"
+    tracked.write_text("def encrypt():\n    pass\n", encoding="utf-8")
+    try:
+        subprocess.run(git + ["init", "-q"], cwd=tmp_path, check=True)
+        subprocess.run(git + ["add", "src"], cwd=tmp_path, check=True)
+        subprocess.run(git + ["commit", "-q", "-m", "init"], cwd=tmp_path, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip("git not available")
+
+    mesh.generate_provenance_report()
+    with mesh.get_db() as conn:
+        assert mesh._provenance_index_meta(conn)["head"]
+
+    def no_walk(*args, **kwargs):
+        raise AssertionError("full walk on the gatekeeper path")
+
+    monkeypatch.setattr(mesh, "_provenance_walk_paths", no_walk)
+    monkeypatch.setattr(mesh, "generate_provenance_report", no_walk)
+    tracked.write_text("# Implements [HIPAA-SEC-01]\ndef encrypt():\n    pass\n", encoding="utf-8")
+    assert mesh.validate_task_completion(1)["ok"]
+    with mesh.get_db() as conn:
+        rows = conn.execute("SELECT source_id, path, line FROM provenance_tags").fetchall()
+    assert [tuple(r) for r in rows] == [("HIPAA-SEC-01", os.path.join("src", "crypto.py"), 1)]
+
+
+def test_complete_task_indexes_submitted_files(mesh, tmp_path):
+    mesh.generate_provenance_report()
+    with mesh.get_db() as conn:
+        mesh._set_provenance_index_meta(conn, "not-a-commit")  # Forces the stat-walk fallback
+    (tmp_path / "src" / "phi.py").write_text("// Implements [hipaa-sec-01]\n", encoding="utf-8")
+    mesh._index_submitted_files("src/phi.py, docs/notes.md")
+    with mesh.get_db() as conn:
+        assert [r[0] for r in conn.execute("SELECT path FROM provenance_files")] == [os.path.join("src", "phi.py")]
+    assert mesh._provenance_evidence(["HIPAA-SEC-01", "OTHER"]) == {
+        "HIPAA-SEC-01": [os.path.join("src", "phi.py")],
+        "OTHER": [],
+    }
+
+
+def test_registry_is_cached_until_it_changes(mesh):
+    first = mesh._load_source_registry()
+    assert mesh._load_source_registry() is first
+    path = mesh.get_source_path("SOURCE_REGISTRY.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"sources": {}, "version": 2}, f)
+    assert mesh._load_source_registry()["version"] == 2
+
+
+def test_git_refresh_advances_head_and_sees_pending_untracked(mesh, tmp_path, monkeypatch):
+    git = ["git", "-c", "user.email=t@example.com", "-c", "user.name=t"]
+    tracked = tmp_path / "src" / "crypto.py"
+    tracked.write_text("def encrypt():\n    pass\n", encoding="utf-8")
+    try:
+        subprocess.run(git + ["init", "-q"], cwd=tmp_path, check=True)
+        subprocess.run(git + ["add", "src"], cwd=tmp_path, check=True)
+        subprocess.run(git + ["commit", "-q", "-m", "init"], cwd=tmp_path, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip("git not available")
+    mesh.generate_provenance_report()
+
+    # Still waiting on the first git status: untracked files come from ls-files
+    from tools import git_state
+    monkeypatch.setattr(git_state, "read_git_state", lambda *a, **k: git_state.PENDING_STATE)
+    (tmp_path / "src" / "phi.py").write_text("# Implements [HIPAA-SEC-01]\n", encoding="utf-8")
+    assert mesh.validate_task_completion(1)["ok"]  # Not in files_changed
+
+    # Commit + refresh: the index head follows HEAD, so old commits aren't re-diffed
+    subprocess.run(git + ["add", "src"], cwd=tmp_path, check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "phi"], cwd=tmp_path, check=True)
+    mesh._provenance_evidence(["HIPAA-SEC-01"])
+    head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=tmp_path, capture_output=True, text=True).stdout.strip()
+    with mesh.get_db() as conn:
+        assert mesh._provenance_index_meta(conn)["head"] == head
+    assert mesh._provenance_changed_paths(head) == set()
+
+    # A worktree edit reverted after being indexed is still rechecked once
+    tracked.write_text("# Implements [HIPAA-SEC-01]\ndef encrypt():\n    pass\n", encoding="utf-8")
+    (tmp_path / "src" / "phi.py").unlink()
+    assert mesh._provenance_evidence(["HIPAA-SEC-01"]) == {"HIPAA-SEC-01": [os.path.join("src", "crypto.py")]}
+    subprocess.run(["git", "checkout", "-q", "--", "src/crypto.py"], cwd=tmp_path, check=True)
+    assert mesh._provenance_evidence(["HIPAA-SEC-01"]) == {"HIPAA-SEC-01": []}
+
+
+def test_renamed_file_drops_its_old_path_tags(mesh, tmp_path):
+    git = ["git", "-c", "user.email=t@example.com", "-c", "user.name=t"]
+    body = "".join(f"X{n} = {n}\n" for n in range(20))
+    (tmp_path / "src" / "a.py").write_text("# Implements [HIPAA-SEC-01]\n" + body, encoding="utf-8")
+    try:
+        subprocess.run(git + ["init", "-q"], cwd=tmp_path, check=True)
+        subprocess.run(git + ["add", "src"], cwd=tmp_path, check=True)
+        subprocess.run(git + ["commit", "-q", "-m", "init"], cwd=tmp_path, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip("git not available")
+    mesh.generate_provenance_report()
+    assert mesh._provenance_evidence(["HIPAA-SEC-01"]) == {"HIPAA-SEC-01": [os.path.join("src", "a.py")]}
+
+    subprocess.run(git + ["mv", "src/a.py", "src/b.py"], cwd=tmp_path, check=True)
+    (tmp_path / "src" / "b.py").write_text(body, encoding="utf-8")  # Tag removed with the rename
+    assert mesh._provenance_evidence(["HIPAA-SEC-01"]) == {"HIPAA-SEC-01": []}
+    assert not mesh.validate_task_completion(1)["ok"]
@@ -0,0 +1,167 @@
+"""
+v39: Retry backoff + dead letter in the braided scheduler.
+
+- Reaped tasks back off exponentially (first retry immediate), per lane
+- pick_task_braided skips tasks inside their backoff window
+- Tasks out of retries move to dead_letter; requeue_task revives them
+- Worker-reported failures (complete_task success=False) share that budget
+- Pick indexes carry backoff_until (legacy definitions rebuilt)
+"""
+import importlib
+import json
+import sqlite3
+import sys
+import os
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def mesh(tmp_path, monkeypatch):
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    import mesh_server
+    return importlib.reload(mesh_server), db
+
+
+def _stale_task(conn, retry_count, lane="backend"):
+    stale = int(time.time()) - 10_000
+    cursor = conn.execute(
+        "INSERT INTO tasks (type, lane, desc, status, updated_at, worker_id, retry_count, deps) "
+        "VALUES ('backend', ?, 'poison', 'in_progress', ?, 'w', ?, '[]')",  # SAFETY-ALLOW: status-write
+        (lane, stale, retry_count),
+    )
+    return cursor.lastrowid
+
+
+def test_backoff_schedule_matches_sql(mesh):
+    mesh_server, _ = mesh
+    with mesh_server.get_db() as conn:
+        for lane in ("backend", "qa", "ops", "mystery", None):
+            for retries in (0, 1, 2, 3, 10, 40):
+                sql = conn.execute(
+                    f"SELECT {mesh_server._retry_backoff_sql()} FROM (SELECT ? AS lane, ? AS retry_count)",
+                    (lane, retries),
+                ).fetchone()[0]
+                assert sql == mesh_server._retry_backoff_s(lane, retries)
+    assert mesh_server._retry_backoff_s("backend", 0) == 0
+    assert mesh_server._retry_backoff_s("backend", 1) == 60
+    assert mesh_server._retry_backoff_s("backend", 3) == 240
+    assert mesh_server._retry_backoff_s("backend", 40) == mesh_server.RETRY_BACKOFF_MAX_S
+
+
+def test_repeat_failures_back_off_instead_of_hot_looping(mesh):
+    mesh_server, _ = mesh
+    with mesh_server.get_db() as conn:
+        task_id = _stale_task(conn, retry_count=1)
+
+    picked = json.loads(mesh_server.pick_task_braided("w2"))
+    assert picked["status"] == "NO_WORK" and picked["backoff_total"] == 1
+    assert "backing off" in picked["message"]
+
+    with mesh_server.get_db() as conn:
+        row = conn.execute("SELECT status, retry_count, backoff_until FROM tasks WHERE id=?", (task_id,)).fetchone()
+        assert row["status"] == "pending" and row["retry_count"] == 2
+        assert picked["next_retry_at"] == row["backoff_until"]
+        assert 55 <= row["backoff_until"] - int(time.time()) <= 60
+        conn.execute("UPDATE tasks SET backoff_until = 0 WHERE id=?", (task_id,))
+
+    picked = json.loads(mesh_server.pick_task_braided("w2"))
+    assert picked["status"] == "OK" and picked["id"] == task_id
+
+
+def test_out_of_retries_goes_to_dead_letter(mesh):
+    mesh_server, _ = mesh
+    with mesh_server.get_db() as conn:
+        task_id = _stale_task(conn, retry_count=mesh_server.RETRY_MAX_ATTEMPTS - 1)
+        reap = mesh_server._reap_stale_in_progress(conn, int(time.time()))
+    assert reap["dead_lettered"] == 1 and reap["reaped"] == 0
+
+    with mesh_server.get_db() as conn:
+        assert conn.execute("SELECT status FROM tasks WHERE id=?", (task_id,)).fetchone()[0] == "dead_letter"
+        vias = [r[0] for r in conn.execute("SELECT via FROM task_transitions WHERE task_id=?", (task_id,))]
+        assert vias[-1] == "dead_letter"
+    assert json.loads(mesh_server.pick_task_braided("w"))["status"] == "NO_WORK"
+
+    mesh_server.requeue_task(task_id, "fixed upstream")
+    with mesh_server.get_db() as conn:
+        row = conn.execute("SELECT status, retry_count, backoff_until FROM tasks WHERE id=?", (task_id,)).fetchone()
+    assert tuple(row) == ("pending", 0, 0)
+
+
+def test_worker_failures_share_the_reaper_budget(mesh):
+    mesh_server, _ = mesh
+    with mesh_server.get_db() as conn:
+        task_id = _stale_task(conn, retry_count=mesh_server.RETRY_MAX_ATTEMPTS - 2)
+
+    assert "Auto-retrying" in mesh_server.complete_task(task_id, "boom", success=False)
+    with mesh_server.get_db() as conn:
+        conn.execute("UPDATE tasks SET status='in_progress', backoff_until=0 WHERE id=?", (task_id,))  # SAFETY-ALLOW: status-write
+    assert "dead-lettered" in mesh_server.complete_task(task_id, "boom again", success=False)
+
+    with mesh_server.get_db() as conn:
+        row = conn.execute("SELECT status, retry_count, worker_id FROM tasks WHERE id=?", (task_id,)).fetchone()
+        assert tuple(row) == ("dead_letter", mesh_server.RETRY_MAX_ATTEMPTS, None)
+        vias = [r[0] for r in conn.execute("SELECT via FROM task_transitions WHERE task_id=?", (task_id,))]
+        assert vias[-1] == "dead_letter"
+
+    mesh_server.requeue_task(task_id, "fixed upstream")
+    with mesh_server.get_db() as conn:
+        assert conn.execute("SELECT retry_count FROM tasks WHERE id=?", (task_id,)).fetchone()[0] == 0
+
+
+def test_requeue_resets_budget_of_legacy_failed_tasks(mesh):
+    mesh_server, _ = mesh
+    with mesh_server.get_db() as conn:
+        task_id = _stale_task(conn, retry_count=3)
+        conn.execute("UPDATE tasks SET status='failed' WHERE id=?", (task_id,))  # SAFETY-ALLOW: status-write
+
+    mesh_server.requeue_task(task_id)
+    with mesh_server.get_db() as conn:
+        row = conn.execute("SELECT status, retry_count FROM tasks WHERE id=?", (task_id,)).fetchone()
+    assert tuple(row) == ("pending", 0)
+
+
+def test_sweep_stale_leases_backs_off_and_dead_letters(mesh):
+    mesh_server, _ = mesh
+    now = int(time.time())
+    with mesh_server.get_db() as conn:
+        for retries in (1, mesh_server.RETRY_MAX_ATTEMPTS - 1):
+            conn.execute(
+                "INSERT INTO tasks (type, lane, desc, status, worker_id, lease_expires_at, retry_count) "
+                "VALUES ('backend', 'qa', 'leased', 'in_progress', 'w', ?, ?)",  # SAFETY-ALLOW: status-write
+                (now - 5, retries),
+            )
+    result = json.loads(mesh_server.sweep_stale_leases())
+    assert result["requeued_count"] == 1 and len(result["dead_letter_ids"]) == 1
+    with mesh_server.get_db() as conn:
+        backoff = conn.execute("SELECT backoff_until FROM tasks WHERE status='pending'").fetchone()[0]
+    assert backoff >= now + 30
+
+
+def test_pick_indexes_carry_backoff(mesh):
+    mesh_server, db = mesh
+    conn = sqlite3.connect(db)
+    conn.execute("DROP INDEX idx_tasks_pick_lane")
+    conn.execute(
+        "CREATE INDEX idx_tasks_pick_lane ON tasks(status, lane, priority, lane_rank, created_at, id)"
+    )  # Pre-v39 definition
+    conn.commit()
+    conn.close()
+
+    mesh_server.init_db(force=True)
+    conn = sqlite3.connect(db)
+    for name in ("idx_tasks_pick_lane", "idx_tasks_pick_preempt"):
+        assert "backoff_until" in [r[2] for r in conn.execute(f"PRAGMA index_info({name})")]
+    plan = " ".join(r[-1] for r in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE status='pending' AND lane='qa' AND backoff_until <= 5 "
+        "ORDER BY priority, lane_rank, created_at, id LIMIT 10"
+    ))
+    conn.close()
+    assert "idx_tasks_pick_lane" in plan and "TEMP B-TREE" not in plan
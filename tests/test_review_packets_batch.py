@@ -0,0 +1,115 @@
+"""
+v48: Batch review-packet builder.
+
+- create_review_packets matches create_review_packet / validate_task_completion
+  per task while loading shared inputs once
+- get_review_queue(auto_heal=True) heals a page's stale packets in one batch
+- Packets are written atomically (no temp files left behind)
+"""
+import importlib
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def mesh(tmp_path, monkeypatch):
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    import mesh_server
+    return importlib.reload(mesh_server)
+
+
+def _insert(mesh, task_id, sources, archetype="GENERIC", status="completed", justification=None):
+    with mesh.get_db() as conn:
+        conn.execute(
+            "INSERT INTO tasks (id, type, desc, status, source_ids, archetype, override_justification) "
+            "VALUES (?, 'backend', ?, ?, ?, ?, ?)",
+            (task_id, f"task {task_id}", status, json.dumps(sources), archetype, justification),
+        )
+
+
+def _packet(mesh, task_id):
+    with open(os.path.join(mesh.get_state_path("reviews"), f"T-{task_id}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_batch_matches_single_task_evidence(mesh):
+    _insert(mesh, 1, ["HIPAA-01"], archetype="LOGIC")  # MANDATORY, no code tag
+    _insert(mesh, 2, ["PRO-ARCH-01"], justification="Vendor SDK")  # STRONG, justified
+    _insert(mesh, 3, ["HIPAA-01", "GDPR-02"], archetype="TEST", status="pending")
+    _insert(mesh, 4, ["GDPR-02"], archetype="TEST", status="pending")
+    _insert(mesh, 5, [])  # Plumbing
+    _insert(mesh, 6, ["PRO-ARCH-01"], archetype="API")  # No paired test
+
+    expected = {t: mesh.validate_task_completion(t) for t in (1, 2, 5, 6)}
+    paired = {t: mesh.find_paired_test(["HIPAA-01"] if t == 1 else ["PRO-ARCH-01"], "LOGIC") for t in (1, 6)}
+
+    results = mesh.create_review_packets([1, 2, 5, 6, 99], max_workers=4)
+    assert list(results) == [1, 2, 5, 6, 99]
+    assert results[99] == {"status": "ERROR", "message": "Task 99 not found"}
+    for task_id in (1, 2, 5, 6):
+        assert results[task_id]["status"] == "SUCCESS"
+        packet = _packet(mesh, task_id)
+        assert packet["gatekeeper"] == expected[task_id], task_id
+        assert results[task_id]["snapshot_hash"] == packet["meta"]["snapshot_hash"]
+        assert mesh.is_packet_stale(task_id) == (False, "Packet is fresh")
+    assert _packet(mesh, 1)["evidence"]["paired_test"] == {"id": paired[1]["task"]["id"], "status": "pending"}
+    assert _packet(mesh, 6)["evidence"]["paired_test"] == {"id": None, "status": "N/A"}
+    assert not paired[6]["found"]
+
+    with mesh.get_db() as conn:
+        statuses = dict(conn.execute("SELECT id, status FROM tasks WHERE id IN (1, 2, 5, 6)").fetchall())
+    assert set(statuses.values()) == {"reviewing"}
+    assert not [f for f in os.listdir(mesh.get_state_path("reviews")) if not f.endswith(".json")]
+
+    # The single-task entry point is the batch of one
+    assert mesh.create_review_packet(99)["status"] == "ERROR"
+    assert mesh.create_review_packet(2)["gatekeeper_ok"] is True
+
+
+def test_queue_heals_stale_packets_in_one_batch(mesh, monkeypatch):
+    for task_id in range(1, 41):
+        _insert(mesh, task_id, [f"STD-{task_id % 3}"], status="reviewing")
+    mesh.create_review_packets(range(1, 41))
+    with mesh.get_db() as conn:
+        conn.execute("UPDATE tasks SET desc = desc || ' (edited)' WHERE id % 2 = 0")
+
+    calls = {"evidence": 0, "sharing": 0}
+    evidence, sharing = mesh._provenance_evidence, mesh._tasks_sharing_sources
+
+    def counted_evidence(*args, **kwargs):
+        calls["evidence"] += 1
+        return evidence(*args, **kwargs)
+
+    def counted_sharing(*args, **kwargs):
+        calls["sharing"] += 1
+        return sharing(*args, **kwargs)
+
+    monkeypatch.setattr(mesh, "_provenance_evidence", counted_evidence)
+    monkeypatch.setattr(mesh, "_tasks_sharing_sources", counted_sharing)
+    queue = json.loads(mesh.get_review_queue(limit=50))
+    assert queue["healed_count"] == 20 and queue["stale_count"] == 0
+    assert calls == {"evidence": 1, "sharing": 1}
+    assert _packet(mesh, 2)["claims"]["description"] == "task 2 (edited)"
+
+
+def test_packet_temp_name_is_unique_per_process(mesh, monkeypatch):
+    _insert(mesh, 1, [])
+    sources = []
+    real_replace = os.replace
+
+    def recording_replace(src, dst):
+        sources.append(os.path.basename(src))
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(mesh.os, "replace", recording_replace)
+    mesh.create_review_packets([1])
+    assert any(name.startswith(f"T-1.json.tmp.{os.getpid()}.") for name in sources)
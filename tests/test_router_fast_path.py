@@ -0,0 +1,125 @@
+"""
+Router fast path: combined-alternation matcher and screened sanitizer.
+
+Pins intent equivalence against the legacy sequential matcher over a recorded
+corpus of control-panel commands, and micro-benchmarks both implementations.
+"""
+import os
+import re
+import sys
+import time
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import router as router_module
+from router import SemanticRouter
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "router_corpus.txt")
+
+
+def _load_corpus():
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def legacy_fast_path(text):
+    """The pre-v29 sequential matcher (reference implementation)."""
+    text_lower = text.lower()
+    for compiled_pattern, intent, action, param_extractor in router_module.COMPILED_FAST_PATH_PATTERNS:
+        target_text = text if intent == "CONTEXT_SET" else text_lower
+        match = compiled_pattern.match(target_text)
+        if match:
+            params = None
+            if param_extractor:
+                params = param_extractor(match) if callable(param_extractor) else param_extractor
+            return intent, action, params
+    return None
+
+
+def legacy_sanitize(text):
+    sanitized = text
+    for pattern, replacement in SemanticRouter.SENSITIVE_PATTERNS:
+        sanitized = re.sub(pattern, replacement, sanitized, flags=re.IGNORECASE)
+    return sanitized
+
+
+@pytest.fixture
+def semantic_router(tmp_path):
+    r = SemanticRouter(str(tmp_path / "mesh.db"))
+    yield r
+    r.close()
+
+
+def _fast(r, text):
+    result = r._fast_path(text)
+    return (result.intent, result.action, result.parameters) if result else None
+
+
+def test_corpus_intent_equivalence(semantic_router):
+    corpus = _load_corpus()
+    for text in corpus:
+        assert _fast(semantic_router, text) == legacy_fast_path(text), text
+        assert semantic_router._sanitize_for_log(text) == legacy_sanitize(text), text
+
+
+def test_first_pattern_in_order_wins(semantic_router):
+    # "nuke --confirm" must not fall through to the bare "nuke" warning
+    assert _fast(semantic_router, "nuke --confirm")[:2] == ("QUEUE_OPS", "nuke")
+    assert _fast(semantic_router, "nuke")[:2] == ("SAFETY_WARN", "nuke_confirm_required")
+
+
+def test_case_handling_matches_legacy(semantic_router):
+    assert _fast(semantic_router, "post backend Fix Auth")[2] == {"type": "backend", "desc": "fix auth"}
+    assert _fast(semantic_router, "note: Keep CASE")[2] == {"content": "Keep CASE"}
+
+
+def test_sanitizer_masks_all_secret_kinds(semantic_router):
+    text = "password=x token: y sk-" + "a" * 24 + " ghp_" + "b" * 24 + " AKIA" + "C" * 16
+    assert semantic_router._sanitize_for_log(text) == "password=*** token=*** sk-*** ghp_*** AKIA***"
+
+
+def test_sanitizer_matches_legacy_chain_on_adjacent_secrets(semantic_router):
+    key = "sk-" + "a" * 30
+    cases = [
+        key + "password=SECRET",
+        key + "token:abc api_key=zz",
+        "ghp_" + "b" * 22 + "secret=1",
+        "AKIA" + "C" * 16 + "pwd=2",
+        "password=" + key,
+        "token=ghp_" + "d" * 25 + " sk-" + "e" * 19,
+    ]
+    for text in cases:
+        assert semantic_router._sanitize_for_log(text) == legacy_sanitize(text), text
+    assert semantic_router._sanitize_for_log(cases[0]) == "sk-***=***"
+
+
+def test_sanitizer_fuzz_equivalence(semantic_router):
+    import random
+    rng = random.Random(29)
+    pieces = ["sk-", "ghp_", "AKIA", "password", "passwd", "pwd", "api_key", "apikey", "api-key",
+              "secret", "token", "=", ":", " ", "  ", "a", "Z", "9", "x" * 8, "A" * 16, "b" * 20, "\t", "-", "_"]
+    for _ in range(5000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 14)))
+        assert semantic_router._sanitize_for_log(text) == legacy_sanitize(text), text
+
+
+def test_benchmark_combined_vs_sequential(semantic_router):
+    """Micro-benchmark: combined matcher + sanitizer vs the legacy per-pattern loops."""
+    corpus = _load_corpus() * 50
+
+    def bench(fn):
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            for text in corpus:
+                fn(text)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    legacy = bench(lambda t: (legacy_sanitize(t), legacy_fast_path(t)))
+    combined = bench(lambda t: (semantic_router._sanitize_for_log(t), semantic_router._fast_path(t)))
+    print(f"\nrouter fast path over {len(corpus)} inputs: legacy={legacy * 1e3:.2f}ms combined={combined * 1e3:.2f}ms")
+    assert combined < legacy
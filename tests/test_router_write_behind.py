@@ -0,0 +1,93 @@
+"""
+SemanticRouter: in-memory session context + batched route_log persistence.
+"""
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import router as router_module
+from router import SemanticRouter
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "mesh.db")
+
+
+def _count(db_path, table):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_routes_are_buffered_then_flushed_in_one_batch(db_path, monkeypatch):
+    monkeypatch.setattr(router_module, "ROUTER_FLUSH_INTERVAL", 60.0)
+    r = SemanticRouter(db_path)
+    try:
+        for cmd in ("status", "task 5", "skip it"):
+            r.route(cmd)
+        # Nothing written yet: routing never touched the DB
+        assert _count(db_path, "route_log") == 0
+        assert r.get_context("last_mentioned_task_id") == 5
+        assert r.resolve_pronouns("skip it", {})["task_id"] == 5
+
+        assert r.flush() is True
+        assert _count(db_path, "route_log") == 3
+        assert _count(db_path, "session_context") == 1
+    finally:
+        r.close()
+
+
+def test_context_survives_restart(db_path):
+    r = SemanticRouter(db_path)
+    r.update_last_shown_task(42)
+    r.close()
+
+    restarted = SemanticRouter(db_path)
+    try:
+        assert restarted.get_context("last_shown_task_id") == 42
+    finally:
+        restarted.close()
+
+
+def test_locked_db_requeues_batch(db_path, monkeypatch):
+    monkeypatch.setattr(router_module, "ROUTER_FLUSH_INTERVAL", 60.0)
+    r = SemanticRouter(db_path)
+    blocker = sqlite3.connect(db_path, timeout=0)
+    try:
+        r.route("status")
+        r.set_context("last_shown_task_id", 7)
+        blocker.execute("BEGIN EXCLUSIVE")
+
+        assert r.flush() is False
+        assert r.get_context("last_shown_task_id") == 7
+
+        blocker.rollback()
+        assert r.flush() is True
+        assert _count(db_path, "route_log") == 1
+        assert _count(db_path, "session_context") == 1
+    finally:
+        blocker.close()
+        r.close()
+
+
+def test_route_log_buffer_is_bounded(db_path, monkeypatch):
+    monkeypatch.setattr(router_module, "ROUTER_FLUSH_INTERVAL", 60.0)
+    monkeypatch.setattr(router_module, "ROUTER_LOG_QUEUE_MAX", 3)
+    monkeypatch.setattr(router_module, "ROUTER_LOG_BATCH_SIZE", 100)
+    r = SemanticRouter(db_path)
+    try:
+        for _ in range(5):
+            r.route("status")
+        assert r.dropped_route_logs == 2
+        r.flush()
+        assert _count(db_path, "route_log") == 3
+    finally:
+        r.close()
@@ -0,0 +1,177 @@
+"""
+v33: Consolidated snapshot aggregates + write-time status normalization.
+
+- load_task_aggregates() matches the per-counter queries it replaced
+- mesh_server.init_db() lower-cases tasks.status on insert/update (and migrates old rows)
+- Snapshot reads never wrap status in LOWER(), so the status indexes are used
+"""
+import inspect
+import importlib
+import random
+import sqlite3
+import sys
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tools import snapshot
+
+STATUSES = ["pending", "next", "planned", "in_progress", "running",
+            "blocked", "error", "failed", "completed"]
+
+
+@pytest.fixture
+def mesh(tmp_path, monkeypatch):
+    """mesh_server-initialized DB (triggers + indexes)."""
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    import mesh_server
+    return importlib.reload(mesh_server), db
+
+
+def _seed(mesh_server, n=300):
+    rng = random.Random(33)
+    with mesh_server.get_db() as conn:
+        conn.execute("ALTER TABLE tasks ADD COLUMN verified INTEGER DEFAULT 0")
+        for i in range(n):
+            conn.execute(
+                "INSERT INTO tasks (type, lane, desc, status, risk, verified, updated_at) "
+                "VALUES ('backend', ?, ?, ?, ?, ?, ?)",
+                (rng.choice(["backend", "frontend", "", None]), f"t{i}", rng.choice(STATUSES),
+                 rng.choice(["LOW", "HIGH", "high"]), rng.choice([0, 1]), rng.randint(1, 10_000)),
+            )
+
+
+def test_aggregates_match_individual_queries(mesh):
+    mesh_server, db = mesh
+    _seed(mesh_server)
+
+    agg = snapshot.load_task_aggregates(db)
+
+    conn = sqlite3.connect(db)
+    try:
+        def scalar(sql, *params):
+            return conn.execute(sql, params).fetchone()[0]
+
+        expected_lanes = sorted(
+            (lane, status, c) for lane, status, c in conn.execute(
+                "SELECT IFNULL(NULLIF(lane, ''), 'UNKNOWN') AS l, status, COUNT(*) FROM tasks GROUP BY l, status"
+            )
+        )
+        assert sorted((lc["Lane"], lc["Status"], lc["Count"]) for lc in agg["lane_counts"]) == expected_lanes
+        assert agg["pending"] == scalar("SELECT COUNT(*) FROM tasks WHERE status IN ('pending','next','planned')")
+        assert agg["active"] == scalar("SELECT COUNT(*) FROM tasks WHERE status IN ('in_progress','running')")
+        assert agg["problems"] == scalar("SELECT COUNT(*) FROM tasks WHERE status IN ('blocked','error','failed')")
+        assert agg["high_risk_unverified"] == scalar(
+            "SELECT COUNT(*) FROM tasks WHERE LOWER(risk) = 'high' AND verified = 0"
+        )
+        assert agg["first_blocked_id"] == scalar(
+            "SELECT id FROM tasks WHERE status = 'blocked' ORDER BY updated_at DESC LIMIT 1"
+        )
+        assert agg["first_error_id"] == scalar(
+            "SELECT id FROM tasks WHERE status IN ('error','failed') ORDER BY updated_at DESC LIMIT 1"
+        )
+    finally:
+        conn.close()
+
+
+def test_high_risk_count_needs_verified_column(mesh):
+    mesh_server, db = mesh
+    with mesh_server.get_db() as conn:
+        conn.execute("INSERT INTO tasks (type, desc, status, risk) VALUES ('backend', 'x', 'pending', 'HIGH')")
+    assert snapshot.load_task_aggregates(db)["high_risk_unverified"] == 0
+
+
+def test_high_risk_rollup_tracks_risk_and_verified_updates(mesh):
+    mesh_server, db = mesh
+    _seed(mesh_server, n=50)
+    mesh_server.init_db(force=True)  # installs task_rollups now that tasks.verified exists
+    rng = random.Random(34)
+
+    def scanned():
+        with mesh_server.get_db() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE UPPER(risk) = 'HIGH' AND verified = 0"
+            ).fetchone()[0]
+
+    for i in range(200):
+        with mesh_server.get_db() as conn:
+            ids = [r[0] for r in conn.execute("SELECT id FROM tasks")]
+            op = rng.random()
+            if op < 0.3 or not ids:
+                conn.execute(
+                    "INSERT INTO tasks (type, desc, status, risk, verified) VALUES ('backend', ?, 'pending', ?, ?)",
+                    (f"n{i}", rng.choice(["LOW", "HIGH", "high", None]), rng.choice([0, 1, None])),
+                )
+            elif op < 0.6:
+                conn.execute("UPDATE tasks SET risk = ? WHERE id = ?",
+                             (rng.choice(["LOW", "HIGH", "High", None]), rng.choice(ids)))
+            elif op < 0.9:
+                conn.execute("UPDATE tasks SET verified = ? WHERE id = ?", (rng.choice([0, 1]), rng.choice(ids)))
+            else:
+                conn.execute("DELETE FROM tasks WHERE id = ?", (rng.choice(ids),))
+        if i % 20 == 0:
+            assert snapshot.load_task_aggregates(db)["high_risk_unverified"] == scanned()
+    assert snapshot.load_task_aggregates(db)["high_risk_unverified"] == scanned()
+
+    with mesh_server.get_db() as conn:
+        conn.execute("UPDATE task_rollups SET count = count + 7")
+    assert "1 rows corrected" in mesh_server.repair_lane_status_counts()
+    assert snapshot.load_task_aggregates(db)["high_risk_unverified"] == scanned()
+
+
+def test_no_problem_lookup_without_problems(mesh):
+    mesh_server, db = mesh
+    with mesh_server.get_db() as conn:
+        conn.execute("INSERT INTO tasks (type, desc, status) VALUES ('backend', 'ok', 'pending')")
+
+    agg = snapshot.load_task_aggregates(db)
+    assert (agg["pending"], agg["problems"], agg["first_blocked_id"]) == (1, 0, None)
+
+
+def test_status_normalized_at_write_time(mesh):
+    mesh_server, db = mesh
+    with mesh_server.get_db() as conn:
+        conn.execute("INSERT INTO tasks (type, desc, status) VALUES ('backend', 'a', 'BLOCKED')")
+        conn.execute("INSERT INTO tasks (type, desc, status) VALUES ('backend', 'b', 'pending')")
+        conn.execute("UPDATE tasks SET status = 'In_Progress' WHERE desc = 'b'")
+        rows = dict(conn.execute("SELECT desc, status FROM tasks").fetchall())
+    assert rows == {"a": "blocked", "b": "in_progress"}
+
+
+def test_init_db_migrates_mixed_case_rows(mesh):
+    mesh_server, db = mesh
+    conn = sqlite3.connect(db)
+    conn.execute("DROP TRIGGER trg_tasks_status_lower_insert")
+    conn.execute("INSERT INTO tasks (type, desc, status) VALUES ('backend', 'legacy', 'PENDING')")
+    conn.commit()
+    conn.close()
+
+    mesh_server.init_db(force=True)
+    with mesh_server.get_db() as conn:
+        assert conn.execute("SELECT status FROM tasks WHERE desc = 'legacy'").fetchone()[0] == "pending"
+
+
+def test_problem_lookup_uses_status_index(mesh):
+    _, db = mesh
+    conn = sqlite3.connect(db)
+    try:
+        plan = " ".join(
+            str(r[-1]) for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE status = 'blocked' "
+                "ORDER BY updated_at DESC LIMIT 1"
+            )
+        )
+        assert "idx_tasks_status_updated_at" in plan
+    finally:
+        conn.close()
+
+
+def test_snapshot_reads_do_not_lower_status():
+    source = inspect.getsource(snapshot)
+    assert "LOWER(status)" not in source.replace("no LOWER(status)", "")
@@ -0,0 +1,231 @@
+"""
+v31: tools/snapshot.py --serve (resident snapshot daemon).
+
+- Payload matches the one-shot CLI output
+- Unchanged inputs return the cached payload; DB writes and doc edits invalidate it
+- v32: only sections whose inputs changed are recomputed; etag conditional refresh
+- One shared read-only connection serves every loader
+"""
+import io
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tools import snapshot
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.delenv("ATOMIC_MESH_DB", raising=False)
+    conn = sqlite3.connect(tmp_path / "mesh.db")
+    conn.executescript(
+        """
+        CREATE TABLE tasks (id INTEGER PRIMARY KEY, type TEXT, lane TEXT, desc TEXT,
+            status TEXT, priority INTEGER, created_at INTEGER, updated_at INTEGER,
+            notes TEXT, risk TEXT, verified INTEGER DEFAULT 0);
+        CREATE TABLE audit_log (task_id INTEGER, action TEXT, reason TEXT, created_at INTEGER);
+        CREATE TABLE config (key TEXT PRIMARY KEY, value TEXT);
+        INSERT INTO tasks (type, lane, desc, status, priority, created_at, updated_at)
+            VALUES ('backend', 'backend', 'first', 'pending', 1, 1, 1);
+        """
+    )
+    conn.commit()
+    conn.close()
+    (tmp_path / "docs").mkdir()
+    return tmp_path
+
+
+def _add_task(project, status="pending"):
+    conn = sqlite3.connect(project / "mesh.db")
+    conn.execute(
+        "INSERT INTO tasks (type, lane, desc, status, priority, created_at, updated_at) "
+        "VALUES ('backend', 'backend', 'more', ?, 1, 2, 2)",
+        (status,),
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def server(project):
+    s = snapshot.SnapshotServer(project)
+    yield s
+    s.close()
+
+
+def test_serve_payload_matches_one_shot_cli(project):
+    proc = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "tools", "snapshot.py"), str(project)],
+        capture_output=True, text=True, timeout=30,
+    )
+    assert proc.returncode == 0, proc.stderr
+    one_shot = json.loads(proc.stdout)
+
+    stdin = io.StringIO('{"id": 1, "op": "snapshot"}\n')
+    stdout = io.StringIO()
+    snapshot.serve(project, stdin=stdin, stdout=stdout)
+    response = json.loads(stdout.getvalue())
+
+    assert response["id"] == 1 and response["ok"] is True
+    served = response["payload"]
+    for volatile in ("ReadinessMode",):  # Timing guard differs between cold and warm runs
+        one_shot.pop(volatile)
+        served.pop(volatile)
+    assert served == one_shot
+
+
+def test_cache_hit_until_inputs_change(project, server):
+    payload, etag, recomputed = server.snapshot()
+    assert "db" in recomputed and "readiness" in recomputed
+    assert payload["DistinctLaneCounts"]["pending"] == 1
+
+    assert server.snapshot()[1:] == (etag, [])
+
+    _add_task(project)
+    payload, etag2, recomputed = server.snapshot()
+    assert etag2 != etag
+    assert payload["DistinctLaneCounts"]["pending"] == 2
+
+    (project / "docs" / "PRD.md").write_text("# PRD\n", encoding="utf-8")
+    payload, etag3, recomputed = server.snapshot()
+    assert etag3 != etag2
+    assert payload["DocScores"]["PRD"]["exists"] is True
+
+    assert server.snapshot(force=True)[2]
+
+
+def test_single_read_only_connection(project, server, monkeypatch):
+    server.snapshot()
+    shared = snapshot._shared_db["conn"]
+    assert shared is not None
+
+    def no_new_connections(*args, **kwargs):
+        raise AssertionError("loader opened its own connection")
+
+    _add_task(project, status="blocked")
+    monkeypatch.setattr(snapshot.sqlite3, "connect", no_new_connections)
+    payload, _, recomputed = server.snapshot()
+    assert "db" in recomputed
+    assert payload["HealthStatus"] == "WARN"
+    assert snapshot._shared_db["conn"] is shared
+
+    with pytest.raises(sqlite3.OperationalError):
+        shared.execute("DELETE FROM tasks")
+
+
+def test_protocol_ping_errors_and_shutdown(project):
+    stdin = io.StringIO('{"op": "ping"}\nnot json\n{"op": "bogus"}\n{"op": "shutdown"}\n{"id": 9}\n')
+    stdout = io.StringIO()
+    snapshot.serve(project, stdin=stdin, stdout=stdout)
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+    assert responses[0]["pong"] is True
+    assert responses[1]["ok"] is False and "invalid request" in responses[1]["error"]
+    assert responses[2]["ok"] is False and "unknown op" in responses[2]["error"]
+    assert responses[3] == {"id": None, "ok": True}
+    assert len(responses) == 4  # Nothing served after shutdown
+    assert snapshot._shared_db["conn"] is None
+
+
+def test_warmup_handshake_primes_the_first_snapshot(project, server):
+    ready = server.handle({"id": 1, "op": "warmup"})
+    assert ready["ok"] is True and ready["ready"] is True and "payload" not in ready
+    assert ready["recomputed"]  # Cold build happened here, not on the first refresh
+
+    first = server.handle({"id": 2, "op": "snapshot"})
+    assert first["etag"] == ready["etag"] and first["recomputed"] == []
+    assert "payload" in first
+
+
+# =============================================================================
+# v32: Section-level change detection
+# =============================================================================
+
+def _add_audit(project):
+    conn = sqlite3.connect(project / "mesh.db")
+    conn.execute("INSERT INTO audit_log (task_id, action, reason, created_at) VALUES (1, 'x', 'y', 3)")
+    conn.commit()
+    conn.close()
+
+
+def _install_counters(project):
+    """Same triggers mesh_server.init_db() installs (CHANGE_COUNTER_TABLES)."""
+    conn = sqlite3.connect(project / "mesh.db")
+    conn.execute("CREATE TABLE change_counters (name TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0)")
+    for table in ("tasks", "audit_log", "config"):
+        conn.execute("INSERT INTO change_counters VALUES (?, 0)", (table,))
+        for op in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(
+                f"CREATE TRIGGER trg_{table}_{op.lower()}_version AFTER {op} ON {table} "
+                f"BEGIN UPDATE change_counters SET version = version + 1 WHERE name = '{table}'; END"
+            )
+    conn.commit()
+    conn.close()
+
+
+def test_only_sections_with_changed_inputs_recompute(project, server):
+    _install_counters(project)
+    server.snapshot()
+
+    _add_audit(project)
+    assert server.snapshot()[2] == ["history"]
+
+    _add_task(project)
+    assert set(server.snapshot()[2]) == {"db", "plan", "optimize", "history"}
+
+    (project / "docs" / "SPEC.md").write_text("# SPEC\n", encoding="utf-8")
+    assert set(server.snapshot()[2]) == {"init", "readiness"}
+
+
+def test_without_counters_data_version_invalidates_db_sections(project, server):
+    server.snapshot()
+    _add_audit(project)
+    recomputed = set(server.snapshot()[2])
+    assert {"db", "optimize", "history"} <= recomputed
+    assert "readiness" not in recomputed
+
+
+def test_if_none_match_skips_payload(project, server):
+    first = server.handle({"id": 1})
+    assert "payload" in first
+
+    second = server.handle({"id": 2, "if_none_match": first["etag"]})
+    assert second["not_modified"] is True and "payload" not in second
+
+    _add_task(project)
+    third = server.handle({"id": 3, "if_none_match": first["etag"]})
+    assert third["etag"] != first["etag"]
+    assert third["payload"]["DistinctLaneCounts"]["pending"] == 2
+
+
+def test_mesh_server_installs_change_counter_triggers(tmp_path, monkeypatch):
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    import importlib
+    import mesh_server
+    mesh_server = importlib.reload(mesh_server)
+
+    def versions():
+        conn = sqlite3.connect(db)
+        try:
+            return dict(conn.execute("SELECT name, version FROM change_counters").fetchall())
+        finally:
+            conn.close()
+
+    before = versions()
+    assert set(before) == set(mesh_server.CHANGE_COUNTER_TABLES)
+    with mesh_server.get_db() as conn:
+        conn.execute("INSERT INTO tasks (type, desc, status) VALUES ('backend', 'x', 'pending')")
+        conn.execute("UPDATE tasks SET priority = 5")
+    after = versions()
+    assert after["tasks"] == before["tasks"] + 2
+    assert after["decisions"] == before["decisions"]
@@ -0,0 +1,96 @@
+"""
+v42: task_sources junction table mirroring tasks.source_ids.
+
+- Triggers keep it in sync for inserts, source updates and deletes
+- Malformed source_ids never block a task write
+- find_paired_test / upsert_task resolve sources through the indexed join
+"""
+import importlib
+import json
+import sqlite3
+import sys
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def mesh(tmp_path, monkeypatch):
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    import mesh_server
+    return importlib.reload(mesh_server)
+
+
+def _links(mesh):
+    with mesh.get_db() as conn:
+        return sorted(tuple(r) for r in conn.execute("SELECT task_id, source_id FROM task_sources"))
+
+
+def _insert(mesh, task_id, sources, archetype="GENERIC", raw=None):
+    with mesh.get_db() as conn:
+        conn.execute(
+            "INSERT INTO tasks (id, type, desc, status, source_ids, archetype) "
+            "VALUES (?, 'backend', ?, 'pending', ?, ?)",
+            (task_id, f"task {task_id}", raw if raw is not None else json.dumps(sources), archetype),
+        )
+
+
+def test_triggers_keep_links_in_sync(mesh):
+    _insert(mesh, 1, ["HIPAA-01", "STD-SEC-01", "HIPAA-01"])
+    _insert(mesh, 2, None, raw="not json")
+    _insert(mesh, 3, None, raw='{"a": 1}')
+    assert _links(mesh) == [(1, "HIPAA-01"), (1, "STD-SEC-01")]
+
+    mesh.update_task_sources("1", "GDPR-02")
+    with mesh.get_db() as conn:
+        conn.execute("UPDATE tasks SET source_ids = '[\"PRO-ARCH-01\"]' WHERE id = 2")
+        conn.execute("UPDATE tasks SET desc = 'renamed' WHERE id = 1")  # Unrelated column
+    assert _links(mesh) == [(1, "GDPR-02"), (2, "PRO-ARCH-01")]
+
+    with mesh.get_db() as conn:
+        conn.execute("DELETE FROM tasks WHERE id = 1")
+        plan = " ".join(r[-1] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT task_id FROM task_sources WHERE source_id = 'PRO-ARCH-01'"
+        ))
+    assert _links(mesh) == [(2, "PRO-ARCH-01")]
+    assert "idx_task_sources_source" in plan
+
+
+def test_init_backfills_existing_rows(mesh, tmp_path):
+    _insert(mesh, 7, ["DR-HIPAA-01"])
+    conn = sqlite3.connect(tmp_path / "mesh.db")
+    conn.execute("DELETE FROM task_sources")
+    conn.commit()
+    conn.close()
+    mesh.init_db(force=True)
+    assert _links(mesh) == [(7, "DR-HIPAA-01")]
+
+
+def test_paired_test_and_upsert_use_the_join(mesh):
+    _insert(mesh, 1, ["HIPAA-01"], archetype="LOGIC")
+    _insert(mesh, 2, ["GDPR-02"], archetype="TEST")
+    _insert(mesh, 3, ["HIPAA-01", "GDPR-02"], archetype="TEST")
+
+    paired = mesh.find_paired_test(["HIPAA-01"], "LOGIC")
+    assert paired["found"] and paired["task"]["id"] == 3 and paired["status"] == "pending"
+    assert not mesh.find_paired_test(["NOPE-01"])["found"]
+
+    result = json.loads(mesh.upsert_task("[TEST] Verify consent", archetype="TEST", source_ids="GDPR-02, X-1"))
+    assert result["action"] == "UPDATED" and result["task_id"] == 2
+    assert result["match_reason"] == "Source+Archetype match: ['GDPR-02']"
+    assert (2, "X-1") in _links(mesh)
+
+
+def test_lookup_falls_back_without_table(mesh):
+    _insert(mesh, 4, ["HIPAA-01"], archetype="TEST")
+    with mesh.get_db() as conn:
+        conn.execute("DROP TABLE task_sources")
+        for trigger in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER trg_tasks_sources_{trigger}")
+        assert mesh._tasks_sharing_sources(conn, ["HIPAA-01", "X"], archetype="TEST") == {4: ["HIPAA-01"]}
@@ -0,0 +1,109 @@
+"""
+v37: Append-only task_transitions log with monthly compressed archives.
+
+- Claim / reap / requeue / gavel paths record tagged transitions
+- Case-only status rewrites don't produce rows
+- archive_task_transitions() moves old rows into monthly blobs, idempotently,
+  and _iter_task_transitions() still returns the full history
+"""
+import importlib
+import json
+import sys
+import os
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def mesh(tmp_path, monkeypatch):
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    import mesh_server
+    return importlib.reload(mesh_server)
+
+
+def _transitions(mesh, task_id):
+    with mesh.get_db() as conn:
+        return [
+            (r["from_status"], r["to_status"], r["via"])
+            for r in mesh._iter_task_transitions(conn)
+            if r["task_id"] == task_id
+        ]
+
+
+def test_lifecycle_paths_are_tagged(mesh):
+    with mesh.get_db() as conn:
+        conn.execute("INSERT INTO tasks (id, type, desc, status) VALUES (1, 'backend', 'x', 'pending')")
+
+    assert "claimed" in mesh.claim_task(1, "w1").lower()
+    with mesh.get_db() as conn:
+        conn.execute("UPDATE tasks SET lease_expires_at = 1, updated_at = 1 WHERE id = 1")
+    mesh.sweep_stale_leases(max_stale_seconds=1)
+    mesh.claim_task(1, "w2")
+    mesh.requeue_task(1, "retry")
+    ok, _ = mesh.update_task_state(1, "completed", via_gavel=True)
+    assert ok
+
+    assert _transitions(mesh, 1) == [
+        (None, "pending", ""),
+        ("pending", "in_progress", "claim"),
+        ("in_progress", "pending", "reap"),
+        ("pending", "in_progress", "claim"),
+        ("in_progress", "pending", "requeue"),
+        ("pending", "completed", "gavel"),
+    ]
+    with mesh.get_db() as conn:
+        workers = [r["worker_id"] for r in conn.execute("SELECT worker_id FROM task_transitions ORDER BY id")]
+        assert workers[1:3] == ["w1", "w1"]
+        assert conn.execute("SELECT via FROM transition_context").fetchone()[0] == ""
+
+
+def test_case_only_rewrite_is_not_a_transition(mesh):
+    with mesh.get_db() as conn:
+        conn.execute("INSERT INTO tasks (id, type, desc, status) VALUES (1, 'backend', 'x', 'PENDING')")
+        conn.execute("UPDATE tasks SET status = 'Pending' WHERE id = 1")  # SAFETY-ALLOW: status-write
+    assert _transitions(mesh, 1) == [(None, "pending", "")]
+
+
+def test_archive_rolls_old_rows_into_months(mesh):
+    now = int(time.time())
+    jan, feb = 1767225600, 1769904000  # 2026-01-01, 2026-02-01 (UTC)
+    with mesh.get_db() as conn:
+        for i, at in enumerate([jan + 10, jan + 20, feb + 5, now]):
+            conn.execute(
+                "INSERT INTO task_transitions (task_id, from_status, to_status, via, at) "
+                "VALUES (?, 'pending', 'in_progress', 'claim', ?)", (100 + i, at),
+            )
+    before = _transitions(mesh, 100) + _transitions(mesh, 102)
+
+    summary = json.loads(mesh.archive_task_transitions(retention_days=1))
+    assert summary["archived"] == {"2026-01": 2, "2026-02": 1}
+    assert summary["hot_rows"] >= 1
+
+    with mesh.get_db() as conn:
+        archive = {r["month"]: r["row_count"] for r in conn.execute("SELECT * FROM task_transitions_archive")}
+        assert archive == {"2026-01": 2, "2026-02": 1}
+        assert conn.execute("SELECT COUNT(*) FROM task_transitions WHERE at < ?", (now - 86400,)).fetchone()[0] == 0
+        ats = [r["at"] for r in mesh._iter_task_transitions(conn, since_at=jan)]
+        assert ats == sorted(ats) and ats[:3] == [jan + 10, jan + 20, feb + 5]
+        assert [r["at"] for r in mesh._iter_task_transitions(conn, since_at=feb, until_at=now)] == [feb + 5]
+    assert _transitions(mesh, 100) + _transitions(mesh, 102) == before
+
+    # Re-running (and archiving a late-arriving January row) merges, never duplicates
+    with mesh.get_db() as conn:
+        conn.execute(
+            "INSERT INTO task_transitions (task_id, from_status, to_status, via, at) "
+            "VALUES (200, 'in_progress', 'completed', 'complete', ?)", (jan + 30,),
+        )
+    summary = json.loads(mesh.archive_task_transitions(retention_days=1))
+    assert summary["archived"] == {"2026-01": 1}
+    assert json.loads(mesh.archive_task_transitions(retention_days=1))["archived_total"] == 0
+    with mesh.get_db() as conn:
+        row = conn.execute("SELECT row_count, payload FROM task_transitions_archive WHERE month='2026-01'").fetchone()
+        assert row[0] == 3 and len(mesh._decode_transition_payload(row[1])) == 3
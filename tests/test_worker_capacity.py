@@ -0,0 +1,109 @@
+"""
+v40: Capacity-aware dispatch fed by worker heartbeats.
+
+- A worker that reported a capacity gets no more than that many tasks
+- MESH_LANE_CONCURRENCY caps in_progress tasks per lane
+- Lanes holding their fair share of online capacity are tried last
+- Expired heartbeats let the reaper requeue a dead worker's tasks early
+- The registry is rebuilt from worker_heartbeats after a restart
+"""
+import importlib
+import json
+import sys
+import os
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def mesh(tmp_path, monkeypatch):
+    db = tmp_path / "mesh.db"
+    db.touch()
+    monkeypatch.setenv("MESH_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATOMIC_MESH_DB", str(db))
+    monkeypatch.delenv("MESH_LANE_CONCURRENCY", raising=False)
+    import mesh_server
+    return importlib.reload(mesh_server)
+
+
+def _add(mesh, lane, n, status="pending"):
+    with mesh.get_db() as conn:
+        for i in range(n):
+            conn.execute(
+                "INSERT INTO tasks (type, lane, desc, status, deps, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, '[]', ?, ?)",
+                (lane, lane, f"{lane}-{i}", status, i, int(time.time())),
+            )
+
+
+def test_worker_capacity_limits_claims(mesh):
+    _add(mesh, "backend", 4)
+    mesh.worker_heartbeat("backend_1", worker_type="backend", capacity=2)
+
+    picks = [json.loads(mesh.pick_task_braided("backend_1", worker_type="backend")) for _ in range(3)]
+    assert [p["status"] for p in picks] == ["OK", "OK", "NO_WORK"]
+    assert picks[2]["no_work_reason"] == "worker_at_capacity" and picks[2]["capacity"] == 2
+
+    # Workers that never reported a capacity are not limited
+    assert json.loads(mesh.pick_task_braided("backend_2", worker_type="backend"))["status"] == "OK"
+
+
+def test_lane_concurrency_limit(mesh, monkeypatch):
+    monkeypatch.setattr(mesh, "LANE_CONCURRENCY_LIMITS", mesh._parse_lane_limits("qa=1, bogus, docs=x"))
+    assert mesh.LANE_CONCURRENCY_LIMITS == {"qa": 1}
+    _add(mesh, "qa", 3)
+    _add(mesh, "docs", 1)
+
+    lanes = [json.loads(mesh.pick_task_braided("w")).get("lane") for _ in range(3)]
+    assert sorted(lanes[:2]) == ["docs", "qa"]
+    # Other lanes are merely empty; a qa-only picker is told the lane is full
+    final = json.loads(mesh.pick_task_braided("w", blocked_lanes=["backend", "frontend", "ops", "docs"]))
+    assert final["no_work_reason"] == "lanes_at_capacity" and final["lanes_full"] == ["qa"]
+
+
+def test_fair_share_defers_saturated_lanes(mesh):
+    _add(mesh, "backend", 3, status="in_progress")
+    _add(mesh, "backend", 2)
+    _add(mesh, "docs", 2)
+    mesh.worker_heartbeat("w1", capacity=2)
+    mesh.worker_heartbeat("w2", capacity=2)
+
+    with mesh.get_db() as conn:
+        view = mesh._dispatch_capacity(conn, "w3", int(time.time()), list(mesh.LANE_ORDER))
+    assert view["fair_share"] == 2 and view["over_share"] == {"backend"}
+
+    mesh._write_lane_pointer(0, "backend")  # Rotation alone would pick backend
+    assert json.loads(mesh.pick_task_braided("w3"))["lane"] == "docs"
+
+
+def test_expired_heartbeat_feeds_reaper(mesh):
+    now = int(time.time())
+    with mesh.get_db() as conn:
+        for worker, seen in (("dead", now - 600), ("alive", now)):
+            conn.execute(
+                "INSERT INTO worker_heartbeats (worker_id, last_seen, created_at) VALUES (?, ?, ?)",
+                (worker, seen, seen),
+            )
+            conn.execute(
+                "INSERT INTO tasks (type, lane, desc, status, worker_id, updated_at) "
+                "VALUES ('backend', 'backend', ?, 'in_progress', ?, ?)",  # SAFETY-ALLOW: status-write
+                (worker, worker, now - 300),
+            )
+        reap = mesh._reap_stale_in_progress(conn, now)
+        assert reap["reaped"] == 1
+        rows = dict(conn.execute("SELECT desc, status FROM tasks").fetchall())
+    assert rows == {"dead": "pending", "alive": "in_progress"}
+
+
+def test_registry_reloads_from_heartbeats(mesh):
+    mesh.worker_heartbeat("backend_9", worker_type="backend", allowed_lanes=["backend"], capacity=3)
+    fresh = mesh._WorkerRegistry()
+    with mesh.get_db() as conn:
+        fresh.ensure_loaded(conn)
+    worker = fresh.get("backend_9")
+    assert worker["capacity"] == 3 and worker["allowed_lanes"] == ["backend"]
+    assert [w["worker_id"] for w in fresh.live(int(time.time()))] == ["backend_9"]
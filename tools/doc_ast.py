@@ -0,0 +1,351 @@
+"""
+v43: Single-pass markdown tokenizer shared by the plan extractors
+(mesh_server._extract_*), write_active_spec_snapshot and tools/readiness.py.
+
+parse_markdown() splits a document into lines once and records headings,
+bullets and table rows; extractors query sections and line kinds instead of
+each running whole-document regexes. Parsed documents are memoized by
+content hash, and MarkdownDoc.memo lets each consumer cache its derived
+results on the document, so PRD/SPEC/DECISION_LOG are tokenized and
+analyzed once per content version, however many tools ask.
+
+v44: AnalysisStore persists derived results (readiness scores, extracted
+stories/endpoints/entities/decisions) under control/state, keyed by each
+document's (path, size, mtime, sha1), so separate processes - the MCP
+server, the readiness subprocess, the snapshot daemon - share them.
+
+Stdlib only (readiness.py must stay import-light).
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+DOC_CACHE_MAX = 64
+
+# Column-0 ATX heading: "## Title" (not "#Title", not indented)
+_HEADING_RE = re.compile(r"(#{1,6})\s")
+# Bullet / numbered / checkbox line (readiness scorer's definition)
+_BULLET_RE = re.compile(r"[\s]*(?:(?:[-*]|\d+\.)\s+(?:\[[ xX]\]\s+)?|\[[ xX]\]\s+)")
+# Candidate header text: optional hashes stripped, cut at "(" or trailing ":"
+_HEADER_KEY_RE = re.compile(r"(?:#{1,6}\s+)?(.*?)(?:[\s:]*|\s*\(.*)$")
+
+
+class MarkdownDoc:
+    """
+    Tokenized markdown document.
+
+    lines      raw lines (no newline); line i ended with "\\n" unless last
+    headings   [(line index, level, title)] for column-0 ATX headings
+    bullets    line indexes the readiness scorer counts as bullet points
+    tables     line indexes of table rows (stripped line starts with "|")
+    memo       per-document cache for consumers' derived results
+    """
+
+    __slots__ = ("text", "sha1", "lines", "headings", "bullets", "tables", "word_count",
+                 "_header_keys", "memo")
+
+    def __init__(self, text: str, sha1: Optional[str] = None):
+        self.text = text
+        self.sha1 = sha1 or content_hash(text)
+        self.lines = text.split("\n")
+        self.headings: List[Tuple[int, int, str]] = []
+        self.bullets: List[int] = []
+        self.tables: List[int] = []
+        self.word_count = len(text.split())
+        self._header_keys = None
+        self.memo: Dict = {}
+
+        last = len(self.lines) - 1
+        for i, line in enumerate(self.lines):
+            if line.startswith("#"):
+                match = _HEADING_RE.match(line)
+                if match:
+                    self.headings.append((i, len(match.group(1)), line[match.end():].strip()))
+            # Bullet markers may be followed by the line break itself ("-\n")
+            if _BULLET_RE.match(line if i == last else line + "\n"):
+                self.bullets.append(i)
+            if line.lstrip().startswith("|"):
+                self.tables.append(i)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def find(self, pattern, start: int = 0) -> Optional[Tuple[int, "re.Match"]]:
+        """First (line index, match) where pattern matches at the start of a line."""
+        for i in range(start, len(self.lines)):
+            match = pattern.match(self.lines[i])
+            if match:
+                return i, match
+        return None
+
+    def section_end(self, start: int, levels=(1, 2, 3),
+                    stop: Optional[Callable[[str], bool]] = None) -> int:
+        """
+        Index of the first line after start that ends its section: a heading
+        whose level is in levels, or (optionally) a line stop() accepts.
+        """
+        end = len(self.lines)
+        for i, level, _ in self.headings:
+            if i > start and level in levels:
+                end = i
+                break
+        if stop is not None:
+            for i in range(start + 1, end):
+                if stop(self.lines[i]):
+                    return i
+        return end
+
+    def section(self, pattern, levels=(1, 2, 3),
+                stop: Optional[Callable[[str], bool]] = None) -> Optional[List[str]]:
+        """
+        Body lines of the first section whose heading line matches pattern.
+        Blank lines under the heading belong to it, and the first body line
+        never closes the section (a "### Must Have" right below "## User
+        Stories" opens it), matching the extractors' original regexes.
+        """
+        found = self.find(pattern)
+        if found is None:
+            return None
+        start = found[0]
+        first = start + 1
+        while first < len(self.lines) - 1 and not self.lines[first].strip():
+            first += 1
+        return self.lines[start + 1:self.section_end(first, levels, stop)]
+
+    def has_header(self, header_text: str) -> bool:
+        """
+        True when some line reads as header_text: "## Text", "# Text" or plain
+        "Text" at line start, optionally followed by ":" or a "(...)" note.
+        Case-insensitive.
+        """
+        if self._header_keys is None:
+            keys = set()
+            for line in self.lines:
+                keys.add(_HEADER_KEY_RE.match(line).group(1).lower())
+            self._header_keys = keys
+        return header_text.lower() in self._header_keys
+
+    def cached(self, key, compute: Callable):
+        """memo[key], computed once per document version."""
+        try:
+            return self.memo[key]
+        except KeyError:
+            value = self.memo[key] = compute()
+            return value
+
+
+# ----------------------------------------------------------------------
+# Caches
+# ----------------------------------------------------------------------
+
+_lock = threading.Lock()
+_docs: "OrderedDict[str, MarkdownDoc]" = OrderedDict()
+_derived: "OrderedDict[tuple, object]" = OrderedDict()
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def parse_markdown(text: str) -> MarkdownDoc:
+    """Tokenize text, reusing the parse of identical content (LRU by sha1)."""
+    sha1 = content_hash(text)
+    with _lock:
+        doc = _docs.get(sha1)
+        if doc is not None:
+            _docs.move_to_end(sha1)
+            return doc
+    doc = MarkdownDoc(text, sha1)
+    with _lock:
+        doc = _docs.setdefault(sha1, doc)
+        _docs.move_to_end(sha1)
+        while len(_docs) > DOC_CACHE_MAX:
+            _docs.popitem(last=False)
+    return doc
+
+
+def derive(text: str, key, compute: Callable[[str], object]):
+    """
+    compute(text), memoized by (key, content hash) - for whole-text
+    transforms that run before tokenizing (e.g. stripping LLM blocks).
+    """
+    cache_key = (key, content_hash(text))
+    with _lock:
+        if cache_key in _derived:
+            _derived.move_to_end(cache_key)
+            return _derived[cache_key]
+    value = compute(text)
+    with _lock:
+        _derived[cache_key] = value
+        while len(_derived) > DOC_CACHE_MAX:
+            _derived.popitem(last=False)
+    return value
+
+
+def read_text(path, errors: str = "strict") -> str:
+    """Read a doc as UTF-8 (raises like open(); errors as for open())."""
+    with open(path, "r", encoding="utf-8", errors=errors) as f:
+        return f.read()
+
+
+def load_markdown(path, errors: str = "strict") -> MarkdownDoc:
+    """
+    parse_markdown(read_text(path)). Reading is cheap; the parse (and every
+    memoized result on it) is reused while the content hash is unchanged.
+    """
+    return parse_markdown(read_text(path, errors))
+
+
+def clear_caches() -> None:
+    with _lock:
+        _docs.clear()
+        _derived.clear()
+        _store_files.clear()
+
+
+# ----------------------------------------------------------------------
+# v44: Persistent analysis store (control/state/doc_analysis.json)
+# ----------------------------------------------------------------------
+
+ANALYSIS_STORE_FILE = "doc_analysis.json"
+# Bump when an analysis changes shape or meaning: older stores are dropped
+ANALYSIS_STORE_VERSION = 1
+ANALYSIS_STORE_MAX_DOCS = 32
+
+# store path -> ((mtime_ns, size), parsed docs) - skips re-parsing the JSON
+_store_files: Dict[str, tuple] = {}
+
+
+def _file_signature(path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def file_version(path) -> str:
+    """Short "mtime_ns:size" tag for keys that depend on another file (templates)."""
+    sig = _file_signature(path)
+    return f"{sig[0]}:{sig[1]}" if sig else "missing"
+
+
+class AnalysisStore:
+    """
+    Derived results per document, persisted as JSON under state_dir.
+
+    A document's results are valid while its (size, mtime_ns, sha1) match
+    the stored entry; any change starts the entry afresh. Values must be
+    JSON-serializable. Fail-open: an unreadable or unwritable store just
+    means recomputing.
+
+        store = AnalysisStore(state_dir)
+        stories = store.get(prd_path, prd_text, "user_stories", extract)
+        store.save()
+    """
+
+    def __init__(self, state_dir):
+        self.path = os.path.join(str(state_dir), ANALYSIS_STORE_FILE)
+        self._docs = self._load()
+        self._dirty = set()
+
+    def _load(self) -> dict:
+        sig = _file_signature(self.path)
+        if sig is None:
+            return {}
+        with _lock:
+            cached = _store_files.get(self.path)
+        if cached is not None and cached[0] == sig:
+            return copy.deepcopy(cached[1])
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != ANALYSIS_STORE_VERSION:
+            return {}
+        docs = data.get("docs")
+        docs = docs if isinstance(docs, dict) else {}
+        with _lock:
+            _store_files[self.path] = (sig, copy.deepcopy(docs))
+        return docs
+
+    def _entry(self, path, text: str) -> dict:
+        key = os.path.abspath(str(path))
+        sig = _file_signature(path) or (0, 0)
+        sha1 = content_hash(text)
+        entry = self._docs.get(key)
+        if not (isinstance(entry, dict) and entry.get("sha1") == sha1
+                and entry.get("mtime_ns") == sig[0] and entry.get("size") == sig[1]
+                and isinstance(entry.get("results"), dict)):
+            entry = self._docs[key] = {
+                "size": sig[1], "mtime_ns": sig[0], "sha1": sha1, "results": {},
+            }
+            self._dirty.add(key)
+        return entry
+
+    def lookup(self, path, text: str, key: str):
+        """Stored result for this document version (a copy), or None."""
+        value = self._entry(path, text)["results"].get(key)
+        return copy.deepcopy(value) if value is not None else None
+
+    def put(self, path, text: str, key: str, value) -> None:
+        self._entry(path, text)["results"][key] = copy.deepcopy(value)
+        self._dirty.add(os.path.abspath(str(path)))
+
+    def get(self, path, text: str, key: str, compute: Callable[[str], object]):
+        """compute(text), stored under key for this document version; returns a copy."""
+        value = self.lookup(path, text, key)
+        if value is None:
+            value = compute(text)
+            self.put(path, text, key, value)
+        return value
+
+    def save(self) -> bool:
+        """
+        Write touched entries back, merged into whatever another process
+        saved meanwhile (atomic replace). Returns False if nothing was written.
+        """
+        if not self._dirty:
+            return False
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._store_files_invalidate()
+            on_disk = self._load()
+            now = int(time.time())
+            for key in self._dirty:
+                entry = dict(self._docs[key], used_at=now)
+                theirs = on_disk.get(key)
+                if (isinstance(theirs, dict) and isinstance(theirs.get("results"), dict)
+                        and all(theirs.get(f) == entry[f] for f in ("sha1", "mtime_ns", "size"))):
+                    entry["results"] = {**theirs["results"], **entry["results"]}
+                on_disk[key] = entry
+            if len(on_disk) > ANALYSIS_STORE_MAX_DOCS:
+                keep = sorted(on_disk, key=lambda k: on_disk[k].get("used_at", 0), reverse=True)
+                on_disk = {k: on_disk[k] for k in keep[:ANALYSIS_STORE_MAX_DOCS]}
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": ANALYSIS_STORE_VERSION, "docs": on_disk}, f)
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError):
+            return False
+        self._docs = on_disk
+        self._dirty.clear()
+        sig = _file_signature(self.path)
+        with _lock:
+            if sig is not None:
+                _store_files[self.path] = (sig, copy.deepcopy(on_disk))
+        return True
+
+    def _store_files_invalidate(self) -> None:
+        with _lock:
+            _store_files.pop(self.path, None)
+
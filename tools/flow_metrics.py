@@ -0,0 +1,178 @@
+"""
+v38: Flow (queue-theory) metrics over the task_transitions log.
+
+Pure functions: mesh_server feeds transition rows (see _iter_task_transitions)
+and gets back rolling-window numbers for fleet sizing:
+
+- arrival rate and throughput per hour
+- wait (pending -> claim), service (claim -> review/done), review dwell and
+  lead time (arrival -> completed) as p50/p90/p95, per lane and archetype
+- rework rate (reject_work / reopen_task transitions vs. completions)
+- workers needed per lane to keep the mean claim wait under a target,
+  from an M/M/c (Erlang C) model of that lane
+
+Intervals are attributed to the window they *end* in, so callers should pass
+transitions starting some lookback before the window (interval starts).
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional
+
+PERCENTILES = (50, 90, 95)
+WORKERS_NEEDED_CAP = 64
+
+ACTIVE_STATUSES = ("in_progress",)
+REVIEW_STATUSES = ("review_needed", "reviewing")
+DONE_STATUSES = ("completed",)
+REWORK_VIAS = ("reject", "reopen")
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list (None when empty)."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(values: Iterable[float]) -> Dict:
+    """count / mean / pXX for one duration series (seconds)."""
+    ordered = sorted(values)
+    summary = {"count": len(ordered), "mean_s": None}
+    if ordered:
+        summary["mean_s"] = round(sum(ordered) / len(ordered), 1)
+    for pct in PERCENTILES:
+        summary[f"p{pct}_s"] = percentile(ordered, pct)
+    return summary
+
+
+def erlang_c_wait(arrival_rate: float, service_s: float, servers: int) -> Optional[float]:
+    """
+    Mean queue wait (seconds) of an M/M/c queue; None when the queue is
+    unstable (offered load >= servers).
+    """
+    load = arrival_rate * service_s  # Offered load in Erlangs
+    if servers <= 0 or load >= servers:
+        return None
+    if load == 0:
+        return 0.0
+    # sum_{k<c} a^k/k! and a^c/c!, built incrementally (no factorial overflow)
+    term, head = 1.0, 0.0
+    for k in range(servers):
+        head += term
+        term *= load / (k + 1)
+    tail = term * servers / (servers - load)
+    prob_wait = tail / (head + tail)
+    return prob_wait * service_s / (servers - load)
+
+
+def workers_needed(arrival_rate: float, service_s: Optional[float], target_wait_s: float,
+                   cap: int = WORKERS_NEEDED_CAP) -> Optional[int]:
+    """Smallest worker count whose Erlang C mean wait is <= target_wait_s."""
+    if not arrival_rate or not service_s:
+        return 0 if not arrival_rate else None
+    start = max(1, math.floor(arrival_rate * service_s) + 1)
+    for servers in range(start, cap + 1):
+        wait = erlang_c_wait(arrival_rate, service_s, servers)
+        if wait is not None and wait <= target_wait_s:
+            return servers
+    return None  # Not reachable within cap
+
+
+class _Series:
+    """Duration samples for one grouping (overall / lane / archetype)."""
+
+    __slots__ = ("wait", "service", "review", "lead", "arrivals", "completed", "rework")
+
+    def __init__(self):
+        self.wait, self.service, self.review, self.lead = [], [], [], []
+        self.arrivals = self.completed = self.rework = 0
+
+    def to_dict(self, hours: float) -> Dict:
+        finished = self.completed + self.rework
+        return {
+            "arrivals": self.arrivals,
+            "arrival_rate_per_h": round(self.arrivals / hours, 3),
+            "completed": self.completed,
+            "throughput_per_h": round(self.completed / hours, 3),
+            "rework": self.rework,
+            "rework_rate": round(self.rework / finished, 3) if finished else None,
+            "wait": summarize(self.wait),
+            "service": summarize(self.service),
+            "review_dwell": summarize(self.review),
+            "lead_time": summarize(self.lead),
+        }
+
+
+def compute_flow_metrics(transitions: Iterable[Dict], window_start: int, window_end: int,
+                         target_wait_s: float, created_at: Optional[Dict[int, int]] = None) -> Dict:
+    """
+    Aggregate transitions (dicts with task_id, from_status, to_status, lane,
+    archetype, via, at; ordered by at) into flow metrics for
+    [window_start, window_end). created_at supplies arrival times for tasks
+    whose insert predates the transition log.
+    """
+    created_at = created_at or {}
+    hours = max((window_end - window_start) / 3600.0, 1e-9)
+    overall, by_lane, by_archetype = _Series(), {}, {}
+    # Per task: status entered at, first arrival, lane/archetype
+    entered: Dict[int, tuple] = {}
+    arrived: Dict[int, int] = {}
+
+    for row in transitions:
+        task_id, at = row["task_id"], int(row["at"])
+        lane = row.get("lane") or "UNKNOWN"
+        archetype = row.get("archetype") or "GENERIC"
+        from_status, to_status = row.get("from_status"), row.get("to_status")
+        if from_status is None:
+            arrived[task_id] = at
+        previous = entered.get(task_id)
+        entered[task_id] = (to_status, at)
+        if not window_start <= at < window_end:
+            continue
+
+        groups = (
+            overall,
+            by_lane.setdefault(lane, _Series()),
+            by_archetype.setdefault(archetype, _Series()),
+        )
+        if from_status is None:
+            for series in groups:
+                series.arrivals += 1
+        if previous is not None and previous[0] == from_status:
+            dwell = at - previous[1]
+            if from_status in ("pending", "blocked") and to_status in ACTIVE_STATUSES:
+                bucket = "wait"
+            elif from_status in ACTIVE_STATUSES and to_status in REVIEW_STATUSES + DONE_STATUSES:
+                bucket = "service"
+            elif from_status in REVIEW_STATUSES:
+                bucket = "review"
+            else:
+                bucket = None
+            if bucket:
+                for series in groups:
+                    getattr(series, bucket).append(dwell)
+        if row.get("via") in REWORK_VIAS:
+            for series in groups:
+                series.rework += 1
+        if to_status in DONE_STATUSES:
+            start = arrived.get(task_id, created_at.get(task_id))
+            for series in groups:
+                series.completed += 1
+                if start is not None:
+                    series.lead.append(at - start)
+
+    lanes = {}
+    for lane, series in sorted(by_lane.items()):
+        stats = series.to_dict(hours)
+        rate_per_s = series.arrivals / (hours * 3600.0)
+        stats["workers_needed"] = workers_needed(rate_per_s, stats["service"]["mean_s"], target_wait_s)
+        lanes[lane] = stats
+
+    return {
+        "window": {"start": window_start, "end": window_end, "hours": round(hours, 3)},
+        "target_wait_s": target_wait_s,
+        "overall": overall.to_dict(hours),
+        "lanes": lanes,
+        "archetypes": {name: s.to_dict(hours) for name, s in sorted(by_archetype.items())},
+    }
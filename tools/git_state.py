@@ -0,0 +1,308 @@
+"""
+v35: Shared background git-status cache.
+
+One GitStateService per worktree runs `git status --porcelain -b` off the
+request path and keeps the last result. Callers (tools/snapshot.py,
+mesh_server's exec snapshot, librarian_tools, vibe_mcp.git_server) read the
+last known state together with its age instead of shelling out themselves.
+
+Invalidation:
+- watchdog (inotify/FSEvents/ReadDirectoryChangesW) on the worktree when the
+  package is installed. The recursive watch is set up on its own thread, so
+  one-shot callers never wait for it; SQLite files (the mesh DB and its WAL)
+  and .git internals other than index/HEAD are ignored
+- otherwise a poller on .git/index and .git/HEAD (commits, staging, checkouts)
+  plus a max-age refresh that picks up plain worktree edits
+
+The background refresh uses a generous timeout, so large repos produce a real
+answer a little later instead of timing out and reporting "clean".
+"""
+
+import atexit
+import os
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+GIT_STATUS_TIMEOUT_S = 30.0   # Background refresh; never on a caller's path
+GIT_STATE_MAX_AGE_S = 5.0     # Refresh at least this often (catches unwatched edits)
+GIT_STATE_POLL_S = 0.5        # .git/index + HEAD poll interval
+GIT_STATE_DEBOUNCE_S = 0.2    # Coalesce bursts of watcher events
+
+# Worktree files whose writes never change `git status` in practice (the mesh
+# DB lives in the worktree and is git-ignored, but its WAL churns constantly)
+IGNORED_EVENT_SUFFIXES = (".db", "-wal", "-shm", "-journal")
+
+
+@dataclass(frozen=True)
+class GitState:
+    """Result of one `git status --porcelain -b` run."""
+    ok: bool
+    branch: str = ""
+    entries: Tuple[str, ...] = ()   # Porcelain lines, without the "##" header
+    error: Optional[str] = None
+    checked_at: Optional[float] = None  # time.monotonic() of the run
+    duration_ms: int = 0
+
+    @property
+    def age_s(self) -> Optional[float]:
+        if self.checked_at is None:
+            return None
+        return time.monotonic() - self.checked_at
+
+    @property
+    def clean(self) -> bool:
+        """Fail-open: an unknown or failed status counts as clean."""
+        return not self.ok or not self.entries
+
+
+PENDING_STATE = GitState(ok=False, error="git status pending")
+
+
+def run_git_status(repo_root: str, timeout_s: float = GIT_STATUS_TIMEOUT_S) -> GitState:
+    """Run git status once (synchronously) and parse it into a GitState."""
+    started = time.monotonic()
+    try:
+        # --no-optional-locks: don't rewrite .git/index (would re-trigger the poller)
+        proc = subprocess.run(
+            ["git", "--no-optional-locks", "status", "--porcelain", "-b"],
+            cwd=repo_root,
+            capture_output=True,
+            text=True,
+            timeout=timeout_s,
+        )
+    except subprocess.TimeoutExpired:
+        return GitState(ok=False, error=f"git status timed out after {timeout_s}s", checked_at=time.monotonic())
+    except Exception as e:
+        return GitState(ok=False, error=str(e), checked_at=time.monotonic())
+
+    finished = time.monotonic()
+    if proc.returncode != 0:
+        return GitState(ok=False, error=proc.stderr.strip() or f"git exited {proc.returncode}",
+                        checked_at=finished)
+    branch = ""
+    entries = []
+    for line in proc.stdout.splitlines():
+        if line.startswith("##"):
+            branch = line[3:].split("...")[0]
+        elif line.strip():
+            entries.append(line)
+    return GitState(ok=True, branch=branch, entries=tuple(entries), checked_at=finished,
+                    duration_ms=int((finished - started) * 1000))
+
+
+def _git_dir(repo_root: str) -> str:
+    """Resolve .git (a directory, or a "gitdir: ..." file for worktrees/submodules)."""
+    dot_git = os.path.join(repo_root, ".git")
+    if os.path.isfile(dot_git):
+        try:
+            with open(dot_git, "r", encoding="utf-8") as f:
+                line = f.readline().strip()
+            if line.startswith("gitdir:"):
+                return os.path.normpath(os.path.join(repo_root, line[len("gitdir:"):].strip()))
+        except OSError:
+            pass
+    return dot_git
+
+
+def _invalidates(path: str, git_dir: str) -> bool:
+    """Whether a change to path can change `git status` output."""
+    path = os.path.abspath(path)
+    if path.startswith(git_dir + os.sep):
+        # Inside .git (objects/, logs/, locks...) only index/HEAD matter
+        return os.path.basename(path) in ("index", "HEAD")
+    return not path.endswith(IGNORED_EVENT_SUFFIXES)
+
+
+class _InvalidateHandler(FileSystemEventHandler):
+    """Invalidate the service on watcher events that can change git status."""
+
+    def __init__(self, service: "GitStateService"):
+        self.service = service
+
+    def on_any_event(self, event):
+        for path in (getattr(event, "src_path", ""), getattr(event, "dest_path", "")):
+            # index.lock -> index renames surface as dest_path
+            if path and _invalidates(path, self.service.git_dir):
+                self.service.invalidate()
+                return
+
+
+@dataclass
+class GitStateService:
+    """Background git-status refresher for one worktree."""
+    repo_root: str
+    max_age_s: float = GIT_STATE_MAX_AGE_S
+    poll_interval_s: float = GIT_STATE_POLL_S
+    timeout_s: float = GIT_STATUS_TIMEOUT_S
+    use_watchdog: bool = WATCHDOG_AVAILABLE
+
+    _state: GitState = field(default=PENDING_STATE, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _refresh_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _wakeup: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _ready: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _stop: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _dirty: bool = field(default=True, init=False, repr=False)
+    _signature: Optional[tuple] = field(default=None, init=False, repr=False)
+    _thread: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+    _observer: object = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self.repo_root = os.path.abspath(self.repo_root)
+        self.git_dir = _git_dir(self.repo_root)
+
+    # === LIFECYCLE ===
+
+    @property
+    def watching(self) -> str:
+        return "watchdog" if self._observer is not None else "poll"
+
+    def start(self) -> "GitStateService":
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        if self.use_watchdog and WATCHDOG_AVAILABLE:
+            # A recursive schedule walks the whole worktree; keep it off the caller
+            threading.Thread(target=self._start_observer, name="GitStateWatcher", daemon=True).start()
+        self._thread = threading.Thread(target=self._loop, name="GitStateRefresher", daemon=True)
+        self._thread.start()
+        return self
+
+    def _start_observer(self) -> None:
+        try:
+            observer = Observer()
+            observer.schedule(_InvalidateHandler(self), self.repo_root, recursive=True)
+            observer.daemon = True
+            observer.start()
+        except Exception:
+            return  # inotify limits etc. - polling still works
+        with self._lock:
+            if not self._stop.is_set() and self._observer is None:
+                self._observer, observer = observer, None
+        if observer is not None:  # stop() (or a restart) ran while we were scheduling
+            observer.stop()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        with self._lock:
+            observer, self._observer = self._observer, None
+        if observer is not None:
+            try:
+                observer.stop()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    # === READ / INVALIDATE ===
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._dirty = True
+        self._wakeup.set()
+
+    def get(self, wait_s: float = 0.0, max_age_s: Optional[float] = None) -> GitState:
+        """
+        Last known state. wait_s bounds how long to wait for the very first
+        result; max_age_s forces a synchronous refresh when the cached state is
+        invalidated or older than that (for callers that gate writes on it).
+        """
+        if wait_s and not self._ready.is_set():
+            self._ready.wait(wait_s)
+        with self._lock:
+            state, dirty = self._state, self._dirty
+        if max_age_s is not None:
+            age = state.age_s
+            if dirty or age is None or age > max_age_s:
+                return self.refresh()
+        return state
+
+    def refresh(self) -> GitState:
+        """Run git status now and publish the result."""
+        with self._refresh_lock:
+            with self._lock:
+                self._dirty = False
+            signature = self._index_signature()
+            state = run_git_status(self.repo_root, self.timeout_s)
+            with self._lock:
+                self._state = state
+                self._signature = signature
+            self._ready.set()
+            return state
+
+    # === BACKGROUND LOOP ===
+
+    def _index_signature(self) -> tuple:
+        sig = []
+        for name in ("index", "HEAD"):
+            try:
+                st = os.stat(os.path.join(self.git_dir, name))
+                sig.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                sig.append(None)
+        return tuple(sig)
+
+    def _needs_refresh(self) -> bool:
+        with self._lock:
+            state, dirty, signature = self._state, self._dirty, self._signature
+        if dirty:
+            return True
+        age = state.age_s
+        if age is None or age >= self.max_age_s:
+            return True
+        return self._index_signature() != signature
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            if self._needs_refresh():
+                self.refresh()
+                # Coalesce the burst of events that usually follows a save/commit
+                self._stop.wait(GIT_STATE_DEBOUNCE_S)
+            self._wakeup.wait(self.poll_interval_s)
+            self._wakeup.clear()
+
+
+# =============================================================================
+# SHARED REGISTRY (one service per worktree per process)
+# =============================================================================
+
+_services: Dict[str, GitStateService] = {}
+_services_lock = threading.Lock()
+
+
+def get_service(repo_root) -> GitStateService:
+    """Shared, started GitStateService for repo_root."""
+    key = os.path.realpath(str(repo_root))
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = _services[key] = GitStateService(key)
+        service.start()
+        return service
+
+
+def read_git_state(repo_root, wait_s: float = 0.0, max_age_s: Optional[float] = None) -> GitState:
+    """Convenience: get_service(repo_root).get(...)."""
+    return get_service(repo_root).get(wait_s=wait_s, max_age_s=max_age_s)
+
+
+@atexit.register
+def stop_all() -> None:
+    with _services_lock:
+        services = list(_services.values())
+        _services.clear()
+    for service in services:
+        service.stop()
@@ -0,0 +1,345 @@
+"""
+v50: Write-ahead buffered appender for the Release Ledger (group commit).
+
+One LedgerWriter per ledger file per process owns the append handle. Callers
+serialize their entries and queue them; a writer thread drains the queue,
+appends everything queued so far with one write() and fsyncs per the
+durability level, then releases the callers. Decisions arriving while a
+write/fsync is in flight form the next group, so concurrent auditors and
+auto-approval batches share writes and fsyncs instead of each opening the
+file.
+
+Durability levels (MESH_LEDGER_DURABILITY, or per append()):
+- "sync"  (default) append() returns once its group is written and fsync'd
+- "batch" append() returns once written (survives a process crash); fsync
+          every MESH_LEDGER_FSYNC_MS ms or MESH_LEDGER_FSYNC_ENTRIES entries
+- "async" append() returns once queued; written and fsync'd on the "batch"
+          schedule, and flushed at exit. A process crash can lose the window.
+
+Crash safety: before its first write (and whenever another process has
+appended since), the writer checks the ledger ends with a newline. A torn
+last line from a crashed writer is either terminated (it is a complete JSON
+entry) or moved to <ledger>.partial and truncated away, so the next entry
+never fuses with it. Writes and recovery hold an exclusive flock where
+available (POSIX), so several processes can share one ledger.
+
+Stdlib only.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process appends only
+    fcntl = None
+
+LEDGER_DURABILITY_LEVELS = ("sync", "batch", "async")
+LEDGER_DURABILITY = os.getenv("MESH_LEDGER_DURABILITY", "sync").strip().lower() or "sync"
+LEDGER_FSYNC_MS = float(os.getenv("MESH_LEDGER_FSYNC_MS", "50") or "50")
+LEDGER_FSYNC_ENTRIES = int(os.getenv("MESH_LEDGER_FSYNC_ENTRIES", "256") or "256")
+LEDGER_MAX_GROUP_ENTRIES = 4096   # Upper bound on entries per write()
+LEDGER_TAIL_BLOCK = 64 * 1024     # Backward read size when locating a torn line
+LEDGER_RETRY_S = 0.5              # Pause before retrying a failed async write
+
+
+class _Commit:
+    """One append() call: its serialized lines and completion signal."""
+    __slots__ = ("data", "count", "durability", "done", "error")
+
+    def __init__(self, data: bytes, count: int, durability: str):
+        self.data = data
+        self.count = count
+        self.durability = durability
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+def recover_partial_tail(path: str) -> Optional[str]:
+    """
+    Repair a ledger whose last line has no newline (writer crashed mid-line).
+
+    Returns None when the file is fine (or missing), "terminated" when the
+    tail was a complete JSON entry and only lacked its newline, or
+    "truncated" when the fragment was moved to <path>.partial.
+    Callers must hold the ledger lock.
+    """
+    try:
+        f = open(path, "r+b")
+    except FileNotFoundError:
+        return None
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return None
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return None
+
+        # Walk back to the last complete line
+        end = size
+        tail = b""
+        line_start = 0
+        while end > 0:
+            start = max(0, end - LEDGER_TAIL_BLOCK)
+            f.seek(start)
+            tail = f.read(end - start) + tail
+            newline = tail.rfind(b"\n")
+            if newline != -1:
+                line_start = start + newline + 1
+                tail = tail[newline + 1:]
+                break
+            end = start
+
+        try:
+            complete = isinstance(json.loads(tail.decode("utf-8")), dict)
+        except ValueError:
+            complete = False
+        if complete:
+            f.seek(0, os.SEEK_END)
+            f.write(b"\n")
+            action = "terminated"
+        else:
+            with open(path + ".partial", "ab") as fragments:
+                fragments.write(tail + b"\n")
+                fragments.flush()
+                os.fsync(fragments.fileno())
+            f.truncate(line_start)
+            action = "truncated"
+        f.flush()
+        os.fsync(f.fileno())
+        return action
+
+
+@dataclass
+class LedgerWriter:
+    """Group-commit appender for one JSONL ledger."""
+    path: str
+    durability: str = LEDGER_DURABILITY
+    fsync_interval_ms: float = LEDGER_FSYNC_MS
+    fsync_entries: int = LEDGER_FSYNC_ENTRIES
+    max_group_entries: int = LEDGER_MAX_GROUP_ENTRIES
+
+    stats: Dict[str, int] = field(default_factory=lambda: {
+        "entries": 0, "writes": 0, "fsyncs": 0, "recovered": 0, "errors": 0,
+    }, init=False)
+    last_recovery: Optional[str] = field(default=None, init=False)
+    _queue: deque = field(default_factory=deque, init=False, repr=False)
+    _cond: threading.Condition = field(default_factory=threading.Condition, init=False, repr=False)
+    _stop: bool = field(default=False, init=False, repr=False)
+    _thread: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+    _file: object = field(default=None, init=False, repr=False)
+    _expected_size: Optional[int] = field(default=None, init=False, repr=False)
+    _unsynced: list = field(default_factory=list, init=False, repr=False)  # Written, awaiting fsync
+    _last_fsync: float = field(default_factory=time.monotonic, init=False, repr=False)
+
+    def __post_init__(self):
+        self.path = os.path.abspath(self.path)
+        _check_durability(self.durability)
+
+    # === LIFECYCLE ===
+
+    def start(self) -> "LedgerWriter":
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._stop = False
+            self._thread = threading.Thread(target=self._loop, name="LedgerWriter", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write and fsync everything queued, then stop the thread."""
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        with self._cond:
+            self._thread = None
+        self._close()
+
+    # === APPEND / FLUSH ===
+
+    def append(self, entries, durability: Optional[str] = None) -> None:
+        """
+        Queue entries (JSON-serializable dicts) as one group member and wait
+        as the durability level requires. Raises the write error, if any
+        (not for "async", whose failures are retried and counted).
+        """
+        level = durability or self.durability
+        _check_durability(level)
+        entries = list(entries)
+        if not entries:
+            return
+        data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode("utf-8")
+        self._submit(_Commit(data, len(entries), level))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Make everything queued so far durable (written + fsync'd)."""
+        commit = _Commit(b"", 0, "sync")
+        return self._submit(commit, timeout)
+
+    def _submit(self, commit: _Commit, timeout: Optional[float] = None) -> bool:
+        self.start()
+        with self._cond:
+            self._queue.append(commit)
+            self._cond.notify_all()
+        if commit.durability == "async":
+            return True
+        if not commit.done.wait(timeout):
+            return False
+        if commit.error is not None:
+            raise commit.error
+        return True
+
+    # === WRITER THREAD ===
+
+    def _fsync_due(self) -> bool:
+        if not self._unsynced:
+            return False
+        pending = sum(c.count for c in self._unsynced)
+        waited_ms = (time.monotonic() - self._last_fsync) * 1000
+        return pending >= self.fsync_entries or waited_ms >= self.fsync_interval_ms
+
+    def _take_group(self) -> list:
+        group, count = [], 0
+        while self._queue and (not group or count + self._queue[0].count <= self.max_group_entries):
+            commit = self._queue.popleft()
+            group.append(commit)
+            count += commit.count
+        return group
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stop and not self._fsync_due():
+                    if self._unsynced:
+                        remaining = self.fsync_interval_ms / 1000 - (time.monotonic() - self._last_fsync)
+                        self._cond.wait(max(remaining, 0.001))
+                    else:
+                        self._cond.wait()
+                group = self._take_group()
+                stopping = self._stop and not self._queue
+
+            try:
+                if group:
+                    self._write(group)
+                if self._unsynced and (stopping or self._fsync_due()
+                                       or any(c.durability == "sync" for c in group)):
+                    self._fsync()
+            except Exception as e:
+                self.stats["errors"] += 1
+                self._close()
+                unsynced, self._unsynced = self._unsynced, []
+                unwritten = [c for c in group if c not in unsynced]
+                # Only never-written async entries are retried (no duplicates)
+                retry = [c for c in unwritten if c.durability == "async"] if not stopping else []
+                for commit in unsynced + unwritten:
+                    if commit not in retry and not commit.done.is_set():
+                        commit.error = e
+                        commit.done.set()
+                if retry:
+                    with self._cond:
+                        self._queue.extendleft(reversed(retry))
+                    time.sleep(LEDGER_RETRY_S)
+                    continue
+
+            if stopping and not self._unsynced:
+                return
+
+    def _open(self):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, "ab")
+            self._expected_size = None  # Unknown: check the tail before writing
+        return self._file
+
+    def _close(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def _write(self, group: list) -> None:
+        data = b"".join(c.data for c in group)
+        if not data:
+            self._unsynced.extend(group)  # flush() markers: released by the next fsync
+            return
+        f = self._open()
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            size = os.fstat(f.fileno()).st_size
+            if size != self._expected_size:
+                # First write, or another process appended: never fuse with a torn line
+                action = recover_partial_tail(self.path)
+                if action:
+                    self.last_recovery = action
+                    self.stats["recovered"] += 1
+                size = os.fstat(f.fileno()).st_size
+            f.write(data)
+            f.flush()
+            self.stats["writes"] += 1
+            self.stats["entries"] += sum(c.count for c in group)
+            self._expected_size = size + len(data)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+        self._unsynced.extend(group)
+        for commit in group:
+            if commit.durability == "batch":
+                commit.done.set()
+
+    def _fsync(self) -> None:
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+            self.stats["fsyncs"] += 1
+        self._last_fsync = time.monotonic()
+        for commit in self._unsynced:
+            commit.done.set()
+        self._unsynced = []
+
+
+def _check_durability(level: str) -> None:
+    if level not in LEDGER_DURABILITY_LEVELS:
+        raise ValueError(f"Unknown ledger durability {level!r} (expected one of {LEDGER_DURABILITY_LEVELS})")
+
+
+# =============================================================================
+# SHARED REGISTRY (one writer per ledger per process)
+# =============================================================================
+
+_writers: Dict[str, LedgerWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(path) -> LedgerWriter:
+    """Shared, started LedgerWriter for the ledger at path."""
+    key = os.path.realpath(str(path))
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = LedgerWriter(key)
+        writer.start()
+        return writer
+
+
+@atexit.register
+def stop_all() -> None:
+    """Flush (write + fsync) every writer's queue; async entries included."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.stop()
@@ -16,6 +16,34 @@ import json
 from pathlib import Path
 from difflib import SequenceMatcher
 
+
+def _load_doc_ast():
+    """
+    v43: Shared tokenizer (tools/doc_ast.py). Resolved as a package module,
+    a sibling when run as a script, or by file path when this module itself
+    was loaded by path (snapshot daemon) - sys.path stays untouched.
+    """
+    try:
+        from tools import doc_ast
+        return doc_ast
+    except ImportError:
+        pass
+    try:
+        import doc_ast
+        return doc_ast
+    except ImportError:
+        pass
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(
+        "_readiness_doc_ast", Path(__file__).with_name("doc_ast.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+doc_ast = _load_doc_ast()
+
 # Single source of truth for doc readiness thresholds
 # Importable by snapshot.py for fail-open fallback
 # NOTE: Changing thresholds requires updating tests/test_threshold_fallback.py
@@ -157,6 +185,12 @@ def get_template_similarity(content: str, template_path: Path) -> float:
 
 
 def has_real_decisions(content: str) -> bool:
+    """v43: _has_real_decisions over the shared tokenized lines, memoized per content."""
+    doc = doc_ast.parse_markdown(content)
+    return doc.cached("has_real_decisions", lambda: _has_real_decisions(doc.lines))
+
+
+def _has_real_decisions(lines) -> bool:
     """
     Check if DECISION_LOG has real decision rows beyond the bootstrap init row.
 
@@ -178,7 +212,6 @@ def has_real_decisions(content: str) -> bool:
     # Skip header row and separator row
     table_row_pattern = r'^\|\s*(\d+|\w+)\s*\|'
 
-    lines = content.split('\n')
     in_records_section = False
     decision_rows = []
 
@@ -257,6 +290,26 @@ def has_real_decisions(content: str) -> bool:
     return False
 
 
+def _meaningful_line_count(doc) -> int:
+    """v43: is_meaningful_line() count, memoized on the tokenized doc."""
+    return doc.cached(
+        "meaningful_lines", lambda: sum(1 for line in doc.lines if is_meaningful_line(line))
+    )
+
+
+def _cached_template_similarity(doc, template_path: Path) -> float:
+    """v43: get_template_similarity() memoized per (content, template version)."""
+    try:
+        stat = template_path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        version = None
+    return doc.cached(
+        ("template_similarity", str(template_path), version),
+        lambda: get_template_similarity(doc.text, template_path),
+    )
+
+
 def get_context_readiness(base_dir=None):
     """
     Analyzes Golden Docs (PRD, SPEC, DECISION_LOG) for completeness.
@@ -317,6 +370,9 @@ def get_context_readiness(base_dir=None):
     }
 
     results = {}
+    # v44: Per-doc results persist across processes (control/state/doc_analysis.json)
+    store = doc_ast.AnalysisStore(base_dir / "control" / "state")
+    decision_template = base_dir / "library" / "templates" / "DECISION_LOG.template.md"
 
     for doc_name, config in files_to_check.items():
         # Check if file exists (try alt_path for SPEC)
@@ -350,19 +406,27 @@ def get_context_readiness(base_dir=None):
         # Initialize for hint generation (may be updated in try block)
         is_stub = False
         content = ""
+        raw_content = None
+        cache_key = f"readiness:{doc_name}:{config['threshold']}:{doc_ast.file_version(decision_template)}"
 
         # Read and analyze content
+        # v43: One shared tokenization per content version (tools/doc_ast.py)
         try:
-            raw_content = file_path.read_text(encoding='utf-8')
+            raw_content = doc_ast.read_text(file_path)
+            cached = store.lookup(file_path, raw_content, cache_key)
+            if cached is not None:
+                results[doc_name] = cached
+                continue
 
             # Check if this is a template stub (use raw content to preserve marker)
             is_stub = 'ATOMIC_MESH_TEMPLATE_STUB' in raw_content
 
             # Strip LLM-only blocks from scoring
-            content = strip_llm_blocks(raw_content)
+            content = doc_ast.derive(raw_content, "strip_llm_blocks", strip_llm_blocks)
+            doc = doc_ast.parse_markdown(content)
 
             # Word count (rough estimate: split by whitespace)
-            words = len(content.split())
+            words = doc.word_count
             length = words
 
             # Length check: +20% if >150 words (disabled for stubs)
@@ -377,12 +441,11 @@ def get_context_readiness(base_dir=None):
             for header in config["required_headers"]:
                 # Extract header text without ## prefix
                 header_text = header.lstrip('# ').strip()
-                # Match: optional 1-6 # chars + optional whitespace + header text
-                # Note: {{1,6}} escapes braces in f-string to produce {1,6} in regex
-                # Header must be at end of line OR followed by parenthetical (e.g., "API (Internal)")
+                # Match: optional 1-6 # chars + whitespace, then the header text
+                # Header must be at end of line (optionally ":") OR followed by
+                # a parenthetical (e.g., "API (Internal)")
                 # This prevents "Goals are important" from matching as "Goals" header
-                pattern = rf'^(?:#{{1,6}}\s+)?{re.escape(header_text)}(?:[\s:]*$|\s*\()'
-                if re.search(pattern, content, re.IGNORECASE | re.MULTILINE):
+                if doc.has_header(header_text):
                     headers_found += 1
                     score += 10
                 else:
@@ -393,12 +456,7 @@ def get_context_readiness(base_dir=None):
             #   - "- ", "* ", "1. " (standard bullets)
             #   - "- [ ]", "- [x]" (bulleted checkboxes)
             #   - "[ ]", "[x]" (standalone checkboxes - common in generated docs)
-            bullet_lines = re.findall(
-                r'^[\s]*(?:(?:[-*]|\d+\.)\s+(?:\[[ xX]\]\s+)?|\[[ xX]\]\s+)',
-                content,
-                re.MULTILINE
-            )
-            bullets_found = len(bullet_lines)
+            bullets_found = len(doc.bullets)
             if bullets_found > 5 and not is_stub:
                 score += 20
 
@@ -418,8 +476,7 @@ def get_context_readiness(base_dir=None):
                             score += 20
                     else:
                         # Template similarity check (threshold: 0.85)
-                        template_path = base_dir / "library" / "templates" / "DECISION_LOG.template.md"
-                        similarity = get_template_similarity(content, template_path)
+                        similarity = _cached_template_similarity(doc, decision_template)
 
                         # If very similar to template OR no real decisions: cap at 40%
                         if similarity >= 0.85:
@@ -430,11 +487,7 @@ def get_context_readiness(base_dir=None):
                             score = min(score, 40)
                 else:
                     # PRD and SPEC: use meaningful line detection
-                    meaningful_lines = [
-                        line for line in content.split('\n')
-                        if is_meaningful_line(line)
-                    ]
-                    meaningful_count = len(meaningful_lines)
+                    meaningful_count = _meaningful_line_count(doc)
 
                     # Cap stub score at 40% unless ≥6 meaningful lines exist
                     if meaningful_count >= 6:
@@ -456,6 +509,7 @@ def get_context_readiness(base_dir=None):
             import sys
             print(f"Warning: Error reading {file_path}: {e}", file=sys.stderr)
             score = 10  # Still gets "exists" credit
+            raw_content = None  # Not cached
 
         # Generate deterministic hint (priority order for stability)
         # 1. ready (score >= threshold)
@@ -470,11 +524,7 @@ def get_context_readiness(base_dir=None):
             hint = "ready"
         elif is_stub and doc_name != "DECISION_LOG":
             # Check meaningful lines for PRD/SPEC stubs
-            meaningful_lines = [
-                line for line in content.split('\n')
-                if is_meaningful_line(line)
-            ]
-            if len(meaningful_lines) < 6:
+            if _meaningful_line_count(doc_ast.parse_markdown(content)) < 6:
                 hint = "needs content"
             elif missing_headers:
                 # Show top 2 missing headers, abbreviated
@@ -500,6 +550,10 @@ def get_context_readiness(base_dir=None):
             "missing": missing_headers,
             "hint": hint
         }
+        if raw_content is not None:
+            store.put(file_path, raw_content, cache_key, results[doc_name])
+
+    store.save()
 
     # Determine overall status
     thresholds = {name: config["threshold"] for name, config in files_to_check.items()}
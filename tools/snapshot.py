@@ -21,6 +21,26 @@ from pathlib import Path
 # Measured ~450ms on Windows; use 500ms for typical execution
 TIMING_GUARD_MS = 500
 
+# v31: --serve mode (resident daemon, JSON-lines over stdin/stdout)
+# git status is not fingerprinted; the daemon re-runs it after this TTL.
+# v35: Only used when tools/git_state.py is unavailable.
+SERVE_GIT_TTL_S = 2.0
+
+# v35: Shared background git-status cache. First snapshot waits up to this
+# long for the initial git status (same budget as the old 1s subprocess timeout).
+SNAPSHOT_GIT_WAIT_S = 1.0
+
+try:
+    from tools import git_state
+except ImportError:
+    try:
+        import git_state  # Script mode: tools/ is sys.path[0]
+    except ImportError:
+        git_state = None
+
+# Shared read-only connection held by the daemon (None in one-shot mode)
+_shared_db = {"path": None, "conn": None}
+
 
 def _dict_from_row(row, keys):
     """Best-effort projection of sqlite row to dict using provided keys."""
@@ -41,6 +61,30 @@ def _has_column(conn: sqlite3.Connection, table: str, column: str) -> bool:
         return False
 
 
+def _has_table(conn: sqlite3.Connection, table: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    return row is not None
+
+
+def _open_db(db_path: Path) -> sqlite3.Connection:
+    """
+    v31: In --serve mode, return the daemon's shared read-only connection.
+    One-shot mode opens a fresh connection per loader (closed by _close_db).
+    """
+    if _shared_db["conn"] is not None and _shared_db["path"] == str(db_path):
+        return _shared_db["conn"]
+    return sqlite3.connect(f"file:{db_path}", uri=True)
+
+
+def _close_db(conn: sqlite3.Connection) -> None:
+    if conn is _shared_db["conn"]:
+        conn.row_factory = None  # Loaders may set sqlite3.Row; keep shared conn neutral
+        return
+    conn.close()
+
+
 def find_db(repo_root: Path) -> Path:
     """
     Find the database file. Priority:
@@ -65,15 +109,99 @@ def find_db(repo_root: Path) -> Path:
     raise FileNotFoundError("No mesh.db or tasks.db found")
 
 
-def load_counts(db_path: Path):
-    conn = sqlite3.connect(f"file:{db_path}", uri=True)
+# v33: Status buckets for header counters. mesh_server.init_db() lower-cases
+# tasks.status at write time (triggers), so reads compare exact values and the
+# status indexes stay usable - no LOWER(status) on the read path.
+PENDING_STATUSES = ("pending", "next", "planned")
+ACTIVE_STATUSES = ("in_progress", "running")
+ERROR_STATUSES = ("error", "failed")
+PROBLEM_STATUSES = ("blocked",) + ERROR_STATUSES
+
+
+def load_task_aggregates(db_path: Path) -> dict:
+    """
+    v33: All header counters from a single GROUP BY lane, status pass:
+    LaneCounts, pending/active totals, problem count (health) and the HIGH
+    risk unverified count. The newest blocked/error task IDs come from the
+    (status, updated_at) index and are only looked up when problems exist.
+
+    v34: Reads mesh_server's trigger-maintained lane_status_counts (O(lanes)
+    rows) when present, falling back to GROUP BY over tasks. Empty and NULL
+    lanes are both reported once as UNKNOWN. The HIGH risk count comes from
+    the task_rollups row when mesh_server installed it (tasks.verified exists).
+
+    Raises on DB errors (missing tasks table = no-db, handled by caller).
+    """
+    conn = _open_db(db_path)
     try:
-        cur = conn.execute(
-            "select lane, status, count(*) as c from tasks group by lane, status"
-        )
-        return [{"Lane": r[0] or "UNKNOWN", "Status": r[1] or "", "Count": int(r[2])} for r in cur.fetchall()]
+        has_high_risk = _has_column(conn, "tasks", "risk") and _has_column(conn, "tasks", "verified")
+        if _has_table(conn, "lane_status_counts"):
+            conn.execute("SELECT 1 FROM tasks LIMIT 1")  # Keep "no such table" semantics
+            rows = conn.execute(
+                "SELECT lane, status, SUM(count) FROM lane_status_counts "
+                "WHERE count <> 0 GROUP BY lane, status"
+            ).fetchall()
+            high_risk = 0
+            if has_high_risk and _has_table(conn, "task_rollups"):
+                row = conn.execute(
+                    "SELECT count FROM task_rollups WHERE name = 'high_risk_unverified'"
+                ).fetchone()
+                high_risk = row[0] if row else 0
+            elif has_high_risk:
+                high_risk = conn.execute(
+                    "SELECT COUNT(*) FROM tasks WHERE UPPER(risk) = 'HIGH' AND verified = 0"
+                ).fetchone()[0]
+        else:
+            high_risk_expr = (
+                "SUM(CASE WHEN UPPER(risk) = 'HIGH' AND verified = 0 THEN 1 ELSE 0 END)"
+                if has_high_risk else "0"
+            )
+            rows = conn.execute(
+                f"SELECT lane, status, COUNT(*) AS c, {high_risk_expr} AS high_risk "
+                "FROM tasks GROUP BY lane, status"
+            ).fetchall()
+            high_risk = sum(int(r[3] or 0) for r in rows)
+
+        result = {
+            "lane_counts": [],
+            "pending": 0,
+            "active": 0,
+            "problems": 0,
+            "high_risk_unverified": int(high_risk or 0),
+            "first_blocked_id": None,
+            "first_error_id": None,
+        }
+        lane_counts = {}
+        for lane, status, count, *_ in rows:
+            count = int(count)
+            key = (lane or "UNKNOWN", status or "")
+            lane_counts[key] = lane_counts.get(key, 0) + count
+            if status in PENDING_STATUSES:
+                result["pending"] += count
+            elif status in ACTIVE_STATUSES:
+                result["active"] += count
+            elif status in PROBLEM_STATUSES:
+                result["problems"] += count
+        result["lane_counts"] = [
+            {"Lane": lane, "Status": status, "Count": count}
+            for (lane, status), count in lane_counts.items()
+        ]
+
+        if result["problems"]:
+            row = conn.execute(
+                "SELECT id FROM tasks WHERE status = 'blocked' ORDER BY updated_at DESC LIMIT 1"
+            ).fetchone()
+            if row:
+                result["first_blocked_id"] = row[0]
+            row = conn.execute(
+                "SELECT id FROM tasks WHERE status IN (?, ?) ORDER BY updated_at DESC LIMIT 1",
+                ERROR_STATUSES,
+            ).fetchone()
+            if row:
+                result["first_error_id"] = row[0]
+        return result
     finally:
-        conn.close()
+        _close_db(conn)
 
 
 def load_history_data(db_path: Path) -> dict:
@@ -89,7 +217,7 @@ def load_history_data(db_path: Path) -> dict:
     }
 
     try:
-        conn = sqlite3.connect(f"file:{db_path}", uri=True)
+        conn = _open_db(db_path)
         conn.row_factory = sqlite3.Row
         try:
             # Active task (now)
@@ -149,7 +277,7 @@ def load_history_data(db_path: Path) -> dict:
                 except Exception:
                     result["scheduler_last_decision"] = dec_row["value"]
         finally:
-            conn.close()
+            _close_db(conn)
     except Exception:
         # Fail-open: keep defaults
         pass
@@ -157,44 +285,17 @@ def load_history_data(db_path: Path) -> dict:
     return result
 
 
-def load_distinct_lane_counts(db_path: Path) -> dict:
-    """
-    v23.1: Returns TOTAL task counts for pending and active statuses.
-    Fixed: Previously returned distinct LANE count, causing header/lane drift.
-    Now returns actual TASK count for consistency with lane metrics.
-    """
-    pending_statuses = ("pending", "next", "planned")
-    active_statuses = ("in_progress", "running")
-
-    conn = sqlite3.connect(f"file:{db_path}", uri=True)
-    try:
-        # Pending: total tasks with pending/next/planned status
-        cur = conn.execute(
-            """SELECT COUNT(*) FROM tasks WHERE LOWER(status) IN (?, ?, ?)""",
-            pending_statuses
-        )
-        pending = cur.fetchone()[0] or 0
-
-        # Active: total tasks with in_progress/running status
-        cur = conn.execute(
-            """SELECT COUNT(*) FROM tasks WHERE LOWER(status) IN (?, ?)""",
-            active_statuses
-        )
-        active = cur.fetchone()[0] or 0
-
-        return {"pending": pending, "active": active}
-    except Exception:
-        return {"pending": 0, "active": 0}
-    finally:
-        conn.close()
-
-
 def check_git_clean(repo_root: Path) -> bool:
     """
     GOLDEN TRANSPLANT: lines 1267-1268 (Ship stage git clean check)
     Returns True if working directory is clean (no uncommitted changes).
     Fast operation: git status --porcelain (~10ms typically).
+
+    v35: Reads the background-refreshed git_state cache; only the first call
+    in a process waits (up to SNAPSHOT_GIT_WAIT_S) for git to answer.
     """
+    if git_state is not None:
+        return git_state.read_git_state(repo_root, wait_s=SNAPSHOT_GIT_WAIT_S).clean
     try:
         result = subprocess.run(
             ["git", "status", "--porcelain"],
@@ -210,73 +311,6 @@ def check_git_clean(repo_root: Path) -> bool:
         return True
 
 
-def check_health_status(db_path: Path) -> str:
-    """
-    GOLDEN TRANSPLANT: lines 1137-1143, 1186-1194
-    Returns health status: "OK", "WARN", or "FAIL"
-    Based on task states and adapter connectivity.
-    """
-    try:
-        conn = sqlite3.connect(f"file:{db_path}", uri=True)
-        try:
-            # Check for blocked or error tasks
-            cur = conn.execute(
-                """SELECT COUNT(*) FROM tasks
-                   WHERE LOWER(status) IN ('blocked', 'error', 'failed')"""
-            )
-            error_count = cur.fetchone()[0] or 0
-
-            if error_count > 0:
-                return "WARN"
-
-            return "OK"
-        finally:
-            conn.close()
-    except Exception:
-        return "FAIL"
-
-
-def get_first_problem_tasks(db_path: Path) -> dict:
-    """
-    GOLDEN NUANCE: Task-specific hints (P1)
-    Returns first blocked and first error task IDs for actionable hints.
-    """
-    result = {"first_blocked_id": None, "first_error_id": None, "high_risk_unverified": 0}
-    try:
-        conn = sqlite3.connect(f"file:{db_path}", uri=True)
-        try:
-            # First blocked task
-            cur = conn.execute(
-                """SELECT id FROM tasks WHERE LOWER(status) = 'blocked'
-                   ORDER BY updated_at DESC LIMIT 1"""
-            )
-            row = cur.fetchone()
-            if row:
-                result["first_blocked_id"] = row[0]
-
-            # First error task
-            cur = conn.execute(
-                """SELECT id FROM tasks WHERE LOWER(status) IN ('error', 'failed')
-                   ORDER BY updated_at DESC LIMIT 1"""
-            )
-            row = cur.fetchone()
-            if row:
-                result["first_error_id"] = row[0]
-
-            # HIGH risk unverified count (for /ship blocking)
-            cur = conn.execute(
-                """SELECT COUNT(*) FROM tasks
-                   WHERE LOWER(risk) = 'high' AND verified = 0"""
-            )
-            result["high_risk_unverified"] = cur.fetchone()[0] or 0
-
-            return result
-        finally:
-            conn.close()
-    except Exception:
-        return result
-
-
 def get_optimize_status(db_path: Path) -> dict:
     """
     GOLDEN NUANCE: Optimize stage (P7)
@@ -302,13 +336,14 @@ def get_optimize_status(db_path: Path) -> dict:
     ]
 
     try:
-        conn = sqlite3.connect(f"file:{db_path}", uri=True)
+        conn = _open_db(db_path)
         try:
             # Get all active tasks with notes
             cur = conn.execute(
                 """SELECT id, notes FROM tasks
-                   WHERE LOWER(status) IN ('pending', 'next', 'planned', 'running', 'in_progress')
-                   ORDER BY updated_at DESC"""
+                   WHERE status IN (?, ?, ?, ?, ?)
+                   ORDER BY updated_at DESC""",
+                PENDING_STATUSES + ACTIVE_STATUSES,
             )
             rows = cur.fetchall()
             result["total_tasks"] = len(rows)
@@ -324,7 +359,7 @@ def get_optimize_status(db_path: Path) -> dict:
 
             return result
         finally:
-            conn.close()
+            _close_db(conn)
     except Exception:
         return result
 
@@ -343,12 +378,32 @@ def _get_fallback_thresholds() -> dict:
         return {"PRD": 90, "SPEC": 90, "DECISION_LOG": 60}
 
 
-def get_readiness_data(repo_root: Path) -> dict:
+_readiness_module = None
+
+
+def _readiness_report_in_process(readiness_script: Path, repo_root: Path) -> dict:
+    """
+    v31: Score docs in-process (resident daemon loads readiness.py once).
+    Loaded by file path so sys.path / sys.modules stay untouched.
+    """
+    global _readiness_module
+    if _readiness_module is None:
+        import importlib.util
+        spec = importlib.util.spec_from_file_location("_snapshot_readiness", readiness_script)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _readiness_module = module
+    return _readiness_module.get_context_readiness(base_dir=str(repo_root))
+
+
+def get_readiness_data(repo_root: Path, in_process: bool = False) -> dict:
     """
     GOLDEN NUANCE: /draft-plan BLOCKED + blocking files (P5) + rated doc scores (P8)
     Calls readiness.py subprocess to get full readiness data including per-doc scores.
     Returns dict with blocking_files, per-doc scores, and thresholds.
 
+    v31: in_process=True imports readiness.py instead (resident --serve daemon).
+
     Fallback chain for thresholds:
     1. Subprocess call to readiness.py (primary - includes scoring)
     2. Import THRESHOLDS from readiness.py (if subprocess fails)
@@ -375,15 +430,19 @@ def get_readiness_data(repo_root: Path) -> dict:
         if not readiness_script.exists():
             return _make_default_result(fallback_thresholds)
 
-        result = subprocess.run(
-            ["python", str(readiness_script), str(repo_root)],
-            capture_output=True,
-            text=True,
-            timeout=0.35,  # Keep under the 500ms snapshot budget (with overhead)
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            data = json.loads(result.stdout)
-
+        if in_process:
+            data = _readiness_report_in_process(readiness_script, repo_root)
+        else:
+            result = subprocess.run(
+                ["python", str(readiness_script), str(repo_root)],
+                capture_output=True,
+                text=True,
+                timeout=0.35,  # Keep under the 500ms snapshot budget (with overhead)
+            )
+            data = None
+            if result.returncode == 0 and result.stdout.strip():
+                data = json.loads(result.stdout)
+        if data:
             # Extract blocking files
             blocking_files = data.get("overall", {}).get("blocking_files", [])
 
@@ -607,16 +666,13 @@ def check_initialized(repo_root: Path) -> bool:
     return False
 
 
-def main():
-    start_time = time.monotonic()
-    repo_root = Path(sys.argv[1]) if len(sys.argv) > 1 else Path.cwd()
-    repo_root = repo_root.resolve()
-
+def _default_payload(repo_root: Path) -> dict:
+    """Fail-open defaults for every snapshot field."""
     # Get fallback thresholds (single source of truth from readiness.py)
     _thresholds = _get_fallback_thresholds()
 
     # Initialize with fail-open defaults
-    payload = {
+    return {
         "ProjectName": repo_root.name,
         "GeneratedAtUtc": "",
         "LaneCounts": [],
@@ -680,22 +736,46 @@ def main():
         "ProjectRoot": str(repo_root),
     }
 
-    # Database is optional - new projects may not have one yet
-    db_path = None
-    db_present = False
-    db_candidates = [repo_root / "tasks.db", repo_root / "mesh.db"]
-    payload["DbPathTried"] = str(db_candidates[0])  # Primary candidate for debug
+
+# =============================================================================
+# v32: Snapshot Sections
+# =============================================================================
+# Each section fills a fixed set of payload fields from a declared set of
+# inputs (fingerprinted by ChangeTracker). build_snapshot() runs them all in
+# order; the --serve daemon re-runs a section only when its inputs changed.
+# Sections see earlier sections' fields (plan reads LaneCounts).
+
+
+def _snapshot_context(repo_root: Path, readiness_in_process: bool = False, git_clean=None) -> dict:
     try:
         db_path = find_db(repo_root)
-        db_present = True
-        payload["DbPathTried"] = str(db_path)  # Actual path found
-        lane_counts = load_counts(db_path)
-        payload["LaneCounts"] = lane_counts
     except FileNotFoundError:
+        db_path = None
+    return {
+        "repo_root": repo_root,
+        "db_path": db_path,
+        "readiness_in_process": readiness_in_process,
+        "git_clean": git_clean,
+    }
+
+
+def _section_db(ctx: dict, payload: dict) -> None:
+    """
+    DB presence + every header counter (v33: one aggregate pass).
+    Raises on unexpected DB errors.
+    """
+    repo_root, db_path = ctx["repo_root"], ctx["db_path"]
+    # Primary candidate for debug until a DB is actually found
+    payload["DbPathTried"] = str(db_path) if db_path else str(repo_root / "tasks.db")
+    if db_path is None:
         # No database = new/uninitialized project, continue with defaults
         payload["ReadinessMode"] = "no-db"  # Explicit degraded mode
         payload["DbPresent"] = False
-        pass
+        return
+    try:
+        aggregates = load_task_aggregates(db_path)
+        payload["LaneCounts"] = aggregates["lane_counts"]
+        payload["DbPresent"] = True
     except Exception as exc:  # noqa: BLE001
         # DB errors (missing table, corruption, lock, etc.) = treat as no-db
         # "no such table: tasks" is common when DB file exists but schema not created
@@ -703,26 +783,33 @@ def main():
         if "no such table" in exc_str or "unable to open" in exc_str:
             payload["ReadinessMode"] = "no-db"
             payload["DbPresent"] = False
-            db_present = False  # Prevent further DB queries
-        else:
-            # Unexpected error - log and fail
-            sys.stderr.write(str(exc))
-            sys.exit(1)
+            payload["HealthStatus"] = "FAIL"  # DB file without a usable tasks table
+            return
+        # Unexpected error - caller logs and fails
+        raise
+
+    payload["DistinctLaneCounts"] = {"pending": aggregates["pending"], "active": aggregates["active"]}
+    payload["HealthStatus"] = "WARN" if aggregates["problems"] > 0 else "OK"
+    # P1+P4: Task-specific hints + HIGH risk blocking
+    payload["FirstBlockedTaskId"] = aggregates["first_blocked_id"]
+    payload["FirstErrorTaskId"] = aggregates["first_error_id"]
+    payload["HighRiskUnverifiedCount"] = aggregates["high_risk_unverified"]
 
-    if db_present:
-        payload["DbPresent"] = True
 
+def _section_init(ctx: dict, payload: dict) -> None:
     # Check initialization status (fast file check, ~1ms)
     try:
-        payload["IsInitialized"] = check_initialized(repo_root)
+        payload["IsInitialized"] = check_initialized(ctx["repo_root"])
     except Exception:
         payload["IsInitialized"] = False  # Fail-open: assume not initialized
 
+
+def _section_plan(ctx: dict, payload: dict) -> None:
     # Plan status detection (fast file check, ~1ms)
     try:
-        plan_status = get_plan_status(repo_root)
+        plan_status = get_plan_status(ctx["repo_root"])
         # Also check if tasks exist in DB (means plan was accepted)
-        if db_present and payload.get("LaneCounts"):
+        if payload.get("DbPresent") and payload.get("LaneCounts"):
             total_tasks = sum(lc.get("Count", 0) for lc in payload["LaneCounts"])
             if total_tasks > 0:
                 plan_status["accepted"] = True
@@ -731,9 +818,11 @@ def main():
     except Exception:
         pass  # Keep defaults
 
+
+def _section_librarian(ctx: dict, payload: dict) -> None:
     # Librarian feedback cache (optional, fast file read ~1ms)
     try:
-        librarian_data = get_librarian_feedback(repo_root)
+        librarian_data = get_librarian_feedback(ctx["repo_root"])
         payload["LibrarianDocFeedback"] = librarian_data["docs"]
         payload["LibrarianDocFeedbackStale"] = librarian_data["stale"]
         payload["LibrarianDocFeedbackPresent"] = librarian_data["present"]
@@ -744,73 +833,46 @@ def main():
     except Exception:
         pass  # Fail-open: keep defaults
 
-    # Micro-timing guard: check elapsed time
-    elapsed_ms = (time.monotonic() - start_time) * 1000
-    if elapsed_ms > TIMING_GUARD_MS:
-        payload["ReadinessMode"] = "fail-open"
-        sys.stdout.write(json.dumps(payload, separators=(",", ":")))
-        return
-
-    # Fast operations only from here (each must complete quickly)
-
-    # DB-dependent operations (skip if no database)
-    if db_path:
-        # Distinct lane counts (SQL query, ~5ms)
-        try:
-            payload["DistinctLaneCounts"] = load_distinct_lane_counts(db_path)
-        except Exception:
-            pass  # Keep default
 
-        # Check timing again
-        elapsed_ms = (time.monotonic() - start_time) * 1000
-        if elapsed_ms > TIMING_GUARD_MS:
-            payload["ReadinessMode"] = "fail-open"
-            sys.stdout.write(json.dumps(payload, separators=(",", ":")))
-            return
-
-        # Health status (~5ms)
-        try:
-            payload["HealthStatus"] = check_health_status(db_path)
-        except Exception:
-            pass  # Keep default OK
+def _section_optimize(ctx: dict, payload: dict) -> None:
+    # P7: Optimize stage - entropy proof detection (only scans pending/active tasks)
+    counts = payload["DistinctLaneCounts"]
+    if not (counts["pending"] or counts["active"]):
+        return  # Defaults already describe "no active tasks"
+    try:
+        optimize_status = get_optimize_status(ctx["db_path"])
+        payload["FirstUnoptimizedTaskId"] = optimize_status["first_unoptimized_id"]
+        payload["HasAnyOptimized"] = optimize_status["has_any_optimized"]
+        payload["OptimizeTotalTasks"] = optimize_status["total_tasks"]
+    except Exception:
+        pass  # Keep defaults
 
-        # P1+P4: First problem tasks + HIGH risk count (~5ms)
-        try:
-            problem_tasks = get_first_problem_tasks(db_path)
-            payload["FirstBlockedTaskId"] = problem_tasks["first_blocked_id"]
-            payload["FirstErrorTaskId"] = problem_tasks["first_error_id"]
-            payload["HighRiskUnverifiedCount"] = problem_tasks["high_risk_unverified"]
-        except Exception:
-            pass  # Keep defaults
 
-        # P7: Optimize stage - entropy proof detection (~5ms)
-        try:
-            optimize_status = get_optimize_status(db_path)
-            payload["FirstUnoptimizedTaskId"] = optimize_status["first_unoptimized_id"]
-            payload["HasAnyOptimized"] = optimize_status["has_any_optimized"]
-            payload["OptimizeTotalTasks"] = optimize_status["total_tasks"]
-        except Exception:
-            pass  # Keep defaults
+def _section_history(ctx: dict, payload: dict) -> None:
+    # History sampler (active/pending/audit) - tight limits for overlay
+    try:
+        history_data = load_history_data(ctx["db_path"])
+        payload["active_task"] = history_data.get("active_task")
+        payload["pending_tasks"] = history_data.get("pending_tasks", [])
+        payload["history"] = history_data.get("history", [])
+        payload["scheduler_last_decision"] = history_data.get("scheduler_last_decision")
+    except Exception:
+        pass  # Keep defaults
 
-        # History sampler (active/pending/audit) - tight limits for overlay
-        try:
-            history_data = load_history_data(db_path)
-            payload["active_task"] = history_data.get("active_task")
-            payload["pending_tasks"] = history_data.get("pending_tasks", [])
-            payload["history"] = history_data.get("history", [])
-            payload["scheduler_last_decision"] = history_data.get("scheduler_last_decision")
-        except Exception:
-            pass  # Keep defaults
 
+def _section_git(ctx: dict, payload: dict) -> None:
     # Git status (~10ms typically) - works without DB
     try:
-        payload["GitClean"] = check_git_clean(repo_root)
+        git_clean = ctx["git_clean"]
+        payload["GitClean"] = check_git_clean(ctx["repo_root"]) if git_clean is None else git_clean
     except Exception:
         pass  # Keep default True
 
+
+def _section_readiness(ctx: dict, payload: dict) -> None:
     # P5+P8: Readiness data with per-doc scores (subprocess capped at 350ms)
     try:
-        readiness_data = get_readiness_data(repo_root)
+        readiness_data = get_readiness_data(ctx["repo_root"], in_process=ctx["readiness_in_process"])
         payload["BlockingFiles"] = readiness_data["blocking_files"]
         payload["DocScores"] = readiness_data["doc_scores"]
         payload["DocsAllPassed"] = readiness_data["docs_all_passed"]
@@ -824,11 +886,328 @@ def main():
     except Exception:
         pass  # Keep defaults (empty bars, not misleading)
 
+
+# (name, fn, fields, inputs, needs_db, timing_guard_before)
+SNAPSHOT_SECTIONS = [
+    ("db", _section_db,
+     ("LaneCounts", "DbPresent", "DbPathTried", "ReadinessMode", "DistinctLaneCounts",
+      "HealthStatus", "FirstBlockedTaskId", "FirstErrorTaskId", "HighRiskUnverifiedCount"),
+     ("db", "tasks"), False, False),
+    ("init", _section_init, ("IsInitialized",),
+     ("init_marker", "golden_docs"), False, False),
+    ("plan", _section_plan, ("plan",),
+     ("plans", "db", "tasks"), False, False),
+    ("librarian", _section_librarian,
+     ("LibrarianDocFeedback", "LibrarianDocFeedbackStale", "LibrarianDocFeedbackPresent",
+      "LibrarianOverallQuality", "LibrarianConfidence", "LibrarianCriticalRisksCount"),
+     ("librarian",), False, False),
+    ("optimize", _section_optimize,
+     ("FirstUnoptimizedTaskId", "HasAnyOptimized", "OptimizeTotalTasks"),
+     ("db", "tasks"), True, True),
+    ("history", _section_history,
+     ("active_task", "pending_tasks", "history", "scheduler_last_decision"),
+     ("db", "tasks", "audit_log", "config"), True, False),
+    ("git", _section_git, ("GitClean",),
+     ("git",), False, False),
+    ("readiness", _section_readiness,
+     ("BlockingFiles", "DocScores", "DocsAllPassed", "DocsReadiness", "DocsReadyCount"),
+     ("golden_docs",), False, False),
+]
+
+
+def build_snapshot(repo_root: Path, readiness_in_process: bool = False, git_clean=None) -> dict:
+    """
+    Build the UI snapshot payload for repo_root.
+
+    Args:
+        repo_root: Resolved project root
+        readiness_in_process: Score docs by importing readiness.py instead of
+            spawning a subprocess (v31: used by the resident --serve daemon)
+        git_clean: Precomputed GitClean value; None runs git status here
+
+    Raises the underlying exception for unexpected DB errors (main() reports
+    them on stderr with exit code 1).
+    """
+    start_time = time.monotonic()
+    payload = _default_payload(repo_root)
+    ctx = _snapshot_context(repo_root, readiness_in_process, git_clean)
+
+    for _name, fn, _fields, _inputs, needs_db, guard_before in SNAPSHOT_SECTIONS:
+        # Micro-timing guard: bail out with what we have so far
+        if guard_before and (time.monotonic() - start_time) * 1000 > TIMING_GUARD_MS:
+            payload["ReadinessMode"] = "fail-open"
+            return payload
+        if needs_db and ctx["db_path"] is None:
+            continue  # DB-dependent sections skip when there is no database
+        fn(ctx, payload)
+
     # Final timing check
     elapsed_ms = (time.monotonic() - start_time) * 1000
     if elapsed_ms > TIMING_GUARD_MS:
         payload["ReadinessMode"] = "fail-open"
 
+    return payload
+
+
+# =============================================================================
+# v32: Change Tracking
+# =============================================================================
+# Fingerprints for every section input, cheap enough to take per request:
+# - tasks / audit_log / config: change_counters rows (bumped by triggers that
+#   mesh_server.init_db installs), falling back to PRAGMA data_version on the
+#   daemon's connection, or the DB file stats when there is no connection
+# - docs, plans dir, librarian cache, init marker: (mtime_ns, size)
+# - git: the (TTL-cached) GitClean value
+# The etag is a hash of all fingerprints; equal etags mean an identical payload.
+
+READINESS_DOCS = INIT_GOLDEN_DOCS + ["docs/ACTIVE_SPEC.md"]
+COUNTED_TABLES = ("tasks", "audit_log", "config")
+
+
+def _stat_key(path: Path):
+    try:
+        st = path.stat()
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def _read_change_counters(conn: sqlite3.Connection) -> dict:
+    try:
+        return dict(conn.execute("SELECT name, version FROM change_counters").fetchall())
+    except sqlite3.Error:
+        return {}  # Older schema without counters
+
+
+class ChangeTracker:
+    """Input fingerprints for snapshot sections (see SNAPSHOT_SECTIONS)."""
+
+    def __init__(self, repo_root: Path):
+        self.repo_root = repo_root
+
+    def fingerprints(self, conn, db_path, git_clean) -> dict:
+        root = self.repo_root
+        fp = {"db": str(db_path) if db_path else None, "git": git_clean}
+
+        if db_path is None:
+            db_fallback = None
+            counters = {}
+        elif conn is not None:
+            db_fallback = ("data_version", conn.execute("PRAGMA data_version").fetchone()[0])
+            counters = _read_change_counters(conn)
+        else:
+            db_fallback = (_stat_key(db_path), _stat_key(Path(f"{db_path}-wal")))
+            counters = {}
+        for table in COUNTED_TABLES:
+            fp[table] = counters.get(table, db_fallback)
+
+        fp["golden_docs"] = tuple(_stat_key(root / rel) for rel in READINESS_DOCS)
+        fp["init_marker"] = _stat_key(root / INIT_MARKER_PATH)
+        fp["plans"] = _stat_key(root / "docs" / "PLANS")
+        librarian = _stat_key(root / LIBRARIAN_CACHE_PATH)
+        stale = librarian is not None and (time.time() - librarian[0] / 1e9) > LIBRARIAN_STALE_SECONDS
+        fp["librarian"] = (librarian, stale)
+        return fp
+
+    @staticmethod
+    def etag(fp: dict) -> str:
+        import hashlib
+        return hashlib.sha1(repr(sorted(fp.items())).encode("utf-8")).hexdigest()[:16]
+
+
+# =============================================================================
+# v31: Resident Snapshot Daemon (--serve)
+# =============================================================================
+# The UI used to spawn `python tools/snapshot.py` on every refresh, paying
+# interpreter startup, one SQLite connection per loader, git status and a
+# readiness.py subprocess each time. In --serve mode one process stays up,
+# holds a single read-only connection, and answers JSON-lines requests:
+#
+#   -> {"id": 1, "op": "snapshot"}      ("force": true bypasses all caches)
+#   <- {"id": 1, "ok": true, "etag": "...", "recomputed": ["tasks"],
+#       "elapsed_ms": 1.2, "payload": {...}}
+#   -> {"id": 2, "op": "snapshot", "if_none_match": "<etag>"}
+#   <- {"id": 2, "ok": true, "etag": "<etag>", "not_modified": true, ...}
+#   -> {"op": "ping"}                   <- {"ok": true, "pong": true}
+#   -> {"op": "warmup"}                 <- {"ok": true, "ready": true, "etag": "...", ...}
+#      Readiness handshake: builds (and caches) the first snapshot, paying the
+#      cold start (imports, first git status wait) before the client switches
+#      to its short per-refresh timeout.
+#   -> {"op": "shutdown"}               (EOF on stdin also exits)
+#
+# v32: Sections are recomputed only when their inputs' fingerprints change.
+
+
+class SnapshotServer:
+    """Caching snapshot builder backing the --serve loop."""
+
+    def __init__(self, repo_root: Path):
+        self.repo_root = repo_root
+        self.tracker = ChangeTracker(repo_root)
+        self._sections = {}  # name -> (input key, {field: value})
+        self._payload = None
+        self._etag = None
+        self._git_clean = True
+        self._git_checked_at = None
+
+    def close(self) -> None:
+        conn = _shared_db["conn"]
+        _shared_db["conn"] = None
+        _shared_db["path"] = None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _ensure_connection(self):
+        """Open (or re-target) the shared read-only connection. Returns db path or None."""
+        try:
+            db_path = find_db(self.repo_root)
+        except FileNotFoundError:
+            self.close()
+            return None
+        if _shared_db["conn"] is None or _shared_db["path"] != str(db_path):
+            self.close()
+            try:
+                conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+                conn.execute("PRAGMA query_only=1")
+            except sqlite3.Error:
+                return db_path  # Fall back to per-loader connections
+            _shared_db["conn"] = conn
+            _shared_db["path"] = str(db_path)
+        return db_path
+
+    def _git_status(self) -> bool:
+        if git_state is not None:
+            return check_git_clean(self.repo_root)  # v35: cached, refreshed in background
+        now = time.monotonic()
+        if self._git_checked_at is None or now - self._git_checked_at >= SERVE_GIT_TTL_S:
+            self._git_clean = check_git_clean(self.repo_root)
+            self._git_checked_at = now
+        return self._git_clean
+
+    def _fingerprints(self, db_path, git_clean) -> dict:
+        try:
+            return self.tracker.fingerprints(_shared_db["conn"], db_path, git_clean)
+        except sqlite3.Error:
+            self.close()  # Stale handle (file replaced, etc.): reconnect next request
+            return self.tracker.fingerprints(None, db_path, git_clean)
+
+    def snapshot(self, force: bool = False):
+        """Return (payload, etag, recomputed section names)."""
+        start_time = time.monotonic()
+        db_path = self._ensure_connection()
+        git_clean = self._git_status()
+        fp = self._fingerprints(db_path, git_clean)
+        etag = ChangeTracker.etag(fp)
+        if not force and self._payload is not None and etag == self._etag:
+            return self._payload, etag, []
+
+        payload = _default_payload(self.repo_root)
+        ctx = {
+            "repo_root": self.repo_root,
+            "db_path": db_path,
+            "readiness_in_process": True,
+            "git_clean": git_clean,
+        }
+        recomputed = []
+        for name, fn, fields, inputs, needs_db, _guard in SNAPSHOT_SECTIONS:
+            if needs_db and db_path is None:
+                continue
+            key = tuple(fp[i] for i in inputs)
+            cached = self._sections.get(name)
+            if not force and cached is not None and cached[0] == key:
+                payload.update(cached[1])
+                continue
+            fn(ctx, payload)
+            self._sections[name] = (key, {f: payload[f] for f in fields if f in payload})
+            recomputed.append(name)
+
+        self._payload = payload
+        self._etag = etag
+        if (time.monotonic() - start_time) * 1000 > TIMING_GUARD_MS:
+            payload["ReadinessMode"] = "fail-open"
+            self._etag = None  # Don't pin a fail-open payload
+        return payload, etag, recomputed
+
+    def handle(self, request: dict) -> dict:
+        response = {"id": request.get("id"), "ok": True}
+        op = request.get("op", "snapshot")
+        if op == "ping":
+            response["pong"] = True
+        elif op == "warmup":
+            start = time.monotonic()
+            try:
+                _payload, etag, recomputed = self.snapshot()
+            except Exception as exc:  # noqa: BLE001
+                return {"id": request.get("id"), "ok": False, "error": str(exc)}
+            response["ready"] = True
+            response["etag"] = etag
+            response["recomputed"] = recomputed
+            response["elapsed_ms"] = round((time.monotonic() - start) * 1000, 2)
+        elif op == "snapshot":
+            start = time.monotonic()
+            try:
+                payload, etag, recomputed = self.snapshot(force=bool(request.get("force")))
+            except Exception as exc:  # noqa: BLE001
+                return {"id": request.get("id"), "ok": False, "error": str(exc)}
+            response["etag"] = etag
+            response["recomputed"] = recomputed
+            response["elapsed_ms"] = round((time.monotonic() - start) * 1000, 2)
+            if request.get("if_none_match") == etag:
+                response["not_modified"] = True
+            else:
+                response["payload"] = payload
+        else:
+            return {"id": request.get("id"), "ok": False, "error": f"unknown op: {op}"}
+        return response
+
+
+def _write_line(stdout, obj: dict) -> None:
+    stdout.write(json.dumps(obj, separators=(",", ":")) + "\n")
+    stdout.flush()
+
+
+def serve(repo_root: Path, stdin=None, stdout=None) -> None:
+    """JSON-lines request loop; returns on EOF or a shutdown request."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    server = SnapshotServer(repo_root)
+    try:
+        for line in stdin:
+            line = line.strip()
+            try:
+                request = json.loads(line) if line else {}
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as exc:
+                _write_line(stdout, {"id": None, "ok": False, "error": f"invalid request: {exc}"})
+                continue
+            if request.get("op") == "shutdown":
+                _write_line(stdout, {"id": request.get("id"), "ok": True})
+                return
+            _write_line(stdout, server.handle(request))
+    finally:
+        server.close()
+
+
+def main():
+    args = sys.argv[1:]
+    serve_mode = "--serve" in args
+    args = [a for a in args if a != "--serve"]
+    repo_root = Path(args[0]) if args else Path.cwd()
+    repo_root = repo_root.resolve()
+
+    if serve_mode:
+        serve(repo_root)
+        return
+
+    try:
+        payload = build_snapshot(repo_root)
+    except Exception as exc:  # noqa: BLE001
+        sys.stderr.write(str(exc))
+        sys.exit(1)
     sys.stdout.write(json.dumps(payload, separators=(",", ":")))
 
 
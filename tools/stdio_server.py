@@ -26,7 +26,8 @@ def ensure_db_path(db_path_arg: str | None):
 def load_mesh_server():
     # Import mesh_server after env is ready; it creates the mcp instance with registered tools
     import mesh_server
-    return mesh_server.mcp  # Return the mcp instance with all tools registered
+    # mesh_server.mcp defers tool registration; .server builds the FastMCP instance
+    return mesh_server.mcp.server
 
 
 async def run_server():
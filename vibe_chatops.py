@@ -108,13 +108,21 @@ def get_status_summary():
         GROUP BY lane
     """).fetchall()
     
-    # Task summary by status
-    tasks = conn.execute("""
-        SELECT status, COUNT(*) as count 
-        FROM tasks 
-        GROUP BY status
-        ORDER BY count DESC
-    """).fetchall()
+    # Task summary by status (V3.4: trigger-maintained lane_status_counts)
+    try:
+        tasks = conn.execute("""
+            SELECT status, SUM(count) as count
+            FROM lane_status_counts
+            GROUP BY status
+            ORDER BY count DESC
+        """).fetchall()
+    except sqlite3.OperationalError:
+        tasks = conn.execute("""
+            SELECT status, COUNT(*) as count 
+            FROM tasks 
+            GROUP BY status
+            ORDER BY count DESC
+        """).fetchall()
     
     conn.close()
     
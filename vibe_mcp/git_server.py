@@ -15,6 +15,13 @@ import subprocess
 import os
 from typing import Optional
 
+# v35: Shared background git-status cache (tools/git_state.py)
+try:
+    from tools.git_state import get_service, read_git_state
+    GIT_STATE_AVAILABLE = True
+except ImportError:
+    GIT_STATE_AVAILABLE = False
+
 
 def run_git(args: list, cwd: Optional[str] = None) -> dict:
     """Execute git command and return structured result."""
@@ -37,6 +44,10 @@ def run_git(args: list, cwd: Optional[str] = None) -> dict:
         return {"success": False, "error": str(e)}
 
 
+# Re-run git inline when the cached status is invalidated or older than this
+GIT_STATUS_MAX_AGE_S = 2.0
+
+
 def git_status(cwd: Optional[str] = None) -> dict:
     """
     MCP Tool: Get repository status.
@@ -47,21 +58,30 @@ def git_status(cwd: Optional[str] = None) -> dict:
             "staged": [files],
             "modified": [files],
             "untracked": [files],
-            "clean": bool
+            "clean": bool,
+            "age_s": float  # v35: age of the cached status (0 without tools/git_state)
         }
     """
-    result = run_git(["status", "--porcelain", "-b"], cwd)
-    if not result["success"]:
-        return result
-    
-    lines = result["stdout"].split("\n")
+    age_s = 0.0
+    if GIT_STATE_AVAILABLE:
+        state = read_git_state(cwd or os.getcwd(), max_age_s=GIT_STATUS_MAX_AGE_S)
+        if not state.ok:
+            return {"success": False, "error": state.error}
+        lines = ["## " + state.branch] + list(state.entries)
+        age_s = round(state.age_s, 3)
+    else:
+        result = run_git(["status", "--porcelain", "-b"], cwd)
+        if not result["success"]:
+            return result
+        lines = result["stdout"].split("\n")
     
     status = {
         "branch": "",
         "staged": [],
         "modified": [],
         "untracked": [],
-        "clean": True
+        "clean": True,
+        "age_s": age_s
     }
     
     for line in lines:
@@ -160,6 +180,8 @@ def git_commit(message: str, files: Optional[list] = None, cwd: Optional[str] =
     
     # Commit
     result = run_git(["commit", "-m", message], cwd)
+    if GIT_STATE_AVAILABLE:
+        get_service(cwd or os.getcwd()).invalidate()  # v35: staged/committed
     
     if not result["success"]:
         if "nothing to commit" in result.get("stderr", "") or "nothing to commit" in result.get("stdout", ""):